@@ -1,58 +1,275 @@
 # api_client.py
 
-import streamlit as st
-import requests
+"""
+Client pentru intensitatea carbonică live (Electricity Maps).
+
+`CarbonIntensityClient` folosește o sesiune `requests` cu pool de conexiuni,
+timeout-uri și reîncercări cu backoff (tenacity) pentru erorile tranzitorii.
+Valorile sunt păstrate într-un cache pe disc cu TTL (`DiskTTLCache`), comun
+tuturor proceselor și care supraviețuiește repornirii. Cererile concurente
+pentru aceeași zonă sunt deduplicate (single-flight): un singur apel HTTP,
+ceilalți apelanți așteaptă rezultatul lui. `fetch_many` preia mai multe zone
+în paralel (asyncio).
+
+URL-ul de bază este configurabil (config.EM_API_BASE_URL), astfel încât
+clientul poate fi testat contra unui server local.
+"""
+import asyncio
+import json
+import math
 import os
-# Nu mai este nevoie de load_dotenv aici dacă este deja în config.py și config.py este importat devreme în app_streamlit.py
-# from dotenv import load_dotenv
-# load_dotenv() # Asigură-te că EM_API_KEY este disponibil ca variabilă de mediu
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from tenacity import Retrying, retry_if_exception, stop_after_attempt, wait_exponential_jitter
+
+import config
+
+
+class CarbonIntensityError(Exception):
+    """Intensitatea carbonică nu a putut fi obținută (și nu există o valoare în cache)."""
+
+
+# ==============================================================================
+# == CACHE PE DISC CU TTL
+# ==============================================================================
+
+class DiskTTLCache:
+    """
+    Cache cheie -> valoare, persistat ca JSON. Fiecare intrare reține momentul
+    preluării; intrările mai vechi de `ttl` secunde sunt considerate expirate,
+    dar rămân disponibile ca rezervă (`get(..., allow_stale=True)`).
+    Scrierea este atomică (fișier temporar + os.replace).
+    """
+
+    def __init__(self, path, ttl=config.CARBON_CACHE_TTL_S):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def get(self, key, allow_stale=False):
+        """Returnează (valoare, vârsta în secunde) sau None dacă intrarea lipsește sau a expirat."""
+        with self._lock:
+            entry = self._load().get(key)
+        if entry is None:
+            return None
+        age = time.time() - entry["fetched_at"]
+        if age > self.ttl and not allow_stale:
+            return None
+        return entry["value"], age
+
+    def set(self, key, value):
+        with self._lock:
+            data = self._load()
+            data[key] = {"value": value, "fetched_at": time.time()}
+            directory = os.path.dirname(self.path) or "."
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".carbon-", suffix=".json")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(data, f)
+                os.replace(tmp_path, self.path)
+            except OSError:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+
+    def clear(self):
+        with self._lock:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+
+# ==============================================================================
+# == CLIENTUL HTTP
+# ==============================================================================
+
+def _is_transient(error):
+    """Erori pentru care are sens o reîncercare: rețea, timeout, 429 și 5xx."""
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return True
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        return error.response.status_code == 429 or error.response.status_code >= 500
+    return False
+
+
+class CarbonIntensityClient:
+    """
+    Client pentru `GET {base_url}/carbon-intensity/latest?zone=<cod>`.
+
+    Args:
+        api_key (str): Token-ul Electricity Maps (implicit variabila EM_API_KEY).
+        base_url (str): URL-ul de bază al API-ului (implicit config.EM_API_BASE_URL).
+        timeout (tuple): Timeout-urile (conectare, citire) în secunde.
+        max_attempts (int): Numărul maxim de încercări pentru erorile tranzitorii.
+        cache (DiskTTLCache): Cache-ul persistent; None pentru a-l dezactiva.
+        pool_size (int): Conexiunile păstrate deschise per gazdă.
+    """
+
+    def __init__(self, api_key=None, base_url=None, timeout=config.EM_API_TIMEOUT_S,
+                 max_attempts=config.EM_API_MAX_ATTEMPTS, cache=None, pool_size=10):
+        self.api_key = api_key if api_key is not None else os.getenv("EM_API_KEY")
+        self.base_url = (base_url or config.EM_API_BASE_URL).rstrip("/")
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+        self.cache = cache
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        if self.api_key:
+            self.session.headers["auth-token"] = self.api_key
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+        self.stats = {"requests": 0, "cache_hits": 0, "stale_hits": 0, "deduplicated": 0}
+
+    def _fetch(self, zone):
+        """Un apel HTTP (cu reîncercări); ridică CarbonIntensityError dacă răspunsul nu e valid."""
+        for attempt in Retrying(stop=stop_after_attempt(self.max_attempts), wait=wait_exponential_jitter(initial=0.2, max=2.0),
+                                retry=retry_if_exception(_is_transient), reraise=True):
+            with attempt:
+                self.stats["requests"] += 1
+                response = self.session.get(f"{self.base_url}/carbon-intensity/latest", params={"zone": zone}, timeout=self.timeout)
+                response.raise_for_status()
+        try:
+            payload = response.json()
+        except ValueError:
+            raise CarbonIntensityError(f"Răspuns API care nu este JSON pentru zona {zone}") from None
+        value = payload.get("carbonIntensity") if isinstance(payload, dict) else None
+        if value is None:
+            raise CarbonIntensityError(f"Răspuns API fără 'carbonIntensity' pentru zona {zone}")
+        if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+            raise CarbonIntensityError(f"Valoare 'carbonIntensity' invalidă pentru zona {zone}: {value!r}")
+        try:
+            value = float(value)
+        except ValueError:
+            raise CarbonIntensityError(f"Valoare 'carbonIntensity' invalidă pentru zona {zone}: {value!r}") from None
+        if not math.isfinite(value) or value < 0:
+            raise CarbonIntensityError(f"Valoare 'carbonIntensity' invalidă pentru zona {zone}: {value!r}")
+        return value
+
+    def get(self, zone, allow_stale=True):
+        """
+        Intensitatea carbonică (gCO2eq/kWh) pentru o zonă.
+
+        Ordinea: cache proaspăt -> un singur apel HTTP per zonă (apelanții concurenți
+        așteaptă același rezultat) -> valoarea expirată din cache, dacă `allow_stale`.
+
+        Raises:
+            CarbonIntensityError: Dacă nu există cheie API, apelul eșuează și nu există rezervă.
+        """
+        if self.cache is not None:
+            cached = self.cache.get(zone)
+            if cached is not None:
+                self.stats["cache_hits"] += 1
+                return cached[0]
+
+        with self._inflight_lock:
+            future = self._inflight.get(zone)
+            owner = future is None
+            if owner:
+                future = self._inflight[zone] = Future()
+            else:
+                self.stats["deduplicated"] += 1
+        if owner:
+            try:
+                if not self.api_key:
+                    raise CarbonIntensityError("Cheia API (EM_API_KEY) lipsește")
+                value = self._fetch(zone)
+                future.set_result(value)
+                if self.cache is not None:
+                    try:
+                        self.cache.set(zone, value)
+                    except OSError:
+                        pass  # un cache pe disc indisponibil nu trebuie să blocheze valoarea live
+            except Exception as e:
+                future.set_exception(e)
+            finally:
+                with self._inflight_lock:
+                    self._inflight.pop(zone, None)
+        try:
+            return future.result()
+        except (requests.RequestException, CarbonIntensityError, ValueError) as e:
+            stale = self.cache.get(zone, allow_stale=True) if (self.cache is not None and allow_stale) else None
+            if stale is not None:
+                self.stats["stale_hits"] += 1
+                return stale[0]
+            raise CarbonIntensityError(f"Intensitatea CO2 pentru zona {zone} nu a putut fi obținută: {e}") from e
+
+    async def fetch_many(self, zones, max_concurrency=8):
+        """
+        Preia mai multe zone în paralel. Returnează zonă -> valoare (sau excepția
+        CarbonIntensityError, pentru zonele care au eșuat).
+        """
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(zones)))) as executor:
+            results = await asyncio.gather(*(loop.run_in_executor(executor, self.get, zone) for zone in zones), return_exceptions=True)
+        return dict(zip(zones, results))
+
+    def get_many(self, zones, max_concurrency=8):
+        """Varianta sincronă a `fetch_many` (pentru codul care nu rulează într-o buclă asyncio)."""
+        return asyncio.run(self.fetch_many(list(zones), max_concurrency))
+
+    def close(self):
+        self.session.close()
+
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def get_default_client():
+    """Clientul partajat de proces (sesiune și cache pe disc comune tuturor sesiunilor Streamlit)."""
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = CarbonIntensityClient(cache=DiskTTLCache(config.CARBON_CACHE_PATH))
+        return _default_client
+
+
+# ==============================================================================
+# == INTEGRAREA CU STREAMLIT
+# ==============================================================================
 
-@st.cache_data(ttl=24*3600) # Cache pentru 24 de ore
 def get_romania_carbon_intensity():
     """
     Obține intensitatea carbonică pentru România de la API-ul Electricity Maps.
-    Folosește cheia API din variabilele de mediu.
+    Folosește cheia API din variabilele de mediu și cache-ul pe disc al clientului implicit.
     Afișează mesaje de avertizare/succes/eroare în interfața Streamlit.
 
     Returns:
         float or None: Intensitatea carbonică (gCO2eq/kWh) sau None dacă eșuează.
     """
-    api_key = os.getenv("EM_API_KEY")
-    zone_code = "RO"
-
-    if not api_key:
-        # Acest mesaj va apărea în contextul în care funcția este apelată.
-        # Este mai bine ca mesajele specifice UI să fie gestionate în app_streamlit.py
-        # dar pentru simplitate și pentru că funcția este @st.cache_data,
-        # un warning aici poate fi util.
+    import streamlit as st
+    zone_code = config.ROMANIA_ZONE_CODE
+    client = get_default_client()
+
+    if not client.api_key:
         if 'api_key_warning_shown_details' not in st.session_state:
             st.warning(f"Cheia API (EM_API_KEY) lipsește pentru Electricity Maps. Se va folosi valoarea implicită pentru CO2.")
             st.session_state.api_key_warning_shown_details = True
         return None
 
-    headers = {'auth-token': api_key}
     try:
-        response = requests.get(f'https://api.electricitymap.org/v3/carbon-intensity/latest?zone={zone_code}', headers=headers)
-        response.raise_for_status()  # Va ridica o excepție pentru statusuri HTTP 4xx/5xx
-        data = response.json()
-        carbon_intensity = data.get('carbonIntensity')
-
-        if carbon_intensity is not None:
-            # Similar, gestionarea st.session_state pentru mesaje de succes
-            # poate fi mai curat gestionată în app_streamlit.py
-            if 'api_call_success_msg_shown' not in st.session_state or \
-               not st.session_state.api_call_success_msg_shown.get(zone_code, False):
-                st.success(f"Intensitatea CO2 pentru România: {carbon_intensity:.2f} gCO2eq/kWh (Sursa: Electricity Maps). Cache: 24h.")
-                if 'api_call_success_msg_shown' not in st.session_state:
-                    st.session_state.api_call_success_msg_shown = {}
-                st.session_state.api_call_success_msg_shown[zone_code] = True
-            return float(carbon_intensity)
-        else:
-            st.warning(f"Răspuns API invalid pentru România (Electricity Maps). Se folosește valoarea implicită.")
-            return None
-    except requests.exceptions.RequestException as e:
+        carbon_intensity = client.get(zone_code)
+    except CarbonIntensityError as e:
         st.error(f"Eroare API România (Electricity Maps): {e}. Se folosește valoarea implicită.")
         return None
-    except Exception as e: # Captură mai generală pentru alte erori neașteptate
-        st.error(f"Eroare neașteptată la preluarea datelor CO2 pentru România: {e}. Se folosește valoarea implicită.")
-        return None
+
+    if 'api_call_success_msg_shown' not in st.session_state:
+        st.session_state.api_call_success_msg_shown = {}
+    if not st.session_state.api_call_success_msg_shown.get(zone_code, False):
+        st.success(f"Intensitatea CO2 pentru România: {carbon_intensity:.2f} gCO2eq/kWh (Sursa: Electricity Maps). Cache: {config.CARBON_CACHE_TTL_S // 3600}h.")
+        st.session_state.api_call_success_msg_shown[zone_code] = True
+    return carbon_intensity
@@ -1,125 +1,263 @@
 # api_handler.py
 
-import math
+"""
+Modelele analitice pentru fiecare scenariu.
+
+Evaluarea are două etape:
+  1. `*_costs`: costurile abstracte (CPU, mișcare date, memorie), care nu
+     depind de hardware sau de intensitatea CO2. Pe nivel de scenariu,
+     rezultatul este păstrat într-un cache (vezi `scenario_costs`).
+  2. `apply_energy_factors`: conversia liniară în kWh și gCO2; rezultatul
+     final este și el păstrat în cache (vezi `run_scenario_batch`).
+
+Fiecare model are o variantă vectorizată (`*_batch`) care acceptă array-uri
+NumPy pentru oricare parametru, le face broadcast și returnează un
+`results.ResultTable` (coloane pentru costurile abstracte, energie și CO2).
+Funcțiile scalare sunt doar un strat subțire peste varianta batch și
+returnează un `results.ModelResult`.
+"""
+import hashlib
+import threading
+from contextlib import contextmanager
+
+import numpy as np
 # --- Corecție Importuri ---
 import utils  # Am înlocuit 'from . import utils'
 import config # Am înlocuit 'from . import config'
+import profiling
+import shared_cache
+from results import ResultTable
 # --- Sfârșit Corecție Importuri ---
 
+# ==============================================================================
+# == FUNCȚII AJUTĂTOARE PENTRU VECTORIZARE
+# ==============================================================================
+
+def _broadcast(*args):
+    """Convertește argumentele în array-uri float64 cu aceeași formă (broadcast)."""
+    return np.broadcast_arrays(*(np.asarray(a, dtype=np.float64) for a in args))
+
+def _log2_safe(N):
+    """log2(N) pentru N > 1, altfel 0 (evită avertismentele pentru N <= 0)."""
+    return np.log2(np.maximum(N, 1.0))
+
+def _first_record(result_table):
+    """Transformă rezultatul unui model batch cu un singur punct în `ModelResult`."""
+    return result_table.record(0)
+
+# ==============================================================================
+# == CONSTANTELE DE COST (COST_PER_*)
+# ==============================================================================
+# Modelele citesc constantele prin `cost_constant`, astfel încât ele pot fi
+# înlocuite temporar, doar pe firul curent (ex: eșantioane Monte Carlo ca array-uri),
+# fără a modifica config.py pentru celelalte sesiuni.
+_constant_overrides = threading.local()
+
+def cost_constant(name):
+    """Valoarea unei constante COST_PER_*: suprascrierea activă pe firul curent sau cea din config."""
+    overrides = getattr(_constant_overrides, "values", None)
+    if overrides is not None and name in overrides:
+        return overrides[name]
+    return getattr(config, name)
+
+@contextmanager
+def override_cost_constants(**values):
+    """
+    Înlocuiește constante COST_PER_* (scalari sau array-uri 1-D) pe firul curent.
+    Array-urile se combină prin broadcast cu parametrii modelelor; în interior
+    `scenario_costs` nu folosește cache-ul.
+    """
+    unknown = [name for name in values if not name.startswith("COST_PER_") or not hasattr(config, name)]
+    if unknown:
+        raise KeyError(f"Constante de cost necunoscute: {', '.join(unknown)}")
+    previous = getattr(_constant_overrides, "values", None)
+    _constant_overrides.values = {**(previous or {}), **values}
+    try:
+        yield
+    finally:
+        _constant_overrides.values = previous
+
+def _has_constant_overrides():
+    return bool(getattr(_constant_overrides, "values", None))
+
+# ==============================================================================
+# == ETAPA 2: CONVERSIA COSTURILOR ABSTRACTE ÎN ENERGIE ȘI CO2
+# ==============================================================================
+
+def _model_blocks(costs):
+    """Numărul de modele dintr-un tabel de costuri (blocuri egale, în ordinea modelelor)."""
+    m = max(len(costs.model_names), 1)
+    if len(costs) % m:
+        raise ValueError("Tabelul de costuri trebuie să conțină același număr de rânduri pentru fiecare model.")
+    return m
+
+@profiling.timed("api_handler.energy_factors")
+def apply_energy_factors(costs, kwh_cpu, kwh_data, gco2_factor):
+    """
+    Convertește un tabel de costuri abstracte în kWh și gCO2 (conversie liniară).
+
+    Factorii pot fi scalari sau array-uri 1-D; se face broadcast cu punctele
+    fiecărui model (ex: un singur punct de cost x K factori -> K rânduri).
+
+    Args:
+        costs (ResultTable): Costuri produse de `*_costs` / `scenario_costs`
+            (același număr de rânduri per model, în blocuri consecutive).
+        kwh_cpu, kwh_data, gco2_factor: Factorii de conversie.
+
+    Returns:
+        ResultTable: Un tabel nou, cu coloanele de energie și CO2 completate.
+    """
+    m = _model_blocks(costs)
+    cpu = costs["cpu_operations"].reshape(m, -1)
+    data = costs["data_movement_units"].reshape(m, -1)
+    kwh, co2 = utils.calculate_energy_co2(cpu, data, np.asarray(kwh_cpu, dtype=np.float64), np.asarray(kwh_data, dtype=np.float64), np.asarray(gco2_factor, dtype=np.float64))
+    kwh, co2 = np.broadcast_arrays(kwh, co2)
+    shape = kwh.shape
+    columns = {col: np.broadcast_to(costs[col].reshape(m, -1), shape).ravel() for col in ("cpu_operations", "data_movement_units", "memory_usage_data_units", "aux_memory_units")}
+    columns["estimated_kwh"] = kwh.ravel()
+    columns["estimated_co2_g"] = co2.ravel()
+    param_columns = {k: np.broadcast_to(v.reshape(m, -1), shape).ravel() for k, v in costs.param_columns.items()}
+    return ResultTable(costs.model_names, np.repeat(np.arange(m, dtype=np.int16), shape[1]), columns,
+                       param_columns, costs.complexity, costs.param_categories)
+
+def energy_matrix(costs, kwh_cpu, kwh_data, gco2_factor):
+    """
+    Calculează energia și CO2 pentru toate combinațiile profil hardware x zonă CO2
+    într-un singur broadcast, fără a reevalua modelele.
+
+    Args:
+        costs (ResultTable): Costuri abstracte (m modele x n puncte).
+        kwh_cpu, kwh_data (array P): Factorii profilurilor hardware.
+        gco2_factor (array Z): Intensitățile CO2 ale zonelor.
+
+    Returns:
+        tuple: (kwh de formă (m, n, P), co2 de formă (m, n, P, Z)).
+    """
+    m = _model_blocks(costs)
+    cpu = costs["cpu_operations"].reshape(m, -1, 1)
+    data = costs["data_movement_units"].reshape(m, -1, 1)
+    kwh = cpu * np.asarray(kwh_cpu, dtype=np.float64) + data * np.asarray(kwh_data, dtype=np.float64)
+    co2 = kwh[..., None] * np.asarray(gco2_factor, dtype=np.float64)
+    return kwh, co2
+
 # == SCENARIUL 1: SORTAREA DATELOR ==
+def model_standard_sort_costs(N, average_record_size_data_units):
+    N, rec_size = _broadcast(N, average_record_size_data_units)
+    valid = (N > 0) & (rec_size > 0)
+    comparisons = N * (N - 1) / 2
+    swaps = N * (N - 1) / 4 # Estimare pentru BubbleSort mediu
+    cpu_operations = (comparisons * cost_constant("COST_PER_COMPARISON_CPU")) + \
+                     (swaps * cost_constant("COST_PER_SWAP_FULL_RECORD_CPU"))
+    data_movement = swaps * rec_size * 2.0 # Fiecare swap mută 2 înregistrări
+    memory_usage_data_units = N * rec_size # Stocarea listei
+    cpu_operations, data_movement, memory_usage_data_units = (np.where(valid, x, 0.0) for x in (cpu_operations, data_movement, memory_usage_data_units))
+    return ResultTable.from_model(
+        "Sortare Standard (tip BubbleSort)",
+        complexity_cpu="O(N^2)",
+        complexity_memory="O(N)",
+        cpu_operations=cpu_operations,
+        data_movement_units=data_movement,
+        memory_usage_data_units=memory_usage_data_units,
+    )
+
+def model_standard_sort_batch(N, average_record_size_data_units, kwh_cpu, kwh_data, gco2_factor):
+    return apply_energy_factors(model_standard_sort_costs(N, average_record_size_data_units), kwh_cpu, kwh_data, gco2_factor)
+
 def model_standard_sort(N, average_record_size_data_units, kwh_cpu, kwh_data, gco2_factor):
-    default_return = {"name": "Sortare Standard (tip BubbleSort)", "cpu_operations": 0.0, "data_movement_units": 0.0, "memory_usage_data_units": 0.0, "estimated_kwh": 0.0, "estimated_co2_g": 0.0, "complexity_cpu": "O(N^2)", "complexity_memory": "O(N)"}
-    if N <= 0 or average_record_size_data_units <=0: return default_return
-    comparisons = float(N * (N - 1) / 2)
-    swaps = float(N * (N - 1) / 4) # Estimare pentru BubbleSort mediu
-    cpu_operations = (comparisons * config.COST_PER_COMPARISON_CPU) + \
-                     (swaps * config.COST_PER_SWAP_FULL_RECORD_CPU)
-    data_movement = swaps * average_record_size_data_units * 2.0 # Fiecare swap mută 2 înregistrări
-    memory_usage_data_units = float(N * average_record_size_data_units) # Stocarea listei
-    kwh, co2 = utils.calculate_energy_co2(cpu_operations, data_movement, kwh_cpu, kwh_data, gco2_factor)
-    return {
-        "name": "Sortare Standard (tip BubbleSort)",
-        "cpu_operations": cpu_operations,
-        "data_movement_units": data_movement,
-        "memory_usage_data_units": memory_usage_data_units,
-        "estimated_kwh": kwh,
-        "estimated_co2_g": co2,
-        "complexity_cpu": "O(N^2)",
-        "complexity_memory": "O(N)"
-    }
+    return _first_record(model_standard_sort_batch(N, average_record_size_data_units, kwh_cpu, kwh_data, gco2_factor))
+
+def model_efficient_sort_costs(N, average_record_size_data_units):
+    N, rec_size = _broadcast(N, average_record_size_data_units)
+    valid = (N > 0) & (rec_size > 0)
+    log2_N = _log2_safe(N)
+    # Pentru N == 1: o comparație, zero swap-uri (cazul de bază pentru logN)
+    comparisons = np.where(N > 1, N * log2_N, np.where(N == 1, 1.0, 0.0))
+    swaps = np.where(N > 1, N * log2_N / 2.0, 0.0) # O estimare, poate varia
+    aux_memory_logN = np.where(N > 1, log2_N * 1.0, 0.0) # Estimare spațiu stivă pentru recursivitate (unități abstracte)
+    cpu_operations = (comparisons * cost_constant("COST_PER_COMPARISON_CPU")) + \
+                     (swaps * cost_constant("COST_PER_SWAP_FULL_RECORD_CPU")) # Quicksort face swap-uri pe înregistrări complete
+    data_movement = swaps * rec_size * 2.0
+    memory_usage_data_units = N * rec_size # Stocarea listei
+    cpu_operations, data_movement, memory_usage_data_units, aux_memory_logN = (np.where(valid, x, 0.0) for x in (cpu_operations, data_movement, memory_usage_data_units, aux_memory_logN))
+    return ResultTable.from_model(
+        "Sortare Eficientă (tip Quicksort)",
+        complexity_cpu="O(N log N)",
+        complexity_memory="O(N) + O(log N) aux",
+        cpu_operations=cpu_operations,
+        data_movement_units=data_movement,
+        memory_usage_data_units=memory_usage_data_units,
+        aux_memory_units=aux_memory_logN,
+    )
+
+def model_efficient_sort_batch(N, average_record_size_data_units, kwh_cpu, kwh_data, gco2_factor):
+    return apply_energy_factors(model_efficient_sort_costs(N, average_record_size_data_units), kwh_cpu, kwh_data, gco2_factor)
 
 def model_efficient_sort(N, average_record_size_data_units, kwh_cpu, kwh_data, gco2_factor):
-    default_return = {"name": "Sortare Eficientă (tip Quicksort)", "cpu_operations": 0.0, "data_movement_units": 0.0, "memory_usage_data_units": 0.0, "aux_memory_units (stack)": 0.0, "estimated_kwh": 0.0, "estimated_co2_g": 0.0, "complexity_cpu": "O(N log N)", "complexity_memory": "O(N) + O(log N) aux"}
-    if N <= 0 or average_record_size_data_units <=0: return default_return
-    aux_memory_logN = 0.0
-    comparisons, swaps = 0.0, 0.0
-    if N == 1: # Cazul de bază pentru logN
-        comparisons, swaps = 1.0, 0.0 # O comparație, zero swap-uri
-    elif N > 1:
-        comparisons = float(N * math.log2(N))
-        swaps = float(N * math.log2(N) / 2.0) # O estimare, poate varia
-        aux_memory_logN = float(math.log2(N) * 1.0) # Estimare spațiu stivă pentru recursivitate (unități abstracte)
-    cpu_operations = (comparisons * config.COST_PER_COMPARISON_CPU) + \
-                     (swaps * config.COST_PER_SWAP_FULL_RECORD_CPU) # Quicksort face swap-uri pe înregistrări complete
-    data_movement = swaps * average_record_size_data_units * 2.0
-    memory_usage_data_units = float(N * average_record_size_data_units) # Stocarea listei
-    kwh, co2 = utils.calculate_energy_co2(cpu_operations, data_movement, kwh_cpu, kwh_data, gco2_factor)
-    return {
-        "name": "Sortare Eficientă (tip Quicksort)",
-        "cpu_operations": cpu_operations,
-        "data_movement_units": data_movement,
-        "memory_usage_data_units": memory_usage_data_units,
-        "aux_memory_units (stack)": aux_memory_logN,
-        "estimated_kwh": kwh,
-        "estimated_co2_g": co2,
-        "complexity_cpu": "O(N log N)",
-        "complexity_memory": "O(N) + O(log N) aux"
-    }
+    return _first_record(model_efficient_sort_batch(N, average_record_size_data_units, kwh_cpu, kwh_data, gco2_factor))
 
-def model_sort_index(N, average_record_size_data_units, size_of_key_index_pair_data_units, kwh_cpu, kwh_data, gco2_factor):
-    default_return = {"name": "Sortare-Index (Sortare Eficientă Chei)", "cpu_operations": 0.0, "data_movement_units": 0.0, "peak_memory_usage_data_units": 0.0, "estimated_kwh": 0.0, "estimated_co2_g": 0.0, "complexity_cpu": "O(N log N)", "complexity_memory": "O(N) (original) + O(N) (chei)"}
-    if N <= 0 or average_record_size_data_units <=0 or size_of_key_index_pair_data_units <=0: return default_return
+def model_sort_index_costs(N, average_record_size_data_units, size_of_key_index_pair_data_units):
+    N, rec_size, key_size = _broadcast(N, average_record_size_data_units, size_of_key_index_pair_data_units)
+    valid = (N > 0) & (rec_size > 0) & (key_size > 0)
 
     # 1. Creare listă de perechi (cheie, index original)
-    cpu_ops_creation = float(N * 1.0) # Estimare: o operație per element pentru a extrage cheia și a stoca indexul
-    memory_for_key_index_list = float(N * size_of_key_index_pair_data_units)
+    cpu_ops_creation = N * 1.0 # Estimare: o operație per element pentru a extrage cheia și a stoca indexul
+    memory_for_key_index_list = N * key_size
 
     # 2. Sortare listă de perechi (cheie, index) folosind un algoritm eficient (N log N)
-    key_comparisons, key_swaps = 0.0, 0.0
-    if N == 1:
-        key_comparisons, key_swaps = 1.0, 0.0
-    elif N > 1 :
-        key_comparisons = float(N * math.log2(N))
-        key_swaps = float(N * math.log2(N) / 2.0) # Swap-uri pe perechi cheie-index
+    log2_N = _log2_safe(N)
+    key_comparisons = np.where(N > 1, N * log2_N, np.where(N == 1, 1.0, 0.0))
+    key_swaps = np.where(N > 1, N * log2_N / 2.0, 0.0) # Swap-uri pe perechi cheie-index
 
-    cpu_ops_sorting_keys = (key_comparisons * config.COST_PER_COMPARISON_CPU) + \
-                           (key_swaps * config.COST_PER_SWAP_KEY_INDEX_CPU) # Cost mai mic pentru swap chei+index
-    data_movement_sorting_keys = key_swaps * size_of_key_index_pair_data_units * 2.0
+    cpu_ops_sorting_keys = (key_comparisons * cost_constant("COST_PER_COMPARISON_CPU")) + \
+                           (key_swaps * cost_constant("COST_PER_SWAP_KEY_INDEX_CPU")) # Cost mai mic pentru swap chei+index
+    data_movement_sorting_keys = key_swaps * key_size * 2.0
 
     # 3. (Opțional, dacă se dorește reordonarea listei originale pe loc sau într-o nouă listă)
     # Aici modelăm costul creării unei noi liste sortate pe baza indexului sortat.
     # Dacă s-ar face pe loc, ar fi mai complex de modelat (cicluri de permutare).
     # Presupunem o citire a listei originale și o scriere în noua listă.
-    cpu_ops_reordering = float(N * 2.0) # O citire, o scriere per element (acces memorie)
-    data_movement_reordering = float(N * average_record_size_data_units) # Mutarea întregii înregistrări o dată
+    cpu_ops_reordering = N * 2.0 # O citire, o scriere per element (acces memorie)
+    data_movement_reordering = N * rec_size # Mutarea întregii înregistrări o dată
 
     total_cpu_operations = cpu_ops_creation + cpu_ops_sorting_keys + cpu_ops_reordering
     total_data_movement = data_movement_sorting_keys + data_movement_reordering
     # Memoria de vârf include lista originală și lista de chei-index
-    peak_memory_usage_data_units = (N * average_record_size_data_units) + memory_for_key_index_list
-
-    kwh, co2 = utils.calculate_energy_co2(total_cpu_operations, total_data_movement, kwh_cpu, kwh_data, gco2_factor)
-    return {
-        "name": "Sortare-Index (Sortare Eficientă Chei)",
-        "cpu_operations": total_cpu_operations,
-        "data_movement_units": total_data_movement,
-        "peak_memory_usage_data_units": peak_memory_usage_data_units,
-        "estimated_kwh": kwh,
-        "estimated_co2_g": co2,
-        "complexity_cpu": "O(N log N)", # Dominat de sortarea cheilor
-        "complexity_memory": "O(N) (original) + O(N) (chei)"
-    }
+    peak_memory_usage_data_units = (N * rec_size) + memory_for_key_index_list
 
-# == SCENARIUL 2: GENERAREA RAPORTULUI DE VÂNZĂRI ==
-def model_standard_sales_report(num_transactions, avg_items_per_transaction, avg_record_size_transaction_header, avg_record_size_item, kwh_cpu, kwh_data, gco2_factor):
-    default_return = {"name": "Raport Vânzări Standard (Multi-Pass)", "cpu_operations": 0.0, "data_movement_units": 0.0, "memory_usage_data_units": 0.0, "estimated_kwh": 0.0, "estimated_co2_g": 0.0, "complexity_cpu": "O(N*M)", "complexity_memory": "O(N*M + N)"}
-    if num_transactions <= 0 or avg_items_per_transaction <=0 or avg_record_size_transaction_header <=0 or avg_record_size_item <=0: return default_return
+    total_cpu_operations, total_data_movement, peak_memory_usage_data_units = (np.where(valid, x, 0.0) for x in (total_cpu_operations, total_data_movement, peak_memory_usage_data_units))
+    return ResultTable.from_model(
+        "Sortare-Index (Sortare Eficientă Chei)",
+        complexity_cpu="O(N log N)", # Dominat de sortarea cheilor
+        complexity_memory="O(N) (original) + O(N) (chei)",
+        cpu_operations=total_cpu_operations,
+        data_movement_units=total_data_movement,
+        memory_usage_data_units=peak_memory_usage_data_units,
+    )
+
+def model_sort_index_batch(N, average_record_size_data_units, size_of_key_index_pair_data_units, kwh_cpu, kwh_data, gco2_factor):
+    return apply_energy_factors(model_sort_index_costs(N, average_record_size_data_units, size_of_key_index_pair_data_units), kwh_cpu, kwh_data, gco2_factor)
 
-    N = float(num_transactions) # Nr. tranzacții
-    M = float(avg_items_per_transaction) # Nr. mediu itemi/tranzacție
+def model_sort_index(N, average_record_size_data_units, size_of_key_index_pair_data_units, kwh_cpu, kwh_data, gco2_factor):
+    return _first_record(model_sort_index_batch(N, average_record_size_data_units, size_of_key_index_pair_data_units, kwh_cpu, kwh_data, gco2_factor))
+
+# == SCENARIUL 2: GENERAREA RAPORTULUI DE VÂNZĂRI ==
+def model_standard_sales_report_costs(num_transactions, avg_items_per_transaction, avg_record_size_transaction_header, avg_record_size_item):
+    N, M, header_size, item_size = _broadcast(num_transactions, avg_items_per_transaction, avg_record_size_transaction_header, avg_record_size_item)
+    # N = Nr. tranzacții, M = Nr. mediu itemi/tranzacție
+    valid = (N > 0) & (M > 0) & (header_size > 0) & (item_size > 0)
 
     # Pass 1: Procesare itemi și stocare sume intermediare per tranzacție
-    cpu_ops_item_processing = N * M * 3.0 * config.COST_PER_ARITHMETIC_OP_CPU # Ex: citire preț, cantitate, calcul total item
-    cpu_ops_storing_intermediate = N * 2.0 * config.COST_PER_MEMORY_ACCESS_CPU # Stocare sumă/contor per tranzacție
+    cpu_ops_item_processing = N * M * 3.0 * cost_constant("COST_PER_ARITHMETIC_OP_CPU") # Ex: citire preț, cantitate, calcul total item
+    cpu_ops_storing_intermediate = N * 2.0 * cost_constant("COST_PER_MEMORY_ACCESS_CPU") # Stocare sumă/contor per tranzacție
 
     # Pass 2: Agregare finală a sumelor intermediare
-    cpu_ops_final_aggregation = N * 2.0 * config.COST_PER_ARITHMETIC_OP_CPU # Adunare sume tranzacții
+    cpu_ops_final_aggregation = N * 2.0 * cost_constant("COST_PER_ARITHMETIC_OP_CPU") # Adunare sume tranzacții
 
     total_cpu_operations = cpu_ops_item_processing + cpu_ops_storing_intermediate + cpu_ops_final_aggregation
 
     # Memorie: stocare toate datele tranzacțiilor și itemilor, plus liste intermediare
-    memory_all_transactions_headers = N * avg_record_size_transaction_header
-    memory_all_items_data = N * M * avg_record_size_item
+    memory_all_transactions_headers = N * header_size
+    memory_all_items_data = N * M * item_size
     memory_intermediate_lists = N * 2.0 # Ex: o listă de sume per tranzacție (float) și poate una de ID-uri
 
     total_memory_usage = memory_all_transactions_headers + memory_all_items_data + memory_intermediate_lists
@@ -129,32 +267,33 @@ def model_standard_sales_report(num_transactions, avg_items_per_transaction, avg
     data_movement = (memory_all_transactions_headers + memory_all_items_data) * 1.5 + \
                     (memory_intermediate_lists * 2.0) # Citire și scriere liste intermediare
 
-    kwh, co2 = utils.calculate_energy_co2(total_cpu_operations, data_movement, kwh_cpu, kwh_data, gco2_factor)
-    return {
-        "name": "Raport Vânzări Standard (Multi-Pass)",
-        "cpu_operations": total_cpu_operations,
-        "data_movement_units": data_movement,
-        "memory_usage_data_units": total_memory_usage,
-        "estimated_kwh": kwh,
-        "estimated_co2_g": co2,
-        "complexity_cpu": "O(N*M)", # Procesare fiecare item
-        "complexity_memory": "O(N*M + N)" # Stocare toate datele + intermediare
-    }
+    total_cpu_operations, data_movement, total_memory_usage = (np.where(valid, x, 0.0) for x in (total_cpu_operations, data_movement, total_memory_usage))
+    return ResultTable.from_model(
+        "Raport Vânzări Standard (Multi-Pass)",
+        complexity_cpu="O(N*M)", # Procesare fiecare item
+        complexity_memory="O(N*M + N)", # Stocare toate datele + intermediare
+        cpu_operations=total_cpu_operations,
+        data_movement_units=data_movement,
+        memory_usage_data_units=total_memory_usage,
+    )
 
-def model_green_sales_report(num_transactions, avg_items_per_transaction, avg_record_size_transaction_header, avg_record_size_item, kwh_cpu, kwh_data, gco2_factor):
-    default_return = {"name": "Raport Vânzări Verde (Single-Pass)", "cpu_operations": 0.0, "data_movement_units": 0.0, "memory_usage_data_units": 0.0, "estimated_kwh": 0.0, "estimated_co2_g": 0.0, "complexity_cpu": "O(N*M)", "complexity_memory": "O(N*M) sau O(M) pt streaming"}
-    if num_transactions <= 0 or avg_items_per_transaction <=0 or avg_record_size_transaction_header <=0 or avg_record_size_item <=0: return default_return
+def model_standard_sales_report_batch(num_transactions, avg_items_per_transaction, avg_record_size_transaction_header, avg_record_size_item, kwh_cpu, kwh_data, gco2_factor):
+    return apply_energy_factors(model_standard_sales_report_costs(num_transactions, avg_items_per_transaction, avg_record_size_transaction_header, avg_record_size_item), kwh_cpu, kwh_data, gco2_factor)
 
-    N = float(num_transactions)
-    M = float(avg_items_per_transaction)
+def model_standard_sales_report(num_transactions, avg_items_per_transaction, avg_record_size_transaction_header, avg_record_size_item, kwh_cpu, kwh_data, gco2_factor):
+    return _first_record(model_standard_sales_report_batch(num_transactions, avg_items_per_transaction, avg_record_size_transaction_header, avg_record_size_item, kwh_cpu, kwh_data, gco2_factor))
+
+def model_green_sales_report_costs(num_transactions, avg_items_per_transaction, avg_record_size_transaction_header, avg_record_size_item):
+    N, M, header_size, item_size = _broadcast(num_transactions, avg_items_per_transaction, avg_record_size_transaction_header, avg_record_size_item)
+    valid = (N > 0) & (M > 0) & (header_size > 0) & (item_size > 0)
 
     # Single-Pass: Procesare itemi și agregare directă
-    total_cpu_operations = N * M * 3.0 * config.COST_PER_ARITHMETIC_OP_CPU # Similar cu standard, dar fără stocare intermediară extinsă
+    total_cpu_operations = N * M * 3.0 * cost_constant("COST_PER_ARITHMETIC_OP_CPU") # Similar cu standard, dar fără stocare intermediară extinsă
 
     # Memorie:
     # Dacă datele sunt încărcate complet:
-    memory_all_transactions_headers = N * avg_record_size_transaction_header
-    memory_all_items_data = N * M * avg_record_size_item
+    memory_all_transactions_headers = N * header_size
+    memory_all_items_data = N * M * item_size
     # Dacă se face streaming real, memoria pentru datele brute ar fi mult mai mică (ex: O(M) pentru itemii unei tranzacții)
     # Aici modelăm cazul în care datele sunt disponibile, dar procesate eficient.
     memory_aggregates = 2.0 * 1.0 # Ex: total vânzări, total itemi (câteva variabile)
@@ -166,79 +305,237 @@ def model_green_sales_report(num_transactions, avg_items_per_transaction, avg_re
     # Mișcare date: citire toate datele o singură dată
     data_movement = memory_all_transactions_headers + memory_all_items_data
 
-    kwh, co2 = utils.calculate_energy_co2(total_cpu_operations, data_movement, kwh_cpu, kwh_data, gco2_factor)
-    return {
-        "name": "Raport Vânzări Verde (Single-Pass)",
-        "cpu_operations": total_cpu_operations,
-        "data_movement_units": data_movement,
-        "memory_usage_data_units": total_memory_usage, # Reflectă datele încărcate; pentru streaming real ar fi mai mic
-        "estimated_kwh": kwh,
-        "estimated_co2_g": co2,
-        "complexity_cpu": "O(N*M)",
-        "complexity_memory": "O(N*M) (date) / O(M) (streaming real)" # Clarificare
-    }
+    total_cpu_operations, data_movement, total_memory_usage = (np.where(valid, x, 0.0) for x in (total_cpu_operations, data_movement, total_memory_usage))
+    return ResultTable.from_model(
+        "Raport Vânzări Verde (Single-Pass)",
+        complexity_cpu="O(N*M)",
+        complexity_memory="O(N*M) (date) / O(M) (streaming real)", # Clarificare
+        cpu_operations=total_cpu_operations,
+        data_movement_units=data_movement,
+        memory_usage_data_units=total_memory_usage, # Reflectă datele încărcate; pentru streaming real ar fi mai mic
+    )
 
-# == SCENARIUL 3: FILTRAREA ȘI ANALIZA LOG-URILOR ==
-def model_standard_log_filter(num_log_lines, avg_line_length, error_line_percentage, avg_error_message_size, kwh_cpu, kwh_data, gco2_factor):
-    default_return = {"name": "Filtrare Log Standard (Full Load, Regex All)", "cpu_operations": 0.0, "data_movement_units": 0.0, "memory_usage_data_units": 0.0, "estimated_kwh": 0.0, "estimated_co2_g": 0.0, "complexity_cpu": "O(L * C_regex)", "complexity_memory": "O(L)"}
-    if num_log_lines <= 0 or avg_line_length <=0 or error_line_percentage <=0 or avg_error_message_size <=0: return default_return
+def model_green_sales_report_batch(num_transactions, avg_items_per_transaction, avg_record_size_transaction_header, avg_record_size_item, kwh_cpu, kwh_data, gco2_factor):
+    return apply_energy_factors(model_green_sales_report_costs(num_transactions, avg_items_per_transaction, avg_record_size_transaction_header, avg_record_size_item), kwh_cpu, kwh_data, gco2_factor)
+
+def model_green_sales_report(num_transactions, avg_items_per_transaction, avg_record_size_transaction_header, avg_record_size_item, kwh_cpu, kwh_data, gco2_factor):
+    return _first_record(model_green_sales_report_batch(num_transactions, avg_items_per_transaction, avg_record_size_transaction_header, avg_record_size_item, kwh_cpu, kwh_data, gco2_factor))
 
-    L = float(num_log_lines) # Nr. linii log
-    num_error_lines = L * (error_line_percentage / 100.0)
+# == SCENARIUL 3: FILTRAREA ȘI ANALIZA LOG-URILOR ==
+def model_standard_log_filter_costs(num_log_lines, avg_line_length, error_line_percentage, avg_error_message_size):
+    L, line_len, err_perc, err_msg_size = _broadcast(num_log_lines, avg_line_length, error_line_percentage, avg_error_message_size)
+    # L = Nr. linii log
+    valid = (L > 0) & (line_len > 0) & (err_perc > 0) & (err_msg_size > 0)
+    num_error_lines = L * (err_perc / 100.0)
 
     # CPU: Aplicare regex pe fiecare linie
-    cpu_operations = L * config.COST_PER_REGEX_MATCH_CPU
+    cpu_operations = L * cost_constant("COST_PER_REGEX_MATCH_CPU")
 
     # Memorie: Stocare toate liniile + mesajele de eroare extrase
-    memory_all_lines = L * avg_line_length
-    memory_extracted_errors = num_error_lines * avg_error_message_size # Presupunem că extragem mesajul
+    memory_all_lines = L * line_len
+    memory_extracted_errors = num_error_lines * err_msg_size # Presupunem că extragem mesajul
     total_memory_usage = memory_all_lines + memory_extracted_errors
 
     # Mișcare date: Citire toate liniile, scriere/stocare mesaje de eroare
-    data_movement = (L * avg_line_length) + (num_error_lines * avg_error_message_size) # Citire linii + stocare erori
-
-    kwh, co2 = utils.calculate_energy_co2(cpu_operations, data_movement, kwh_cpu, kwh_data, gco2_factor)
-    return {
-        "name": "Filtrare Log Standard (Full Load, Regex All)",
-        "cpu_operations": cpu_operations,
-        "data_movement_units": data_movement,
-        "memory_usage_data_units": total_memory_usage,
-        "estimated_kwh": kwh,
-        "estimated_co2_g": co2,
-        "complexity_cpu": "O(L * C_regex)", # L linii * Cost Regex
-        "complexity_memory": "O(L + E*S_msg)" # Linii + Erori * Dimensiune Mesaj
-    }
+    data_movement = (L * line_len) + (num_error_lines * err_msg_size) # Citire linii + stocare erori
 
-def model_green_log_filter(num_log_lines, avg_line_length, error_line_percentage, avg_error_message_size, kwh_cpu, kwh_data, gco2_factor):
-    default_return = {"name": "Filtrare Log Verde (Stream, Target Regex)", "cpu_operations": 0.0, "data_movement_units": 0.0, "memory_usage_data_units": 0.0, "estimated_kwh": 0.0, "estimated_co2_g": 0.0, "complexity_cpu": "O(L + E*C_regex)", "complexity_memory": "O(linie + E*S_msg)"}
-    if num_log_lines <= 0 or avg_line_length <=0 or error_line_percentage <=0 or avg_error_message_size <=0: return default_return
+    cpu_operations, data_movement, total_memory_usage = (np.where(valid, x, 0.0) for x in (cpu_operations, data_movement, total_memory_usage))
+    return ResultTable.from_model(
+        "Filtrare Log Standard (Full Load, Regex All)",
+        complexity_cpu="O(L * C_regex)", # L linii * Cost Regex
+        complexity_memory="O(L + E*S_msg)", # Linii + Erori * Dimensiune Mesaj
+        cpu_operations=cpu_operations,
+        data_movement_units=data_movement,
+        memory_usage_data_units=total_memory_usage,
+    )
+
+def model_standard_log_filter_batch(num_log_lines, avg_line_length, error_line_percentage, avg_error_message_size, kwh_cpu, kwh_data, gco2_factor):
+    return apply_energy_factors(model_standard_log_filter_costs(num_log_lines, avg_line_length, error_line_percentage, avg_error_message_size), kwh_cpu, kwh_data, gco2_factor)
 
-    L = float(num_log_lines)
-    num_error_lines = L * (error_line_percentage / 100.0)
+def model_standard_log_filter(num_log_lines, avg_line_length, error_line_percentage, avg_error_message_size, kwh_cpu, kwh_data, gco2_factor):
+    return _first_record(model_standard_log_filter_batch(num_log_lines, avg_line_length, error_line_percentage, avg_error_message_size, kwh_cpu, kwh_data, gco2_factor))
+
+def model_green_log_filter_costs(num_log_lines, avg_line_length, error_line_percentage, avg_error_message_size):
+    L, line_len, err_perc, err_msg_size = _broadcast(num_log_lines, avg_line_length, error_line_percentage, avg_error_message_size)
+    valid = (L > 0) & (line_len > 0) & (err_perc > 0) & (err_msg_size > 0)
+    num_error_lines = L * (err_perc / 100.0)
 
     # CPU: Verificare string simplă pe fiecare linie, apoi regex doar pe liniile candidate
-    cpu_ops_string_checks = L * config.COST_PER_STRING_CHECK_CPU # Ex: `if "ERROR" in line:`
-    cpu_ops_regex_on_errors = num_error_lines * config.COST_PER_REGEX_MATCH_CPU # Regex doar pe liniile care probabil sunt erori
+    cpu_ops_string_checks = L * cost_constant("COST_PER_STRING_CHECK_CPU") # Ex: `if "ERROR" in line:`
+    cpu_ops_regex_on_errors = num_error_lines * cost_constant("COST_PER_REGEX_MATCH_CPU") # Regex doar pe liniile care probabil sunt erori
     total_cpu_operations = cpu_ops_string_checks + cpu_ops_regex_on_errors
 
     # Memorie: Stocare o singură linie la un moment dat (streaming) + mesajele de eroare extrase
     # Factorul de 1.5 pentru buffer-ul liniei curente este o estimare
-    memory_one_line_buffer = float(avg_line_length * 1.5)
-    memory_extracted_errors = num_error_lines * avg_error_message_size
+    memory_one_line_buffer = line_len * 1.5
+    memory_extracted_errors = num_error_lines * err_msg_size
     total_memory_usage = memory_one_line_buffer + memory_extracted_errors # Memorie peak
 
     # Mișcare date: Citire toate liniile (chiar și în stream, datele trec prin sistem)
     # Nu stocăm toate liniile simultan, dar le citim pe toate.
-    data_movement = L * avg_line_length # Datele sunt citite de pe disc/rețea
-
-    kwh, co2 = utils.calculate_energy_co2(total_cpu_operations, data_movement, kwh_cpu, kwh_data, gco2_factor)
-    return {
-        "name": "Filtrare Log Verde (Stream, Target Regex)",
-        "cpu_operations": total_cpu_operations,
-        "data_movement_units": data_movement,
-        "memory_usage_data_units": total_memory_usage, # Reflectă memoria de vârf, nu totalul datelor stocate pe termen lung
-        "estimated_kwh": kwh,
-        "estimated_co2_g": co2,
-        "complexity_cpu": "O(L + E*C_regex)", # L verificări string + Erori * Cost Regex
-        "complexity_memory": "O(linie + E*S_msg)" # O linie în buffer + Erori * Dimensiune Mesaj
-    }
+    data_movement = L * line_len # Datele sunt citite de pe disc/rețea
+
+    total_cpu_operations, data_movement, total_memory_usage = (np.where(valid, x, 0.0) for x in (total_cpu_operations, data_movement, total_memory_usage))
+    return ResultTable.from_model(
+        "Filtrare Log Verde (Stream, Target Regex)",
+        complexity_cpu="O(L + E*C_regex)", # L verificări string + Erori * Cost Regex
+        complexity_memory="O(linie + E*S_msg)", # O linie în buffer + Erori * Dimensiune Mesaj
+        cpu_operations=total_cpu_operations,
+        data_movement_units=data_movement,
+        memory_usage_data_units=total_memory_usage, # Reflectă memoria de vârf, nu totalul datelor stocate pe termen lung
+    )
+
+def model_green_log_filter_batch(num_log_lines, avg_line_length, error_line_percentage, avg_error_message_size, kwh_cpu, kwh_data, gco2_factor):
+    return apply_energy_factors(model_green_log_filter_costs(num_log_lines, avg_line_length, error_line_percentage, avg_error_message_size), kwh_cpu, kwh_data, gco2_factor)
+
+def model_green_log_filter(num_log_lines, avg_line_length, error_line_percentage, avg_error_message_size, kwh_cpu, kwh_data, gco2_factor):
+    return _first_record(model_green_log_filter_batch(num_log_lines, avg_line_length, error_line_percentage, avg_error_message_size, kwh_cpu, kwh_data, gco2_factor))
+
+# ==============================================================================
+# == REGISTRU SCENARII -> MODELE BATCH
+# ==============================================================================
+# Pentru fiecare scenariu: lista de (model batch, chei din config.DEFAULT_INPUT_VALUES
+# în ordinea argumentelor). Primul model din listă este modelul standard (referința).
+SCENARIO_MODELS = {
+    config.SCENARIU_SORTARE: [
+        (model_standard_sort_costs, ("s1_N", "s1_avg_rec_size")),
+        (model_efficient_sort_costs, ("s1_N", "s1_avg_rec_size")),
+        (model_sort_index_costs, ("s1_N", "s1_avg_rec_size", "s1_key_idx_size")),
+    ],
+    config.SCENARIU_RAPORT_VANZARI: [
+        (model_standard_sales_report_costs, ("s2_N_trans", "s2_avg_items", "s2_trans_header_size", "s2_item_size")),
+        (model_green_sales_report_costs, ("s2_N_trans", "s2_avg_items", "s2_trans_header_size", "s2_item_size")),
+    ],
+    config.SCENARIU_FILTRARE_LOGURI: [
+        (model_standard_log_filter_costs, ("s3_N_lines", "s3_avg_line_len", "s3_err_perc", "s3_err_msg_size")),
+        (model_green_log_filter_costs, ("s3_N_lines", "s3_avg_line_len", "s3_err_perc", "s3_err_msg_size")),
+    ],
+}
+
+# ==============================================================================
+# == ETAPA 1 (CU CACHE): COSTURILE ABSTRACTE PE SCENARIU
+# ==============================================================================
+# Cache-uri LRU la nivel de proces, partajate între sesiuni și plafonate în octeți
+# (shared_cache); cheile includ constantele COST_PER_* curente, astfel încât o
+# recalibrare invalidează automat intrările vechi.
+_cost_cache = shared_cache.get_cache("cost_cache")
+_result_cache = shared_cache.get_cache("result_cache")
+
+def _cost_constants():
+    return tuple((name, getattr(config, name)) for name in sorted(dir(config)) if name.startswith("COST_PER_"))
+
+def _value_key(value):
+    """Cheie hashable pentru un scalar sau un array (array-urile mari sunt reduse la un digest)."""
+    arr = np.asarray(value)
+    if arr.ndim == 0:
+        return float(arr)
+    arr = np.ascontiguousarray(arr)
+    return (arr.dtype.str, arr.shape, hashlib.blake2b(arr.view(np.uint8), digest_size=16).hexdigest())
+
+def cost_key(scenario, params):
+    """
+    Cheia normalizată a costurilor unui scenariu: doar intrările folosite de scenariu
+    (scenario_input_keys), cu scalarii ca float (1000 și 1000.0 dau aceeași cheie).
+    """
+    return (scenario, _cost_constants()) + tuple((k, _value_key(params[k])) for k in scenario_input_keys(scenario))
+
+def result_key(scenario, params, kwh_cpu, kwh_data, gco2_factor):
+    """
+    Cheia normalizată a rezultatelor (costuri + factorii hardware și CO2), folosită de
+    result_cache și de cache-urile derivate din rezultate (ex: graficele interfeței).
+    Returnează None când constantele sunt suprascrise (`override_cost_constants`).
+    """
+    if _has_constant_overrides():
+        return None
+    return cost_key(scenario, params) + (_value_key(kwh_cpu), _value_key(kwh_data), _value_key(gco2_factor))
+
+def _repeat_rows(table, n):
+    """Extinde tabelul unui model care nu depinde de parametrul variat (1 rând) la n rânduri."""
+    if len(table) == n:
+        return table
+    return ResultTable(table.model_names, np.zeros(n, dtype=np.int16), {col: np.broadcast_to(values, (n,)) for col, values in table.columns.items()},
+                       complexity=table.complexity)
+
+def _freeze(table):
+    for values in list(table.columns.values()) + list(table.param_columns.values()):
+        values.flags.writeable = False
+    return table
+
+@profiling.timed("api_handler.evaluate_costs")
+def _evaluate_scenario_costs(scenario, params):
+    tables = [model(*(params[k] for k in keys)) for model, keys in SCENARIO_MODELS[scenario]]
+    n = max(len(t) for t in tables)
+    return ResultTable.concat(_repeat_rows(t, n) for t in tables)
+
+def scenario_costs(scenario, params, use_cache=True):
+    """
+    Costurile abstracte ale tuturor modelelor unui scenariu, cu cache.
+
+    Rezultatul nu depinde de profilul hardware sau de zona CO2, deci o
+    schimbare a acestora reutilizează intrarea din cache și necesită doar
+    `apply_energy_factors`. Tabelul returnat este partajat și read-only.
+
+    Args:
+        scenario (str): Unul din config.SCENARIO_OPTIONS.
+        params (dict): Valorile de intrare (scalari sau array-uri), cu cheile
+            din config.DEFAULT_INPUT_VALUES.
+        use_cache (bool): False pentru evaluări care nu se vor repeta (ex: bucățile unui sweep mare).
+            Cache-ul este ocolit și când constantele sunt suprascrise (`override_cost_constants`).
+
+    Returns:
+        ResultTable: Costurile (fără energie/CO2), model-major, blocuri egale per model.
+    """
+    if not use_cache or _has_constant_overrides():
+        return _evaluate_scenario_costs(scenario, params)
+    return _cost_cache.get_or_compute(cost_key(scenario, params), lambda: _freeze(_evaluate_scenario_costs(scenario, params)))
+
+def cost_cache_info():
+    """Statistici pentru cache-ul de costuri (hits, misses, evictions, intrări, octeți)."""
+    return _cost_cache.info()
+
+def clear_cost_cache():
+    """Golește cache-urile de costuri și de rezultate."""
+    _cost_cache.clear()
+    _result_cache.clear()
+
+@profiling.timed("api_handler.run_scenario_batch")
+def run_scenario_batch(scenario, params, kwh_cpu, kwh_data, gco2_factor, use_cache=True):
+    """
+    Rulează toate modelele unui scenariu pe parametri scalari sau array-uri NumPy.
+    Costurile abstracte provin din `scenario_costs` (cache), apoi se aplică factorii;
+    rezultatul final este păstrat și el în cache (result_cache), după `result_key`.
+
+    Args:
+        scenario (str): Unul din config.SCENARIO_OPTIONS.
+        params (dict): Valorile de intrare, cu cheile din config.DEFAULT_INPUT_VALUES.
+            Oricare valoare (inclusiv factorii de conversie) poate fi un array.
+        kwh_cpu, kwh_data, gco2_factor: Factorii de conversie (scalari sau array-uri).
+        use_cache (bool): False pentru evaluări care nu se vor repeta (ambele cache-uri sunt ocolite).
+
+    Returns:
+        ResultTable: Rezultatele tuturor modelelor concatenate, în ordinea din
+            SCENARIO_MODELS (toate punctele primului model, apoi ale celui de-al doilea, ...).
+            Cu cache, tabelul este partajat și read-only.
+    """
+    key = result_key(scenario, params, kwh_cpu, kwh_data, gco2_factor) if use_cache else None
+    if key is None:
+        return apply_energy_factors(scenario_costs(scenario, params, use_cache=use_cache), kwh_cpu, kwh_data, gco2_factor)
+    return _result_cache.get_or_compute(
+        key, lambda: _freeze(apply_energy_factors(scenario_costs(scenario, params), kwh_cpu, kwh_data, gco2_factor)))
+
+def scenario_input_keys(scenario):
+    """Cheile de intrare (din config.DEFAULT_INPUT_VALUES) folosite de modelele unui scenariu, fără duplicate."""
+    return list(dict.fromkeys(k for _, keys in SCENARIO_MODELS[scenario] for k in keys))
+
+def resolve_scenario(value):
+    """
+    Returnează numele complet al scenariului pornind de la numele complet,
+    numărul scenariului (1, 2, 3) sau un text de forma "Scenariul 2".
+    """
+    text = str(value).strip()
+    if text in SCENARIO_MODELS:
+        return text
+    for i, scenario in enumerate(config.SCENARIO_OPTIONS, start=1):
+        if text == str(i) or scenario.startswith(text + ":") or scenario.split(":")[1].strip() == text:
+            return scenario
+    raise ValueError(f"Scenariu necunoscut: {value!r}. Opțiuni: 1-{len(config.SCENARIO_OPTIONS)} sau {config.SCENARIO_OPTIONS}")
@@ -1,26 +1,22 @@
 # app_streamlit.py
 
 import streamlit as st
-import pandas as pd
-import plotly.express as px
 import os
-import numpy as np
 from datetime import datetime
 
-# Import modulele create
+# Import modulele create. Dependențele grele (numpy, pandas, plotly, modelele) se încarcă
+# abia la prima simulare, iar api_client doar pentru intensitatea live; prima afișare a
+# paginii nu le așteaptă. Python le păstrează în sys.modules, deci rerulările nu mai plătesc importul.
 import config
-import api_client
-import api_handler
-import utils
+import profiling
 
 # --- Începutul Interfeței Utilizator Streamlit ---
 st.set_page_config(layout="wide", page_title=config.APP_TITLE)
+# Etapele acestei rerulări (timp, alocări, apeluri) sunt înregistrate pentru panoul de profilare
+profiling.begin_rerun()
 st.title(config.APP_TITLE)
 st.markdown(config.APP_SUBHEADER)
 
-if 'history' not in st.session_state:
-    st.session_state.history = []
-
 # --- Configurare Sidebar ---
 st.sidebar.header(config.SIDEBAR_HEADER)
 selected_scenario = st.sidebar.selectbox("Alegeți scenariul de simulat:", options=config.SCENARIO_OPTIONS, index=0)
@@ -31,6 +27,8 @@ kwh_data_factor_selected = current_hardware_factors["kwh_per_data_move"]
 st.sidebar.caption(f"Profil Hardware: **{selected_hardware_profile_name}**")
 st.sidebar.caption(f"{current_hardware_factors['description']}")
 st.sidebar.caption(f"kWh/Op CPU: {kwh_cpu_factor_selected:.2e}, kWh/Mișc.Date: {kwh_data_factor_selected:.2e}")
+if config.ACTIVE_CALIBRATION_PROFILE:
+    st.sidebar.caption(f"Constante COST_PER_* calibrate din profilul **{config.ACTIVE_CALIBRATION_PROFILE}**.")
 
 # --- Logică actualizată pentru sursa CO2 ---
 selected_co2_source = st.sidebar.selectbox("Sursa pentru Intensitatea Carbonică (gCO2eq/kWh):", options=config.CO2_ZONE_OPTIONS, index=0)
@@ -43,6 +41,7 @@ if selected_co2_source == config.ZONE_ROMANIA_API:
     # Cazul 1: Utilizatorul vrea date live pentru România
     EM_API_KEY_AVAILABLE = bool(os.getenv("EM_API_KEY"))
     if EM_API_KEY_AVAILABLE:
+        import api_client
         romania_intensity = api_client.get_romania_carbon_intensity()
         if romania_intensity is not None:
             gco2_per_kwh_final = romania_intensity
@@ -75,12 +74,7 @@ for key, value in config.DEFAULT_INPUT_VALUES.items():
 st.sidebar.markdown("---")
 run_scalability_analysis = st.sidebar.checkbox("📈 Rulează Analiză de Scalabilitate", help="Bifează pentru a simula scenariul pe un interval de valori și a vizualiza cum scalează impactul.")
 st.sidebar.markdown("---")
-scaling_param_details = {
-    config.SCENARIU_SORTARE: {"name": "Nr. înregistrări (N)", "key": "s1_N"},
-    config.SCENARIU_RAPORT_VANZARI: {"name": "Nr. tranzacții (N)", "key": "s2_N_trans"},
-    config.SCENARIU_FILTRARE_LOGURI: {"name": "Nr. linii log (L)", "key": "s3_N_lines"}
-}
-current_scaling_param = scaling_param_details[selected_scenario]
+current_scaling_param = config.SCALING_PARAMS[selected_scenario]
 if run_scalability_analysis:
     st.sidebar.subheader("Parametri Scalabilitate")
     if 'scalability_start' not in st.session_state: st.session_state.scalability_start = 100
@@ -90,6 +84,8 @@ if run_scalability_analysis:
     st.session_state.scalability_end = st.sidebar.number_input(f"Valoare Stop ({current_scaling_param['name']}):", st.session_state.scalability_start + 1, 5000000, st.session_state.scalability_end)
     st.session_state.scalability_steps = st.sidebar.number_input("Număr Pași:", 2, 100, st.session_state.scalability_steps)
     st.sidebar.info(f"Se vor rula {st.session_state.scalability_steps} simulări de la {st.session_state.scalability_start} la {st.session_state.scalability_end}.")
+    show_confidence_bands = st.sidebar.checkbox("Benzi de încredere (Monte Carlo)", value=True, help="Propagă incertitudinea constantelor de cost, a factorilor hardware și a intensității CO2 (banda p5–p95).")
+    mc_samples = st.sidebar.number_input("Eșantioane Monte Carlo:", 100, 100000, 2000, 100, disabled=not show_confidence_bands)
 if selected_scenario == config.SCENARIU_SORTARE:
     if not run_scalability_analysis:
         st.header(config.SCENARIU_SORTARE)
@@ -120,149 +116,162 @@ if run_button: st.session_state.simulation_has_run = True
 
 # --- Logică Simulare și Afișare Rezultate ---
 if st.session_state.simulation_has_run:
+    import uuid
+
+    import numpy as np
+    import pandas as pd
+    import plotly.express as px
+    import api_handler
+    import history_store
+    import lookup_tables
+    import measurement
+    import montecarlo
+    import sensitivity
+    import shared_cache
+    import utils
+
+    # Istoricul rulărilor este persistent (SQLite); fiecare sesiune vede doar rulările ei, după un ID de istoric
+    # păstrat în URL (?istoric=...), astfel încât reîncărcarea paginii sau repornirea serverului nu îl pierd.
+    # Sesiunea păstrează doar o fereastră citită incremental.
+    history = history_store.get_default_store()
+    if "history_owner" not in st.session_state:
+        st.session_state.history_owner = st.query_params.get("istoric") or uuid.uuid4().hex
+    if st.query_params.get("istoric") != st.session_state.history_owner:
+        st.query_params["istoric"] = st.session_state.history_owner
+    history_owner = st.session_state.history_owner
+    # Graficele depind doar de rezultate, deci sunt comune sesiunilor cu aceleași intrări (cheia: api_handler.result_key)
+    figure_cache = shared_cache.get_cache("figure_cache")
+
     if run_scalability_analysis:
         st.header(f"📈 Analiză de Scalabilitate pentru {selected_scenario.split(':')[1].strip()}")
         st.info(f"Se simulează impactul pentru diferite dimensiuni ale setului de date (de la {st.session_state.scalability_start} la {st.session_state.scalability_end} pentru '{current_scaling_param['name']}').")
 
-        scalability_results = []
         param_key_to_scale = current_scaling_param['key']
         scale_range = np.linspace(st.session_state.scalability_start, st.session_state.scalability_end, st.session_state.scalability_steps, dtype=int)
 
-        with st.spinner("Se execută analiza de scalabilitate..."):
-            for val in scale_range:
-                params = {k: st.session_state[k] for k in config.DEFAULT_INPUT_VALUES.keys()}
-                params[param_key_to_scale] = val
-                
-                models = []
-                kwh_cpu, kwh_data = kwh_cpu_factor_selected, kwh_data_factor_selected
-                
-                if selected_scenario == config.SCENARIU_SORTARE:
-                    models = [
-                        api_handler.model_standard_sort(params['s1_N'], params['s1_avg_rec_size'], kwh_cpu, kwh_data, gco2_per_kwh_final),
-                        api_handler.model_efficient_sort(params['s1_N'], params['s1_avg_rec_size'], kwh_cpu, kwh_data, gco2_per_kwh_final),
-                        api_handler.model_sort_index(params['s1_N'], params['s1_avg_rec_size'], params['s1_key_idx_size'], kwh_cpu, kwh_data, gco2_per_kwh_final)
-                    ]
-                elif selected_scenario == config.SCENARIU_RAPORT_VANZARI:
-                    models = [
-                        api_handler.model_standard_sales_report(params['s2_N_trans'], params['s2_avg_items'], params['s2_trans_header_size'], params['s2_item_size'], kwh_cpu, kwh_data, gco2_per_kwh_final),
-                        api_handler.model_green_sales_report(params['s2_N_trans'], params['s2_avg_items'], params['s2_trans_header_size'], params['s2_item_size'], kwh_cpu, kwh_data, gco2_per_kwh_final)
-                    ]
-                elif selected_scenario == config.SCENARIU_FILTRARE_LOGURI:
-                    models = [
-                        api_handler.model_standard_log_filter(params['s3_N_lines'], params['s3_avg_line_len'], params['s3_err_perc'], params['s3_err_msg_size'], kwh_cpu, kwh_data, gco2_per_kwh_final),
-                        api_handler.model_green_log_filter(params['s3_N_lines'], params['s3_avg_line_len'], params['s3_err_perc'], params['s3_err_msg_size'], kwh_cpu, kwh_data, gco2_per_kwh_final)
-                    ]
-
-                for res in models:
-                    res[current_scaling_param['name']] = val
-                    scalability_results.append(res)
-        
-        if scalability_results:
-            df_scaling = pd.DataFrame(scalability_results)
+        with st.spinner("Se execută analiza de scalabilitate..."), profiling.stage("app.scalability"):
+            # Cu parametrii impliciți, sweep-ul este citit din tabelele precalculate (lookup_tables);
+            # altfel toate punctele sunt evaluate într-un singur apel vectorizat per model
+            params = {k: st.session_state[k] for k in config.DEFAULT_INPUT_VALUES.keys()}
+            params[param_key_to_scale] = scale_range
+            scalability_results = lookup_tables.run_sweep(selected_scenario, params, param_key_to_scale, kwh_cpu_factor_selected, kwh_data_factor_selected, gco2_per_kwh_final)
+            scalability_results = scalability_results.with_params(**{current_scaling_param['name']: scale_range})
+            bands = None
+            if show_confidence_bands:
+                distributions = montecarlo.default_distributions(kwh_cpu_factor_selected, kwh_data_factor_selected, gco2_per_kwh_final)
+                bands = montecarlo.sweep_bands(selected_scenario, params, param_key_to_scale, scale_range, distributions, n_samples=mc_samples)
+                bands = bands.rename(columns={param_key_to_scale: current_scaling_param['name']})
+
+        if len(scalability_results):
+            def build_scaling_figures():
+                df_scaling = scalability_results.to_pandas()
+                fig_co2_scaling = px.line(df_scaling, x=current_scaling_param['name'], y="estimated_co2_g", color="name", title="Impactul CO2 în funcție de mărimea datelor", labels={"estimated_co2_g": "Emisii CO2 (g)", "name": "Model"}, markers=True)
+                fig_cpu_scaling = px.line(df_scaling, x=current_scaling_param['name'], y="cpu_operations", color="name", title="Operații CPU în funcție de mărimea datelor", labels={"cpu_operations": "Operații CPU (unități abstracte)", "name": "Model"}, markers=True)
+                if bands is not None:
+                    montecarlo.add_confidence_bands(fig_co2_scaling, bands, current_scaling_param['name'], "estimated_co2_g")
+                    montecarlo.add_confidence_bands(fig_cpu_scaling, bands, current_scaling_param['name'], "cpu_operations")
+                return df_scaling, fig_co2_scaling, fig_cpu_scaling
+
+            with profiling.stage("app.figures"):
+                # Benzile Monte Carlo sunt eșantionate la fiecare rulare, deci graficele cu benzi nu intră în cache
+                scaling_key = api_handler.result_key(selected_scenario, params, kwh_cpu_factor_selected, kwh_data_factor_selected, gco2_per_kwh_final)
+                if scaling_key is None or bands is not None:
+                    df_scaling, fig_co2_scaling, fig_cpu_scaling = build_scaling_figures()
+                else:
+                    df_scaling, fig_co2_scaling, fig_cpu_scaling = figure_cache.get_or_compute(("scalabilitate", current_scaling_param['name']) + scaling_key, build_scaling_figures)
             col1, col2 = st.columns(2)
             with col1:
                 st.subheader("Scalabilitate CO2")
-                fig_co2_scaling = px.line(df_scaling, x=current_scaling_param['name'], y="estimated_co2_g", color="name", title="Impactul CO2 în funcție de mărimea datelor", labels={"estimated_co2_g": "Emisii CO2 (g)", "name": "Model"}, markers=True)
                 st.plotly_chart(fig_co2_scaling, use_container_width=True)
             with col2:
                 st.subheader("Scalabilitate Operații CPU")
-                fig_cpu_scaling = px.line(df_scaling, x=current_scaling_param['name'], y="cpu_operations", color="name", title="Operații CPU în funcție de mărimea datelor", labels={"cpu_operations": "Operații CPU (unități abstracte)", "name": "Model"}, markers=True)
                 st.plotly_chart(fig_cpu_scaling, use_container_width=True)
+            if bands is not None:
+                st.caption(f"Benzile colorate arată intervalul p5–p95 din {mc_samples} eșantioane Monte Carlo (constante de cost, factori hardware și intensitate CO2 incerte).")
+                with st.expander("Probabilitatea ca modelele verzi să emită mai puțin decât modelul standard"):
+                    prob_table = bands.dropna(subset=["prob_beats_standard"]).pivot(index=current_scaling_param['name'], columns="name", values="prob_beats_standard")
+                    st.dataframe(prob_table.style.format("{:.1%}"))
             with st.expander("Vezi datele brute de scalabilitate"):
                 st.dataframe(df_scaling)
         else:
             st.warning("Nu s-au putut genera rezultate pentru analiza de scalabilitate.")
     
     else: # Ramura pentru o singură rulare
-        all_results, valid_inputs = [], False
         kwh_cpu, kwh_data = kwh_cpu_factor_selected, kwh_data_factor_selected
-        if selected_scenario == config.SCENARIU_SORTARE:
-            s1_N, s1_avg_rec_size, s1_key_idx_size = st.session_state.s1_N, st.session_state.s1_avg_rec_size, st.session_state.s1_key_idx_size
-            if s1_N > 0 and s1_avg_rec_size > 0 and s1_key_idx_size > 0:
-                all_results = [api_handler.model_standard_sort(s1_N, s1_avg_rec_size, kwh_cpu, kwh_data, gco2_per_kwh_final), api_handler.model_efficient_sort(s1_N, s1_avg_rec_size, kwh_cpu, kwh_data, gco2_per_kwh_final), api_handler.model_sort_index(s1_N, s1_avg_rec_size, s1_key_idx_size, kwh_cpu, kwh_data, gco2_per_kwh_final)]
-                valid_inputs = True
-        elif selected_scenario == config.SCENARIU_RAPORT_VANZARI:
-            s2_N_trans, s2_avg_items, s2_trans_header_size, s2_item_size = st.session_state.s2_N_trans, st.session_state.s2_avg_items, st.session_state.s2_trans_header_size, st.session_state.s2_item_size
-            if s2_N_trans > 0 and s2_avg_items > 0 and s2_trans_header_size > 0 and s2_item_size > 0:
-                all_results = [api_handler.model_standard_sales_report(s2_N_trans, s2_avg_items, s2_trans_header_size, s2_item_size, kwh_cpu, kwh_data, gco2_per_kwh_final), api_handler.model_green_sales_report(s2_N_trans, s2_avg_items, s2_trans_header_size, s2_item_size, kwh_cpu, kwh_data, gco2_per_kwh_final)]
-                valid_inputs = True
-        elif selected_scenario == config.SCENARIU_FILTRARE_LOGURI:
-            s3_N_lines, s3_avg_line_len, s3_err_perc, s3_err_msg_size = st.session_state.s3_N_lines, st.session_state.s3_avg_line_len, st.session_state.s3_err_perc, st.session_state.s3_err_msg_size
-            if s3_N_lines > 0 and s3_avg_line_len > 0 and s3_err_perc > 0 and s3_err_msg_size > 0:
-                all_results = [api_handler.model_standard_log_filter(s3_N_lines, s3_avg_line_len, s3_err_perc, s3_err_msg_size, kwh_cpu, kwh_data, gco2_per_kwh_final), api_handler.model_green_log_filter(s3_N_lines, s3_avg_line_len, s3_err_perc, s3_err_msg_size, kwh_cpu, kwh_data, gco2_per_kwh_final)]
-                valid_inputs = True
+        params = {k: st.session_state[k] for k in api_handler.scenario_input_keys(selected_scenario)}
+        valid_inputs = all(v > 0 for v in params.values())
+        all_results = api_handler.run_scenario_batch(selected_scenario, params, kwh_cpu, kwh_data, gco2_per_kwh_final) if valid_inputs else None
         
         if not valid_inputs:
             st.error(f"EROARE: Parametrii pentru '{selected_scenario.split(':')[1].strip()}' trebuie să fie mai mari ca zero.")
         
-        if valid_inputs and all_results:
+        if valid_inputs and all_results is not None and len(all_results):
             st.header(f"📊 Rezultate pentru {selected_scenario.split(':')[1].strip()}")
             st.markdown(f"Profil Hardware Selectat: **{selected_hardware_profile_name}**")
             
             if st.button("💾 Salvează în Istoric"):
                 run_id = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                base_info = {"ID Rulare": run_id, "Scenariu": selected_scenario.split(':')[1].strip(), "Hardware": selected_hardware_profile_name, "Sursă CO2": selected_co2_source, "Factor CO2": gco2_per_kwh_final}
+                params_info = {}
                 if selected_scenario == config.SCENARIU_SORTARE:
-                    base_info.update({"N": st.session_state.s1_N, "Dim. Înreg.": st.session_state.s1_avg_rec_size, "Dim. Cheie": st.session_state.s1_key_idx_size})
+                    params_info = {"N": st.session_state.s1_N, "Dim. Înreg.": st.session_state.s1_avg_rec_size, "Dim. Cheie": st.session_state.s1_key_idx_size}
                 elif selected_scenario == config.SCENARIU_RAPORT_VANZARI:
-                    base_info.update({"N": st.session_state.s2_N_trans, "M": st.session_state.s2_avg_items, "Dim. Header": st.session_state.s2_trans_header_size, "Dim. Item": st.session_state.s2_item_size})
+                    params_info = {"N": st.session_state.s2_N_trans, "M": st.session_state.s2_avg_items, "Dim. Header": st.session_state.s2_trans_header_size, "Dim. Item": st.session_state.s2_item_size}
                 elif selected_scenario == config.SCENARIU_FILTRARE_LOGURI:
-                    base_info.update({"L": st.session_state.s3_N_lines, "Lung. Linie": st.session_state.s3_avg_line_len, "% Erori": st.session_state.s3_err_perc})
-                for res in all_results:
-                    history_entry = base_info.copy()
-                    history_entry.update({"Model": res['name'], "Op. CPU": res['cpu_operations'], "Mișc. Date": res['data_movement_units'], "Memorie (u)": res.get('peak_memory_usage_data_units', res.get('memory_usage_data_units', 0.0)), "Energie (kWh)": res['estimated_kwh'], "CO2 (g)": res['estimated_co2_g']})
-                    st.session_state.history.append(history_entry)
+                    params_info = {"L": st.session_state.s3_N_lines, "Lung. Linie": st.session_state.s3_avg_line_len, "% Erori": st.session_state.s3_err_perc}
+                history.append_run(run_id, selected_scenario.split(':')[1].strip(), selected_hardware_profile_name, selected_co2_source, gco2_per_kwh_final, params_info, all_results, owner=history_owner)
                 st.success(f"Rezultatele pentru rularea {run_id} au fost salvate în istoric!")
             
-            standard_model_results = all_results[0]
-            reduction_data = []
-            for i, result in enumerate(all_results):
-                if i > 0:
-                    row_reduction = {"Model Verde": result.get('name', 'N/A')}
-                    for metric_key, metric_name_ro_short in [("cpu_operations", "CPU"), ("data_movement_units", "Mișc.Date"), ("memory_usage_data_units", "Memorie"), ("estimated_kwh", "Energie"), ("estimated_co2_g", "CO2")]:
-                        current_val = result.get('peak_memory_usage_data_units', result.get(metric_key, 0.0))
-                        standard_val = standard_model_results.get('peak_memory_usage_data_units', standard_model_results.get(metric_key, 0.0))
-                        if standard_val > 1e-9:
-                            reduction_percent = ((standard_val - current_val) / standard_val) * 100
-                            row_reduction[f"Reducere {metric_name_ro_short} (%)"] = f"{reduction_percent:.1f}%"
-                        else:
-                            row_reduction[f"Reducere {metric_name_ro_short} (%)"] = "N/A" if current_val == standard_val else "∞"
-                    reduction_data.append(row_reduction)
-            df_reductions = pd.DataFrame(reduction_data)
-
-            plot_data_abstract = [{"Model": res.get('name', 'N/A'), "Operații CPU": res.get('cpu_operations', 0.0), "Mișcare Date (unități)": res.get('data_movement_units', 0.0), "Memorie Utilizată (unități)": res.get('peak_memory_usage_data_units', res.get('memory_usage_data_units', 0.0))} for res in all_results]
-            df_abstract = pd.DataFrame(plot_data_abstract)
-            fig_cpu = px.bar(df_abstract, x="Model", y="Operații CPU", color="Model", title="Comparare Operații CPU Estimate", text_auto=True)
-            fig_data = px.bar(df_abstract, x="Model", y="Mișcare Date (unități)", color="Model", title="Comparare Mișcare Date Estimate", text_auto=True)
-            fig_mem = px.bar(df_abstract, x="Model", y="Memorie Utilizată (unități)", color="Model", title="Comparare Memorie Utilizată Estimată", text_auto=True)
-            figs_cost = {"CPU": fig_cpu, "Data Movement": fig_data, "Memory": fig_mem}
-
-            plot_data_impact = [{"Model": res.get('name', 'N/A'), "Energie (kWh)": res.get('estimated_kwh', 0.0), "Emisii CO2 (g)": res.get('estimated_co2_g', 0.0)} for res in all_results]
-            df_impact = pd.DataFrame(plot_data_impact)
-            fig_kwh = px.bar(df_impact, x="Model", y="Energie (kWh)", color="Model", title="Comparare Energie Consumată Estimată", text_auto=True)
-            fig_co2 = px.bar(df_impact, x="Model", y="Emisii CO2 (g)", color="Model", title="Comparare Emisii CO2 Estimate", text_auto=True)
-            figs_impact = {"Energy": fig_kwh, "CO2": fig_co2}
-
-            df_history_full = pd.DataFrame(st.session_state.history)
-            excel_data = utils.create_excel_export(all_results, df_reductions, df_history_full, figs_cost, figs_impact)
-            st.download_button(
-                label="📥 Descarcă Raport Excel",
-                data=excel_data,
-                file_name=f"raport_simulare_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-            )
+            df_reductions = utils.calculate_reductions(all_results)
+
+            def build_result_figures():
+                df_results = all_results.to_pandas()
+                df_abstract = df_results.rename(columns={"name": "Model", "cpu_operations": "Operații CPU", "data_movement_units": "Mișcare Date (unități)", "memory_usage_data_units": "Memorie Utilizată (unități)"})
+                fig_cpu = px.bar(df_abstract, x="Model", y="Operații CPU", color="Model", title="Comparare Operații CPU Estimate", text_auto=True)
+                fig_data = px.bar(df_abstract, x="Model", y="Mișcare Date (unități)", color="Model", title="Comparare Mișcare Date Estimate", text_auto=True)
+                fig_mem = px.bar(df_abstract, x="Model", y="Memorie Utilizată (unități)", color="Model", title="Comparare Memorie Utilizată Estimată", text_auto=True)
+                figs_cost = {"CPU": fig_cpu, "Data Movement": fig_data, "Memory": fig_mem}
+
+                df_impact = df_results.rename(columns={"name": "Model", "estimated_kwh": "Energie (kWh)", "estimated_co2_g": "Emisii CO2 (g)"})
+                fig_kwh = px.bar(df_impact, x="Model", y="Energie (kWh)", color="Model", title="Comparare Energie Consumată Estimată", text_auto=True)
+                fig_co2 = px.bar(df_impact, x="Model", y="Emisii CO2 (g)", color="Model", title="Comparare Emisii CO2 Estimate", text_auto=True)
+                figs_impact = {"Energy": fig_kwh, "CO2": fig_co2}
+                return figs_cost, figs_impact
+
+            with profiling.stage("app.figures"):
+                figure_key = api_handler.result_key(selected_scenario, params, kwh_cpu, kwh_data, gco2_per_kwh_final)
+                figs_cost, figs_impact = build_result_figures() if figure_key is None else figure_cache.get_or_compute(("rezultate",) + figure_key, build_result_figures)
+
+            with profiling.stage("app.history"):
+                st.session_state.history_view = history_store.refresh_view(st.session_state.get("history_view", {}), history, owner=history_owner)
+                df_history_view = st.session_state.history_view["frame"].drop(columns="_rowid")
+            # Raportul Excel (cu randarea graficelor) se generează doar la cerere și se memorează după conținut
+            export_as_images = st.checkbox("Grafice ca imagini PNG în raport (mai lent, necesită kaleido)", value=False, key="excel_images")
+            chart_mode = "image" if export_as_images else "native"
+            report_key = utils.excel_report_key(all_results, None, chart_mode, history_version=history.version(history_owner))
+            if st.session_state.get("excel_report_key") != report_key:
+                if st.button("📄 Pregătește Raport Excel", help="Generează raportul Excel pentru rezultatele curente și istoric."):
+                    st.session_state.excel_report_key = report_key
+            if st.session_state.get("excel_report_key") == report_key:
+                with st.spinner("Se generează raportul Excel..."), profiling.stage("app.excel_export"):
+                    excel_data = utils.get_excel_export(all_results, df_reductions, lambda: history.fetch(owner=history_owner).drop(columns="_rowid"), figs_cost, figs_impact, report_key=report_key, chart_mode=chart_mode)
+                st.download_button(
+                    label="📥 Descarcă Raport Excel",
+                    data=excel_data,
+                    file_name=f"raport_simulare_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
+                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                )
             st.markdown("---")
 
-            tab_rezumat, tab_grafice_costuri, tab_grafice_impact, tab_istoric, tab_what_if = st.tabs([
-                "📝 Rezumat & Reduceri", "📈 Grafice Costuri", "🌍 Grafice Impact", "📜 Istoric Comparații", "🔬 Analiză 'What-If'"
+            tab_rezumat, tab_grafice_costuri, tab_grafice_impact, tab_istoric, tab_what_if, tab_masuratori = st.tabs([
+                "📝 Rezumat & Reduceri", "📈 Grafice Costuri", "🌍 Grafice Impact", "📜 Istoric Comparații", "🔬 Analiză 'What-If'", "⏱️ Măsurători Reale"
             ])
             
             with tab_rezumat:
                 st.subheader("Estimări Costuri & Impact Ambiental (Valori Absolute)")
-                for i, result in enumerate(all_results):
-                    st.markdown(f"#### Model: {result.get('name', 'N/A')}")
+                for result in all_results.records():
+                    st.markdown(f"#### Model: {result.name}")
                     
-                    real_world_eq = utils.get_real_world_equivalents(result.get('estimated_co2_g', 0.0), gco2_per_kwh_final)
+                    real_world_eq = utils.get_real_world_equivalents(result.estimated_co2_g, gco2_per_kwh_final)
                     eq_text = ""
                     if real_world_eq:
                         km_ev = real_world_eq.get("km parcurși cu o mașină electrică", 0)
@@ -274,19 +283,16 @@ if st.session_state.simulation_has_run:
                             eq_text += f"🌳 **{tree_hours:.1f} ore** de absorbție de către un copac."
                     
                     col1, col2, col3, col4, col5 = st.columns(5)
-                    with col1: st.metric("💻 Op. CPU", f"{result.get('cpu_operations', 0.0):,.0f}")
-                    with col2: st.metric("💾 Mișc. Date", f"{result.get('data_movement_units', 0.0):,.0f}")
-                    with col3:
-                        mem_usage = result.get('peak_memory_usage_data_units', result.get('memory_usage_data_units', 0.0))
-                        st.metric("🧠 Memorie", f"{mem_usage:,.0f}")
-                    with col4: st.metric("⚡ Energie (kWh)", f"{result.get('estimated_kwh', 0.0):.6f}")
-                    with col5: st.metric("💨 CO2 (g)", f"{result.get('estimated_co2_g', 0.0):,.2f}", help=eq_text if eq_text else "Nu există echivalent semnificativ")
+                    with col1: st.metric("💻 Op. CPU", f"{result.cpu_operations:,.0f}")
+                    with col2: st.metric("💾 Mișc. Date", f"{result.data_movement_units:,.0f}")
+                    with col3: st.metric("🧠 Memorie", f"{result.memory_usage_data_units:,.0f}")
+                    with col4: st.metric("⚡ Energie (kWh)", f"{result.estimated_kwh:.6f}")
+                    with col5: st.metric("💨 CO2 (g)", f"{result.estimated_co2_g:,.2f}", help=eq_text if eq_text else "Nu există echivalent semnificativ")
                     
-                    st.caption(f"Complexitate CPU: {result.get('complexity_cpu', 'N/A')} | Complexitate Memorie: {result.get('complexity_memory', 'N/A')}")
-                    model_name = result.get('name')
-                    if model_name and model_name in config.MODEL_EXPLANATIONS:
+                    st.caption(f"Complexitate CPU: {result.complexity_cpu} | Complexitate Memorie: {result.complexity_memory}")
+                    if result.name in config.MODEL_EXPLANATIONS:
                         with st.expander("💡 Analiză și Recomandări"):
-                            st.markdown(config.MODEL_EXPLANATIONS[model_name], unsafe_allow_html=True)
+                            st.markdown(config.MODEL_EXPLANATIONS[result.name], unsafe_allow_html=True)
                     st.markdown("---")
                 if not df_reductions.empty:
                     st.subheader("📊 Tabel Reduceri Procentuale vs. Modelul Standard")
@@ -304,26 +310,29 @@ if st.session_state.simulation_has_run:
 
             with tab_istoric:
                 st.subheader("📜 Istoric Detaliat al Comparațiilor")
-                if not df_history_full.empty:
-                    st.dataframe(df_history_full, use_container_width=True, column_config={"Op. CPU": st.column_config.NumberColumn(format="%.0f"), "Mișc. Date": st.column_config.NumberColumn(format="%.0f"), "Memorie (u)": st.column_config.NumberColumn(format="%.0f"), "Energie (kWh)": st.column_config.NumberColumn(format="%.6f"), "CO2 (g)": st.column_config.NumberColumn(format="%.3f"), "Factor CO2": st.column_config.NumberColumn(format="%.2f")}, hide_index=True)
+                if not df_history_view.empty:
+                    if len(df_history_view) >= config.HISTORY_DISPLAY_ROWS:
+                        st.caption(f"Sunt afișate ultimele {config.HISTORY_DISPLAY_ROWS} rânduri; raportul Excel conține tot istoricul.")
+                    st.dataframe(df_history_view, use_container_width=True, column_config={"Op. CPU": st.column_config.NumberColumn(format="%.0f"), "Mișc. Date": st.column_config.NumberColumn(format="%.0f"), "Memorie (u)": st.column_config.NumberColumn(format="%.0f"), "Energie (kWh)": st.column_config.NumberColumn(format="%.6f"), "CO2 (g)": st.column_config.NumberColumn(format="%.3f"), "Factor CO2": st.column_config.NumberColumn(format="%.2f")}, hide_index=True)
                     if st.button("🗑️ Golește Istoricul", key="clear_history_in_tab"):
-                        st.session_state.history = []
+                        history.clear(history_owner)
+                        st.session_state.history_view = {}
                         st.rerun()
                     st.markdown("---")
                     st.subheader("📊 Grafice Comparative din Istoric")
-                    run_ids = df_history_full["ID Rulare"].unique().tolist()
+                    run_ids = history.run_ids(history_owner)
                     selected_runs = st.multiselect("Alege rulările de comparat (după ID):", options=run_ids, default=run_ids[-2:] if len(run_ids) >= 2 else run_ids)
                     metric_options = ["CO2 (g)", "Energie (kWh)", "Op. CPU", "Mișc. Date", "Memorie (u)"]
                     selected_metric = st.selectbox("Alege metrica de vizualizat:", options=metric_options)
                     if selected_runs and len(selected_runs) >= 1:
-                        df_filtered = df_history_full[df_history_full["ID Rulare"].isin(selected_runs)]
+                        df_filtered = history.fetch(run_ids=selected_runs, owner=history_owner)
                         fig_history = px.bar(df_filtered, x="Model", y=selected_metric, color="ID Rulare", barmode="group", title=f"Comparație pentru metrica: {selected_metric}", labels={"ID Rulare": "ID Rulare", selected_metric: f"Valoare {selected_metric}"})
                         fig_history.update_layout(xaxis_tickangle=-45)
                         st.plotly_chart(fig_history, use_container_width=True)
                     else:
                         st.info("Selectează cel puțin o rulare din lista de mai sus pentru a genera un grafic.")
                 else:
-                    st.info("Niciun rezultat salvat în această sesiune.")
+                    st.info("Niciun rezultat salvat în istoric.")
 
             with tab_what_if:
                 st.subheader("🔬 Analiză de Sensibilitate 'What-If'")
@@ -341,33 +350,55 @@ if st.session_state.simulation_has_run:
                     min_val = max(1, int(current_value * 0.2))
                     max_val = int(current_value * 2.0)
                     varied_range = st.slider(f"Alege un interval pentru '{param_to_vary_name}':", min_value=min_val, max_value=max_val, value=(min_val, max_val), key="what_if_slider")
-                    what_if_results = []
-                    for val in np.linspace(varied_range[0], varied_range[1], 15, dtype=int):
-                        models = []
-                        if selected_scenario == config.SCENARIU_SORTARE:
-                            # Variabilele 's1_N', etc., nu sunt definite în acest scope. Trebuie să le luăm din st.session_state
-                            s1_N_local, s1_key_idx_size_local = st.session_state.s1_N, st.session_state.s1_key_idx_size
-                            args_std = (s1_N_local, val, kwh_cpu, kwh_data, gco2_per_kwh_final)
-                            args_eff = (s1_N_local, val, kwh_cpu, kwh_data, gco2_per_kwh_final)
-                            args_idx = (s1_N_local, val, s1_key_idx_size_local, kwh_cpu, kwh_data, gco2_per_kwh_final)
-                            models = [api_handler.model_standard_sort(*args_std), api_handler.model_efficient_sort(*args_eff), api_handler.model_sort_index(*args_idx)]
-                        elif selected_scenario == config.SCENARIU_RAPORT_VANZARI:
-                            base_args = {"num_transactions": st.session_state.s2_N_trans, "avg_items_per_transaction": st.session_state.s2_avg_items, "avg_record_size_transaction_header": st.session_state.s2_trans_header_size, "avg_record_size_item": st.session_state.s2_item_size, "kwh_cpu": kwh_cpu, "kwh_data": kwh_data, "gco2_factor": gco2_per_kwh_final}
-                            if param_key == "s2_avg_items": base_args["avg_items_per_transaction"] = val
-                            if param_key == "s2_item_size": base_args["avg_record_size_item"] = val
-                            models = [api_handler.model_standard_sales_report(**base_args), api_handler.model_green_sales_report(**base_args)]
-                        elif selected_scenario == config.SCENARIU_FILTRARE_LOGURI:
-                            base_args = {"num_log_lines": st.session_state.s3_N_lines, "avg_line_length": st.session_state.s3_avg_line_len, "error_line_percentage": st.session_state.s3_err_perc, "avg_error_message_size": st.session_state.s3_err_msg_size, "kwh_cpu": kwh_cpu, "kwh_data": kwh_data, "gco2_factor": gco2_per_kwh_final}
-                            if param_key == "s3_err_perc": base_args["error_line_percentage"] = val
-                            if param_key == "s3_avg_line_len": base_args["avg_line_length"] = val
-                            models = [api_handler.model_standard_log_filter(**base_args), api_handler.model_green_log_filter(**base_args)]
-                        for res in models:
-                            res[param_to_vary_name] = val
-                            what_if_results.append(res)
-                    df_what_if = pd.DataFrame(what_if_results)
-                    fig_what_if = px.line(df_what_if, x=param_to_vary_name, y="estimated_co2_g", color="name", title=f"Sensibilitatea emisiilor de CO2 la '{param_to_vary_name}'", labels={"estimated_co2_g": "Emisii CO2 (g)", "name": "Model"}, markers=True)
+                    what_if_values = np.linspace(varied_range[0], varied_range[1], 15, dtype=int)
+                    what_if_params_values = {k: st.session_state[k] for k in config.DEFAULT_INPUT_VALUES.keys()}
+                    what_if_params_values[param_key] = what_if_values
+                    with profiling.stage("app.what_if"):
+                        what_if_results = api_handler.run_scenario_batch(selected_scenario, what_if_params_values, kwh_cpu, kwh_data, gco2_per_kwh_final)
+                        df_what_if = what_if_results.with_params(**{param_to_vary_name: what_if_values}).to_pandas()
+                        fig_what_if = px.line(df_what_if, x=param_to_vary_name, y="estimated_co2_g", color="name", title=f"Sensibilitatea emisiilor de CO2 la '{param_to_vary_name}'", labels={"estimated_co2_g": "Emisii CO2 (g)", "name": "Model"}, markers=True)
                     st.plotly_chart(fig_what_if, use_container_width=True)
 
+                st.markdown("---")
+                st.subheader("🌐 Sensibilitate Globală (indici Sobol)")
+                st.info(f"Toate intrările variază simultan (log-uniform, între jumătate și dublul valorii curente): parametrii scenariului, constantele de cost și factorii de conversie. "
+                        f"S1 este efectul parametrului singur; ST include și interacțiunile cu ceilalți (ST - S1 mare = interacțiuni puternice).")
+                sobol_params = {k: st.session_state[k] for k in config.DEFAULT_INPUT_VALUES.keys()}
+                with profiling.stage("app.sobol"):
+                    df_sobol = sensitivity.sobol_indices(selected_scenario, sobol_params, kwh_cpu, kwh_data, gco2_per_kwh_final)
+                sobol_output = st.selectbox("Ieșirea analizată:", options=list(df_sobol["output"].unique()), key="sobol_output_select")
+                df_sobol_output = df_sobol[df_sobol["output"] == sobol_output].melt(id_vars=["parameter"], value_vars=["S1", "ST"], var_name="Indice", value_name="Valoare")
+                fig_sobol = px.bar(df_sobol_output, x="parameter", y="Valoare", color="Indice", barmode="group", title=f"Indici Sobol pentru '{sobol_output}'", labels={"parameter": "Parametru"})
+                st.plotly_chart(fig_sobol, use_container_width=True)
+
+            with tab_masuratori:
+                st.subheader("⏱️ Măsurători Reale vs. Valori Modelate")
+                st.info("Strategiile scenariului sunt executate efectiv pe date sintetice generate din parametrii curenți. "
+                        "Unitățile diferă (secunde și octeți vs. unități abstracte), de aceea comparația se face relativ la modelul standard.")
+                effective_params = measurement.measured_params(selected_scenario, params)
+                capped = {k: v for k, v in effective_params.items() if v != params[k]}
+                if capped:
+                    st.caption(f"Dimensiunea este plafonată pentru măsurare (implementări Python pur): {capped}. Modelele sunt evaluate pe aceiași parametri.")
+                measurement_key = (selected_scenario, tuple(sorted(effective_params.items())))
+                if st.button("▶️ Rulează măsurătorile", key="run_measurements"):
+                    with st.spinner("Se execută strategiile pe date sintetice..."):
+                        df_measured, _ = measurement.measure_scenario(selected_scenario, effective_params, limits={})
+                    st.session_state.measurements = {"key": measurement_key, "data": df_measured}
+                stored = st.session_state.get("measurements")
+                if stored and stored["key"] == measurement_key:
+                    df_compare = measurement.compare_with_model(selected_scenario, stored["data"], effective_params, kwh_cpu, kwh_data, gco2_per_kwh_final)
+                    st.dataframe(df_compare.rename(columns={"name": "Model", "wall_s": "Timp real (s)", "cpu_s": "Timp CPU (s)", "peak_bytes": "Memorie vârf (octeți)"}), hide_index=True, use_container_width=True)
+                    df_relative = pd.concat([
+                        pd.DataFrame({"Model": df_compare["name"], "Metrică": "CPU", "Sursă": "Măsurat", "Relativ la standard": df_compare["cpu_s_rel"]}),
+                        pd.DataFrame({"Model": df_compare["name"], "Metrică": "CPU", "Sursă": "Modelat", "Relativ la standard": df_compare["cpu_operations_rel"]}),
+                        pd.DataFrame({"Model": df_compare["name"], "Metrică": "Memorie", "Sursă": "Măsurat", "Relativ la standard": df_compare["peak_bytes_rel"]}),
+                        pd.DataFrame({"Model": df_compare["name"], "Metrică": "Memorie", "Sursă": "Modelat", "Relativ la standard": df_compare["memory_usage_data_units_rel"]}),
+                    ])
+                    fig_measured = px.bar(df_relative, x="Model", y="Relativ la standard", color="Sursă", facet_col="Metrică", barmode="group", log_y=True, title="Măsurat vs. modelat (multiplu al modelului standard, scară logaritmică)")
+                    st.plotly_chart(fig_measured, use_container_width=True)
+                else:
+                    st.caption("Apăsați butonul pentru a rula măsurătorile pentru parametrii curenți.")
+
             st.markdown("---")
             st.info(config.DISCLAIMER_TEXT)
 
@@ -386,3 +417,28 @@ elif not st.session_state.simulation_has_run:
         3.  **Selectați Hardware și Sursă CO2:** Alegeți un profil hardware și sursa pentru calculul emisiilor.
         4.  **Rulați Simularea:** Apăsați butonul pentru a vedea o comparație detaliată între o abordare standard și una optimizată ("verde").
         """)
+
+# --- Panoul de profilare (ascuns): ?debug=1 în URL sau SIMULATOR_DEBUG_PANEL=1 ---
+profiling.end_rerun(label=f"{selected_scenario.split(':')[0]} | {'scalabilitate' if run_scalability_analysis else 'rulare'}" if st.session_state.simulation_has_run else "start")
+if config.DEBUG_PANEL_ENABLED or st.query_params.get("debug") == "1":
+    with st.expander("🛠️ Profilare rerulări (debug)"):
+        recorded = profiling.traces()
+        st.caption(f"{len(recorded)} rerulări înregistrate (ultimele {config.PROFILING_BUFFER_SIZE}, toate sesiunile). "
+                   f"Timpii etapelor imbricate se suprapun"
+                   f"{'; alocările (tracemalloc) sunt la nivel de proces și includ celelalte sesiuni active' if config.PROFILE_ALLOCATIONS else ''}.")
+        if recorded:
+            st.markdown("**Percentile per etapă (ms)**")
+            st.dataframe(profiling.stage_summary(recorded), hide_index=True, use_container_width=True)
+            last = recorded[-1]
+            st.markdown(f"**Ultima rerulare:** {last['seconds'] * 1000:.1f} ms ({last['label']})")
+            st.json({"etape": last["stages"], "contoare": last["counters"]}, expanded=False)
+            st.markdown("**Contoare (toate rerulările)**")
+            st.json(profiling.counter_totals(recorded), expanded=False)
+            st.download_button("📥 Descarcă trace-ul (JSON)", data=profiling.export_json(recorded),
+                               file_name=f"profil_rerulari_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json", mime="application/json")
+            if st.button("🧹 Golește înregistrările", key="clear_profiling"):
+                profiling.clear()
+                st.rerun()
+        import shared_cache
+        st.markdown("**Cache-uri partajate (toate sesiunile)**")
+        st.json(shared_cache.cache_info(), expanded=False)
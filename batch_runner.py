@@ -0,0 +1,233 @@
+# batch_runner.py
+
+"""
+Rulare headless (fără browser) a multor configurații de scenarii.
+
+Configurațiile se citesc dintr-un fișier CSV, JSON (listă de obiecte sau
+JSON Lines) ori Parquet, câte una pe rând, cu coloanele:
+    scenario          - obligatoriu: numărul (1-3), numele scurt sau numele complet
+    config_id         - opțional: identificatorul configurației (ex: numele serviciului)
+    hardware_profile  - opțional: nume din config.HARDWARE_PROFILES
+    co2_zone          - opțional: nume din sweep.co2_zone_factors()
+    gco2_per_kwh      - opțional: factor CO2 explicit (are prioritate față de co2_zone)
+    <chei de intrare> - opțional: ex. s1_N, s2_N_trans; lipsa lor = config.DEFAULT_INPUT_VALUES
+Rândurile sunt grupate pe scenariu și evaluate vectorizat (api_handler.run_scenario_batch);
+loturile mari sunt împărțite pe bucăți și distribuite pe un pool de procese.
+Rezultatul (un rând per configurație x model) se scrie în Parquet sau CSV.
+
+Exemplu CLI:
+    python batch_runner.py servicii.csv --out rezultate.parquet --workers 8
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+import api_handler
+import config
+from sweep import CO2_ZONE_AXIS, HARDWARE_AXIS, co2_zone_factors
+
+# Numărul de configurații evaluate într-o singură bucată (per proces)
+DEFAULT_CHUNK_ROWS = 100_000
+# Eticheta zonei pentru rândurile care dau direct `gco2_per_kwh`
+CUSTOM_ZONE = "Personalizat"
+GCO2_COLUMN = "gco2_per_kwh"
+ID_COLUMN = "config_id"
+ROW_COLUMN = "config_row"
+SCENARIO_COLUMN = "scenario"
+
+
+# ==============================================================================
+# == CITIREA CONFIGURAȚIILOR
+# ==============================================================================
+
+def load_configs(path):
+    """Citește configurațiile dintr-un fișier .csv, .json/.jsonl sau .parquet."""
+    lower = str(path).lower()
+    if lower.endswith(".csv"):
+        return pd.read_csv(path)
+    if lower.endswith((".jsonl", ".ndjson")):
+        return pd.read_json(path, lines=True)
+    if lower.endswith(".json"):
+        return pd.read_json(path)
+    if lower.endswith((".parquet", ".pq")):
+        return pd.read_parquet(path)
+    raise ValueError(f"Format de intrare nerecunoscut: {path} (se acceptă .csv, .json, .jsonl, .parquet)")
+
+
+def _invalid_rows(mask, what, values):
+    rows = np.flatnonzero(mask)
+    sample = ", ".join(f"rândul {i}: {values[i]!r}" for i in rows[:5])
+    return ValueError(f"{len(rows)} configurații cu {what} ({sample}{', ...' if len(rows) > 5 else ''})")
+
+
+def prepare_configs(df):
+    """
+    Validează configurațiile și rezolvă scenariile, profilurile hardware și zonele CO2.
+
+    Returns:
+        tuple: (scenarii rezolvate, coduri profil hardware, coduri zonă, factori gCO2/kWh),
+            câte un array NumPy per rând din `df`.
+    """
+    if SCENARIO_COLUMN not in df.columns:
+        raise ValueError(f"Lipsește coloana obligatorie '{SCENARIO_COLUMN}'")
+    n = len(df)
+    raw_scenarios = df[SCENARIO_COLUMN].to_numpy()
+    resolved = {}
+    for value in pd.unique(raw_scenarios):
+        try:
+            resolved[value] = api_handler.resolve_scenario(value)
+        except ValueError:
+            raise _invalid_rows(raw_scenarios == value, "scenariu necunoscut", raw_scenarios) from None
+    scenarios = np.array([resolved[v] for v in raw_scenarios], dtype=object)
+
+    profile_names = list(config.HARDWARE_PROFILES)
+    profiles = df[HARDWARE_AXIS].fillna(config.DEFAULT_HARDWARE_PROFILE_NAME) if HARDWARE_AXIS in df.columns \
+        else pd.Series([config.DEFAULT_HARDWARE_PROFILE_NAME] * n)
+    profile_codes = pd.Categorical(profiles, categories=profile_names).codes
+    if (profile_codes < 0).any():
+        raise _invalid_rows(profile_codes < 0, "profil hardware necunoscut", profiles.to_numpy())
+
+    zones = co2_zone_factors()
+    zone_names = list(zones) + [CUSTOM_ZONE]
+    zone_values = np.array(list(zones.values()))
+    explicit = pd.to_numeric(df[GCO2_COLUMN], errors="coerce").to_numpy(dtype=np.float64) if GCO2_COLUMN in df.columns \
+        else np.full(n, np.nan)
+    zone_labels = df[CO2_ZONE_AXIS].fillna(config.ZONE_MEDIA_UE) if CO2_ZONE_AXIS in df.columns \
+        else pd.Series([config.ZONE_MEDIA_UE] * n)
+    zone_codes = pd.Categorical(zone_labels, categories=zone_names[:-1]).codes.astype(np.int16)
+    has_factor = ~np.isnan(explicit)
+    if ((zone_codes < 0) & ~has_factor).any():
+        raise _invalid_rows((zone_codes < 0) & ~has_factor, "zonă CO2 necunoscută (sau indisponibilă offline)", zone_labels.to_numpy())
+    zone_codes = np.where(has_factor, len(zone_names) - 1, zone_codes).astype(np.int16)
+    gco2 = np.where(has_factor, explicit, zone_values[np.clip(zone_codes, 0, len(zone_values) - 1)])
+    return scenarios, profile_codes.astype(np.int16), zone_codes, gco2
+
+
+# ==============================================================================
+# == EVALUARE
+# ==============================================================================
+
+def evaluate_chunk(scenario, params, profile_codes, zone_codes, gco2, rows):
+    """
+    Evaluează o bucată de configurații ale aceluiași scenariu (rulează și în procesele din pool).
+
+    Args:
+        scenario (str): Numele complet al scenariului.
+        params (dict): Cheie de intrare -> array cu valoarea pentru fiecare configurație.
+        profile_codes, zone_codes (np.ndarray): Indicii profilului hardware / zonei CO2.
+        gco2 (np.ndarray): Factorul gCO2eq/kWh al fiecărei configurații.
+        rows (np.ndarray): Poziția fiecărei configurații în fișierul de intrare.
+
+    Returns:
+        pyarrow.Table: Un rând per configurație x model.
+    """
+    profiles = [config.HARDWARE_PROFILES[name] for name in config.HARDWARE_PROFILES]
+    kwh_cpu = np.array([p["kwh_per_cpu_op"] for p in profiles])[profile_codes]
+    kwh_data = np.array([p["kwh_per_data_move"] for p in profiles])[profile_codes]
+    # Configurațiile unui lot nu se repetă: nu le păstrăm în cache-ul de costuri
+    table = api_handler.run_scenario_batch(scenario, params, kwh_cpu, kwh_data, gco2, use_cache=False)
+    categories = {
+        SCENARIO_COLUMN: [scenario],
+        HARDWARE_AXIS: list(config.HARDWARE_PROFILES),
+        CO2_ZONE_AXIS: list(co2_zone_factors()) + [CUSTOM_ZONE],
+    }
+    table = table.with_params(
+        categories=categories,
+        **{ROW_COLUMN: rows, SCENARIO_COLUMN: np.zeros(len(rows), dtype=np.int16),
+           HARDWARE_AXIS: profile_codes, CO2_ZONE_AXIS: zone_codes, GCO2_COLUMN: gco2},
+        **params,
+    )
+    return table.to_arrow()
+
+
+def iter_chunks(df, chunk_size=DEFAULT_CHUNK_ROWS):
+    """
+    Grupează configurațiile pe scenariu și generează argumentele pentru `evaluate_chunk`,
+    în bucăți de cel mult `chunk_size` rânduri. Intrările lipsă primesc valorile implicite.
+    """
+    scenarios, profile_codes, zone_codes, gco2 = prepare_configs(df)
+    for scenario in dict.fromkeys(scenarios):
+        rows = np.flatnonzero(scenarios == scenario)
+        keys = api_handler.scenario_input_keys(scenario)
+        values = {}
+        for key in keys:
+            column = pd.to_numeric(df[key], errors="coerce").to_numpy(dtype=np.float64)[rows] if key in df.columns \
+                else np.full(len(rows), np.nan)
+            values[key] = np.where(np.isnan(column), config.DEFAULT_INPUT_VALUES[key], column)
+        for start in range(0, len(rows), chunk_size):
+            part = slice(start, start + chunk_size)
+            idx = rows[part]
+            yield (scenario, {k: v[part] for k, v in values.items()}, profile_codes[idx], zone_codes[idx], gco2[idx], idx)
+
+
+def run_batch(df, workers=None, chunk_size=DEFAULT_CHUNK_ROWS):
+    """
+    Evaluează toate configurațiile din `df`.
+
+    Args:
+        df (pd.DataFrame): Configurațiile (vezi documentația modulului).
+        workers (int): Numărul de procese; implicit os.cpu_count(). Cu 1 proces
+            (sau un lot care încape într-o singură bucată) totul rulează în procesul curent.
+        chunk_size (int): Numărul de configurații per bucată.
+
+    Returns:
+        pyarrow.Table: Un rând per configurație x model, în ordinea fișierului de intrare.
+    """
+    import pyarrow as pa
+    workers = workers or os.cpu_count() or 1
+    chunks = list(iter_chunks(df, chunk_size))
+    if workers > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+            tables = list(pool.map(evaluate_chunk, *zip(*chunks)))
+    else:
+        tables = [evaluate_chunk(*chunk) for chunk in chunks]
+    if not tables:
+        return pa.table({})
+    # Scenariile au chei de intrare diferite: coloanele lipsă devin nule
+    result = pa.concat_tables(tables, promote_options="default").sort_by(ROW_COLUMN)
+    if ID_COLUMN in df.columns:
+        ids = pa.array(df[ID_COLUMN].astype(str).to_numpy()).take(result[ROW_COLUMN])
+        result = result.add_column(0, ID_COLUMN, ids)
+    return result
+
+
+def write_results(table, path):
+    """Scrie rezultatele în Parquet (implicit) sau CSV, după extensia fișierului."""
+    import pyarrow as pa
+    if str(path).lower().endswith(".csv"):
+        import pyarrow.csv as pacsv
+        # CSV nu are tipuri dicționar: decodificăm coloanele categoriale
+        table = pa.table({name: col.cast(pa.string()) if pa.types.is_dictionary(col.type) else col
+                          for name, col in zip(table.column_names, table.columns)})
+        pacsv.write_csv(table, path)
+    else:
+        import pyarrow.parquet as pq
+        pq.write_table(table.combine_chunks().unify_dictionaries(), path, compression="zstd")
+
+
+# ==============================================================================
+# == INTERFAȚĂ LINIE DE COMANDĂ
+# ==============================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rulează în lot configurații de scenarii, fără interfața Streamlit.")
+    parser.add_argument("input", help="Fișier cu configurații (.csv, .json, .jsonl, .parquet).")
+    parser.add_argument("--out", required=True, help="Fișier de ieșire (.parquet sau .csv).")
+    parser.add_argument("--workers", type=int, default=None, help="Numărul de procese (implicit: numărul de CPU-uri).")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_ROWS, help="Configurații per bucată.")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    df = load_configs(args.input)
+    print(f"{len(df):,} configurații citite din {args.input}")
+    table = run_batch(df, workers=args.workers, chunk_size=args.chunk_size)
+    write_results(table, args.out)
+    print(f"{table.num_rows:,} rânduri scrise în {args.out} în {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+# benchmarks.py
+
+"""
+Suita de benchmark-uri cu praguri de regresie.
+
+Grupurile măsurate:
+  - models: fiecare model din api_handler.SCENARIO_MODELS, scalar și vectorizat
+    (BATCH_POINTS puncte), plus `run_scenario_batch` fără cache (calea din interfață);
+  - sweeps: sweep-uri de scalabilitate cu 1e2 ... 1e7 puncte pe parametrul de
+    dimensiune al fiecărui scenariu (sweep.ParameterGrid, pe bucăți);
+  - excel: `utils.create_excel_export` cu istorice tot mai mari (grafice native);
+  - equivalents: `utils.get_real_world_equivalents`, scalar și pe un array.
+
+Pentru fiecare benchmark se rețin două metrici: `seconds` (cel mai bun timp per
+apel din mai multe repetări) și `peak_mb` (vârful tracemalloc al unui apel, măsurat
+separat, ca urmărirea alocărilor să nu afecteze timpul). Rezultatele se salvează ca
+JSON (linia de bază, `--save`) și, la rulările următoare, sunt comparate cu ea: o
+metrică mai mare decât baza cu mai mult de `--tolerance` (implicit 25%) este o
+regresie, iar programul se termină cu codul 1. Liniile de bază depind de mașină; pe
+mașini partajate (zgomot mare între procese) toleranța trebuie mărită.
+
+Exemplu CLI:
+    python benchmarks.py --save
+    python benchmarks.py --only models --only equivalents --tolerance 0.3
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+
+import api_handler
+import config
+import utils
+from sweep import ParameterGrid
+
+GROUPS = ("models", "sweeps", "excel", "equivalents")
+METRICS = ("seconds", "peak_mb")
+BATCH_POINTS = 100_000
+SWEEP_POINTS = tuple(10 ** k for k in range(2, 8))
+EXCEL_HISTORY_ROWS = (0, 1_000, 10_000)
+EQUIVALENTS_POINTS = 1_000_000
+DEFAULT_TOLERANCE = 0.25
+# Diferențele absolute sub aceste praguri nu sunt considerate regresii (zgomot de măsurare)
+MIN_ABSOLUTE_DELTA = {"seconds": 50e-6, "peak_mb": 1.0}
+
+
+# ==============================================================================
+# == MĂSURARE
+# ==============================================================================
+
+def measure(fn, repeats=5, min_seconds=0.1):
+    """
+    Măsoară o funcție fără argumente.
+
+    Fiecare repetare rulează funcția de atâtea ori cât să dureze cel puțin `min_seconds`
+    (pentru funcțiile de ordinul microsecundelor); se păstrează cel mai bun timp per apel.
+    Apelurile care durează peste o secundă nu se mai repetă.
+
+    Returns:
+        dict: seconds (per apel), peak_mb (vârful tracemalloc al unui apel separat).
+    """
+    start = time.perf_counter()
+    fn()
+    first = time.perf_counter() - start
+    loops = max(1, int(min_seconds / first) if first > 0 else 1000)
+    best = first
+    for _ in range(int(repeats) - 1 if first < 1.0 else 0):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        best = min(best, (time.perf_counter() - start) / loops)
+
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    fn()
+    peak = tracemalloc.get_traced_memory()[1] - base
+    if not tracing:
+        tracemalloc.stop()
+    return {"seconds": best, "peak_mb": max(0.0, peak) / 1e6}
+
+
+def _scenario_number(scenario):
+    return config.SCENARIO_OPTIONS.index(scenario) + 1
+
+
+def _default_factors():
+    profile = config.HARDWARE_PROFILES[config.DEFAULT_HARDWARE_PROFILE_NAME]
+    return profile["kwh_per_cpu_op"], profile["kwh_per_data_move"], config.GCO2EQ_PER_KWH_DEFAULT
+
+
+# ==============================================================================
+# == BENCHMARK-URI
+# ==============================================================================
+# Fiecare grup returnează un dict: numele benchmark-ului -> funcția fără argumente măsurată.
+
+def model_cases(batch_points=BATCH_POINTS):
+    cases = {}
+    kwh_cpu, kwh_data, gco2 = _default_factors()
+    for scenario, models in api_handler.SCENARIO_MODELS.items():
+        number = _scenario_number(scenario)
+        for model, keys in models:
+            scalar = [config.DEFAULT_INPUT_VALUES[k] for k in keys]
+            batch = [np.linspace(1, 2 * scalar[0], batch_points)] + scalar[1:]
+            cases[f"models/{model.__name__}/scalar"] = lambda model=model, args=scalar: model(*args)
+            cases[f"models/{model.__name__}/batch_{batch_points}"] = lambda model=model, args=batch: model(*args)
+        params = {k: config.DEFAULT_INPUT_VALUES[k] for k in api_handler.scenario_input_keys(scenario)}
+        cases[f"models/scenario_{number}/run_scenario_batch"] = lambda scenario=scenario, params=params: \
+            api_handler.run_scenario_batch(scenario, params, kwh_cpu, kwh_data, gco2, use_cache=False)
+    return cases
+
+
+def _run_sweep(grid):
+    total = 0.0
+    for chunk in grid.iter_chunks():
+        total += float(chunk["estimated_co2_g"].sum())
+    return total
+
+
+def sweep_cases(max_points=max(SWEEP_POINTS)):
+    cases = {}
+    for scenario, scaling in config.SCALING_PARAMS.items():
+        axis = scaling["key"]
+        number = _scenario_number(scenario)
+        for points in (p for p in SWEEP_POINTS if p <= max_points):
+            grid = ParameterGrid(scenario, axes={axis: np.linspace(1, 10 * config.DEFAULT_INPUT_VALUES[axis], points)})
+            cases[f"sweeps/scenario_{number}/{points}"] = lambda grid=grid: _run_sweep(grid)
+    return cases
+
+
+def synthetic_history(rows, seed=0):
+    """Un istoric de `rows` rânduri cu aceleași coloane ca history_store (valori aleatoare)."""
+    import pandas as pd
+    import history_store
+    rng = np.random.default_rng(seed)
+    n_runs = max(1, rows // 3)
+    run = np.arange(rows) // 3 % n_runs
+    df = pd.DataFrame({
+        "ID Rulare": pd.Categorical([f"2026-01-01 {i // 3600 % 24:02d}:{i // 60 % 60:02d}:{i % 60:02d}" for i in run]),
+        "Scenariu": pd.Categorical(np.array(["Sortare", "Raport Vânzări", "Filtrare Loguri"])[run % 3]),
+        "Hardware": pd.Categorical(np.full(rows, config.DEFAULT_HARDWARE_PROFILE_NAME)),
+        "Sursă CO2": pd.Categorical(np.full(rows, config.ZONE_MEDIA_UE)),
+        "Factor CO2": np.full(rows, config.GCO2EQ_PER_KWH_DEFAULT, dtype=np.float32),
+        "N": rng.integers(100, 1_000_000, rows),
+        "Model": pd.Categorical(np.array(["Standard", "Eficient", "Index"])[np.arange(rows) % 3]),
+    })
+    for label in history_store.METRIC_COLUMNS:
+        df[label] = rng.random(rows).astype(np.float32) * 1e6
+    return df
+
+
+def excel_cases(history_rows=EXCEL_HISTORY_ROWS):
+    kwh_cpu, kwh_data, gco2 = _default_factors()
+    scenario = config.SCENARIU_SORTARE
+    params = {k: config.DEFAULT_INPUT_VALUES[k] for k in api_handler.scenario_input_keys(scenario)}
+    results = api_handler.run_scenario_batch(scenario, params, kwh_cpu, kwh_data, gco2)
+    reductions = utils.calculate_reductions(results)
+    # Figurile contează doar prin titlu în modul "native"; fără plotly se folosesc titlurile implicite
+    figs_cost = dict.fromkeys(("CPU", "Data Movement", "Memory"))
+    figs_impact = dict.fromkeys(("Energy", "CO2"))
+    cases = {}
+    for rows in history_rows:
+        history = synthetic_history(rows)
+        cases[f"excel/history_{rows}"] = lambda history=history: utils.create_excel_export(results, reductions, history, figs_cost, figs_impact, "native")
+    return cases
+
+
+def equivalents_cases(points=EQUIVALENTS_POINTS):
+    co2 = np.random.default_rng(0).random(points) * 100.0
+    return {
+        "equivalents/scalar": lambda: utils.get_real_world_equivalents(12.5, config.GCO2EQ_PER_KWH_DEFAULT),
+        f"equivalents/array_{points}": lambda: utils.get_real_world_equivalents(co2, config.GCO2EQ_PER_KWH_DEFAULT),
+    }
+
+
+def run_benchmarks(groups=GROUPS, repeats=5, max_sweep_points=max(SWEEP_POINTS), progress=None):
+    """
+    Rulează grupurile de benchmark-uri.
+
+    Args:
+        progress (callable): Apelată cu (nume, rezultat) după fiecare benchmark.
+
+    Returns:
+        dict: numele benchmark-ului -> {"seconds": ..., "peak_mb": ...}.
+    """
+    builders = {"models": model_cases, "sweeps": lambda: sweep_cases(max_sweep_points),
+                "excel": excel_cases, "equivalents": equivalents_cases}
+    results = {}
+    for group in groups:
+        for name, fn in builders[group]().items():
+            results[name] = measure(fn, repeats)
+            if progress:
+                progress(name, results[name])
+    return results
+
+
+# ==============================================================================
+# == LINII DE BAZĂ ȘI REGRESII
+# ==============================================================================
+
+def save_baseline(results, path=None):
+    path = path or config.BENCHMARK_BASELINE_PATH
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    document = {"created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "machine": {"platform": platform.platform(), "processor": platform.processor(),
+                            "python": platform.python_version(), "numpy": np.__version__, "cpus": os.cpu_count()},
+                "results": results}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2, sort_keys=True)
+    return path
+
+
+def load_baseline(path=None):
+    """Linia de bază salvată (None dacă fișierul nu există)."""
+    path = path or config.BENCHMARK_BASELINE_PATH
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE, metrics=METRICS):
+    """
+    Compară rezultatele cu linia de bază.
+
+    Args:
+        tolerance (float sau dict): Creșterea relativă admisă (ex: 0.25), globală sau per metrică.
+
+    Returns:
+        list: Câte un dict per (benchmark, metrică): benchmark, metric, baseline, current,
+            ratio, status ("ok", "regresie", "îmbunătățire", "nou").
+    """
+    baseline_results = (baseline or {}).get("results", {})
+    rows = []
+    for name, values in results.items():
+        for metric in metrics:
+            current = values.get(metric)
+            base = baseline_results.get(name, {}).get(metric)
+            if current is None:
+                continue
+            if base is None:
+                rows.append({"benchmark": name, "metric": metric, "baseline": None, "current": current, "ratio": None, "status": "nou"})
+                continue
+            allowed = tolerance.get(metric, DEFAULT_TOLERANCE) if isinstance(tolerance, dict) else tolerance
+            ratio = current / base if base > 0 else (1.0 if current <= 0 else float("inf"))
+            delta = current - base
+            if delta > base * allowed and delta > MIN_ABSOLUTE_DELTA.get(metric, 0.0):
+                status = "regresie"
+            elif -delta > base * allowed and -delta > MIN_ABSOLUTE_DELTA.get(metric, 0.0):
+                status = "îmbunătățire"
+            else:
+                status = "ok"
+            rows.append({"benchmark": name, "metric": metric, "baseline": base, "current": current, "ratio": ratio, "status": status})
+    return rows
+
+
+# ==============================================================================
+# == INTERFAȚĂ LINIE DE COMANDĂ
+# ==============================================================================
+
+def _format_value(metric, value):
+    if value is None:
+        return "-"
+    return f"{value * 1000:.3f} ms" if metric == "seconds" else f"{value:.2f} MB"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark-uri pentru modele, sweep-uri și export, comparate cu o linie de bază JSON.")
+    parser.add_argument("--only", action="append", choices=GROUPS, help="Grupurile rulate (implicit toate).")
+    parser.add_argument("--baseline", default=config.BENCHMARK_BASELINE_PATH, help="Fișierul liniei de bază (JSON).")
+    parser.add_argument("--save", action="store_true", help="Salvează rezultatele ca linie de bază (fără comparație).")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Creșterea relativă admisă a unei metrici (ex: 0.25 = 25%%).")
+    parser.add_argument("--repeats", type=int, default=5, help="Repetările per benchmark (se păstrează cel mai bun timp).")
+    parser.add_argument("--max-sweep-points", type=float, default=max(SWEEP_POINTS), help="Cel mai mare sweep rulat (puncte).")
+    parser.add_argument("--json", default=None, help="Scrie și rezultatele acestei rulări într-un fișier JSON.")
+    args = parser.parse_args(argv)
+
+    def progress(name, result):
+        print(f"{name:<60} {_format_value('seconds', result['seconds']):>14} {_format_value('peak_mb', result['peak_mb']):>12}", flush=True)
+
+    results = run_benchmarks(tuple(args.only or GROUPS), args.repeats, int(args.max_sweep_points), progress)
+    if args.json:
+        save_baseline(results, args.json)
+    if args.save:
+        print(f"\nLinia de bază a fost salvată în {save_baseline(results, args.baseline)}")
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        print(f"\nNu există o linie de bază în {args.baseline}; rulați cu --save pentru a o crea.")
+        return 0
+    rows = compare(results, baseline, args.tolerance)
+    changed = [r for r in rows if r["status"] != "ok"]
+    print(f"\nComparație cu linia de bază din {baseline.get('created', '?')} (toleranță {args.tolerance:.0%}):")
+    for row in changed or []:
+        ratio = f"x{row['ratio']:.2f}" if row["ratio"] is not None else ""
+        print(f"  [{row['status']}] {row['benchmark']} {row['metric']}: "
+              f"{_format_value(row['metric'], row['baseline'])} -> {_format_value(row['metric'], row['current'])} {ratio}")
+    regressions = [r for r in rows if r["status"] == "regresie"]
+    print(f"{len(rows) - len(changed)} metrici în toleranță, {len(regressions)} regresii.")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,260 @@
+# calibration.py
+
+"""
+Calibrarea automată a constantelor COST_PER_* și a factorilor energetici.
+
+Pe mașina curentă se rulează micro-benchmark-uri (bucle cu număr cunoscut de
+operații): comparații, swap-uri de înregistrări de diferite dimensiuni, swap-uri
+de perechi cheie-index, aritmetică, accese la memorie, regex și verificări `in`
+pe linii de log. Timpul fiecărei rulări este modelat ca o combinație liniară
+a operațiilor efectuate, iar costul pe operație rezultă prin cele mai mici
+pătrate (np.linalg.lstsq), cu overhead-ul buclei ca termen separat.
+
+Constantele sunt exprimate relativ la o comparație (COST_PER_COMPARISON_CPU = 1),
+ca în config.py. Factorii energetici ai profilului hardware calibrat rezultă din
+timpul per unitate și puterea medie a mașinii (`power_watts`):
+    kwh_per_cpu_op    = P * secunde_per_comparație / 3.6e6
+    kwh_per_data_move = P * secunde_per_octet_mutat / 3.6e6
+
+Profilul este salvat ca JSON în config.CALIBRATION_DIR și se încarcă la pornire
+prin variabila de mediu SIMULATOR_CALIBRATION_PROFILE (vezi config.py).
+
+Exemplu CLI:
+    python calibration.py --name laptop-dev --power-watts 20
+"""
+import argparse
+import json
+import os
+import platform
+import re
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+import config
+
+# Puterea medie implicită a unui nucleu încărcat (W), folosită dacă nu se specifică alta
+DEFAULT_POWER_WATTS = 15.0
+# Dimensiunile (număr de operații) pentru fiecare micro-benchmark și dimensiunile înregistrărilor
+BENCHMARK_SIZES = (20_000, 40_000, 80_000)
+QUICK_BENCHMARK_SIZES = (5_000, 10_000)
+SWAP_RECORD_SIZES = (16, 64, 256, 1024, 4096)
+# Coloanele sistemului liniar: costul (în secunde) al fiecărui tip de operație
+OPERATIONS = ("loop", "comparison", "swap_record", "byte_moved", "swap_key_index",
+              "arithmetic", "memory_access", "regex_match", "string_check")
+# Constanta din config.py corespunzătoare fiecărei operații (comparația este unitatea)
+CONSTANT_FOR_OPERATION = {
+    "comparison": "COST_PER_COMPARISON_CPU",
+    "swap_record": "COST_PER_SWAP_FULL_RECORD_CPU",
+    "swap_key_index": "COST_PER_SWAP_KEY_INDEX_CPU",
+    "arithmetic": "COST_PER_ARITHMETIC_OP_CPU",
+    "memory_access": "COST_PER_MEMORY_ACCESS_CPU",
+    "regex_match": "COST_PER_REGEX_MATCH_CPU",
+    "string_check": "COST_PER_STRING_CHECK_CPU",
+}
+LOG_PATTERN = re.compile(r"^(\S+ \S+) ERROR \[(\w+)\] (.*)$")
+
+
+# ==============================================================================
+# == MICRO-BENCHMARK-URI
+# ==============================================================================
+# Fiecare benchmark primește n și returnează (timpul în secunde, contoarele de operații).
+
+def _best_time(fn, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_loop(n, repeats=3):
+    def run():
+        for _ in range(n):
+            pass
+    return _best_time(run, repeats), {"loop": n}
+
+
+def bench_comparison(n, repeats=3):
+    a, b = 123456789, 987654321
+
+    def run():
+        for _ in range(n):
+            a < b
+    return _best_time(run, repeats), {"loop": n, "comparison": n}
+
+
+def bench_arithmetic(n, repeats=3):
+    a, b, c = 3.5, 2.25, 1.0
+
+    def run():
+        for _ in range(n):
+            a * b + c
+    return _best_time(run, repeats), {"loop": n, "arithmetic": 2 * n}
+
+
+def bench_memory_access(n, repeats=3):
+    source = list(range(n))
+    target = [0] * n
+
+    def run():
+        for i in range(n):
+            target[i] = source[i]
+    return _best_time(run, repeats), {"loop": n, "memory_access": 2 * n}
+
+
+def bench_swap_record(n, record_size, repeats=3):
+    slots = 64
+    buf = bytearray(os.urandom(record_size * slots))
+
+    def run():
+        for i in range(n):
+            a = (i % (slots - 1)) * record_size
+            b = a + record_size
+            buf[a:b], buf[b:b + record_size] = buf[b:b + record_size], buf[a:b]
+    # Indicii (modulo, înmulțire, adunări) costă ~5 operații aritmetice per iterație
+    return _best_time(run, repeats), {"loop": n, "arithmetic": 5 * n, "swap_record": n, "byte_moved": 2 * n * record_size}
+
+
+def bench_swap_key_index(n, repeats=3):
+    pairs = [(i, i) for i in range(n + 1)]
+
+    def run():
+        for i in range(n):
+            pairs[i], pairs[i + 1] = pairs[i + 1], pairs[i]
+    return _best_time(run, repeats), {"loop": n, "arithmetic": 2 * n, "swap_key_index": n}
+
+
+def _log_lines(n):
+    lines = []
+    for i in range(n):
+        if i % 20 == 0:
+            lines.append(f"2024-01-01 00:00:{i % 60:02d} ERROR [svc{i % 7}] " + "e" * 50)
+        else:
+            lines.append(f"2024-01-01 00:00:{i % 60:02d} INFO [svc{i % 7}] " + "x" * 110)
+    return lines
+
+
+def bench_regex_match(n, repeats=3):
+    lines = _log_lines(n)
+    match = LOG_PATTERN.match
+
+    def run():
+        for line in lines:
+            match(line)
+    return _best_time(run, repeats), {"loop": n, "regex_match": n}
+
+
+def bench_string_check(n, repeats=3):
+    lines = _log_lines(n)
+
+    def run():
+        for line in lines:
+            "ERROR" in line
+    return _best_time(run, repeats), {"loop": n, "string_check": n}
+
+
+def run_benchmarks(sizes=BENCHMARK_SIZES, record_sizes=SWAP_RECORD_SIZES, repeats=5):
+    """Rulează toate micro-benchmark-urile. Returnează o listă de (nume, timp, contoare)."""
+    runs = []
+    for n in sizes:
+        for bench in (bench_loop, bench_comparison, bench_arithmetic, bench_memory_access,
+                      bench_swap_key_index, bench_regex_match, bench_string_check):
+            seconds, counts = bench(n, repeats)
+            runs.append((bench.__name__, seconds, counts))
+        for record_size in record_sizes:
+            seconds, counts = bench_swap_record(n, record_size, repeats)
+            runs.append((f"bench_swap_record[{record_size}]", seconds, counts))
+    return runs
+
+
+# ==============================================================================
+# == AJUSTARE (CELE MAI MICI PĂTRATE)
+# ==============================================================================
+
+def fit_operation_costs(runs):
+    """
+    Estimează costul (secunde) fiecărei operații din OPERATIONS.
+
+    Fiecare rulare devine o ecuație: timp = sum(contor_op * cost_op). Ecuațiile
+    sunt ponderate cu 1/timp, astfel încât eroarea relativă contează la fel pentru
+    rulările scurte și lungi. Costurile negative (zgomot) sunt limitate la 0.
+
+    Returns:
+        tuple: (dict operație -> secunde, eroarea relativă RMS a ajustării).
+    """
+    A = np.array([[counts.get(op, 0) for op in OPERATIONS] for _, _, counts in runs], dtype=np.float64)
+    t = np.array([seconds for _, seconds, _ in runs], dtype=np.float64)
+    weights = 1.0 / t
+    solution, *_ = np.linalg.lstsq(A * weights[:, None], t * weights, rcond=None)
+    solution = np.maximum(solution, 0.0)
+    predicted = A @ solution
+    rel_rms = float(np.sqrt(np.mean(((predicted - t) / t) ** 2)))
+    return dict(zip(OPERATIONS, solution.tolist())), rel_rms
+
+
+def build_profile(name, operation_costs, rel_rms, power_watts=DEFAULT_POWER_WATTS):
+    """Construiește profilul calibrat (constantele relative la o comparație + factorii energetici)."""
+    unit = operation_costs["comparison"]
+    if unit <= 0:
+        raise ValueError("Costul unei comparații a ieșit nul; reluați calibrarea cu dimensiuni mai mari.")
+    constants = {CONSTANT_FOR_OPERATION[op]: operation_costs[op] / unit for op in CONSTANT_FOR_OPERATION}
+    return {
+        "name": name,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "host": {"machine": platform.machine(), "processor": platform.processor(), "python": platform.python_version(), "node": platform.node()},
+        "power_watts": power_watts,
+        "cost_constants": constants,
+        "hardware_profile": {
+            "kwh_per_cpu_op": power_watts * unit / 3.6e6,
+            "kwh_per_data_move": power_watts * operation_costs["byte_moved"] / 3.6e6,
+            "description": f"Calibrat pe {platform.node() or 'mașina curentă'} ({power_watts:g} W).",
+        },
+        "fit": {"seconds_per_operation": operation_costs, "relative_rms_error": rel_rms},
+    }
+
+
+def calibrate(name, power_watts=DEFAULT_POWER_WATTS, quick=False, repeats=5):
+    """Rulează benchmark-urile, ajustează costurile și returnează profilul calibrat (nesalvat)."""
+    runs = run_benchmarks(QUICK_BENCHMARK_SIZES if quick else BENCHMARK_SIZES, repeats=repeats)
+    operation_costs, rel_rms = fit_operation_costs(runs)
+    return build_profile(name, operation_costs, rel_rms, power_watts)
+
+
+def save_profile(profile, directory=None):
+    """Salvează profilul ca `<nume>.json` în config.CALIBRATION_DIR. Returnează calea."""
+    directory = directory or config.CALIBRATION_DIR
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{profile['name']}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(profile, f, indent=2, ensure_ascii=False)
+    return path
+
+
+# ==============================================================================
+# == INTERFAȚĂ LINIE DE COMANDĂ
+# ==============================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Calibrează constantele COST_PER_* și factorii energetici pe mașina curentă.")
+    parser.add_argument("--name", required=True, help="Numele profilului calibrat.")
+    parser.add_argument("--power-watts", type=float, default=DEFAULT_POWER_WATTS, help="Puterea medie a mașinii sub sarcină (W).")
+    parser.add_argument("--quick", action="store_true", help="Benchmark-uri mai scurte (mai puțin precise).")
+    parser.add_argument("--dir", default=None, help="Directorul profilurilor (implicit config.CALIBRATION_DIR).")
+    args = parser.parse_args(argv)
+
+    profile = calibrate(args.name, args.power_watts, args.quick)
+    print(f"{'Constantă':<32}{'Actual':>12}{'Calibrat':>12}")
+    for constant, value in profile["cost_constants"].items():
+        print(f"{constant:<32}{getattr(config, constant):>12.3f}{value:>12.3f}")
+    hardware = profile["hardware_profile"]
+    print(f"kwh_per_cpu_op = {hardware['kwh_per_cpu_op']:.3e}, kwh_per_data_move = {hardware['kwh_per_data_move']:.3e}")
+    print(f"Eroare relativă RMS a ajustării: {profile['fit']['relative_rms_error']:.1%}")
+    path = save_profile(profile, args.dir)
+    print(f"Profil salvat în {path}. Activare: SIMULATOR_CALIBRATION_PROFILE={args.name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,349 @@
+# carbon_scheduler.py
+
+"""
+Planificarea joburilor în funcție de intensitatea carbonică a rețelei.
+
+În loc de un singur factor gCO2eq/kWh, se folosește o serie de timp (orară
+sau mai fină) încărcată din CSV/Parquet. Pentru un job cu o energie estimată
+(ex: `estimated_kwh` al unui model din api_handler), o durată și o fereastră
+[cel mai devreme, termen limită], se calculează emisiile pentru fiecare moment
+de start posibil și momentul de start cu emisii minime.
+
+Puterea jobului este considerată constantă pe durata rulării, deci emisiile
+sunt energia x media intensității pe fereastra de rulare. Mediile pe toate
+ferestrele rezultă din sume cumulative (O(T) per durată), iar minimul pe
+intervalul permis al fiecărui job dintr-un sparse table (O(1) per job), astfel
+încât mii de joburi pe un an de date se planifică vectorizat. Pentru planificare,
+duratele sunt grupate după numărul de pași întregi (rotunjit în sus), deci
+tabelele se construiesc o dată per număr de pași, nu per durată distinctă.
+
+Exemplu CLI:
+    python carbon_scheduler.py intensitate_2024.csv --jobs joburi.csv --out plan.csv
+    (joburi.csv: job_id, energy_kwh, runtime_h, earliest, deadline)
+"""
+import argparse
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# Numele de coloane recunoscute automat în fișierele cu serii de timp
+TIME_COLUMNS = ("datetime", "timestamp", "time", "date", "data")
+VALUE_COLUMNS = ("carbonIntensity", "carbon_intensity", "gco2_per_kwh", "gco2eq_per_kwh", "intensity", "value")
+# Câte serii de medii glisante (una per durată distinctă) păstrează un profil
+WINDOW_CACHE_SIZE = 16
+
+
+def _pick_column(df, candidates, explicit, what):
+    if explicit is not None:
+        if explicit not in df.columns:
+            raise ValueError(f"Coloana '{explicit}' nu există. Coloane: {list(df.columns)}")
+        return explicit
+    lower = {c.lower(): c for c in df.columns}
+    for name in candidates:
+        if name.lower() in lower:
+            return lower[name.lower()]
+    raise ValueError(f"Nu am găsit coloana pentru {what}. Specificați-o explicit. Coloane: {list(df.columns)}")
+
+
+# ==============================================================================
+# == PROFILUL DE INTENSITATE
+# ==============================================================================
+
+class IntensityProfile:
+    """
+    Serie de intensitate carbonică (gCO2eq/kWh) pe un pas de timp regulat.
+
+    Args:
+        start (datetime-like): Momentul primei valori.
+        step (timedelta-like): Pasul seriei (ex: 1h, 15min).
+        values (array): Intensitatea pentru fiecare pas (valoare constantă pe pas).
+    """
+
+    def __init__(self, start, step, values):
+        start = pd.Timestamp(start)
+        if start.tzinfo is not None:
+            start = start.tz_convert("UTC").tz_localize(None)
+        self.start = np.datetime64(start, "ns")
+        self.step = np.timedelta64(pd.Timedelta(step).value, "ns")
+        self.values = np.ascontiguousarray(values, dtype=np.float64)
+        if self.values.ndim != 1 or self.values.size == 0:
+            raise ValueError("Seria de intensitate trebuie să fie 1-D și nevidă")
+        if np.isnan(self.values).any():
+            raise ValueError("Seria de intensitate conține valori lipsă")
+        # Sume prefix: _cumsum[i] = suma primelor i valori
+        self._cumsum = np.concatenate(([0.0], np.cumsum(self.values)))
+        self._window_cache = OrderedDict()  # durată (pași) -> medii, LRU cu WINDOW_CACHE_SIZE intrări
+
+    @classmethod
+    def from_series(cls, series, step=None):
+        """
+        Construiește profilul dintr-o pd.Series indexată după timp. Seria este
+        adusă pe un pas regulat (pasul median, dacă nu e dat): valorile de pe
+        același pas sunt mediate, golurile sunt interpolate liniar.
+        """
+        series = series.dropna().sort_index()
+        index = pd.DatetimeIndex(series.index)
+        if index.tz is not None:
+            index = index.tz_convert("UTC").tz_localize(None)
+        series = pd.Series(series.to_numpy(dtype=np.float64), index=index)
+        if len(series) < 2 and step is None:
+            raise ValueError("Sunt necesare cel puțin două valori pentru a deduce pasul seriei")
+        step = pd.Timedelta(step) if step is not None else pd.Timedelta(np.median(np.diff(index.asi8)), "ns")
+        regular = series.resample(step).mean().interpolate(limit_direction="both")
+        return cls(regular.index[0], step, regular.to_numpy())
+
+    @property
+    def times(self):
+        """Momentele de start ale fiecărui pas."""
+        return self.start + np.arange(len(self.values)) * self.step
+
+    @property
+    def end(self):
+        return self.start + len(self.values) * self.step
+
+    def steps(self, duration):
+        """Convertește durate (timedelta sau ore, ca număr) în număr de pași (float)."""
+        duration = np.asarray(duration)
+        if np.issubdtype(duration.dtype, np.number):
+            return duration.astype(np.float64) * 3_600e9 / self.step.astype(np.int64)
+        return pd.to_timedelta(np.ravel(duration)).to_numpy().astype(np.int64).reshape(duration.shape) / self.step.astype(np.int64)
+
+    def index_of(self, moments):
+        """Poziția (float, în pași) a unor momente față de începutul seriei; NaN pentru momentele lipsă (NaT)."""
+        moments = pd.to_datetime(np.ravel(moments))
+        if getattr(moments, "tz", None) is not None:
+            moments = moments.tz_convert("UTC").tz_localize(None)
+        moments = moments.to_numpy().astype("datetime64[ns]")
+        position = (moments - self.start).astype(np.int64) / self.step.astype(np.int64)
+        return np.where(np.isnat(moments), np.nan, position)
+
+    def _earliest_index(self, earliest):
+        """Primul pas de start permis; un moment lipsă înseamnă începutul seriei."""
+        return np.nan_to_num(np.ceil(self.index_of(earliest) - 1e-9), nan=0.0)
+
+    def _deadline_index(self, deadline):
+        """Poziția termenului limită; un termen lipsă înseamnă sfârșitul seriei."""
+        return np.nan_to_num(self.index_of(deadline), nan=float(len(self.values)))
+
+    def window_means(self, runtime_steps):
+        """
+        Intensitatea medie pe fereastra de rulare, pentru fiecare pas de start posibil.
+
+        Pentru o durată r = k + f (k pași întregi, fracțiunea f), fereastra care
+        începe la pasul s acoperă valorile s..s+k-1 complet și fracțiunea f din s+k.
+
+        Returns:
+            np.ndarray: Array de lungime T - ceil(r) + 1 (gol dacă jobul nu încape în serie).
+        """
+        r = float(runtime_steps)
+        if r <= 0:
+            raise ValueError("Durata jobului trebuie să fie pozitivă")
+        cached = self._window_cache.get(r)
+        if cached is not None:
+            self._window_cache.move_to_end(r)
+            return cached
+        k = int(np.floor(r))
+        f = r - k
+        n_starts = len(self.values) - int(np.ceil(r)) + 1
+        if n_starts <= 0:
+            return np.empty(0)
+        s = np.arange(n_starts)
+        sums = self._cumsum[s + k] - self._cumsum[s]
+        if f > 0:
+            sums = sums + f * self.values[s + k]
+        means = sums / r
+        self._window_cache[r] = means
+        if len(self._window_cache) > WINDOW_CACHE_SIZE:
+            self._window_cache.popitem(last=False)
+        return means
+
+    def mean_at(self, starts, runtime_steps):
+        """Intensitatea medie a ferestrelor care încep la pașii `starts`, cu duratele `runtime_steps` (per element)."""
+        starts = np.asarray(starts, dtype=np.int64)
+        r = np.asarray(runtime_steps, dtype=np.float64)
+        k = np.floor(r).astype(np.int64)
+        f = r - k
+        partial = self.values[np.minimum(starts + k, len(self.values) - 1)]
+        sums = self._cumsum[starts + k] - self._cumsum[starts] + np.where(f > 0, f * partial, 0.0)
+        return sums / r
+
+    def emission_curve(self, energy_kwh, runtime, earliest=None, deadline=None):
+        """
+        Emisiile (g CO2) ale unui job pentru fiecare moment de start din fereastra permisă.
+
+        Args:
+            energy_kwh (float): Energia totală a jobului.
+            runtime: Durata (timedelta sau ore).
+            earliest, deadline: Limitele ferestrei (implicit: întreaga serie). Jobul
+                trebuie să se termine până la `deadline`.
+
+        Returns:
+            pd.Series: Emisiile indexate după momentul de start.
+        """
+        r = float(self.steps(runtime))
+        means = self.window_means(r)
+        lo, hi = self._start_bounds(r, earliest, deadline, len(means))
+        lo, hi = int(lo[0]), int(hi[0])
+        if hi < lo:
+            return pd.Series(dtype=np.float64, index=pd.DatetimeIndex([]), name="emisii_g")
+        starts = self.start + np.arange(lo, hi + 1) * self.step
+        return pd.Series(energy_kwh * means[lo:hi + 1], index=pd.DatetimeIndex(starts), name="emisii_g")
+
+    def _start_bounds(self, r, earliest, deadline, n_starts):
+        """Primul și ultimul pas de start permis (inclusiv) pentru fiecare job."""
+        lo = np.zeros(1) if earliest is None else self._earliest_index(earliest)
+        hi = np.full(1, n_starts - 1.0) if deadline is None else np.floor(self._deadline_index(deadline) - r + 1e-9)
+        lo = np.clip(lo, 0, None).astype(np.int64)
+        hi = np.minimum(hi, n_starts - 1).astype(np.int64)
+        return lo, hi
+
+
+# ==============================================================================
+# == MINIM PE INTERVAL (SPARSE TABLE)
+# ==============================================================================
+
+def _sparse_argmin_table(values):
+    """table[j, i] = indicele minimului din values[i : i + 2**j] (primul, la egalitate)."""
+    n = len(values)
+    levels = [np.arange(n)]
+    j = 1
+    while (1 << j) <= n:
+        prev, half, width = levels[-1], 1 << (j - 1), n - (1 << j) + 1
+        left, right = prev[:width], prev[half:half + width]
+        levels.append(np.where(values[right] < values[left], right, left))
+        j += 1
+    table = np.zeros((len(levels), n), dtype=np.int64)
+    for j, level in enumerate(levels):
+        table[j, :len(level)] = level
+    return table
+
+
+def range_argmin(values, lo, hi, table=None):
+    """Indicele minimului din values[lo..hi] (inclusiv), pentru array-uri de intervale nevide."""
+    table = _sparse_argmin_table(values) if table is None else table
+    lo, hi = np.asarray(lo, dtype=np.int64), np.asarray(hi, dtype=np.int64)
+    k = np.floor(np.log2(hi - lo + 1)).astype(np.int64)
+    a = table[k, lo]
+    b = table[k, hi - (1 << k) + 1]
+    return np.where(values[b] < values[a], b, a)
+
+
+# ==============================================================================
+# == PLANIFICAREA JOBURILOR
+# ==============================================================================
+
+def schedule_jobs(profile, energy_kwh, runtime, earliest=None, deadline=None):
+    """
+    Momentul de start cu emisii minime pentru fiecare job.
+
+    Args:
+        profile (IntensityProfile): Seria de intensitate.
+        energy_kwh (array): Energia fiecărui job.
+        runtime (array): Durata fiecărui job (timedelta sau ore).
+        earliest, deadline (array): Fereastra fiecărui job (implicit: întreaga serie);
+            un moment lipsă (NaT) înseamnă începutul, respectiv sfârșitul seriei.
+
+    Startul optim este căutat pe ferestre de pași întregi (durata rotunjită în sus
+    la pasul seriei); emisiile raportate folosesc durata exactă. Pentru duratele
+    multiple de pas rezultatul este exact.
+
+    Returns:
+        pd.DataFrame: Câte un rând per job: start optim, emisiile la start optim și
+            la cel mai devreme start, economia (%), `feasible` (False dacă jobul
+            nu încape în fereastră sau în serie) și `invalid_runtime` (durată
+            lipsă, nulă sau negativă; jobul nu este planificat).
+    """
+    energy = np.atleast_1d(np.asarray(energy_kwh, dtype=np.float64))
+    n = energy.size
+    r = np.broadcast_to(np.atleast_1d(profile.steps(runtime)), (n,))
+    invalid = ~(r > 0) | ~np.isfinite(r)
+    blocks = np.where(invalid, 0.0, np.ceil(np.where(invalid, 1.0, r) - 1e-9))
+    lo = np.zeros(n, dtype=np.int64) if earliest is None else np.broadcast_to(profile._earliest_index(earliest), (n,))
+    hi_time = None if deadline is None else np.broadcast_to(profile._deadline_index(deadline), (n,))
+
+    best_mean = np.full(n, np.nan)
+    first_mean = np.full(n, np.nan)
+    best_start = np.full(n, -1, dtype=np.int64)
+    first_start = np.full(n, -1, dtype=np.int64)
+    # Joburile sunt grupate după numărul de pași întregi: sumele glisante și sparse table-ul se
+    # calculează o dată per grup (o durată de k pași are T - k + 1 starturi, ca fereastra de k pași întregi)
+    for steps in np.unique(blocks[~invalid]):
+        jobs = np.flatnonzero(blocks == steps)
+        means = profile.window_means(steps)
+        job_lo = np.clip(lo[jobs], 0, None).astype(np.int64)
+        job_hi = np.full(jobs.size, len(means) - 1, dtype=np.int64) if hi_time is None \
+            else np.minimum(np.floor(hi_time[jobs] - r[jobs] + 1e-9), len(means) - 1).astype(np.int64)
+        ok = job_lo <= job_hi
+        if not ok.any():
+            continue
+        jobs, job_lo, job_hi = jobs[ok], job_lo[ok], job_hi[ok]
+        best = range_argmin(means, job_lo, job_hi, _sparse_argmin_table(means))
+        best_start[jobs], best_mean[jobs] = best, profile.mean_at(best, r[jobs])
+        first_start[jobs], first_mean[jobs] = job_lo, profile.mean_at(job_lo, r[jobs])
+
+    feasible = best_start >= 0
+    best_g = energy * best_mean
+    first_g = energy * first_mean
+    savings = np.divide(first_g - best_g, first_g, out=np.full(n, np.nan), where=feasible & (first_g > 0)) * 100
+    return pd.DataFrame({
+        "feasible": feasible,
+        "best_start": pd.to_datetime(np.where(feasible, profile.start + best_start * profile.step, np.datetime64("NaT"))),
+        "best_emissions_g": best_g,
+        "earliest_start": pd.to_datetime(np.where(feasible, profile.start + first_start * profile.step, np.datetime64("NaT"))),
+        "earliest_emissions_g": first_g,
+        "savings_percent": savings,
+        "best_mean_intensity": best_mean,
+        "invalid_runtime": invalid,
+    })
+
+
+def load_intensity_series(path, time_column=None, value_column=None, step=None):
+    """
+    Încarcă o serie de intensitate carbonică dintr-un fișier CSV sau Parquet.
+
+    Args:
+        path (str): Fișierul (.csv sau .parquet).
+        time_column, value_column (str): Coloanele de timp și valoare (detectate automat dacă lipsesc).
+        step: Pasul dorit (implicit: pasul median din fișier).
+
+    Returns:
+        IntensityProfile: Seria pe un pas regulat.
+    """
+    df = pd.read_parquet(path) if str(path).lower().endswith((".parquet", ".pq")) else pd.read_csv(path)
+    time_col = _pick_column(df, TIME_COLUMNS, time_column, "timp")
+    value_col = _pick_column(df, VALUE_COLUMNS, value_column, "intensitate")
+    times = pd.to_datetime(df[time_col], utc=True)
+    return IntensityProfile.from_series(pd.Series(pd.to_numeric(df[value_col], errors="coerce").to_numpy(), index=times), step=step)
+
+
+# ==============================================================================
+# == INTERFAȚĂ LINIE DE COMANDĂ
+# ==============================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Planifică joburi la momentele cu emisii minime.")
+    parser.add_argument("series", help="Seria de intensitate (.csv sau .parquet).")
+    parser.add_argument("--jobs", required=True, help="Joburile: job_id, energy_kwh, runtime_h, earliest, deadline.")
+    parser.add_argument("--out", required=True, help="Planul rezultat (.csv sau .parquet).")
+    parser.add_argument("--time-column")
+    parser.add_argument("--value-column")
+    args = parser.parse_args(argv)
+
+    profile = load_intensity_series(args.series, args.time_column, args.value_column)
+    jobs = pd.read_parquet(args.jobs) if args.jobs.lower().endswith(".parquet") else pd.read_csv(args.jobs)
+    plan = schedule_jobs(
+        profile, jobs["energy_kwh"].to_numpy(), jobs["runtime_h"].to_numpy(),
+        earliest=jobs["earliest"].to_numpy() if "earliest" in jobs.columns else None,
+        deadline=jobs["deadline"].to_numpy() if "deadline" in jobs.columns else None,
+    )
+    plan = pd.concat([jobs.reset_index(drop=True), plan], axis=1)
+    (plan.to_csv(args.out, index=False) if args.out.lower().endswith(".csv") else plan.to_parquet(args.out, index=False))
+    print(f"{plan['feasible'].sum():,}/{len(plan):,} joburi planificate; "
+          f"economie medie {np.nanmean(plan['savings_percent']):.1f}% față de startul cel mai devreme")
+    if plan["invalid_runtime"].any():
+        print(f"{plan['invalid_runtime'].sum():,} joburi cu durată invalidă (lipsă, nulă sau negativă) nu au fost planificate")
+
+
+if __name__ == "__main__":
+    main()
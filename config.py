@@ -1,10 +1,44 @@
 import os
-from dotenv import load_dotenv
 
 # --- Încărcare variabile de mediu din fișierul .env ---
-# Este bine să încărcăm variabilele de mediu devreme,
-# dar cheia API specifică va fi preluată unde este necesară (ex. în api_client.py)
-load_dotenv()
+# Este bine să încărcăm variabilele de mediu devreme (setările de mai jos le citesc la import),
+# dar cheia API specifică va fi preluată unde este necesară (ex. în api_client.py).
+_env_loaded = False
+
+
+def _find_env_file(start_dir):
+    """Caută fișierul .env în `start_dir` și în directoarele părinte (ca dotenv.find_dotenv)."""
+    directory = os.path.abspath(start_dir)
+    while True:
+        candidate = os.path.join(directory, ".env")
+        if os.path.isfile(candidate):
+            return candidate
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return None
+        directory = parent
+
+
+def load_env(path=None):
+    """
+    Încarcă variabilele din fișierul .env (fără a le suprascrie pe cele deja setate).
+    python-dotenv este importat doar dacă fișierul există; apelurile repetate nu mai fac nimic.
+
+    Returns:
+        bool: True dacă a fost încărcat un fișier .env.
+    """
+    global _env_loaded
+    if _env_loaded and path is None:
+        return False
+    _env_loaded = True
+    path = path or _find_env_file(os.path.dirname(os.path.abspath(__file__)))
+    if not path:
+        return False
+    from dotenv import load_dotenv
+    return load_dotenv(path)
+
+
+load_env()
 
 # --- 1. Definirea Unităților de Cost Abstracte ---
 COST_PER_COMPARISON_CPU = 1.0
@@ -39,11 +73,60 @@ HARDCODED_CO2_ZONES = {
     "SUA (Medie)":           { "value": 410.0, "description": "Medie pentru un mix energetic foarte diversificat la nivel național." }
 }
 
+# --- API Electricity Maps (intensitate carbonică live) ---
+# URL-ul de bază poate fi suprascris (ex: un server local de test) prin variabila EM_API_BASE_URL.
+EM_API_BASE_URL = os.getenv("EM_API_BASE_URL", "https://api.electricitymap.org/v3")
+EM_API_TIMEOUT_S = (3.05, 10.0) # (conectare, citire)
+EM_API_MAX_ATTEMPTS = 3
+ROMANIA_ZONE_CODE = "RO"
+# Cache-ul pe disc al valorilor live (supraviețuiește repornirii aplicației)
+CARBON_CACHE_PATH = os.getenv("CARBON_CACHE_PATH", os.path.join(os.path.expanduser("~"), ".cache", "ict_simulator", "carbon_intensity.json"))
+CARBON_CACHE_TTL_S = 24 * 3600
+
+# --- Istoricul rulărilor (SQLite; persistent între sesiuni și reporniri) ---
+HISTORY_DB_PATH = os.getenv("SIMULATOR_HISTORY_DB", os.path.join(os.path.expanduser("~"), ".cache", "ict_simulator", "history.sqlite3"))
+# Numărul maxim de rânduri din istoric păstrate în memorie pentru afișare, per sesiune
+HISTORY_DISPLAY_ROWS = 1000
+
+# --- Cache-uri partajate de toate sesiunile procesului (shared_cache.py): plafonul de memorie, în MB ---
+# cost_cache: costurile abstracte; result_cache: rezultatele cu energie/CO2 (inclusiv sweep-urile);
+# figure_cache: graficele construite; excel_cache: rapoartele Excel generate.
+SHARED_CACHE_LIMITS_MB = {"cost_cache": 64, "result_cache": 64, "figure_cache": 32, "excel_cache": 64}
+
+# --- Tabele precalculate pentru analiza de scalabilitate (lookup_tables.py; se generează cu `python lookup_tables.py build`) ---
+LOOKUP_TABLES_DIR = os.getenv("SIMULATOR_LOOKUP_TABLES", os.path.join(os.path.expanduser("~"), ".cache", "ict_simulator", "lookup_tables"))
+# Intervalul acoperit (același cu limitele din interfață); toate valorile întregi până la LOOKUP_EXACT_UPTO
+# sunt în tabel, iar peste el grila are LOOKUP_LOG_POINTS puncte spațiate logaritmic (interpolare log-log)
+LOOKUP_RANGE = (1, 5000000)
+LOOKUP_EXACT_UPTO = 4096
+LOOKUP_LOG_POINTS = 8000
+# Eroarea relativă maximă a interpolării (măsurată la generare); tabelele peste prag nu sunt folosite
+LOOKUP_MAX_REL_ERROR = 1e-6
+
+# --- Profilarea rerulărilor (panou ascuns: ?debug=1 în URL sau SIMULATOR_DEBUG_PANEL=1) ---
+PROFILING_BUFFER_SIZE = 500
+DEBUG_PANEL_ENABLED = os.getenv("SIMULATOR_DEBUG_PANEL", "") not in ("", "0")
+# tracemalloc dă octeții alocați per etapă, dar încetinește tot procesul; doar la cerere
+PROFILE_ALLOCATIONS = os.getenv("SIMULATOR_PROFILE_ALLOCATIONS", "") not in ("", "0")
+
+# --- Benchmark-uri (benchmarks.py): linia de bază depinde de mașină (se generează cu --save) ---
+BENCHMARK_BASELINE_PATH = os.getenv("BENCHMARK_BASELINE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baselines", "baseline.json"))
+
+# --- Contoare de energie hardware (RAPL / powercap, Linux) ---
+# Rădăcina poate fi suprascrisă (ex: un arbore sysfs fals, pentru teste sau mașini fără RAPL).
+POWERCAP_ROOT = os.getenv("POWERCAP_ROOT", "/sys/class/powercap")
+
 # --- Nume Scenarii ---
 SCENARIU_SORTARE = "Scenariul 1: Sortarea Datelor Clienților"
 SCENARIU_RAPORT_VANZARI = "Scenariul 2: Generarea Raportului de Vânzări"
 SCENARIU_FILTRARE_LOGURI = "Scenariul 3: Filtrarea și Analiza Log-urilor"
 SCENARIO_OPTIONS = [SCENARIU_SORTARE, SCENARIU_RAPORT_VANZARI, SCENARIU_FILTRARE_LOGURI]
+# Parametrul de dimensiune variat de analiza de scalabilitate (interfață, lookup_tables, benchmarks)
+SCALING_PARAMS = {
+    SCENARIU_SORTARE: {"name": "Nr. înregistrări (N)", "key": "s1_N"},
+    SCENARIU_RAPORT_VANZARI: {"name": "Nr. tranzacții (N)", "key": "s2_N_trans"},
+    SCENARIU_FILTRARE_LOGURI: {"name": "Nr. linii log (L)", "key": "s3_N_lines"},
+}
 
 # --- Opțiuni Sursă CO2 ---
 # Generăm dinamic lista de opțiuni pentru a fi extensibilă
@@ -135,3 +218,38 @@ MODEL_EXPLANATIONS = {
     **Recomandare:** "Mutați logica la stânga" - efectuați operațiunile ieftine și de filtrare cât mai devreme posibil pentru a reduce volumul de date pe care trebuie să-l procesați cu operațiuni scumpe.
     """
 }
+
+# --- Profil Calibrat (opțional) ---
+# Profilurile sunt generate de calibration.py. Dacă SIMULATOR_CALIBRATION_PROFILE conține
+# numele (sau calea) unui profil, constantele COST_PER_* de mai sus sunt înlocuite cu cele
+# calibrate, iar profilul hardware calibrat este adăugat în HARDWARE_PROFILES.
+CALIBRATION_DIR = os.getenv("CALIBRATION_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "calibration_profiles"))
+CALIBRATED_PROFILE_PREFIX = "Calibrat: "
+ACTIVE_CALIBRATION_PROFILE = None
+
+def apply_calibration_profile(name_or_path):
+    """
+    Încarcă un profil calibrat și actualizează constantele acestui modul.
+
+    Returns:
+        dict: Profilul încărcat.
+    """
+    import json
+    global ACTIVE_CALIBRATION_PROFILE
+    path = name_or_path if name_or_path.endswith(".json") else os.path.join(CALIBRATION_DIR, f"{name_or_path}.json")
+    with open(path, encoding="utf-8") as f:
+        profile = json.load(f)
+    for constant, value in profile.get("cost_constants", {}).items():
+        if constant.startswith("COST_PER_") and constant in globals():
+            globals()[constant] = float(value)
+    if "hardware_profile" in profile:
+        HARDWARE_PROFILES[CALIBRATED_PROFILE_PREFIX + profile["name"]] = dict(profile["hardware_profile"])
+    ACTIVE_CALIBRATION_PROFILE = profile["name"]
+    return profile
+
+if os.getenv("SIMULATOR_CALIBRATION_PROFILE"):
+    try:
+        apply_calibration_profile(os.getenv("SIMULATOR_CALIBRATION_PROFILE"))
+    except (OSError, ValueError, KeyError) as e:
+        import warnings
+        warnings.warn(f"Profilul calibrat '{os.getenv('SIMULATOR_CALIBRATION_PROFILE')}' nu a putut fi încărcat: {e}. Se folosesc constantele implicite.")
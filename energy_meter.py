@@ -0,0 +1,353 @@
+# energy_meter.py
+
+"""
+Măsurarea energiei consumate cu contoarele hardware RAPL (Linux powercap).
+
+Kernel-ul expune contoarele în /sys/class/powercap/intel-rapl:<pachet>[:<subdomeniu>]:
+`name` (ex: package-0, core, dram), `energy_uj` (energia cumulată, în µJ) și
+`max_energy_range_uj` (valoarea la care contorul revine la zero). `EnergyMeter`
+citește periodic contoarele pe durata unei sarcini, într-un fir separat, astfel
+încât o singură revenire la zero între două citiri este tratată corect. Consumul
+de repaus (măsurat separat) poate fi scăzut, pentru a obține energia atribuibilă sarcinii.
+
+Rădăcina arborelui (config.POWERCAP_ROOT) poate fi orice director cu aceeași
+structură, deci un arbore fals poate înlocui sysfs în teste sau pe mașini fără RAPL.
+
+Exemplu CLI:
+    python energy_meter.py --scenario 3 --idle 2
+"""
+import argparse
+import glob
+import inspect
+import math
+import os
+import threading
+import time
+
+import api_handler
+import config
+import utils
+
+JOULES_PER_KWH = 3.6e6
+# Subdomeniile incluse implicit: pachetul (include core/uncore) și DRAM, fără dublă numărare
+DEFAULT_DOMAINS = ("package", "dram")
+DEFAULT_SAMPLE_INTERVAL_S = 0.1
+# Plafonul seturilor de argumente pregătite dinainte pentru o măsurătoare (vezi EnergyMeter.measure)
+MAX_PREPARED_CALLS = 1000
+
+
+class EnergyMeterError(Exception):
+    """Contoarele RAPL lipsesc sau nu pot fi citite (ex: permisiuni)."""
+
+
+# ==============================================================================
+# == DOMENII RAPL
+# ==============================================================================
+
+class RaplDomain:
+    """Un contor de energie RAPL (un director powercap cu `energy_uj`)."""
+
+    __slots__ = ("path", "name", "max_range_uj")
+
+    def __init__(self, path):
+        self.path = path
+        zone_id = os.path.basename(path)
+        with open(os.path.join(path, "name")) as f:
+            base = f.read().strip()
+        # Numele devin unice între pachete: package-0, package-1, dram@intel-rapl:1:0
+        self.name = base if base.startswith("package") or base.startswith("psys") else f"{base}@{zone_id}"
+        try:
+            with open(os.path.join(path, "max_energy_range_uj")) as f:
+                self.max_range_uj = int(f.read().strip())
+        except (OSError, ValueError):
+            self.max_range_uj = 2**32
+        self.read_uj()
+
+    def read_uj(self):
+        try:
+            with open(os.path.join(self.path, "energy_uj")) as f:
+                return int(f.read().strip())
+        except PermissionError as e:
+            raise EnergyMeterError(f"Fără drept de citire pentru {self.path}/energy_uj (necesită root sau ajustarea permisiunilor)") from e
+        except (OSError, ValueError) as e:
+            raise EnergyMeterError(f"Contor RAPL ilizibil: {self.path}/energy_uj") from e
+
+    def delta_uj(self, previous, current):
+        """Diferența dintre două citiri, ținând cont de o eventuală revenire la zero a contorului."""
+        return current - previous if current >= previous else current + self.max_range_uj - previous
+
+    def __repr__(self):
+        return f"RaplDomain({self.name!r})"
+
+
+def discover_domains(root=None, include=DEFAULT_DOMAINS):
+    """
+    Găsește contoarele RAPL sub `root` (implicit config.POWERCAP_ROOT).
+
+    Args:
+        include (tuple): Prefixele numelor de domenii păstrate (None = toate).
+
+    Raises:
+        EnergyMeterError: Dacă nu există niciun contor utilizabil.
+    """
+    root = root or config.POWERCAP_ROOT
+    domains = []
+    for path in sorted(glob.glob(os.path.join(root, "intel-rapl:*"))):
+        if not os.path.isfile(os.path.join(path, "energy_uj")) or not os.path.isfile(os.path.join(path, "name")):
+            continue
+        domain = RaplDomain(path)
+        if include is None or domain.name.startswith(tuple(include)):
+            domains.append(domain)
+    if not domains:
+        raise EnergyMeterError(f"Nu s-au găsit contoare RAPL sub {root}")
+    return domains
+
+
+# ==============================================================================
+# == MĂSURARE
+# ==============================================================================
+
+class EnergyReading:
+    """Rezultatul unei măsurători: energia pe domeniu, durata și energia netă (fără repaus)."""
+
+    __slots__ = ("duration_s", "joules_by_domain", "idle_watts", "calls")
+
+    def __init__(self, duration_s, joules_by_domain, idle_watts=0.0, calls=1):
+        self.duration_s = duration_s
+        self.joules_by_domain = dict(joules_by_domain)
+        self.idle_watts = idle_watts
+        self.calls = calls
+
+    @property
+    def total_joules(self):
+        return sum(self.joules_by_domain.values())
+
+    @property
+    def idle_joules(self):
+        return self.idle_watts * self.duration_s
+
+    @property
+    def net_joules(self):
+        """Energia atribuibilă sarcinii (poate fi ușor negativă din cauza zgomotului)."""
+        return self.total_joules - self.idle_joules
+
+    @property
+    def net_joules_per_call(self):
+        return self.net_joules / max(self.calls, 1)
+
+    def as_dict(self):
+        return {"duration_s": self.duration_s, "calls": self.calls, "total_joules": self.total_joules,
+                "idle_joules": self.idle_joules, "net_joules": self.net_joules,
+                "net_joules_per_call": self.net_joules_per_call, **{f"joules[{k}]": v for k, v in self.joules_by_domain.items()}}
+
+    def __repr__(self):
+        return f"EnergyReading(net_joules={self.net_joules:.3f}, duration_s={self.duration_s:.3f})"
+
+
+def _materialize(args):
+    """Consumă argumentele generatoare (înlocuite cu un iterator peste o listă), ca generarea să nu fie măsurată."""
+    return tuple(iter(list(arg)) if inspect.isgenerator(arg) else arg for arg in args)
+
+
+class EnergyMeter:
+    """
+    Măsoară energia unei sarcini cu contoarele RAPL.
+
+    Args:
+        root (str): Rădăcina arborelui powercap (implicit config.POWERCAP_ROOT).
+        domains (list): Domeniile de măsurat (implicit `discover_domains(root)`).
+        sample_interval (float): Perioada citirilor în fundal; trebuie să fie mai mică
+            decât timpul în care un contor poate face o tură completă.
+        idle_watts (float): Puterea de repaus scăzută din măsurători (vezi `calibrate_idle`).
+    """
+
+    def __init__(self, root=None, domains=None, sample_interval=DEFAULT_SAMPLE_INTERVAL_S, idle_watts=0.0):
+        self.domains = list(domains) if domains is not None else discover_domains(root)
+        self.sample_interval = sample_interval
+        self.idle_watts = idle_watts
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._last = None
+        self._accumulated = None
+        self._started = None
+        self._error = None
+
+    # --- Eșantionare ---
+    def _sample(self):
+        with self._lock:
+            for i, domain in enumerate(self.domains):
+                current = domain.read_uj()
+                self._accumulated[i] += domain.delta_uj(self._last[i], current)
+                self._last[i] = current
+
+    def _run(self):
+        try:
+            while not self._stop.wait(self.sample_interval):
+                self._sample()
+        except Exception as e:  # reapare în stop(), pe firul apelantului
+            self._error = e
+
+    def start(self):
+        if self._thread is not None:
+            raise RuntimeError("Măsurătoarea este deja pornită")
+        self._last = [d.read_uj() for d in self.domains]
+        self._accumulated = [0] * len(self.domains)
+        self._error = None
+        self._stop.clear()
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="energy-meter", daemon=True)
+        self._thread.start()
+
+    def stop(self, calls=1):
+        """Oprește măsurătoarea și returnează un `EnergyReading`."""
+        if self._thread is None:
+            raise RuntimeError("Măsurătoarea nu a fost pornită")
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        if self._error is not None:
+            raise EnergyMeterError(f"Citirea contoarelor RAPL a eșuat: {self._error}") from self._error
+        self._sample()
+        duration = time.perf_counter() - self._started
+        joules = {d.name: uj / 1e6 for d, uj in zip(self.domains, self._accumulated)}
+        return EnergyReading(duration, joules, self.idle_watts, calls)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        if self._thread is not None:
+            self.reading = self.stop()
+        return False
+
+    # --- Utilitare ---
+    def calibrate_idle(self, duration=2.0):
+        """Măsoară puterea de repaus (W) pe `duration` secunde și o reține pentru măsurătorile următoare."""
+        self.idle_watts = 0.0
+        self.start()
+        time.sleep(duration)
+        reading = self.stop()
+        self.idle_watts = reading.total_joules / reading.duration_s
+        return self.idle_watts
+
+    def measure(self, workload, min_duration=0.0, make_args=None):
+        """
+        Rulează `workload()` cel puțin o dată și până la `min_duration` secunde,
+        pentru ca sarcinile scurte să depășească rezoluția contoarelor.
+
+        Cu `make_args`, fiecare rulare este `workload(*make_args())`, iar argumentele
+        sunt construite înainte de pornirea măsurătorii (un set per rulare), ca
+        energia pregătirii datelor să nu fie atribuită sarcinii; argumentele care
+        sunt generatoare (date produse leneș) sunt consumate tot atunci, într-o
+        listă, iar sarcina primește un iterator peste ea. Numărul de rulări
+        rezultă dintr-o rulare de încălzire nemăsurată și este plafonat la
+        MAX_PREPARED_CALLS (durata poate rămâne atunci sub `min_duration`).
+
+        Returns:
+            EnergyReading: Cu `calls` = numărul de rulări (vezi `net_joules_per_call`).
+        """
+        if make_args is not None:
+            args = make_args()
+            warmup_start = time.perf_counter()
+            workload(*args)
+            elapsed = time.perf_counter() - warmup_start
+            calls = MAX_PREPARED_CALLS if elapsed <= 0 else max(1, min(math.ceil(min_duration / elapsed), MAX_PREPARED_CALLS))
+            prepared = [_materialize(make_args()) for _ in range(calls)]
+            self.start()
+            try:
+                for args in prepared:
+                    workload(*args)
+            finally:
+                reading = self.stop(calls)
+            return reading
+
+        calls = 0
+        self.start()
+        try:
+            deadline = time.perf_counter() + min_duration
+            while True:
+                workload()
+                calls += 1
+                if time.perf_counter() >= deadline:
+                    break
+        finally:
+            reading = self.stop(calls)
+        return reading
+
+
+# ==============================================================================
+# == COMPARAȚIE CU ESTIMAREA MODELELOR
+# ==============================================================================
+
+def compare_with_estimate(reading, cpu_operations, data_movement, kwh_cpu, kwh_data, gco2_factor):
+    """
+    Pune alături energia măsurată (per rulare) și estimarea `utils.calculate_energy_co2`.
+
+    Returns:
+        dict: Jouli și kWh măsurați/estimați, raportul măsurat/estimat și CO2 pentru ambele.
+    """
+    estimated_kwh, estimated_co2 = utils.calculate_energy_co2(cpu_operations, data_movement, kwh_cpu, kwh_data, gco2_factor)
+    measured_kwh = reading.net_joules_per_call / JOULES_PER_KWH
+    return {
+        "measured_joules": reading.net_joules_per_call,
+        "estimated_joules": estimated_kwh * JOULES_PER_KWH,
+        "measured_kwh": measured_kwh,
+        "estimated_kwh": estimated_kwh,
+        "measured_to_estimated": measured_kwh / estimated_kwh if estimated_kwh > 0 else float("nan"),
+        "measured_co2_g": measured_kwh * gco2_factor,
+        "estimated_co2_g": estimated_co2,
+    }
+
+
+def measure_scenario_energy(scenario, params, meter, kwh_cpu, kwh_data, gco2_factor, min_duration=1.0, seed=0):
+    """
+    Măsoară energia implementărilor reale ale unui scenariu (vezi measurement.py)
+    și o compară cu estimarea modelelor, pe aceiași parametri.
+
+    Returns:
+        pd.DataFrame: Un rând per model.
+    """
+    import pandas as pd
+    import measurement
+    scenario = api_handler.resolve_scenario(scenario)
+    effective = measurement.measured_params(scenario, params)
+    setup, strategies = measurement.SCENARIO_STRATEGIES[scenario]
+    make_args = setup(effective, seed)
+    modeled = api_handler.scenario_costs(scenario, effective)
+    rows = []
+    for i, fn in enumerate(strategies):
+        reading = meter.measure(fn, min_duration=min_duration, make_args=make_args)
+        comparison = compare_with_estimate(reading, float(modeled["cpu_operations"][i]), float(modeled["data_movement_units"][i]),
+                                           kwh_cpu, kwh_data, gco2_factor)
+        rows.append({"name": modeled.model_names[i], "calls": reading.calls, "duration_s": reading.duration_s, **comparison})
+    return pd.DataFrame(rows)
+
+
+# ==============================================================================
+# == INTERFAȚĂ LINIE DE COMANDĂ
+# ==============================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Măsoară energia reală a strategiilor unui scenariu cu contoarele RAPL.")
+    parser.add_argument("--scenario", required=True, help="Numărul (1-3) sau numele scenariului.")
+    parser.add_argument("--root", default=None, help="Rădăcina powercap (implicit config.POWERCAP_ROOT).")
+    parser.add_argument("--idle", type=float, default=2.0, help="Secunde pentru măsurarea consumului de repaus (0 = fără).")
+    parser.add_argument("--min-duration", type=float, default=1.0, help="Durata minimă a fiecărei măsurători (s).")
+    parser.add_argument("--hardware", default=config.DEFAULT_HARDWARE_PROFILE_NAME, help="Profilul hardware pentru estimare.")
+    parser.add_argument("--gco2", type=float, default=config.GCO2EQ_PER_KWH_DEFAULT, help="Factorul gCO2eq/kWh.")
+    args = parser.parse_args(argv)
+
+    meter = EnergyMeter(root=args.root)
+    print(f"Domenii RAPL: {', '.join(d.name for d in meter.domains)}")
+    if args.idle > 0:
+        print(f"Putere de repaus: {meter.calibrate_idle(args.idle):.2f} W")
+    profile = config.HARDWARE_PROFILES[args.hardware]
+    df = measure_scenario_energy(args.scenario, config.DEFAULT_INPUT_VALUES, meter, profile["kwh_per_cpu_op"],
+                                 profile["kwh_per_data_move"], args.gco2, min_duration=args.min_duration)
+    print(df.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+# history_store.py
+
+"""
+Istoricul persistent al rulărilor salvate, într-o bază SQLite.
+
+Șirurile (scenariu, hardware, sursă CO2, model, numele parametrilor) sunt
+codificate printr-un dicționar (`strings`), iar rândurile de rezultate rețin
+doar codurile și valorile numerice. Tabelele au indexuri pe ID-ul rulării,
+scenariu și model. La citire, coloanele text devin `category` (tot dicționar)
+și valorile numerice sunt reduse la float32 / cel mai mic tip întreg, pentru
+ca memoria folosită de interfață să rămână mică.
+
+Interfața citește incremental: `fetch(since_rowid=...)` aduce doar rândurile
+adăugate de la ultima citire, iar graficele interoghează doar rulările selectate.
+Istoricul supraviețuiește repornirii aplicației. Fișierul este comun procesului,
+dar fiecare rulare are un proprietar (`owner`, ex: ID-ul de istoric al sesiunii din
+interfață): citirile, ștergerea și exportul primesc proprietarul și văd doar rulările
+lui; `owner=None` înseamnă tot istoricul (ex: instrumentele din linia de comandă).
+"""
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+import config
+
+# Coloanele afișate (aceleași etichete ca vechiul istoric din session_state)
+RUN_COLUMNS = ["ID Rulare", "Scenariu", "Hardware", "Sursă CO2", "Factor CO2"]
+METRIC_COLUMNS = {
+    "Op. CPU": "cpu_operations",
+    "Mișc. Date": "data_movement_units",
+    "Memorie (u)": "memory_usage_data_units",
+    "Energie (kWh)": "estimated_kwh",
+    "CO2 (g)": "estimated_co2_g",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS strings (
+    id INTEGER PRIMARY KEY,
+    value TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS runs (
+    run_pk INTEGER PRIMARY KEY,
+    run_id TEXT NOT NULL,
+    owner TEXT NOT NULL DEFAULT '',
+    created REAL NOT NULL,
+    scenario_id INTEGER NOT NULL REFERENCES strings(id),
+    hardware_id INTEGER NOT NULL REFERENCES strings(id),
+    co2_source_id INTEGER NOT NULL REFERENCES strings(id),
+    gco2_per_kwh REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS run_params (
+    run_pk INTEGER NOT NULL REFERENCES runs(run_pk) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name_id INTEGER NOT NULL REFERENCES strings(id),
+    value REAL,
+    PRIMARY KEY (run_pk, position)
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_pk INTEGER NOT NULL REFERENCES runs(run_pk) ON DELETE CASCADE,
+    model_id INTEGER NOT NULL REFERENCES strings(id),
+    cpu_operations REAL,
+    data_movement_units REAL,
+    memory_usage_data_units REAL,
+    estimated_kwh REAL,
+    estimated_co2_g REAL
+);
+-- Generația istoricului: crește la fiecare ștergere, pentru că SQLite refolosește
+-- rowid-urile după DELETE (fără ea, un istoric golit și reumplut ar avea aceeași versiune)
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO meta(key, value) VALUES ('generation', 0);
+CREATE INDEX IF NOT EXISTS idx_runs_run_id ON runs(run_id);
+CREATE INDEX IF NOT EXISTS idx_runs_scenario ON runs(scenario_id);
+CREATE INDEX IF NOT EXISTS idx_results_run ON results(run_pk);
+CREATE INDEX IF NOT EXISTS idx_results_model ON results(model_id);
+"""
+
+
+def _normalize(df):
+    """Ordinea coloanelor (rulare, parametri, model, metrici) și tipurile compacte: category pentru text, downcast pentru numere."""
+    params = [c for c in df.columns if c not in RUN_COLUMNS and c not in METRIC_COLUMNS and c not in ("_rowid", "Model")]
+    df = df[["_rowid"] + RUN_COLUMNS + params + ["Model"] + list(METRIC_COLUMNS)].copy()
+    for column in ("Scenariu", "Hardware", "Sursă CO2", "Model"):
+        df[column] = df[column].astype(str).astype("category")
+    for column in ["Factor CO2"] + params + list(METRIC_COLUMNS):
+        df[column] = _downcast(df[column])
+    df["_rowid"] = df["_rowid"].astype(np.int64)
+    return df
+
+
+def _downcast(series):
+    """Reduce o coloană numerică la cel mai mic tip potrivit (întreg dacă toate valorile sunt întregi, altfel float32)."""
+    values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    finite = values[np.isfinite(values)]
+    if len(finite) == len(values) and np.array_equal(finite, np.round(finite)):
+        return pd.to_numeric(series, downcast="integer")
+    return series.astype(np.float32)
+
+
+class HistoryStore:
+    """
+    Istoricul rulărilor într-un fișier SQLite (WAL), sigur pentru mai multe fire.
+
+    Args:
+        path (str): Fișierul bazei de date (implicit config.HISTORY_DB_PATH);
+            ":memory:" pentru un istoric temporar.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or config.HISTORY_DB_PATH
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        if self.path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.executescript(_SCHEMA)
+        # Bazele create înainte de coloana `owner`: rulările vechi rămân fără proprietar ('')
+        if "owner" not in [row[1] for row in self._conn.execute("PRAGMA table_info(runs)")]:
+            self._conn.execute("ALTER TABLE runs ADD COLUMN owner TEXT NOT NULL DEFAULT ''")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_runs_owner ON runs(owner)")
+        self._conn.commit()
+        self._string_ids = {}
+
+    # --- Dicționarul de șiruri ---
+    def _string_id(self, value):
+        value = str(value)
+        cached = self._string_ids.get(value)
+        if cached is not None:
+            return cached
+        self._conn.execute("INSERT OR IGNORE INTO strings(value) VALUES (?)", (value,))
+        string_id = self._conn.execute("SELECT id FROM strings WHERE value = ?", (value,)).fetchone()[0]
+        self._string_ids[value] = string_id
+        return string_id
+
+    # --- Scriere ---
+    def append_run(self, run_id, scenario, hardware, co2_source, gco2_per_kwh, params, results, owner=None):
+        """
+        Salvează o rulare: informațiile comune, parametrii (etichetă -> valoare, în ordinea
+        afișării) și un rând per model din `results` (results.ResultTable), pentru
+        proprietarul `owner` (implicit niciunul).
+
+        Returns:
+            int: Cheia internă a rulării.
+        """
+        rows = [(r.name, r.cpu_operations, r.data_movement_units, r.memory_usage_data_units, r.estimated_kwh, r.estimated_co2_g)
+                for r in results.records()]
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO runs(run_id, owner, created, scenario_id, hardware_id, co2_source_id, gco2_per_kwh) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (run_id, owner or "", time.time(), self._string_id(scenario), self._string_id(hardware), self._string_id(co2_source), float(gco2_per_kwh)))
+            run_pk = cursor.lastrowid
+            self._conn.executemany("INSERT INTO run_params(run_pk, position, name_id, value) VALUES (?, ?, ?, ?)",
+                                   [(run_pk, i, self._string_id(name), float(value)) for i, (name, value) in enumerate(params.items())])
+            self._conn.executemany("INSERT INTO results(run_pk, model_id, cpu_operations, data_movement_units, memory_usage_data_units, estimated_kwh, estimated_co2_g) "
+                                   "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                   [(run_pk, self._string_id(name), *map(float, values)) for name, *values in rows])
+        return run_pk
+
+    def clear(self, owner=None):
+        """Șterge rulările proprietarului `owner` sau, cu None, tot istoricul (dicționarul de șiruri se păstrează)."""
+        with self._lock, self._conn:
+            if owner is None:
+                self._conn.execute("DELETE FROM run_params")
+                self._conn.execute("DELETE FROM results")
+                self._conn.execute("DELETE FROM runs")
+            else:
+                owned = "SELECT run_pk FROM runs WHERE owner = ?"
+                self._conn.execute(f"DELETE FROM run_params WHERE run_pk IN ({owned})", (owner,))
+                self._conn.execute(f"DELETE FROM results WHERE run_pk IN ({owned})", (owner,))
+                self._conn.execute("DELETE FROM runs WHERE owner = ?", (owner,))
+            self._conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'generation'")
+
+    # --- Citire ---
+    def generation(self):
+        """Numărul de ștergeri ale istoricului (rowid-urile pot fi refolosite după o ștergere)."""
+        with self._lock:
+            return self._generation()
+
+    def _generation(self):
+        return self._conn.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()[0]
+
+    @staticmethod
+    def _owner_filter(owner, column="u.owner"):
+        return ("1 = 1", []) if owner is None else (f"{column} = ?", [owner])
+
+    def last_rowid(self, owner=None):
+        """Identificatorul ultimului rând de rezultate al proprietarului (0 dacă nu are niciunul)."""
+        condition, args = self._owner_filter(owner)
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(MAX(r.rowid), 0) FROM results r JOIN runs u ON u.run_pk = r.run_pk "
+                                      f"WHERE {condition}", args).fetchone()[0]
+
+    def version(self, owner=None):
+        """Un jeton care se schimbă la fiecare adăugare sau ștergere (pentru chei de cache)."""
+        condition, args = self._owner_filter(owner)
+        with self._lock:
+            last, count = self._conn.execute("SELECT COALESCE(MAX(r.rowid), 0), COUNT(*) FROM results r JOIN runs u ON u.run_pk = r.run_pk "
+                                             f"WHERE {condition}", args).fetchone()
+            generation = self._generation()
+        return f"{generation}:{last}:{count}"
+
+    def run_ids(self, owner=None):
+        """ID-urile rulărilor proprietarului, în ordinea salvării."""
+        condition, args = self._owner_filter(owner, "owner")
+        with self._lock:
+            return [row[0] for row in self._conn.execute(f"SELECT run_id FROM runs WHERE {condition} ORDER BY run_pk", args)]
+
+    def fetch(self, since_rowid=0, run_ids=None, limit=None, owner=None):
+        """
+        Citește istoricul ca DataFrame (aceleași coloane ca vechiul istoric), cu
+        o coloană suplimentară `_rowid` pentru citirile incrementale.
+
+        Args:
+            since_rowid (int): Doar rândurile adăugate după acest identificator.
+            run_ids (list): Doar rulările cu aceste ID-uri.
+            limit (int): Doar ultimele `limit` rânduri.
+            owner (str): Doar rulările acestui proprietar (None: toate).
+        """
+        where, args = ["r.rowid > ?"], [int(since_rowid)]
+        if owner is not None:
+            where.append("u.owner = ?")
+            args.append(owner)
+        if run_ids is not None:
+            if not run_ids:
+                return self._frame([], {})
+            where.append(f"u.run_id IN ({', '.join('?' * len(run_ids))})")
+            args.extend(run_ids)
+        query = (
+            "SELECT r.rowid, r.run_pk, u.run_id, s.value, h.value, c.value, u.gco2_per_kwh, m.value, "
+            "r.cpu_operations, r.data_movement_units, r.memory_usage_data_units, r.estimated_kwh, r.estimated_co2_g "
+            "FROM results r JOIN runs u ON u.run_pk = r.run_pk "
+            "JOIN strings s ON s.id = u.scenario_id JOIN strings h ON h.id = u.hardware_id "
+            "JOIN strings c ON c.id = u.co2_source_id JOIN strings m ON m.id = r.model_id "
+            f"WHERE {' AND '.join(where)}"
+        )
+        if limit is not None:
+            query += " ORDER BY r.rowid DESC LIMIT ?"
+            args.append(int(limit))
+        else:
+            query += " ORDER BY r.rowid"
+        with self._lock:
+            rows = self._conn.execute(query, args).fetchall()
+            if limit is not None:
+                rows.reverse()
+            run_pks = sorted({row[1] for row in rows})
+            params = {}
+            for start in range(0, len(run_pks), 500):
+                chunk = run_pks[start:start + 500]
+                for run_pk, name, value in self._conn.execute(
+                        f"SELECT p.run_pk, s.value, p.value FROM run_params p JOIN strings s ON s.id = p.name_id "
+                        f"WHERE p.run_pk IN ({', '.join('?' * len(chunk))}) ORDER BY p.run_pk, p.position", chunk):
+                    params.setdefault(run_pk, {})[name] = value
+        return self._frame(rows, params)
+
+    @staticmethod
+    def _frame(rows, params):
+        df = pd.DataFrame(rows, columns=["_rowid", "_run_pk"] + RUN_COLUMNS + ["Model"] + list(METRIC_COLUMNS))
+        for name in dict.fromkeys(name for values in params.values() for name in values):
+            df[name] = df["_run_pk"].map(lambda pk, name=name: params.get(pk, {}).get(name, np.nan))
+        return _normalize(df.drop(columns="_run_pk"))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_default_store():
+    """Istoricul partajat de proces (config.HISTORY_DB_PATH)."""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = HistoryStore()
+        return _default_store
+
+
+def refresh_view(view, store, max_rows=None, owner=None):
+    """
+    Actualizează incremental o fereastră de istoric păstrată în sesiune.
+
+    Args:
+        view (dict): {"generation": generația istoricului, "rowid": ultimul rând citit,
+            "frame": DataFrame} sau {} la prima apelare.
+        max_rows (int): Rândurile păstrate în fereastră (implicit config.HISTORY_DISPLAY_ROWS).
+        owner (str): Proprietarul rulărilor afișate (None: toate).
+
+    Returns:
+        dict: Fereastra actualizată (doar rândurile noi sunt citite din bază).
+    """
+    max_rows = max_rows or config.HISTORY_DISPLAY_ROWS
+    generation = store.generation()
+    last = store.last_rowid(owner)
+    if not view or view.get("generation") != generation or last < view["rowid"]:
+        # Prima citire sau istoricul a fost golit între timp (eventual de altă sesiune)
+        frame = store.fetch(limit=max_rows, owner=owner)
+    elif last > view["rowid"]:
+        new_rows = store.fetch(since_rowid=view["rowid"], owner=owner)
+        frame = _normalize(pd.concat([view["frame"], new_rows], ignore_index=True).tail(max_rows)) if len(view["frame"]) else new_rows.tail(max_rows)
+    else:
+        return view
+    return {"generation": generation, "rowid": int(frame["_rowid"].iloc[-1]) if len(frame) else last, "frame": frame}
@@ -0,0 +1,343 @@
+# http_service.py
+
+"""
+Serviciu HTTP JSON local (tornado) care expune modelele din api_handler.
+
+Endpoint-uri:
+    GET  /models              - scenariile și modelele disponibile, cheile de intrare,
+                                profilurile hardware și zonele CO2
+    POST /evaluate/<țintă>    - evaluează un scenariu (1-3 sau nume) ori un singur model
+                                (ex: efficient_sort) pe parametri scalari sau array-uri
+    GET  /stats               - numărul de cereri, loturile formate și latența (p50/p95/p99)
+
+Corpul unei cereri /evaluate:
+    {"params": {"s1_N": [1000, 2000, 5000], "s1_avg_rec_size": 100},
+     "hardware_profile": "Laptop Modern Eficient",   (opțional, scalar sau listă)
+     "co2_zone": "Franța (Nuclear)"                   (opțional, scalar sau listă)
+     "gco2_per_kwh": 120}                             (opțional, are prioritate față de co2_zone)
+Parametrii lipsă primesc valorile din config.DEFAULT_INPUT_VALUES.
+
+Cererile concurente pentru aceeași țintă sunt grupate de un `MicroBatcher`
+(o fereastră scurtă de așteptare) și evaluate într-un singur apel vectorizat,
+apoi rezultatul este împărțit înapoi pe cereri.
+
+Pornire:
+    python http_service.py --port 8765
+"""
+import argparse
+import asyncio
+import json
+import time
+from collections import deque
+
+import numpy as np
+import tornado.web
+
+import api_handler
+import config
+import shared_cache
+from results import ResultTable
+from sweep import co2_zone_factors
+
+# Fereastra de grupare a cererilor concurente și dimensiunea maximă a unui lot
+DEFAULT_MAX_DELAY_MS = 2.0
+DEFAULT_MAX_BATCH_ROWS = 1_000_000
+# Numărul de latențe recente păstrate pentru percentile
+LATENCY_WINDOW = 10_000
+
+
+# ==============================================================================
+# == ȚINTE DE EVALUARE (SCENARII ȘI MODELE)
+# ==============================================================================
+
+class Target:
+    """O țintă evaluabilă: un scenariu complet sau un singur model (listă de (funcție *_costs, chei))."""
+
+    def __init__(self, target_id, label, models):
+        self.target_id = target_id
+        self.label = label
+        self.models = list(models)
+        self.input_keys = list(dict.fromkeys(k for _, keys in self.models for k in keys))
+
+    def costs(self, params):
+        """Costurile abstracte pentru parametrii dați (array-uri 1-D de aceeași lungime)."""
+        return ResultTable.concat(model(*(params[k] for k in keys)) for model, keys in self.models)
+
+    def describe(self):
+        names = [model(*(config.DEFAULT_INPUT_VALUES[k] for k in keys)).model_names[0] for model, keys in self.models]
+        return {"id": self.target_id, "label": self.label, "models": names, "input_keys": self.input_keys,
+                "defaults": {k: config.DEFAULT_INPUT_VALUES[k] for k in self.input_keys}}
+
+
+def _model_id(model):
+    return model.__name__.removeprefix("model_").removesuffix("_costs")
+
+
+def build_targets():
+    """Ținte indexate după id: scenariile ('1', '2', '3') și modelele individuale (ex: 'standard_sort')."""
+    targets = {}
+    for i, (scenario, models) in enumerate(api_handler.SCENARIO_MODELS.items(), start=1):
+        targets[str(i)] = Target(str(i), scenario, models)
+        for model, keys in models:
+            targets[_model_id(model)] = Target(_model_id(model), scenario, [(model, keys)])
+    return targets
+
+
+def _lookup(names, table, what):
+    """Transformă un nume (sau o listă de nume) în valorile din `table`."""
+    names = np.atleast_1d(np.asarray(names, dtype=object))
+    try:
+        unknown = sorted({str(n) for n in names if n not in table})
+    except TypeError:  # elemente nehashable (ex: liste imbricate)
+        raise ValueError(f"Valoare invalidă pentru {what}: se așteaptă un nume sau o listă de nume") from None
+    if unknown:
+        raise ValueError(f"Valori necunoscute pentru {what}: {unknown}")
+    return np.array([table[n] for n in names], dtype=np.float64)
+
+
+def _as_float_array(value, what):
+    """Convertește un scalar sau o listă JSON în array float64; altfel ValueError (răspuns 400)."""
+    try:
+        return np.asarray(value, dtype=np.float64)
+    except (TypeError, ValueError):
+        raise ValueError(f"Valoare nenumerică pentru '{what}'") from None
+
+
+def prepare_request(target, body):
+    """
+    Validează corpul unei cereri /evaluate și îl transformă în array-uri 1-D de aceeași lungime.
+
+    Returns:
+        dict: Cheie de intrare -> array, plus "kwh_cpu", "kwh_data", "gco2".
+    """
+    if not isinstance(body, dict):
+        raise ValueError("Corpul cererii trebuie să fie un obiect JSON")
+    params = body.get("params") or {}
+    if not isinstance(params, dict):
+        raise ValueError("'params' trebuie să fie un obiect JSON (cheie de intrare -> valoare)")
+    unknown = sorted(set(params) - set(target.input_keys))
+    if unknown:
+        raise ValueError(f"Parametri necunoscuți pentru '{target.target_id}': {unknown}. Opțiuni: {target.input_keys}")
+    values = [_as_float_array(params.get(k, config.DEFAULT_INPUT_VALUES[k]), k) for k in target.input_keys]
+
+    profile = body.get("hardware_profile", config.DEFAULT_HARDWARE_PROFILE_NAME)
+    kwh_cpu = _lookup(profile, {n: p["kwh_per_cpu_op"] for n, p in config.HARDWARE_PROFILES.items()}, "profilul hardware")
+    kwh_data = _lookup(profile, {n: p["kwh_per_data_move"] for n, p in config.HARDWARE_PROFILES.items()}, "profilul hardware")
+    if body.get("gco2_per_kwh") is not None:
+        gco2 = np.atleast_1d(_as_float_array(body["gco2_per_kwh"], "gco2_per_kwh"))
+    else:
+        gco2 = _lookup(body.get("co2_zone", config.ZONE_MEDIA_UE), co2_zone_factors(), "zona CO2")
+
+    arrays = [np.atleast_1d(a) for a in values + [kwh_cpu, kwh_data, gco2]]
+    if any(a.ndim != 1 for a in arrays):
+        raise ValueError("Valorile trebuie să fie scalari sau liste (1-D)")
+    try:
+        arrays = [np.ascontiguousarray(a) for a in np.broadcast_arrays(*arrays)]
+    except ValueError:
+        raise ValueError("Listele de valori trebuie să aibă aceeași lungime (sau lungimea 1)") from None
+    return dict(zip(target.input_keys + ["kwh_cpu", "kwh_data", "gco2"], arrays))
+
+
+def evaluate_prepared(target, requests):
+    """
+    Evaluează mai multe cereri pregătite într-un singur apel vectorizat.
+
+    Returns:
+        list: Pentru fiecare cerere, un dicționar nume model -> coloană -> listă de valori.
+    """
+    sizes = [len(r["gco2"]) for r in requests]
+    merged = {k: np.concatenate([r[k] for r in requests]) if len(requests) > 1 else requests[0][k] for k in requests[0]}
+    costs = target.costs({k: merged[k] for k in target.input_keys})
+    table = api_handler.apply_energy_factors(costs, merged["kwh_cpu"], merged["kwh_data"], merged["gco2"])
+    m, total = len(table.model_names), sum(sizes)
+    columns = {col: values.reshape(m, total) for col, values in table.columns.items()}
+    bounds = np.cumsum([0] + sizes)
+    return [
+        {name: {col: values[j, a:b].tolist() for col, values in columns.items()} for j, name in enumerate(table.model_names)}
+        for a, b in zip(bounds[:-1], bounds[1:])
+    ]
+
+
+# ==============================================================================
+# == GRUPAREA CERERILOR (MICRO-BATCHING)
+# ==============================================================================
+
+class MicroBatcher:
+    """
+    Grupează cererile concurente pentru aceeași țintă.
+
+    Prima cerere dintr-o fereastră programează o evaluare după `max_delay_ms`;
+    cererile sosite între timp intră în același lot. Lotul pleacă imediat dacă
+    depășește `max_batch_rows` puncte. Evaluarea rulează într-un fir de execuție
+    separat, astfel încât bucla de evenimente rămâne liberă.
+    """
+
+    def __init__(self, target, stats, max_delay_ms=DEFAULT_MAX_DELAY_MS, max_batch_rows=DEFAULT_MAX_BATCH_ROWS):
+        self.target = target
+        self.stats = stats
+        self.max_delay = max_delay_ms / 1000.0
+        self.max_batch_rows = max_batch_rows
+        self._pending = []
+        self._pending_rows = 0
+        self._timer = None
+
+    def submit(self, prepared):
+        """Adaugă o cerere pregătită în lotul curent; returnează un future cu rezultatul ei."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((prepared, future))
+        self._pending_rows += len(prepared["gco2"])
+        if self._pending_rows >= self.max_batch_rows:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self._flush)
+        return future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending, self._pending_rows = self._pending, [], 0
+        if batch:
+            asyncio.ensure_future(self._run(batch))
+
+    async def _run(self, batch):
+        requests = [prepared for prepared, _ in batch]
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(None, evaluate_prepared, self.target, requests)
+        except Exception as e:  # o eroare neașteptată în model se transmite tuturor cererilor din lot
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        self.stats.record_batch(len(batch), sum(len(r["gco2"]) for r in requests))
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+
+class ServiceStats:
+    """Contoare și latențe recente ale serviciului."""
+
+    def __init__(self):
+        self.started = time.time()
+        self.requests = 0
+        self.errors = 0
+        self.batches = 0
+        self.batched_requests = 0
+        self.points = 0
+        self.latencies_ms = deque(maxlen=LATENCY_WINDOW)
+
+    def record_request(self, latency_ms, ok=True):
+        self.requests += 1
+        self.errors += 0 if ok else 1
+        self.latencies_ms.append(latency_ms)
+
+    def record_batch(self, n_requests, n_points):
+        self.batches += 1
+        self.batched_requests += n_requests
+        self.points += n_points
+
+    def snapshot(self):
+        latencies = np.fromiter(self.latencies_ms, dtype=np.float64)
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99]).tolist() if latencies.size else (None, None, None)
+        return {
+            "uptime_s": time.time() - self.started,
+            "requests": self.requests,
+            "errors": self.errors,
+            "batches": self.batches,
+            "avg_requests_per_batch": self.batched_requests / self.batches if self.batches else None,
+            "points_evaluated": self.points,
+            "latency_ms": {"p50": p50, "p95": p95, "p99": p99, "window": int(latencies.size)},
+        }
+
+
+# ==============================================================================
+# == HANDLER-E HTTP
+# ==============================================================================
+
+class _JSONHandler(tornado.web.RequestHandler):
+    def initialize(self, service):
+        self.service = service
+
+    def write_json(self, payload, status=200):
+        self.set_status(status)
+        self.set_header("Content-Type", "application/json; charset=utf-8")
+        self.finish(json.dumps(payload, ensure_ascii=False))
+
+
+class ModelsHandler(_JSONHandler):
+    def get(self):
+        self.write_json({
+            "targets": [t.describe() for t in self.service["targets"].values()],
+            "hardware_profiles": list(config.HARDWARE_PROFILES),
+            "co2_zones": co2_zone_factors(),
+        })
+
+
+class StatsHandler(_JSONHandler):
+    def get(self):
+        self.write_json(dict(self.service["stats"].snapshot(), cost_cache=api_handler.cost_cache_info(), caches=shared_cache.cache_info()))
+
+
+class EvaluateHandler(_JSONHandler):
+    async def post(self, target_id):
+        started = time.perf_counter()
+        stats = self.service["stats"]
+        target = self.service["targets"].get(target_id)
+        if target is None:
+            try:
+                scenario = api_handler.resolve_scenario(target_id)
+                target = next(t for t in self.service["targets"].values() if t.label == scenario and len(t.models) > 1)
+            except ValueError:
+                stats.record_request((time.perf_counter() - started) * 1000.0, ok=False)
+                return self.write_json({"error": f"Țintă necunoscută: {target_id!r}", "targets": list(self.service["targets"])}, 404)
+        try:
+            prepared = prepare_request(target, json.loads(self.request.body or b"{}"))
+        except ValueError as e:  # include json.JSONDecodeError
+            stats.record_request((time.perf_counter() - started) * 1000.0, ok=False)
+            return self.write_json({"error": str(e)}, 400)
+
+        results = await self.service["batchers"][target.target_id].submit(prepared)
+        latency_ms = (time.perf_counter() - started) * 1000.0
+        stats.record_request(latency_ms)
+        self.set_header("Server-Timing", f"total;dur={latency_ms:.3f}")
+        self.write_json({"target": target.target_id, "scenario": target.label, "n": len(prepared["gco2"]),
+                         "results": results, "latency_ms": latency_ms})
+
+
+def make_app(max_delay_ms=DEFAULT_MAX_DELAY_MS, max_batch_rows=DEFAULT_MAX_BATCH_ROWS):
+    """Construiește aplicația tornado (câte un MicroBatcher per țintă)."""
+    targets = build_targets()
+    stats = ServiceStats()
+    service = {
+        "targets": targets,
+        "stats": stats,
+        "batchers": {tid: MicroBatcher(t, stats, max_delay_ms, max_batch_rows) for tid, t in targets.items()},
+    }
+    return tornado.web.Application([
+        (r"/models", ModelsHandler, {"service": service}),
+        (r"/stats", StatsHandler, {"service": service}),
+        (r"/evaluate/([^/]+)", EvaluateHandler, {"service": service}),
+    ])
+
+
+async def serve(host, port, max_delay_ms, max_batch_rows):
+    app = make_app(max_delay_ms, max_batch_rows)
+    app.listen(port, address=host)
+    print(f"Serviciul ascultă pe http://{host}:{port} (fereastră de grupare {max_delay_ms} ms)")
+    await asyncio.Event().wait()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serviciu HTTP JSON pentru modelele simulatorului.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-delay-ms", type=float, default=DEFAULT_MAX_DELAY_MS, help="Fereastra de grupare a cererilor.")
+    parser.add_argument("--max-batch-rows", type=int, default=DEFAULT_MAX_BATCH_ROWS, help="Puncte maxime per lot.")
+    args = parser.parse_args(argv)
+    asyncio.run(serve(args.host, args.port, args.max_delay_ms, args.max_batch_rows))
+
+
+if __name__ == "__main__":
+    main()
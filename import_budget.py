@@ -0,0 +1,165 @@
+# import_budget.py
+
+"""
+Bugetul timpului de import pentru punctele de intrare ale simulatorului.
+
+Fiecare punct de intrare este importat într-un proces nou, cu
+`python -X importtime -c "import <modul>"`; raportul din stderr dă, pentru
+fiecare modul încărcat, timpul propriu și cel cumulat (cu dependențele).
+Verificarea are două părți:
+
+  - timpul total al importului (cel mai bun din `--repeat` rulări) trebuie să
+    rămână sub bugetul din IMPORT_BUDGETS_MS;
+  - dependențele grele (pandas, plotly, matplotlib, ...) nu trebuie încărcate
+    la import de punctele de intrare care nu au nevoie de ele (IMPORT_FORBIDDEN);
+    această parte nu depinde de viteza mașinii.
+
+Importul `app_streamlit` rulează scriptul în modul „bare” al Streamlit, adică
+exact prima afișare a paginii (înainte de orice simulare).
+
+Exemplu CLI:
+    python import_budget.py
+    python import_budget.py --module api_handler --top 20
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+# Bugetele (ms) sunt generoase față de măsurătorile pe un singur nucleu: prind regresiile
+# mari (o dependență grea importată din nou la nivel de modul), nu variațiile mici.
+IMPORT_BUDGETS_MS = {
+    "config": 30,
+    "utils": 250,
+    "api_handler": 350,
+    "sweep": 350,
+    "api_client": 500,
+    "http_service": 700,
+    "app_streamlit": 1000,
+}
+_HEADLESS_FORBIDDEN = ("pandas", "plotly", "matplotlib", "openpyxl", "pyarrow", "streamlit")
+IMPORT_FORBIDDEN = {
+    "config": _HEADLESS_FORBIDDEN + ("numpy",),
+    "utils": _HEADLESS_FORBIDDEN,
+    "api_handler": _HEADLESS_FORBIDDEN,
+    "sweep": _HEADLESS_FORBIDDEN,
+    "api_client": _HEADLESS_FORBIDDEN,
+    "http_service": _HEADLESS_FORBIDDEN,
+    # streamlit încarcă el însuși pachetul plotly, dar nu plotly.express
+    "app_streamlit": ("pandas", "plotly.express", "matplotlib", "openpyxl", "pyarrow", "api_handler", "api_client"),
+}
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+_LINE_PATTERN = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)\s*$")
+
+
+# ==============================================================================
+# == MĂSURARE
+# ==============================================================================
+
+def parse_importtime(text):
+    """
+    Interpretează raportul `-X importtime`.
+
+    Returns:
+        list: Câte un dict per modul încărcat, în ordinea din raport:
+            module, self_ms, cumulative_ms, depth (0 = importat direct de comanda măsurată).
+    """
+    entries = []
+    for line in text.splitlines():
+        match = _LINE_PATTERN.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            entries.append({"module": module, "self_ms": int(self_us) / 1000.0,
+                            "cumulative_ms": int(cumulative_us) / 1000.0, "depth": (len(indent) - 1) // 2})
+    return entries
+
+
+def measure_import(module, repeat=3, python=None):
+    """
+    Importă `module` într-un proces nou de `repeat` ori și păstrează rularea cea mai rapidă.
+
+    Returns:
+        dict: module, total_ms (timpul cumulat al modulului), entries (raportul rulării
+            păstrate, vezi `parse_importtime`).
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [REPO_DIR, os.environ.get("PYTHONPATH")])))
+    best = None
+    for _ in range(max(1, int(repeat))):
+        completed = subprocess.run([python or sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                                   cwd=REPO_DIR, env=env, capture_output=True, text=True)
+        if completed.returncode != 0:
+            raise RuntimeError(f"Importul modulului {module} a eșuat:\n{completed.stderr[-2000:]}")
+        entries = parse_importtime(completed.stderr)
+        total = next((e["cumulative_ms"] for e in entries if e["module"] == module and e["depth"] == 0), None)
+        if total is None:
+            raise RuntimeError(f"Raportul -X importtime nu conține modulul {module}.")
+        if best is None or total < best["total_ms"]:
+            best = {"module": module, "total_ms": total, "entries": entries}
+    return best
+
+
+def package_costs(entries, top=10):
+    """Timpul propriu însumat per pachet de nivel superior (ex: toate submodulele pandas), descrescător."""
+    totals = {}
+    for entry in entries:
+        package = entry["module"].split(".")[0]
+        totals[package] = totals.get(package, 0.0) + entry["self_ms"]
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)[:top]
+
+
+def _is_loaded(entries, name):
+    return any(e["module"] == name or e["module"].startswith(name + ".") for e in entries)
+
+
+def check_budget(measurement, budget_ms=None, forbidden=None):
+    """
+    Compară o măsurătoare (`measure_import`) cu bugetul de timp și lista de module interzise.
+
+    Returns:
+        list: Mesajele încălcărilor (goală dacă bugetul este respectat).
+    """
+    module = measurement["module"]
+    budget_ms = IMPORT_BUDGETS_MS.get(module) if budget_ms is None else budget_ms
+    forbidden = IMPORT_FORBIDDEN.get(module, ()) if forbidden is None else forbidden
+    violations = []
+    if budget_ms is not None and measurement["total_ms"] > budget_ms:
+        violations.append(f"{module}: importul durează {measurement['total_ms']:.0f} ms (buget {budget_ms} ms)")
+    for name in forbidden:
+        if _is_loaded(measurement["entries"], name):
+            violations.append(f"{module}: încarcă {name} la import")
+    return violations
+
+
+# ==============================================================================
+# == INTERFAȚĂ LINIE DE COMANDĂ
+# ==============================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Măsoară timpul de import al punctelor de intrare (-X importtime) și îl compară cu bugetul.")
+    parser.add_argument("--module", action="append", help="Punctele de intrare măsurate (implicit toate din IMPORT_BUDGETS_MS).")
+    parser.add_argument("--repeat", type=int, default=3, help="Rulările per modul (se păstrează cea mai rapidă).")
+    parser.add_argument("--top", type=int, default=8, help="Pachetele cele mai costisitoare afișate per modul.")
+    args = parser.parse_args(argv)
+
+    violations = []
+    for module in args.module or list(IMPORT_BUDGETS_MS):
+        measurement = measure_import(module, args.repeat)
+        budget = IMPORT_BUDGETS_MS.get(module)
+        found = check_budget(measurement)
+        status = "DEPĂȘIT" if found else "OK"
+        print(f"{module}: {measurement['total_ms']:.1f} ms (buget {budget if budget is not None else '-'} ms) [{status}]")
+        for package, cost in package_costs(measurement["entries"], args.top):
+            print(f"    {package:<24} {cost:8.1f} ms")
+        violations.extend(found)
+
+    if violations:
+        print("\nÎncălcări ale bugetului de import:")
+        for message in violations:
+            print(f"  - {message}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,274 @@
+# index_sort.py
+
+"""
+Motor real de sortare prin index pentru Scenariul 1 (`model_sort_index`).
+
+Înregistrările sunt tablouri NumPy structurate cu o cheie uint64 și un payload
+opac (`V<lățime-8>`), în memorie sau într-un fișier mapat (np.memmap), deci
+lățimea unei înregistrări poate fi aleasă liber (de la 10 B la 10 KB și peste).
+Sunt comparate trei strategii:
+
+  - `full_record_sort`: sortarea pe loc a înregistrărilor complete (np.sort pe
+    câmpul cheie); fiecare interschimbare mută înregistrări întregi.
+  - `argsort_gather`: sortarea perechilor (cheie, index) cu argsort, apoi o
+    singură citire a înregistrărilor în ordine (np.take) într-un tablou nou.
+  - `cycle_permute`: același argsort, apoi aplicarea permutării pe loc, ciclu
+    cu ciclu, cu o singură înregistrare temporară (fără a dubla memoria).
+
+Octeții mutați sunt raportați în două coloane. `bytes_moved` numără mutările
+reale de înregistrări: exact N pentru argsort_gather și numărul contorizat de
+cycle_permute (np.sort nu expune interschimbările, deci pentru full_record_sort
+valoarea lipsește). `estimated_bytes_moved` este partea estimată după convenția
+din api_handler (N*log2(N)/2 interschimbări înmulțite cu dimensiunea elementelor
+mutate): înregistrările întregi la full_record_sort, perechile (cheie, index) la
+celelalte două.
+
+Exemplu CLI:
+    python index_sort.py --widths 10,100,1000,10000 --n 200000
+    python index_sort.py --widths 4096 --memmap-dir /tmp/records
+"""
+import argparse
+import math
+import os
+import shutil
+import time
+
+import numpy as np
+import pandas as pd
+
+import api_handler
+import config
+
+KEY_BYTES = 8
+# Perechea (cheie, index) sortată de argsort: cheia uint64 și un index int64
+KEY_INDEX_BYTES = 16
+MIN_RECORD_WIDTH = KEY_BYTES + 1
+DEFAULT_WIDTHS = (10, 100, 1_000, 10_000)
+# Plafonul datelor generate per lățime (N este redus pentru înregistrările late)
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+STRATEGIES = ("full_record_sort", "argsort_gather", "cycle_permute")
+
+
+# ==============================================================================
+# == ÎNREGISTRĂRI
+# ==============================================================================
+
+def record_dtype(width):
+    """Tipul unei înregistrări de `width` octeți: cheie uint64 + payload opac."""
+    width = int(width)
+    if width < MIN_RECORD_WIDTH:
+        raise ValueError(f"Lățimea minimă a unei înregistrări este {MIN_RECORD_WIDTH} octeți (cheie de {KEY_BYTES} octeți + payload).")
+    return np.dtype([("key", "<u8"), ("payload", f"V{width - KEY_BYTES}")])
+
+
+def make_records(n, width, seed=0, path=None, chunk_records=65_536):
+    """
+    Generează `n` înregistrări cu chei aleatoare, în memorie sau (cu `path`)
+    într-un fișier de înregistrări mapat în memorie, scris în bucăți.
+    Payload-ul este completat cu un model fix; conținutul lui nu influențează sortarea.
+    """
+    dtype = record_dtype(width)
+    rng = np.random.default_rng(seed)
+    records = np.memmap(path, dtype=dtype, mode="w+", shape=(n,)) if path else np.empty(n, dtype=dtype)
+    raw = records.view(np.uint8).reshape(n, dtype.itemsize)
+    for start in range(0, n, chunk_records):
+        end = min(n, start + chunk_records)
+        raw[start:end, KEY_BYTES:] = np.arange(dtype.itemsize - KEY_BYTES, dtype=np.uint8)
+        records["key"][start:end] = rng.integers(0, 2**63, size=end - start, dtype=np.uint64)
+    if path:
+        records.flush()
+    return records
+
+
+def open_records(path, width, mode="r+"):
+    """Deschide un fișier de înregistrări de `width` octeți ca np.memmap."""
+    return np.memmap(path, dtype=record_dtype(width), mode=mode)
+
+
+def is_sorted(records):
+    keys = records["key"]
+    return bool(np.all(keys[1:] >= keys[:-1]))
+
+
+# ==============================================================================
+# == STRATEGII
+# ==============================================================================
+# Fiecare strategie primește înregistrările și returnează (înregistrările sortate, contoarele).
+
+def _estimated_swaps(n):
+    return n * math.log2(n) / 2.0 if n > 1 else 0.0
+
+
+def full_record_sort(records, out_path=None):
+    """Sortare pe loc a înregistrărilor complete (referința: se mută înregistrări întregi)."""
+    n, width = len(records), records.dtype.itemsize
+    records.sort(order="key", kind="quicksort")
+    return records, {"bytes_moved": float("nan"), "estimated_bytes_moved": _estimated_swaps(n) * width * 2.0,
+                     "extra_memory_bytes": 0.0}
+
+
+def argsort_gather(records, out_path=None):
+    """argsort pe chei, apoi o singură citire a înregistrărilor în ordinea sortată, într-un tablou nou."""
+    n, width = len(records), records.dtype.itemsize
+    order = np.argsort(records["key"], kind="stable")
+    out = np.memmap(out_path, dtype=records.dtype, mode="w+", shape=(n,)) if out_path else np.empty_like(records)
+    np.take(records, order, out=out)
+    return out, {"bytes_moved": float(n * width), "estimated_bytes_moved": _estimated_swaps(n) * KEY_INDEX_BYTES * 2.0,
+                 "extra_memory_bytes": float(order.nbytes + n * width)}
+
+
+def apply_permutation_in_place(records, order):
+    """
+    Rearanjează `records` pe loc astfel încât records[i] devine vechiul records[order[i]],
+    urmând ciclurile permutării, cu o singură înregistrare temporară per ciclu.
+
+    Returns:
+        tuple: (numărul de înregistrări mutate, numărul de cicluri netriviale).
+    """
+    raw = records.view(np.uint8).reshape(len(records), records.dtype.itemsize)
+    pending = order.tolist()
+    moved = cycles = 0
+    for start in range(len(pending)):
+        if pending[start] == start:
+            continue
+        cycles += 1
+        temp = raw[start].copy()
+        j = start
+        while True:
+            k = pending[j]
+            pending[j] = j
+            if k == start:
+                raw[j] = temp
+                break
+            raw[j] = raw[k]
+            j = k
+            moved += 1
+        moved += 2  # intrarea în temporar și ieșirea din el
+    return moved, cycles
+
+
+def cycle_permute(records, out_path=None):
+    """argsort pe chei, apoi aplicarea permutării pe loc (memorie suplimentară: doar indecșii)."""
+    n, width = len(records), records.dtype.itemsize
+    order = np.argsort(records["key"], kind="stable")
+    moved, cycles = apply_permutation_in_place(records, order)
+    return records, {"bytes_moved": float(moved * width), "estimated_bytes_moved": _estimated_swaps(n) * KEY_INDEX_BYTES * 2.0,
+                     "extra_memory_bytes": float(order.nbytes + width), "cycles": cycles}
+
+
+_STRATEGY_FUNCTIONS = {"full_record_sort": full_record_sort, "argsort_gather": argsort_gather, "cycle_permute": cycle_permute}
+
+
+def sort_records(records, in_place=False):
+    """
+    Sortează înregistrările după cheie pe calea rapidă: argsort + citire într-un tablou
+    nou sau, cu `in_place=True` (ex: fișiere mapate mari), permutare pe loc.
+    """
+    strategy = cycle_permute if in_place else argsort_gather
+    return strategy(records)[0]
+
+
+# ==============================================================================
+# == MĂSURARE
+# ==============================================================================
+
+def measure_strategy(strategy, source, work_path=None):
+    """
+    Rulează o strategie pe o copie a înregistrărilor `source` (copierea nu este cronometrată).
+
+    Args:
+        work_path (str): Pentru înregistrări mapate: copia de lucru pe disc (ieșirea
+            lui argsort_gather se scrie alături, în `work_path + ".sorted"`).
+    """
+    if work_path:
+        source.flush()
+        shutil.copyfile(source.filename, work_path)
+        records = open_records(work_path, source.dtype.itemsize)
+        out_path = work_path + ".sorted"
+    else:
+        records, out_path = source.copy(), None
+    n, width = len(records), records.dtype.itemsize
+    started = time.perf_counter()
+    result, counters = _STRATEGY_FUNCTIONS[strategy](records, out_path)
+    if isinstance(result, np.memmap):
+        result.flush()
+    seconds = time.perf_counter() - started
+    row = {"strategy": strategy, "n": n, "width": width, "seconds": seconds,
+           "elements_per_s": n / seconds if seconds > 0 else float("inf"), "sorted": is_sorted(result), **counters}
+    del records, result
+    if work_path:
+        for path in (work_path, out_path):
+            if os.path.exists(path):
+                os.remove(path)
+    return row
+
+
+def _model_data_movement(n, width):
+    """Mișcarea datelor estimată de modelele Scenariului 1: (sortare eficientă, sortare prin index)."""
+    costs = api_handler.scenario_costs(config.SCENARIU_SORTARE, {"s1_N": n, "s1_avg_rec_size": width, "s1_key_idx_size": KEY_INDEX_BYTES})
+    movement = costs["data_movement_units"]
+    return float(movement[1]), float(movement[2])
+
+
+def benchmark(widths=DEFAULT_WIDTHS, n=200_000, max_bytes=DEFAULT_MAX_BYTES, strategies=STRATEGIES, memmap_dir=None, seed=0):
+    """
+    Compară strategiile pentru fiecare lățime de înregistrare.
+
+    Args:
+        n (int): Numărul de înregistrări (redus la `max_bytes // lățime` pentru înregistrările late).
+        memmap_dir (str): Dacă e dat, înregistrările stau în fișiere mapate în acest director.
+
+    Returns:
+        pd.DataFrame: Un rând per (lățime, strategie): seconds, elements_per_s, bytes_moved
+            (numărați), estimated_bytes_moved, extra_memory_bytes, model_bytes_moved și
+            raportul față de sortarea completă.
+    """
+    rows = []
+    for width in widths:
+        count = max(2, min(int(n), int(max_bytes) // int(width)))
+        source_path = os.path.join(memmap_dir, f"records_{width}.bin") if memmap_dir else None
+        if memmap_dir:
+            os.makedirs(memmap_dir, exist_ok=True)
+        source = make_records(count, width, seed, source_path)
+        model_full, model_index = _model_data_movement(count, width)
+        for strategy in strategies:
+            work_path = os.path.join(memmap_dir, f"work_{width}.bin") if memmap_dir else None
+            row = measure_strategy(strategy, source, work_path)
+            row["model_bytes_moved"] = model_full if strategy == "full_record_sort" else model_index
+            rows.append(row)
+        del source
+        if source_path:
+            os.remove(source_path)
+    df = pd.DataFrame(rows)
+    baseline = df[df["strategy"] == "full_record_sort"].set_index("width")["seconds"]
+    if len(baseline):
+        df["speedup_vs_full_sort"] = df["width"].map(baseline) / df["seconds"]
+    return df
+
+
+# ==============================================================================
+# == INTERFAȚĂ LINIE DE COMANDĂ
+# ==============================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compară sortarea înregistrărilor complete cu sortarea prin index (argsort + citire, permutare pe loc).")
+    parser.add_argument("--widths", default=",".join(map(str, DEFAULT_WIDTHS)), help="Lățimile înregistrărilor (octeți), separate prin virgulă.")
+    parser.add_argument("--n", type=int, default=200_000, help="Numărul de înregistrări per lățime.")
+    parser.add_argument("--max-mb", type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024), help="Plafonul datelor per lățime (MiB).")
+    parser.add_argument("--strategy", choices=STRATEGIES, action="append", help="Strategiile măsurate (implicit toate).")
+    parser.add_argument("--memmap-dir", default=None, help="Directorul pentru fișierele de înregistrări mapate (implicit în memorie).")
+    args = parser.parse_args(argv)
+
+    widths = [int(w) for w in args.widths.split(",") if w.strip()]
+    df = benchmark(widths, args.n, args.max_mb * 1024 * 1024, tuple(args.strategy or STRATEGIES), args.memmap_dir)
+    df["MB_moved"] = df["bytes_moved"] / 1e6
+    df["est_MB_moved"] = df["estimated_bytes_moved"] / 1e6
+    df["model_MB_moved"] = df["model_bytes_moved"] / 1e6
+    columns = ["width", "n", "strategy", "seconds", "elements_per_s", "MB_moved", "est_MB_moved", "model_MB_moved", "sorted"]
+    if "speedup_vs_full_sort" in df:
+        columns.append("speedup_vs_full_sort")
+    print(df[columns].to_string(index=False, float_format=lambda x: f"{x:,.3f}"))
+
+
+if __name__ == "__main__":
+    main()
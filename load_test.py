@@ -0,0 +1,329 @@
+# load_test.py
+
+"""
+Test de încărcare cu sesiuni simulate (streamlit.testing.v1.AppTest).
+
+Fiecare sesiune simulată este o instanță AppTest a `app_streamlit.py`, cu propria
+stare de sesiune, care parcurge un flux realist de interacțiuni (SESSION_FLOW):
+deschiderea paginii, rularea simulării, salvarea în istoric, pregătirea raportului
+Excel, schimbarea scenariului și analiza de scalabilitate. Fiecare acțiune poate
+declanșa una sau mai multe rerulări; latența unei acțiuni este timpul total al lor.
+
+Sesiunile sunt împărțite între `--workers` procese (ca mai multe procese server
+în paralel); în fiecare proces, fiecare sesiune rulează pe firul ei, concurent cu
+celelalte (ca sesiunile unui server Streamlit, care împart procesul și GIL-ul).
+Raportul conține:
+  - percentilele latenței per acțiune și pentru toate acțiunile;
+  - debitul (rerulări și acțiuni pe secundă, pe toată durata testului);
+  - memoria: RSS-ul fiecărui proces înainte și după rularea sesiunilor, octeții
+    cache-urilor partajate (shared_cache) și creșterea medie per sesiune fără
+    acestea (o estimare a memoriei reținute de o sesiune). Stările comune
+    procesului (tabelele precalculate, conexiunea la istoric) sunt încărcate
+    înainte de prima măsurătoare, deci nu sunt puse pe seama sesiunilor.
+
+Istoricul salvat de sesiuni merge într-o bază temporară, nu în cea reală
+(config.HISTORY_DB_PATH), decât dacă se dă `--history-db`.
+
+Exemplu CLI:
+    python load_test.py --sessions 8 --workers 2 --iterations 2
+    python load_test.py --sessions 20 --workers 4 --think-ms 500 --json raport_incarcare.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+import config
+import sysinfo
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app_streamlit.py")
+DEFAULT_TIMEOUT_S = 120
+SESSION_FLOW = ("run", "save_history", "excel_export", "switch_scenario", "scalability")
+PERCENTILES = (50, 90, 95, 99)
+SCALABILITY_LABEL = "Rulează Analiză de Scalabilitate"
+
+
+# ==============================================================================
+# == ACȚIUNILE UNEI SESIUNI
+# ==============================================================================
+# Fiecare acțiune primește (at, rng) și returnează numărul de rerulări declanșate.
+
+def _find(elements, text):
+    return next((e for e in elements if text in e.label), None)
+
+
+def _run_simulation(at):
+    _find(at.sidebar.button, config.RUN_BUTTON_TEXT).click().run()
+    return 1
+
+
+def action_open(at, rng):
+    at.run()
+    return 1
+
+
+def action_run(at, rng):
+    return _run_simulation(at)
+
+
+def action_switch_scenario(at, rng):
+    current = at.sidebar.selectbox[0].value
+    options = [s for s in config.SCENARIO_OPTIONS if s != current]
+    at.sidebar.selectbox[0].select(rng.choice(options)).run()
+    return 1 + _run_simulation(at)
+
+
+def action_save_history(at, rng):
+    button = _find(at.button, "Salvează în Istoric")
+    if button is None:
+        return 0
+    button.click().run()
+    return 1
+
+
+def action_excel_export(at, rng):
+    button = _find(at.button, "Pregătește Raport Excel")
+    if button is None:
+        return 0
+    button.click().run()
+    return 1
+
+
+def action_scalability(at, rng):
+    checkbox = _find(at.sidebar.checkbox, SCALABILITY_LABEL)
+    checkbox.check().run()
+    # Înapoi la rularea simplă, pentru pașii următori ai fluxului
+    _find(at.sidebar.checkbox, SCALABILITY_LABEL).uncheck().run()
+    return 2
+
+
+ACTIONS = {
+    "open": action_open,
+    "run": action_run,
+    "switch_scenario": action_switch_scenario,
+    "save_history": action_save_history,
+    "excel_export": action_excel_export,
+    "scalability": action_scalability,
+}
+
+
+# ==============================================================================
+# == PROCESUL DE LUCRU
+# ==============================================================================
+
+def _shared_cache_bytes():
+    """Octeții ocupați de cache-urile partajate ale procesului (shared_cache)."""
+    import shared_cache
+    return sum(info["bytes"] for info in shared_cache.cache_info().values())
+
+
+def _share_streamlit_runtime():
+    """
+    Pregătește procesul pentru mai multe AppTest concurente. Fiecare AppTest.run()
+    instalează un Runtime fals global (Runtime._instance) și îl șterge la final, iar
+    opțiunea `global.appTest` este setată doar pe durata rulării; cu sesiuni pe fire
+    diferite, rularea care se termină prima le-ar lăsa pe celelalte fără ele. Aici
+    opțiunea rămâne setată, iar când nicio rulare nu are runtime-ul instalat se
+    folosește unul fals comun, construit ca în AppTest.
+    """
+    from unittest.mock import MagicMock
+
+    from streamlit import config as st_config
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+    from streamlit.runtime.media_file_manager import MediaFileManager
+    from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+
+    st_config.set_option("global.appTest", True)
+    shared = MagicMock(spec=Runtime)
+    shared.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    shared.cache_storage_manager = MemoryCacheStorageManager()
+    Runtime.instance = classmethod(lambda cls: cls._instance if cls._instance is not None else shared)
+    Runtime.exists = classmethod(lambda cls: True)
+
+
+def _run_session(sid, at, rng, steps, think_s, samples, errors):
+    """Pașii unei sesiuni, pe firul ei; rezultatele sunt adăugate în `samples` și `errors`."""
+    for action in steps:
+        if think_s:
+            time.sleep(think_s)
+        started = time.perf_counter()
+        try:
+            reruns = ACTIONS[action](at, rng)
+            ok = not at.exception
+            if not ok:
+                errors.append(f"sesiunea {sid}, {action}: {at.exception[0].value}")
+        except Exception as e:
+            reruns, ok = 0, False
+            errors.append(f"sesiunea {sid}, {action}: {type(e).__name__}: {e}")
+        samples.append((action, time.perf_counter() - started, reruns, ok))
+
+
+def run_sessions(session_ids, iterations=1, flow=SESSION_FLOW, seed=0, think_s=0.0, history_db=None, timeout=DEFAULT_TIMEOUT_S):
+    """
+    Execută sesiunile date în procesul curent, concurent: fiecare sesiune parcurge
+    pașii fluxului pe firul ei.
+
+    Returns:
+        dict: samples (listă de (acțiune, secunde, rerulări, ok)), errors, sessions,
+            rss_before_bytes, rss_after_bytes, peak_rss_bytes și shared_cache_bytes
+            (creșterea cache-urilor partajate pe durata rulării).
+    """
+    from streamlit.testing.v1 import AppTest
+
+    if history_db:
+        config.HISTORY_DB_PATH = history_db
+    # Importurile grele și stările comune procesului nu sunt puse pe seama sesiunilor
+    import api_handler, history_store, lookup_tables, montecarlo, sensitivity, measurement, utils  # noqa: F401
+    import plotly.express  # noqa: F401
+    history_store.get_default_store()
+    lookup_tables.get_tables()
+    _share_streamlit_runtime()
+
+    rss_before = sysinfo.rss_bytes()
+    cache_before = _shared_cache_bytes()
+    sessions = [(AppTest.from_file(APP_PATH, default_timeout=timeout), random.Random(seed * 1_000_003 + sid)) for sid in session_ids]
+    samples, errors = [], []
+    steps = ["open"] + list(flow) * int(iterations)
+    with ThreadPoolExecutor(max_workers=len(sessions), thread_name_prefix="sesiune") as executor:
+        futures = [executor.submit(_run_session, sid, at, rng, steps, think_s, samples, errors)
+                   for (at, rng), sid in zip(sessions, session_ids)]
+        for future in futures:
+            future.result()
+    rss_after = sysinfo.rss_bytes()
+    peak = sysinfo.peak_rss_bytes()
+    return {"samples": samples, "errors": errors, "sessions": len(sessions),
+            "rss_before_bytes": rss_before, "rss_after_bytes": rss_after, "peak_rss_bytes": peak,
+            "shared_cache_bytes": _shared_cache_bytes() - cache_before}
+
+
+# ==============================================================================
+# == ORCHESTRARE ȘI RAPORT
+# ==============================================================================
+
+def _percentiles(values):
+    values = np.asarray(values, dtype=np.float64)
+    if values.size == 0:
+        return {f"p{q}": float("nan") for q in PERCENTILES}
+    return {f"p{q}": float(np.percentile(values, q)) for q in PERCENTILES}
+
+
+def summarize(worker_results, duration_s):
+    """Agregă rezultatele proceselor: latențe per acțiune, debit și memorie."""
+    samples = [s for r in worker_results for s in r["samples"]]
+    actions = {}
+    for action, seconds, reruns, ok in samples:
+        entry = actions.setdefault(action, {"seconds": [], "reruns": 0, "failed": 0})
+        entry["seconds"].append(seconds)
+        entry["reruns"] += reruns
+        entry["failed"] += 0 if ok else 1
+    by_action = {action: {"count": len(e["seconds"]), "reruns": e["reruns"], "failed": e["failed"],
+                          **_percentiles(e["seconds"]), "max": float(max(e["seconds"]))}
+                 for action, e in actions.items()}
+    total_reruns = sum(s[2] for s in samples)
+    rerun_latencies = [s[1] / s[2] for s in samples if s[2]]
+    sessions = sum(r["sessions"] for r in worker_results)
+    # Cache-urile partajate sunt ale procesului, nu ale sesiunilor: raportate separat
+    growth = [(r["rss_after_bytes"] - r["rss_before_bytes"] - r["shared_cache_bytes"]) / max(r["sessions"], 1) for r in worker_results]
+    return {
+        "sessions": sessions,
+        "workers": len(worker_results),
+        "duration_s": duration_s,
+        "actions": len(samples),
+        "reruns": total_reruns,
+        "throughput_reruns_per_s": total_reruns / duration_s if duration_s > 0 else float("nan"),
+        "throughput_actions_per_s": len(samples) / duration_s if duration_s > 0 else float("nan"),
+        "rerun_latency_s": _percentiles(rerun_latencies),
+        "by_action": by_action,
+        "memory": {
+            "rss_before_mb": [r["rss_before_bytes"] / 1e6 for r in worker_results],
+            "rss_after_mb": [r["rss_after_bytes"] / 1e6 for r in worker_results],
+            "peak_rss_mb": [r["peak_rss_bytes"] / 1e6 for r in worker_results],
+            "shared_cache_mb": [r["shared_cache_bytes"] / 1e6 for r in worker_results],
+            "per_session_mb": float(np.mean(growth)) / 1e6 if growth else float("nan"),
+        },
+        "errors": [e for r in worker_results for e in r["errors"]],
+    }
+
+
+def run_load_test(sessions=4, workers=1, iterations=1, flow=SESSION_FLOW, seed=0, think_ms=0.0, history_db=None, timeout=DEFAULT_TIMEOUT_S):
+    """
+    Rulează testul de încărcare: `sessions` sesiuni împărțite între `workers` procese noi (spawn).
+
+    Returns:
+        dict: Raportul (vezi `summarize`).
+    """
+    workers = max(1, min(int(workers), int(sessions)))
+    groups = [list(range(sessions))[i::workers] for i in range(workers)]
+    temporary = None
+    if history_db is None:
+        temporary = tempfile.TemporaryDirectory(prefix="load_test_")
+        history_db = os.path.join(temporary.name, "history.sqlite3")
+    try:
+        started = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+            futures = [executor.submit(run_sessions, group, iterations, tuple(flow), seed, think_ms / 1000.0, history_db, timeout)
+                       for group in groups]
+            results = [f.result() for f in futures]
+        duration = time.perf_counter() - started
+    finally:
+        if temporary is not None:
+            temporary.cleanup()
+    return summarize(results, duration)
+
+
+def _print_report(report):
+    print(f"Sesiuni: {report['sessions']} în {report['workers']} procese, durată {report['duration_s']:.1f} s")
+    print(f"Debit: {report['throughput_reruns_per_s']:.2f} rerulări/s, {report['throughput_actions_per_s']:.2f} acțiuni/s "
+          f"({report['reruns']} rerulări, {report['actions']} acțiuni)")
+    latency = report["rerun_latency_s"]
+    print("Latența unei rerulări: " + ", ".join(f"{k}={v * 1000:.0f} ms" for k, v in latency.items()))
+    print(f"\n{'acțiune':<18}{'nr':>5}{'eșuate':>8}" + "".join(f"{'p' + str(q):>10}" for q in PERCENTILES) + f"{'max':>10}")
+    for action, row in report["by_action"].items():
+        print(f"{action:<18}{row['count']:>5}{row['failed']:>8}" + "".join(f"{row['p' + str(q)] * 1000:>8.0f}ms" for q in PERCENTILES)
+              + f"{row['max'] * 1000:>8.0f}ms")
+    memory = report["memory"]
+    print(f"\nMemorie (RSS per proces, MB): înainte {', '.join(f'{v:.0f}' for v in memory['rss_before_mb'])}; "
+          f"după {', '.join(f'{v:.0f}' for v in memory['rss_after_mb'])}; vârf {', '.join(f'{v:.0f}' for v in memory['peak_rss_mb'])}")
+    print(f"Cache-uri partajate (MB): {', '.join(f'{v:.1f}' for v in memory['shared_cache_mb'])}")
+    print(f"Creștere medie per sesiune (fără cache-urile partajate): {memory['per_session_mb']:.1f} MB")
+    if report["errors"]:
+        print(f"\nErori ({len(report['errors'])}):")
+        for message in report["errors"][:20]:
+            print(f"  - {message}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Test de încărcare pentru app_streamlit.py cu sesiuni simulate (AppTest).")
+    parser.add_argument("--sessions", type=int, default=4, help="Numărul de sesiuni simulate.")
+    parser.add_argument("--workers", type=int, default=1, help="Procesele între care sunt împărțite sesiunile.")
+    parser.add_argument("--iterations", type=int, default=1, help="De câte ori parcurge fiecare sesiune fluxul de acțiuni.")
+    parser.add_argument("--flow", default=",".join(SESSION_FLOW), help=f"Acțiunile fluxului, separate prin virgulă (din {', '.join(ACTIONS)}).")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="Pauza dinaintea fiecărei acțiuni (timpul de gândire al utilizatorului).")
+    parser.add_argument("--seed", type=int, default=0, help="Sămânța alegerilor aleatoare ale sesiunilor.")
+    parser.add_argument("--history-db", default=None, help="Baza de istoric folosită (implicit una temporară).")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT_S, help="Timpul maxim al unei rerulări (s).")
+    parser.add_argument("--json", default=None, help="Scrie raportul și într-un fișier JSON.")
+    args = parser.parse_args(argv)
+
+    flow = [a.strip() for a in args.flow.split(",") if a.strip()]
+    unknown = [a for a in flow if a not in ACTIONS]
+    if unknown:
+        parser.error(f"Acțiuni necunoscute: {unknown}")
+    report = run_load_test(args.sessions, args.workers, args.iterations, flow, args.seed, args.think_ms, args.history_db, args.timeout)
+    _print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    return 1 if report["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,221 @@
+# log_filter.py
+
+"""
+Motor real de filtrare a logurilor, varianta „verde” din Scenariul 3.
+
+Fișierul este mapat în memorie (mmap) și parcurs în blocuri mari. În fiecare
+bloc se caută direct octeții b"ERROR" (pre-filtrul `"ERROR" in line` din
+`model_green_log_filter`, aplicat la nivel de bloc, nu linie cu linie), iar
+expresia regulată compilată rulează doar pe liniile candidate. Fișierele mari
+sunt împărțite la granițe de linie între procesele unui ProcessPoolExecutor.
+
+Raportul conține debitul (GB/s), liniile citite, candidații (apeluri regex),
+liniile potrivite și memoria rezidentă de vârf (RSS), plus estimarea modelului
+pentru parametrii deduși din fișier, pentru comparație.
+
+Exemplu CLI:
+    python log_filter.py app.log --workers 8 --out erori.log
+    python log_filter.py sample.log --generate 5000000
+"""
+import argparse
+import mmap
+import os
+import re
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import api_handler
+import config
+import measurement
+import sysinfo
+
+NEEDLE = b"ERROR"
+# Aceeași expresie ca în measurement.py, pe octeți; MULTILINE ca `^` să se potrivească la începutul oricărei linii din bloc
+LINE_PATTERN = re.compile(measurement.ERROR_LINE_PATTERN.pattern.encode(), re.MULTILINE)
+DEFAULT_BLOCK_BYTES = 64 * 1024 * 1024
+# Sub această dimensiune fișierul este procesat într-un singur proces
+MIN_BYTES_PER_WORKER = 32 * 1024 * 1024
+
+
+# ==============================================================================
+# == SCANARE
+# ==============================================================================
+
+def _open_map(f):
+    return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def split_ranges(path, parts):
+    """Împarte fișierul în cel mult `parts` intervale [start, end) care încep și se termină la granițe de linie."""
+    size = os.path.getsize(path)
+    if size == 0 or parts <= 1:
+        return [(0, size)]
+    bounds = [0]
+    with open(path, "rb") as f, _open_map(f) as mm:
+        for i in range(1, parts):
+            newline = mm.find(b"\n", max(size * i // parts, bounds[-1]))
+            if newline < 0 or newline + 1 >= size:
+                break
+            if newline + 1 > bounds[-1]:
+                bounds.append(newline + 1)
+    bounds.append(size)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def scan_range(path, start, end, block_bytes=DEFAULT_BLOCK_BYTES, out_path=None):
+    """
+    Filtrează liniile ERROR din intervalul [start, end) al fișierului.
+
+    Args:
+        block_bytes (int): Dimensiunea blocurilor copiate din mmap (memoria de lucru).
+        out_path (str): Dacă e dat, liniile potrivite sunt scrise aici (în ordine).
+
+    Returns:
+        dict: bytes, lines, candidates, matched, message_bytes.
+    """
+    stats = {"bytes": end - start, "lines": 0, "candidates": 0, "matched": 0, "message_bytes": 0}
+    if end <= start:
+        return stats
+    out = open(out_path, "wb") if out_path else None
+    try:
+        with open(path, "rb") as f, _open_map(f) as mm:
+            pos = start
+            while pos < end:
+                block_end = min(end, pos + block_bytes)
+                if block_end < end:
+                    # Blocul se termină după ultima linie completă (sau se extinde până la capătul liniei lungi)
+                    newline = mm.rfind(b"\n", pos, block_end)
+                    if newline < 0:
+                        newline = mm.find(b"\n", block_end, end)
+                    block_end = end if newline < 0 else newline + 1
+                block = mm[pos:block_end]
+                stats["lines"] += block.count(b"\n")
+                hit = block.find(NEEDLE)
+                while hit >= 0:
+                    line_start = block.rfind(b"\n", 0, hit) + 1
+                    line_end = block.find(b"\n", hit)
+                    if line_end < 0:
+                        line_end = len(block)
+                    stats["candidates"] += 1
+                    match = LINE_PATTERN.match(block, line_start, line_end)
+                    if match:
+                        stats["matched"] += 1
+                        stats["message_bytes"] += len(match.group(3))
+                        if out is not None:
+                            out.write(block[line_start:line_end] + b"\n")
+                    hit = block.find(NEEDLE, line_end)
+                pos = block_end
+            if mm[end - 1:end] != b"\n":
+                stats["lines"] += 1  # ultima linie, fără terminator
+    finally:
+        if out is not None:
+            out.close()
+    return stats
+
+
+def filter_log(path, workers=None, block_bytes=DEFAULT_BLOCK_BYTES, out_path=None):
+    """
+    Filtrează un fișier de log, în paralel dacă este suficient de mare.
+
+    Args:
+        path (str): Fișierul de log.
+        workers (int): Numărul de procese (implicit os.cpu_count(); limitat la câte
+            un proces per MIN_BYTES_PER_WORKER).
+        block_bytes (int): Dimensiunea blocurilor scanate de fiecare proces.
+        out_path (str): Fișierul în care se scriu liniile potrivite (opțional).
+
+    Returns:
+        dict: Contoarele cumulate, plus seconds, gb_per_s, workers, peak_rss_bytes
+            (procesul curent) și peak_rss_worker_bytes (cel mai mare proces copil).
+    """
+    size = os.path.getsize(path)
+    workers = max(1, min(workers or os.cpu_count() or 1, size // MIN_BYTES_PER_WORKER or 1))
+    ranges = split_ranges(path, workers)
+    started = time.perf_counter()
+    if len(ranges) == 1:
+        parts = [scan_range(path, 0, size, block_bytes, out_path)]
+    else:
+        part_paths = [f"{out_path}.part{i}" if out_path else None for i in range(len(ranges))]
+        with ProcessPoolExecutor(max_workers=len(ranges)) as executor:
+            futures = [executor.submit(scan_range, path, start, end, block_bytes, part)
+                       for (start, end), part in zip(ranges, part_paths)]
+            parts = [future.result() for future in futures]
+        if out_path:
+            with open(out_path, "wb") as out:
+                for part in part_paths:
+                    with open(part, "rb") as f:
+                        shutil.copyfileobj(f, out, 16 * 1024 * 1024)
+                    os.remove(part)
+    seconds = time.perf_counter() - started
+
+    result = {key: sum(p[key] for p in parts) for key in parts[0]}
+    result.update(seconds=seconds, gb_per_s=size / 1e9 / seconds if seconds > 0 else float("inf"), workers=len(ranges),
+                  peak_rss_bytes=sysinfo.peak_rss_bytes(), peak_rss_worker_bytes=sysinfo.peak_rss_bytes(children=True))
+    return result
+
+
+# ==============================================================================
+# == COMPARAȚIE CU MODELUL ȘI DATE DE TEST
+# ==============================================================================
+
+def model_params_from_result(result):
+    """Parametrii Scenariului 3 deduși din fișierul filtrat (linii, lungime medie, % erori, mesaj mediu)."""
+    lines = max(result["lines"], 1)
+    matched = result["matched"]
+    return {
+        "s3_N_lines": result["lines"],
+        "s3_avg_line_len": result["bytes"] / lines,
+        "s3_err_perc": 100.0 * matched / lines,
+        "s3_err_msg_size": result["message_bytes"] / matched if matched else 0.0,
+    }
+
+
+def compare_with_model(result, kwh_cpu, kwh_data, gco2_factor):
+    """Estimările modelelor din Scenariul 3 pentru parametrii deduși din fișier (pd.DataFrame)."""
+    params = model_params_from_result(result)
+    return api_handler.run_scenario_batch(config.SCENARIU_FILTRARE_LOGURI, params, kwh_cpu, kwh_data, gco2_factor).to_pandas()
+
+
+def write_sample_log(path, n_lines, avg_line_len=None, err_perc=None, err_msg_size=None, seed=0):
+    """Scrie un fișier de log sintetic (generatorul din measurement.py), cu valorile implicite ale scenariului."""
+    defaults = config.DEFAULT_INPUT_VALUES
+    lines = measurement.iter_log_lines(n_lines,
+                                       avg_line_len if avg_line_len is not None else defaults["s3_avg_line_len"],
+                                       err_perc if err_perc is not None else defaults["s3_err_perc"],
+                                       err_msg_size if err_msg_size is not None else defaults["s3_err_msg_size"], seed)
+    with open(path, "w", encoding="utf-8", buffering=16 * 1024 * 1024) as f:
+        for line in lines:
+            f.write(line)
+            f.write("\n")
+
+
+# ==============================================================================
+# == INTERFAȚĂ LINIE DE COMANDĂ
+# ==============================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Filtrează liniile ERROR dintr-un fișier de log (mmap + pre-filtru + regex).")
+    parser.add_argument("path", help="Fișierul de log.")
+    parser.add_argument("--workers", type=int, default=None, help="Numărul de procese (implicit numărul de nuclee).")
+    parser.add_argument("--block-mb", type=int, default=DEFAULT_BLOCK_BYTES // (1024 * 1024), help="Dimensiunea blocurilor scanate (MiB).")
+    parser.add_argument("--out", default=None, help="Fișierul în care se scriu liniile potrivite.")
+    parser.add_argument("--generate", type=int, default=None, metavar="N_LINES", help="Generează întâi un log sintetic cu N_LINES linii la `path`.")
+    parser.add_argument("--hardware", default=config.DEFAULT_HARDWARE_PROFILE_NAME, help="Profilul hardware pentru estimarea modelului.")
+    args = parser.parse_args(argv)
+
+    if args.generate:
+        write_sample_log(args.path, args.generate)
+    result = filter_log(args.path, args.workers, args.block_mb * 1024 * 1024, args.out)
+    print(f"{result['bytes'] / 1e9:.3f} GB în {result['seconds']:.3f} s ({result['gb_per_s']:.2f} GB/s, {result['workers']} procese)")
+    print(f"Linii: {result['lines']:,}  candidați (regex): {result['candidates']:,}  potrivite: {result['matched']:,}")
+    print(f"RSS de vârf: {result['peak_rss_bytes'] / 2**20:.1f} MiB (proces principal), {result['peak_rss_worker_bytes'] / 2**20:.1f} MiB (proces de lucru)")
+
+    profile = config.HARDWARE_PROFILES[args.hardware]
+    modeled = compare_with_model(result, profile["kwh_per_cpu_op"], profile["kwh_per_data_move"], config.GCO2EQ_PER_KWH_DEFAULT)
+    print("\nEstimarea modelelor pentru parametrii deduși din fișier:")
+    print(modeled[["name", "cpu_operations", "data_movement_units", "memory_usage_data_units", "estimated_kwh"]].to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
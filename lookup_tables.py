@@ -0,0 +1,318 @@
+# lookup_tables.py
+
+"""
+Tabele precalculate (.npy, memory-mapped) pentru analiza de scalabilitate.
+
+Analiza de scalabilitate variază un singur parametru (config.SCALING_PARAMS) în intervalul
+config.LOOKUP_RANGE, iar majoritatea utilizatorilor păstrează ceilalți parametri
+la valorile implicite. Pasul de generare (offline) evaluează costurile abstracte
+ale tuturor modelelor fiecărui scenariu pe o grilă densă a parametrului variat,
+cu ceilalți parametri la config.DEFAULT_INPUT_VALUES:
+  - toate valorile întregi până la config.LOOKUP_EXACT_UPTO;
+  - config.LOOKUP_LOG_POINTS puncte spațiate logaritmic până la capătul intervalului.
+
+Interfața răspunde apoi unui sweep din tabel: valorile aflate pe grilă sunt
+citite direct (slicing), celelalte sunt interpolate log-log între vecini (exact
+pentru legile putere, cu eroare sub config.LOOKUP_MAX_REL_ERROR pentru N log N;
+eroarea este măsurată la generare și salvată în manifest). Modelele rulează doar
+pentru intrările din afara tabelului: alt parametru decât cel implicit, valori
+neîntregi sau în afara intervalului, constante de cost diferite de cele de la
+generare (recalibrare sau `override_cost_constants`).
+
+Tabelele conțin doar costurile abstracte: energia și CO2 sunt o transformare
+liniară a acestora (api_handler.apply_energy_factors), deci un singur tabel per
+scenariu acoperă orice profil hardware (inclusiv cele calibrate) și orice zonă CO2
+(inclusiv valoarea live), fără câte un tabel per combinație.
+
+Fișierele (config.LOOKUP_TABLES_DIR): grid.npy, câte un scenariu_<n>.npy de formă
+(coloane de cost, modele, puncte) și manifest.json, scris ultimul.
+
+Exemplu CLI:
+    python lookup_tables.py
+    python lookup_tables.py --out /srv/simulator/lookup_tables
+    python lookup_tables.py --check
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+import config
+import profiling
+from results import NUMERIC_COLUMNS, ResultTable
+
+FORMAT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+GRID_NAME = "grid.npy"
+# Coloanele care nu depind de hardware sau de zona CO2
+COST_COLUMNS = tuple(c for c in NUMERIC_COLUMNS if c not in ("estimated_kwh", "estimated_co2_g"))
+ERROR_SAMPLES = 100_000
+
+
+def _cost_constants():
+    """Constantele COST_PER_* în vigoare pe firul curent (inclusiv suprascrierile temporare)."""
+    import api_handler
+    return {name: float(api_handler.cost_constant(name)) for name in sorted(dir(config)) if name.startswith("COST_PER_")}
+
+
+# ==============================================================================
+# == GRILA ȘI INTERPOLAREA
+# ==============================================================================
+
+def build_grid(value_range=None, exact_upto=None, log_points=None):
+    """Grila parametrului variat: toți întregii până la `exact_upto`, apoi puncte întregi spațiate logaritmic."""
+    low, high = value_range or config.LOOKUP_RANGE
+    exact_upto = min(int(exact_upto or config.LOOKUP_EXACT_UPTO), int(high))
+    exact = np.arange(int(low), exact_upto + 1, dtype=np.float64)
+    spaced = np.round(np.geomspace(max(exact_upto, low), high, int(log_points or config.LOOKUP_LOG_POINTS)))
+    return np.unique(np.concatenate([exact, spaced]))
+
+
+def interpolate(grid, values, points):
+    """
+    Valorile tabelului în `points`: citire directă pentru punctele de pe grilă,
+    interpolare log-log între vecini în rest (liniară dacă un vecin este 0).
+
+    Args:
+        grid (np.ndarray): Grila crescătoare (n,).
+        values (np.ndarray): Valorile (..., n), ex: un tabel memory-mapped.
+        points (np.ndarray): Punctele cerute (m,), în intervalul grilei.
+
+    Returns:
+        np.ndarray: (..., m)
+    """
+    idx = np.clip(np.searchsorted(grid, points), 1, len(grid) - 1)
+    on_grid = grid[idx] == points
+    if on_grid.all():
+        return np.asarray(values[..., idx])
+    x0, x1 = grid[idx - 1], grid[idx]
+    y0, y1 = np.asarray(values[..., idx - 1]), np.asarray(values[..., idx])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        weight_log = (np.log(points) - np.log(x0)) / (np.log(x1) - np.log(x0))
+        log_estimate = np.exp(np.log(y0) + weight_log * (np.log(y1) - np.log(y0)))
+    linear_estimate = y0 + (points - x0) / (x1 - x0) * (y1 - y0)
+    estimate = np.where((y0 > 0) & (y1 > 0), log_estimate, linear_estimate)
+    return np.where(on_grid, y1, estimate)
+
+
+# ==============================================================================
+# == GENERAREA (OFFLINE)
+# ==============================================================================
+
+def _evaluate(scenario, points):
+    """Costurile modelelor în `points` (ceilalți parametri impliciți), ca array (coloane, modele, puncte)."""
+    import api_handler
+    params = dict(config.DEFAULT_INPUT_VALUES)
+    params[config.SCALING_PARAMS[scenario]["key"]] = points
+    costs = api_handler.scenario_costs(scenario, params, use_cache=False)
+    values = np.stack([costs[col].reshape(len(costs.model_names), len(points)) for col in COST_COLUMNS])
+    return values, costs
+
+
+def measure_error(grid, values, scenario, samples=ERROR_SAMPLES, seed=0):
+    """Eroarea relativă maximă a interpolării, pe `samples` întregi aleatori din afara grilei."""
+    rng = np.random.default_rng(seed)
+    points = np.unique(rng.integers(int(grid[0]), int(grid[-1]) + 1, samples)).astype(np.float64)
+    points = points[~np.isin(points, grid)]
+    if not len(points):
+        return 0.0
+    reference, _ = _evaluate(scenario, points)
+    estimate = interpolate(grid, values, points)
+    nonzero = reference != 0
+    if not nonzero.any():
+        return 0.0
+    return float(np.max(np.abs(estimate[nonzero] - reference[nonzero]) / np.abs(reference[nonzero])))
+
+
+def _save_npy(path, array):
+    with open(path + ".tmp", "wb") as f:
+        np.save(f, array)
+    os.replace(path + ".tmp", path)
+
+
+def build(out_dir=None, value_range=None, exact_upto=None, log_points=None, samples=ERROR_SAMPLES):
+    """
+    Generează tabelele tuturor scenariilor din config.SCALING_PARAMS și manifestul.
+
+    Returns:
+        dict: Manifestul scris (scenarii, grila, constantele de cost, eroarea maximă).
+    """
+    out_dir = out_dir or config.LOOKUP_TABLES_DIR
+    os.makedirs(out_dir, exist_ok=True)
+    grid = build_grid(value_range, exact_upto, log_points)
+    _save_npy(os.path.join(out_dir, GRID_NAME), grid)
+    scenarios = {}
+    for number, (scenario, scaling) in enumerate(config.SCALING_PARAMS.items(), start=1):
+        values, costs = _evaluate(scenario, grid)
+        file_name = f"scenariu_{number}.npy"
+        _save_npy(os.path.join(out_dir, file_name), values)
+        scenarios[scenario] = {
+            "file": file_name,
+            "key": scaling["key"],
+            "defaults": {k: float(config.DEFAULT_INPUT_VALUES[k]) for k in _input_keys(scenario)},
+            "model_names": costs.model_names,
+            "complexity": {name: list(value) for name, value in costs.complexity.items()},
+            "max_rel_error": measure_error(grid, values, scenario, samples),
+        }
+    manifest = {
+        "format": FORMAT_VERSION,
+        "created": time.time(),
+        "range": [float(grid[0]), float(grid[-1])],
+        "points": int(len(grid)),
+        "columns": list(COST_COLUMNS),
+        "cost_constants": _cost_constants(),
+        "scenarios": scenarios,
+    }
+    manifest_path = os.path.join(out_dir, MANIFEST_NAME)
+    with open(manifest_path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    os.replace(manifest_path + ".tmp", manifest_path)
+    return manifest
+
+
+def _input_keys(scenario):
+    import api_handler
+    return api_handler.scenario_input_keys(scenario)
+
+
+# ==============================================================================
+# == CITIREA (LA PORNIRE, MEMORY-MAPPED)
+# ==============================================================================
+
+class LookupTables:
+    """
+    Tabelele dintr-un director generat cu `build`, deschise memory-mapped (doar
+    paginile citite ajung în memorie și sunt partajate între procese).
+
+    Args:
+        directory (str): Directorul tabelelor (implicit config.LOOKUP_TABLES_DIR).
+    """
+
+    def __init__(self, directory=None):
+        self.directory = directory or config.LOOKUP_TABLES_DIR
+        with open(os.path.join(self.directory, MANIFEST_NAME), encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        if self.manifest.get("format") != FORMAT_VERSION or self.manifest.get("columns") != list(COST_COLUMNS):
+            raise ValueError(f"Tabelele din {self.directory} au alt format; regenerați-le cu `python lookup_tables.py`.")
+        self.grid = np.load(os.path.join(self.directory, GRID_NAME), mmap_mode="r")
+        self.values = {scenario: np.load(os.path.join(self.directory, entry["file"]), mmap_mode="r")
+                       for scenario, entry in self.manifest["scenarios"].items()
+                       if entry["max_rel_error"] <= config.LOOKUP_MAX_REL_ERROR}
+
+    def covers(self, scenario, params, key):
+        """True dacă sweep-ul (`params[key]` variat, ceilalți parametri din `params`) poate fi citit din tabel."""
+        entry = self.manifest["scenarios"].get(scenario)
+        if entry is None or scenario not in self.values or entry["key"] != key:
+            return False
+        if any(k != key and float(params[k]) != value for k, value in entry["defaults"].items()):
+            return False
+        points = np.asarray(params[key], dtype=np.float64)
+        if points.ndim != 1 or not len(points) or not np.isfinite(points).all() or not np.array_equal(points, np.round(points)):
+            return False
+        low, high = self.manifest["range"]
+        if points.min() < low or points.max() > high:
+            return False
+        return _cost_constants() == self.manifest["cost_constants"]
+
+    def costs(self, scenario, params, key):
+        """
+        Costurile sweep-ului citite din tabel, ca în api_handler.scenario_costs
+        (model-major), sau None dacă intrările nu sunt acoperite (`covers`).
+        """
+        if not self.covers(scenario, params, key):
+            return None
+        entry = self.manifest["scenarios"][scenario]
+        points = np.asarray(params[key], dtype=np.float64)
+        values = interpolate(self.grid, self.values[scenario], points)
+        n_models = len(entry["model_names"])
+        return ResultTable(entry["model_names"], np.repeat(np.arange(n_models, dtype=np.int16), len(points)),
+                           {col: values[i].reshape(-1) for i, col in enumerate(COST_COLUMNS)},
+                           complexity={name: tuple(value) for name, value in entry["complexity"].items()})
+
+
+_default_tables = None
+_default_tables_loaded = False
+_default_tables_lock = threading.Lock()
+
+
+def get_tables():
+    """Tabelele din config.LOOKUP_TABLES_DIR (deschise o singură dată per proces), sau None dacă lipsesc."""
+    global _default_tables, _default_tables_loaded
+    with _default_tables_lock:
+        if not _default_tables_loaded:
+            _default_tables_loaded = True
+            try:
+                _default_tables = LookupTables()
+            except (OSError, ValueError, KeyError):
+                _default_tables = None
+        return _default_tables
+
+
+def sweep_costs(scenario, params, key):
+    """Costurile unui sweep pe `key` din tabelele implicite, sau None dacă nu sunt acoperite."""
+    tables = get_tables()
+    costs = tables.costs(scenario, params, key) if tables is not None else None
+    profiling.count("lookup_tables.miss" if costs is None else "lookup_tables.hit")
+    return costs
+
+
+def run_sweep(scenario, params, key, kwh_cpu, kwh_data, gco2_factor):
+    """
+    La fel ca api_handler.run_scenario_batch pentru un sweep pe `key`: costurile vin
+    din tabel, iar modelele rulează doar dacă intrările nu sunt acoperite de el.
+    """
+    import api_handler
+    costs = sweep_costs(scenario, params, key)
+    if costs is None:
+        return api_handler.run_scenario_batch(scenario, params, kwh_cpu, kwh_data, gco2_factor)
+    return api_handler.apply_energy_factors(costs, kwh_cpu, kwh_data, gco2_factor)
+
+
+# ==============================================================================
+# == INTERFAȚĂ LINIE DE COMANDĂ
+# ==============================================================================
+
+def _print_manifest(manifest, directory):
+    print(f"Tabele în {directory}: {manifest['points']} puncte în [{manifest['range'][0]:.0f}, {manifest['range'][1]:.0f}]")
+    for scenario, entry in manifest["scenarios"].items():
+        size = os.path.getsize(os.path.join(directory, entry["file"])) / 1e6
+        status = "OK" if entry["max_rel_error"] <= config.LOOKUP_MAX_REL_ERROR else "PESTE PRAG (nefolosit)"
+        print(f"  {scenario}: {entry['key']}, {len(entry['model_names'])} modele, {size:.1f} MB, "
+              f"eroare relativă maximă {entry['max_rel_error']:.2e} [{status}]")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generează tabelele precalculate (.npy) pentru analiza de scalabilitate.")
+    parser.add_argument("--out", default=None, help=f"Directorul tabelelor (implicit {config.LOOKUP_TABLES_DIR}).")
+    parser.add_argument("--exact-upto", type=int, default=None, help="Toate valorile întregi până aici sunt în tabel.")
+    parser.add_argument("--log-points", type=int, default=None, help="Punctele spațiate logaritmic de deasupra zonei exacte.")
+    parser.add_argument("--samples", type=int, default=ERROR_SAMPLES, help="Punctele aleatoare pe care se măsoară eroarea interpolării.")
+    parser.add_argument("--check", action="store_true", help="Doar afișează tabelele existente și verifică dacă sunt utilizabile.")
+    args = parser.parse_args(argv)
+
+    directory = args.out or config.LOOKUP_TABLES_DIR
+    if args.check:
+        try:
+            tables = LookupTables(directory)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Tabelele din {directory} nu pot fi folosite: {e}")
+            return 1
+        _print_manifest(tables.manifest, directory)
+        if tables.manifest["cost_constants"] != _cost_constants():
+            print("Constantele de cost s-au schimbat de la generare: tabelele nu vor fi folosite (regenerați-le).")
+            return 1
+        return 0
+
+    started = time.perf_counter()
+    manifest = build(directory, exact_upto=args.exact_upto, log_points=args.log_points, samples=args.samples)
+    print(f"Generat în {time.perf_counter() - started:.1f} s.")
+    _print_manifest(manifest, directory)
+    return 0 if all(e["max_rel_error"] <= config.LOOKUP_MAX_REL_ERROR for e in manifest["scenarios"].values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,342 @@
+# measurement.py
+
+"""
+Modul de măsurare empirică: execută efectiv strategiile din fiecare scenariu.
+
+Pentru fiecare scenariu se generează date sintetice după parametrii de intrare
+(N, dimensiunea înregistrărilor, itemi per tranzacție, lungimea liniilor,
+procentul de erori) și se rulează implementări reale ale strategiilor
+comparate de modelele din api_handler:
+    Scenariul 1: Bubble sort / Quicksort pe înregistrări complete / sortare prin index
+    Scenariul 2: agregare multi-pass (date încărcate complet) / single-pass (streaming)
+    Scenariul 3: încărcare completă + regex pe toate liniile / streaming + pre-filtru `in`
+
+Se măsoară timpul real (wall), timpul CPU al procesului și memoria de vârf
+alocată în timpul rulării (tracemalloc, într-o rulare separată, pentru a nu
+distorsiona timpii). Datele sintetice sunt generate o singură dată, înainte de
+măsurare: la sortare, buffer-ul de intrare nu intră în memoria măsurată; la
+scenariile 2 și 3 fiecare rulare primește un iterator nou peste tranzacțiile /
+liniile deja generate, deci se măsoară doar parcurgerea lor (încărcarea completă
+plătește lista proprie și rezultatele intermediare, nu generarea datelor).
+O unitate abstractă de date corespunde unui octet din datele sintetice.
+Dimensiunea principală este plafonată (MEASUREMENT_LIMITS), deoarece
+implementările sunt Python pur; valorile efectiv folosite sunt returnate,
+pentru a fi comparate cu modelele evaluate pe aceiași parametri.
+"""
+import gc
+import re
+import threading
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+import api_handler
+import config
+
+# Plafonul dimensiunii principale a fiecărui scenariu (Bubble sort este O(N^2) în Python pur)
+MEASUREMENT_LIMITS = {"s1_N": 2_000, "s2_N_trans": 100_000, "s3_N_lines": 200_000}
+# Octeții de la începutul fiecărei înregistrări care formează cheia de sortare
+KEY_BYTES = 8
+ERROR_LINE_PATTERN = re.compile(r"^(\S+ \S+) ERROR \[(\w+)\] (.*)$")
+
+
+# ==============================================================================
+# == GENERATOARE DE DATE SINTETICE
+# ==============================================================================
+
+def make_record_buffer(n, rec_size, seed=0):
+    """N înregistrări de `rec_size` octeți, contigue; primii KEY_BYTES octeți sunt cheia (big-endian)."""
+    rng = np.random.default_rng(seed)
+    rec_size = max(int(rec_size), KEY_BYTES)
+    records = rng.integers(0, 256, size=(n, rec_size), dtype=np.uint8)
+    records[:, :KEY_BYTES] = rng.integers(0, 2**63, size=n, dtype=np.int64).astype(">u8").view(np.uint8).reshape(n, KEY_BYTES)
+    return bytearray(records.tobytes()), rec_size
+
+
+def iter_transactions(n_trans, avg_items, header_size, item_size, seed=0):
+    """Generează tranzacții (id, antet, [(cantitate, preț, date item), ...]) una câte una."""
+    rng = np.random.default_rng(seed)
+    header = b"h" * max(int(header_size), 1)
+    padding = b"i" * max(int(item_size), 1)
+    max_items = max(1, 2 * int(avg_items) - 1)
+    for tid in range(int(n_trans)):
+        n_items = int(rng.integers(1, max_items + 1))
+        quantities = rng.integers(1, 10, size=n_items)
+        prices = rng.integers(100, 10_000, size=n_items) / 100.0
+        yield tid, header, [(int(q), float(p), padding) for q, p in zip(quantities, prices)]
+
+
+def iter_log_lines(n_lines, avg_line_len, err_perc, err_msg_size, seed=0):
+    """Generează linii de log; aproximativ `err_perc`% sunt linii ERROR cu un mesaj de `err_msg_size` caractere."""
+    rng = np.random.default_rng(seed)
+    is_error = rng.random(int(n_lines)) < err_perc / 100.0
+    line_len = max(int(avg_line_len), 40)
+    message = "e" * max(int(err_msg_size), 1)
+    for i, error in enumerate(is_error):
+        prefix = f"2024-01-01 00:00:{i % 60:02d}"
+        if error:
+            line = f"{prefix} ERROR [svc{i % 7}] {message}"
+        else:
+            line = f"{prefix} INFO [svc{i % 7}] "
+            line += "x" * max(0, line_len - len(line))
+        yield line
+
+
+# ==============================================================================
+# == IMPLEMENTĂRI REALE ALE STRATEGIILOR
+# ==============================================================================
+
+def _quicksort(n, key_at, swap):
+    """Quicksort iterativ (partiționare Hoare). Returnează (comparații, swap-uri, adâncimea maximă a stivei)."""
+    comparisons = swaps = max_depth = 0
+    stack = [(0, n - 1)]
+    while stack:
+        max_depth = max(max_depth, len(stack))
+        lo, hi = stack.pop()
+        if lo >= hi:
+            continue
+        pivot = key_at((lo + hi) // 2)
+        i, j = lo - 1, hi + 1
+        while True:
+            i += 1
+            comparisons += 1
+            while key_at(i) < pivot:
+                i += 1
+                comparisons += 1
+            j -= 1
+            comparisons += 1
+            while key_at(j) > pivot:
+                j -= 1
+                comparisons += 1
+            if i >= j:
+                break
+            swap(i, j)
+            swaps += 1
+        stack.append((lo, j))
+        stack.append((j + 1, hi))
+    return comparisons, swaps, max_depth
+
+
+def _record_keys(buf, n, size):
+    """Cheile înregistrărilor ca întregi (ordinea lor coincide cu ordinea octeților cheii)."""
+    return [int.from_bytes(buf[i * size:i * size + KEY_BYTES], "big") for i in range(n)]
+
+
+def _swap_records(buf, keys, size, i, j):
+    a, b = i * size, j * size
+    buf[a:a + size], buf[b:b + size] = buf[b:b + size], buf[a:a + size]
+    keys[i], keys[j] = keys[j], keys[i]
+
+
+def bubble_sort_records(buf, n, size):
+    """Bubble sort direct pe buffer: fiecare swap mută două înregistrări complete."""
+    keys = _record_keys(buf, n, size)
+    comparisons = swaps = 0
+    for end in range(n - 1, 0, -1):
+        swapped = False
+        for i in range(end):
+            comparisons += 1
+            if keys[i] > keys[i + 1]:
+                _swap_records(buf, keys, size, i, i + 1)
+                swaps += 1
+                swapped = True
+        if not swapped:
+            break
+    return {"comparisons": comparisons, "swaps": swaps, "bytes_moved": swaps * size * 2}
+
+
+def quicksort_records(buf, n, size):
+    """Quicksort pe loc, direct pe buffer (swap-uri de înregistrări complete)."""
+    keys = _record_keys(buf, n, size)
+
+    def swap(i, j):
+        _swap_records(buf, keys, size, i, j)
+
+    comparisons, swaps, depth = _quicksort(n, keys.__getitem__, swap)
+    return {"comparisons": comparisons, "swaps": swaps, "bytes_moved": swaps * size * 2, "stack_depth": depth}
+
+
+def index_sort_records(buf, n, size):
+    """Sortează perechile (cheie, index) cu același Quicksort, apoi copiază fiecare înregistrare o singură dată."""
+    pairs = list(zip(_record_keys(buf, n, size), range(n)))
+
+    def key_at(i):
+        return pairs[i][0]
+
+    def swap(i, j):
+        pairs[i], pairs[j] = pairs[j], pairs[i]
+
+    comparisons, swaps, depth = _quicksort(n, key_at, swap)
+    view = memoryview(buf)
+    ordered = bytearray().join(view[i * size:(i + 1) * size] for _, i in pairs)
+    return {"comparisons": comparisons, "swaps": swaps, "bytes_moved": swaps * KEY_BYTES * 2 + len(ordered), "stack_depth": depth}
+
+
+def sales_report_multi_pass(transactions):
+    """Încarcă toate tranzacțiile, calculează totalul fiecăreia (listă intermediară), apoi agregă."""
+    data = list(transactions)
+    per_transaction = []
+    for tid, _, items in data:
+        per_transaction.append((tid, sum(q * p for q, p, _ in items), len(items)))
+    total_sales = sum(t[1] for t in per_transaction)
+    total_items = sum(t[2] for t in per_transaction)
+    return {"transactions": len(data), "total_sales": total_sales, "total_items": total_items}
+
+
+def sales_report_single_pass(transactions):
+    """Agregă totalurile direct, pe măsură ce tranzacțiile sunt citite (streaming)."""
+    count = total_items = 0
+    total_sales = 0.0
+    for _, _, items in transactions:
+        count += 1
+        for q, p, _ in items:
+            total_sales += q * p
+        total_items += len(items)
+    return {"transactions": count, "total_sales": total_sales, "total_items": total_items}
+
+
+def log_filter_full_load(lines):
+    """Încarcă toate liniile și aplică expresia regulată pe fiecare."""
+    data = list(lines)
+    errors = []
+    for line in data:
+        match = ERROR_LINE_PATTERN.match(line)
+        if match:
+            errors.append(match.group(3))
+    return {"lines": len(data), "regex_calls": len(data), "error_lines": len(errors)}
+
+
+def log_filter_streaming(lines):
+    """Parcurge liniile în flux; regex doar pe liniile care conțin 'ERROR'."""
+    count = regex_calls = 0
+    errors = []
+    for line in lines:
+        count += 1
+        if "ERROR" in line:
+            regex_calls += 1
+            match = ERROR_LINE_PATTERN.match(line)
+            if match:
+                errors.append(match.group(3))
+    return {"lines": count, "regex_calls": regex_calls, "error_lines": len(errors)}
+
+
+def _sort_setup(params, seed):
+    buf, size = make_record_buffer(int(params["s1_N"]), params["s1_avg_rec_size"], seed)
+    return lambda: (bytearray(buf), int(params["s1_N"]), size)
+
+
+def _sales_setup(params, seed):
+    transactions = list(iter_transactions(params["s2_N_trans"], params["s2_avg_items"], params["s2_trans_header_size"],
+                                          params["s2_item_size"], seed))
+    return lambda: (iter(transactions),)
+
+
+def _logs_setup(params, seed):
+    lines = list(iter_log_lines(params["s3_N_lines"], params["s3_avg_line_len"], params["s3_err_perc"],
+                                params["s3_err_msg_size"], seed))
+    return lambda: (iter(lines),)
+
+
+# Pentru fiecare scenariu: funcția care generează datele (o dată) și returnează funcția care
+# pregătește argumentele unei rulări, în afara măsurătorii; apoi implementările, în ordinea
+# modelelor din api_handler.SCENARIO_MODELS.
+SCENARIO_STRATEGIES = {
+    config.SCENARIU_SORTARE: (_sort_setup, [bubble_sort_records, quicksort_records, index_sort_records]),
+    config.SCENARIU_RAPORT_VANZARI: (_sales_setup, [sales_report_multi_pass, sales_report_single_pass]),
+    config.SCENARIU_FILTRARE_LOGURI: (_logs_setup, [log_filter_full_load, log_filter_streaming]),
+}
+
+
+# ==============================================================================
+# == MĂSURARE
+# ==============================================================================
+
+def measured_params(scenario, params, limits=None):
+    """Parametrii efectiv folosiți la măsurare (dimensiunea principală plafonată)."""
+    limits = MEASUREMENT_LIMITS if limits is None else limits
+    effective = {k: params.get(k, config.DEFAULT_INPUT_VALUES[k]) for k in api_handler.scenario_input_keys(scenario)}
+    for key, limit in limits.items():
+        if key in effective and limit:
+            effective[key] = min(int(effective[key]), int(limit))
+    return effective
+
+
+# tracemalloc este global procesului: măsurătorile de memorie ale sesiunilor nu se suprapun
+_tracemalloc_lock = threading.Lock()
+
+
+def measure_call(make_args, fn, repeats=1):
+    """
+    Rulează `fn(*make_args())` și măsoară timpul real, timpul CPU și memoria de vârf.
+
+    Timpii sunt minimul din `repeats` rulări fără tracemalloc; memoria de vârf
+    provine dintr-o rulare suplimentară cu tracemalloc activ, măsurată față de
+    memoria urmărită la început. Dacă urmărirea era deja pornită (ex:
+    config.PROFILE_ALLOCATIONS), ea rămâne pornită. tracemalloc vede toate firele,
+    deci pe un server cu mai multe sesiuni vârful poate include și alocările lor.
+    """
+    wall = cpu = float("inf")
+    counters = {}
+    for _ in range(max(1, repeats)):
+        args = make_args()
+        gc.collect()
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        counters = fn(*args)
+        wall = min(wall, time.perf_counter() - wall_start)
+        cpu = min(cpu, time.process_time() - cpu_start)
+    args = make_args()
+    gc.collect()
+    with _tracemalloc_lock:
+        tracing = tracemalloc.is_tracing()
+        if not tracing:
+            tracemalloc.start()
+        try:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            fn(*args)
+            peak = tracemalloc.get_traced_memory()[1] - base
+        finally:
+            if not tracing:
+                tracemalloc.stop()
+    return {"wall_s": wall, "cpu_s": cpu, "peak_bytes": float(max(peak, 0)), **counters}
+
+
+def measure_scenario(scenario, params, repeats=1, seed=0, limits=None):
+    """
+    Măsoară toate strategiile unui scenariu pe aceleași date sintetice.
+
+    Args:
+        scenario: Numele sau numărul scenariului.
+        params (dict): Valorile de intrare (cheile din config.DEFAULT_INPUT_VALUES).
+        repeats (int): Numărul de rulări pentru timpi (se păstrează minimul).
+        seed (int): Sămânța generatorului de date.
+        limits (dict): Plafoanele dimensiunii principale (implicit MEASUREMENT_LIMITS).
+
+    Returns:
+        tuple: (pd.DataFrame cu un rând per model: name, wall_s, cpu_s, peak_bytes și
+            contoarele strategiei; parametrii efectiv folosiți).
+    """
+    scenario = api_handler.resolve_scenario(scenario)
+    effective = measured_params(scenario, params, limits)
+    setup, strategies = SCENARIO_STRATEGIES[scenario]
+    make_args = setup(effective, seed)
+    names = api_handler.scenario_costs(scenario, effective).model_names
+    rows = [{"name": name, **measure_call(make_args, fn, repeats)} for name, fn in zip(names, strategies)]
+    return pd.DataFrame(rows), effective
+
+
+def compare_with_model(scenario, measured, effective, kwh_cpu, kwh_data, gco2_factor):
+    """
+    Pune alături valorile măsurate și cele modelate (pe aceiași parametri).
+
+    Unitățile diferă (secunde vs. operații abstracte), deci comparația utilă este
+    cea relativă: fiecare metrică este raportată și ca multiplu al modelului standard.
+    """
+    modeled = api_handler.run_scenario_batch(scenario, effective, kwh_cpu, kwh_data, gco2_factor).to_pandas()
+    df = measured.merge(modeled[["name", "cpu_operations", "memory_usage_data_units", "estimated_kwh"]].astype({"name": str}), on="name")
+    for measured_col, modeled_col in (("cpu_s", "cpu_operations"), ("peak_bytes", "memory_usage_data_units")):
+        df[f"{measured_col}_rel"] = df[measured_col] / df[measured_col].iloc[0] if df[measured_col].iloc[0] > 0 else np.nan
+        df[f"{modeled_col}_rel"] = df[modeled_col] / df[modeled_col].iloc[0] if df[modeled_col].iloc[0] > 0 else np.nan
+    return df
@@ -0,0 +1,274 @@
+# montecarlo.py
+
+"""
+Propagarea incertitudinii (Monte Carlo) pentru estimările de energie și CO2.
+
+Constantele COST_PER_*, factorii hardware (kWh per operație CPU / per unitate de
+date) și intensitatea CO2 primesc distribuții (`Distribution`). Pentru fiecare
+eșantion, modelele scenariului sunt evaluate vectorizat: constantele sunt
+trecute ca array-uri prin `api_handler.override_cost_constants`, iar factorii
+prin `utils.calculate_energy_co2`. Eșantioanele se procesează în bucăți
+(`chunk_size`), astfel încât milioane de eșantioane rămân în memorie doar ca
+rezultate float32.
+
+Rezultatele sunt percentilele per model și probabilitatea ca fiecare model
+„verde” să aibă emisii mai mici decât modelul standard pe același eșantion.
+`sweep_bands` produce benzile de încredere pentru graficele de scalabilitate.
+
+Exemplu CLI:
+    python montecarlo.py --scenario 3 --samples 1000000
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+import api_handler
+import config
+import utils
+
+DEFAULT_N_SAMPLES = 100_000
+DEFAULT_CHUNK_SIZE = 100_000
+DEFAULT_PERCENTILES = (5, 50, 95)
+# Incertitudinea implicită: sigma lognormal pentru constantele de cost relative
+# (≈ factor 2 la 95%) și pentru factorii hardware (≈ factor 2.7), abaterea
+# relativă a intensității CO2 a rețelei.
+COST_CONSTANT_SIGMA = 0.35
+HARDWARE_FACTOR_SIGMA = 0.5
+CO2_RELATIVE_STD = 0.15
+# Constanta care definește unitatea de cost CPU; incertitudinea ei este inclusă în kwh_per_cpu_op
+UNIT_COST_CONSTANT = "COST_PER_COMPARISON_CPU"
+METRICS = ("cpu_operations", "estimated_kwh", "estimated_co2_g")
+
+
+# ==============================================================================
+# == DISTRIBUȚII
+# ==============================================================================
+
+class Distribution:
+    """O distribuție univariată pentru o intrare incertă (valori nenegative)."""
+
+    KINDS = ("fixed", "uniform", "normal", "lognormal", "triangular")
+    __slots__ = ("kind", "params")
+
+    def __init__(self, kind, **params):
+        if kind not in self.KINDS:
+            raise ValueError(f"Tip de distribuție necunoscut: {kind!r} (opțiuni: {', '.join(self.KINDS)})")
+        self.kind = kind
+        self.params = params
+
+    @classmethod
+    def fixed(cls, value):
+        return cls("fixed", value=float(value))
+
+    @classmethod
+    def uniform(cls, low, high):
+        return cls("uniform", low=float(low), high=float(high))
+
+    @classmethod
+    def normal(cls, mean, std):
+        """Normală trunchiată la 0 (factorii fizici nu pot fi negativi)."""
+        return cls("normal", mean=float(mean), std=float(std))
+
+    @classmethod
+    def lognormal(cls, median, sigma):
+        """Lognormală în jurul valorii nominale: factorul multiplicativ are deviația `sigma` în spațiul log."""
+        return cls("lognormal", median=float(median), sigma=float(sigma))
+
+    @classmethod
+    def triangular(cls, low, mode, high):
+        return cls("triangular", low=float(low), mode=float(mode), high=float(high))
+
+    def sample(self, rng, size):
+        p = self.params
+        if self.kind == "fixed":
+            return np.full(size, p["value"])
+        if self.kind == "uniform":
+            return rng.uniform(p["low"], p["high"], size)
+        if self.kind == "normal":
+            return np.maximum(rng.normal(p["mean"], p["std"], size), 0.0)
+        if self.kind == "lognormal":
+            return p["median"] * np.exp(rng.normal(0.0, p["sigma"], size))
+        return rng.triangular(p["low"], p["mode"], p["high"], size)
+
+    def __repr__(self):
+        return f"Distribution.{self.kind}({', '.join(f'{k}={v:g}' for k, v in self.params.items())})"
+
+
+def default_distributions(kwh_cpu, kwh_data, gco2_factor, cost_sigma=COST_CONSTANT_SIGMA,
+                          hardware_sigma=HARDWARE_FACTOR_SIGMA, co2_relative_std=CO2_RELATIVE_STD):
+    """
+    Distribuțiile implicite, centrate pe valorile nominale curente.
+
+    Returns:
+        dict: nume -> Distribution, pentru fiecare COST_PER_* (lognormal; unitatea de
+            cost rămâne fixă), "kwh_cpu", "kwh_data" (lognormal) și "gco2" (normal).
+    """
+    distributions = {}
+    for name in sorted(dir(config)):
+        if name.startswith("COST_PER_"):
+            value = getattr(config, name)
+            distributions[name] = Distribution.fixed(value) if name == UNIT_COST_CONSTANT else Distribution.lognormal(value, cost_sigma)
+    distributions["kwh_cpu"] = Distribution.lognormal(kwh_cpu, hardware_sigma)
+    distributions["kwh_data"] = Distribution.lognormal(kwh_data, hardware_sigma)
+    distributions["gco2"] = Distribution.normal(gco2_factor, co2_relative_std * gco2_factor)
+    return distributions
+
+
+def sample_inputs(distributions, size, rng):
+    """Extrage `size` eșantioane independente din fiecare distribuție (dict nume -> array)."""
+    return {name: dist.sample(rng, size) for name, dist in distributions.items()}
+
+
+# ==============================================================================
+# == SIMULARE
+# ==============================================================================
+
+def _simulate(scenario, params, draws):
+    """
+    Evaluează modelele scenariului pe un set de eșantioane.
+
+    Returns:
+        tuple: (numele modelelor, dict metrică -> array (modele x eșantioane)).
+    """
+    size = len(draws["kwh_cpu"])
+    constants = {name: values for name, values in draws.items() if name.startswith("COST_PER_")}
+    with api_handler.override_cost_constants(**constants):
+        costs = api_handler.scenario_costs(scenario, params, use_cache=False)
+    m = len(costs.model_names)
+    cpu = np.broadcast_to(costs["cpu_operations"].reshape(m, -1), (m, size))
+    data = np.broadcast_to(costs["data_movement_units"].reshape(m, -1), (m, size))
+    kwh, co2 = utils.calculate_energy_co2(cpu, data, draws["kwh_cpu"], draws["kwh_data"], draws["gco2"])
+    return costs.model_names, {"cpu_operations": cpu, "estimated_kwh": kwh, "estimated_co2_g": co2}
+
+
+def _scalar_params(scenario, params):
+    return {k: float(params.get(k, config.DEFAULT_INPUT_VALUES[k])) for k in api_handler.scenario_input_keys(scenario)}
+
+
+def _summarize(names, samples, percentiles):
+    """Un rând per model: media și percentilele fiecărei metrici, plus P(model < standard) pentru CO2."""
+    rows = []
+    standard_co2 = samples["estimated_co2_g"][0]
+    for i, name in enumerate(names):
+        row = {"name": name}
+        for metric in METRICS:
+            values = samples[metric][i]
+            row[f"{metric}_mean"] = float(values.mean(dtype=np.float64))
+            for q, value in zip(percentiles, np.percentile(values, percentiles)):
+                row[f"{metric}_p{q:g}"] = float(value)
+        row["prob_beats_standard"] = float(np.mean(samples["estimated_co2_g"][i] < standard_co2)) if i else np.nan
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def run_monte_carlo(scenario, params, distributions, n_samples=DEFAULT_N_SAMPLES, chunk_size=DEFAULT_CHUNK_SIZE,
+                    seed=0, percentiles=DEFAULT_PERCENTILES, return_samples=False):
+    """
+    Propagă incertitudinea prin modelele unui scenariu, pentru o configurație fixă.
+
+    Args:
+        scenario: Numele sau numărul scenariului.
+        params (dict): Valorile de intrare (scalari; lipsurile se completează cu valorile implicite).
+        distributions (dict): nume -> Distribution (vezi `default_distributions`); trebuie
+            să conțină "kwh_cpu", "kwh_data" și "gco2", iar constantele COST_PER_* lipsă rămân fixe.
+        n_samples (int): Numărul total de eșantioane.
+        chunk_size (int): Eșantioanele evaluate într-un singur apel vectorizat.
+        seed (int): Sămânța generatorului.
+        percentiles (tuple): Percentilele raportate.
+        return_samples (bool): Returnează și eșantioanele (float32, modele x eșantioane).
+
+    Returns:
+        pd.DataFrame sau tuple: Rezumatul per model (media, percentilele pentru
+            cpu_operations/estimated_kwh/estimated_co2_g și prob_beats_standard);
+            cu `return_samples`, perechea (rezumat, dict metrică -> array).
+    """
+    scenario = api_handler.resolve_scenario(scenario)
+    params = _scalar_params(scenario, params)
+    rng = np.random.default_rng(seed)
+    names, samples = None, None
+    for start in range(0, int(n_samples), int(chunk_size)):
+        size = min(int(chunk_size), int(n_samples) - start)
+        chunk_names, chunk = _simulate(scenario, params, sample_inputs(distributions, size, rng))
+        if samples is None:
+            names = chunk_names
+            samples = {metric: np.empty((len(names), int(n_samples)), dtype=np.float32) for metric in METRICS}
+        for metric in METRICS:
+            samples[metric][:, start:start + size] = chunk[metric]
+    summary = _summarize(names, samples, percentiles)
+    return (summary, samples) if return_samples else summary
+
+
+def sweep_bands(scenario, params, sweep_key, values, distributions, n_samples=2_000, seed=0, percentiles=DEFAULT_PERCENTILES):
+    """
+    Benzile de încredere pentru o analiză de scalabilitate: aceleași eșantioane
+    (numere aleatoare comune) sunt evaluate în fiecare punct, deci benzile sunt netede.
+
+    Returns:
+        pd.DataFrame: Un rând per (punct, model): `sweep_key`, name, percentilele
+            fiecărei metrici și prob_beats_standard.
+    """
+    scenario = api_handler.resolve_scenario(scenario)
+    draws = sample_inputs(distributions, int(n_samples), np.random.default_rng(seed))
+    frames = []
+    for value in np.asarray(values).tolist():
+        point = _scalar_params(scenario, {**params, sweep_key: value})
+        names, samples = _simulate(scenario, point, draws)
+        frame = _summarize(names, samples, percentiles)
+        frame.insert(0, sweep_key, value)
+        frames.append(frame)
+    return pd.concat(frames, ignore_index=True)
+
+
+# ==============================================================================
+# == GRAFICE
+# ==============================================================================
+
+def _rgba(color, alpha):
+    color = color.lstrip("#")
+    r, g, b = (int(color[i:i + 2], 16) for i in (0, 2, 4))
+    return f"rgba({r},{g},{b},{alpha})"
+
+
+def add_confidence_bands(fig, bands, x_col, metric, low=DEFAULT_PERCENTILES[0], high=DEFAULT_PERCENTILES[-1], alpha=0.2):
+    """
+    Adaugă benzile [p`low`, p`high`] ale unei metrici pe o figură plotly.express.line
+    (câte o bandă per model, în culoarea liniei modelului).
+    """
+    import plotly.graph_objects as go
+    colors = {trace.name: trace.line.color for trace in fig.data if getattr(trace, "line", None) is not None}
+    for name, group in bands.groupby("name", sort=False):
+        color = colors.get(name)
+        fill = _rgba(color, alpha) if isinstance(color, str) and color.startswith("#") else f"rgba(128,128,128,{alpha})"
+        group = group.sort_values(x_col)
+        fig.add_trace(go.Scatter(x=group[x_col], y=group[f"{metric}_p{high:g}"], mode="lines", line={"width": 0},
+                                 showlegend=False, hoverinfo="skip", legendgroup=name))
+        fig.add_trace(go.Scatter(x=group[x_col], y=group[f"{metric}_p{low:g}"], mode="lines", line={"width": 0},
+                                 fill="tonexty", fillcolor=fill, name=f"{name} (p{low:g}–p{high:g})",
+                                 showlegend=False, legendgroup=name))
+    return fig
+
+
+# ==============================================================================
+# == INTERFAȚĂ LINIE DE COMANDĂ
+# ==============================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Propagarea incertitudinii (Monte Carlo) pentru estimările unui scenariu.")
+    parser.add_argument("--scenario", required=True, help="Numărul (1-3) sau numele scenariului.")
+    parser.add_argument("--samples", type=int, default=DEFAULT_N_SAMPLES, help="Numărul de eșantioane.")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Eșantioane per evaluare vectorizată.")
+    parser.add_argument("--seed", type=int, default=0, help="Sămânța generatorului.")
+    parser.add_argument("--hardware", default=config.DEFAULT_HARDWARE_PROFILE_NAME, help="Profilul hardware nominal.")
+    parser.add_argument("--gco2", type=float, default=config.GCO2EQ_PER_KWH_DEFAULT, help="Intensitatea CO2 nominală (gCO2eq/kWh).")
+    args = parser.parse_args(argv)
+
+    profile = config.HARDWARE_PROFILES[args.hardware]
+    distributions = default_distributions(profile["kwh_per_cpu_op"], profile["kwh_per_data_move"], args.gco2)
+    summary = run_monte_carlo(args.scenario, config.DEFAULT_INPUT_VALUES, distributions, args.samples, args.chunk_size, args.seed)
+    columns = ["name"] + [f"estimated_co2_g_p{q:g}" for q in DEFAULT_PERCENTILES] + ["prob_beats_standard"]
+    print(summary[columns].to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+# profiling.py
+
+"""
+Instrumentarea etapelor unei rerulări (timp, alocări, apeluri) și istoricul ultimelor rerulări.
+
+Fiecare rerulare a scriptului Streamlit (sau orice altă unitate de lucru) este
+încadrată de `begin_rerun` / `end_rerun`. În interiorul ei, etapele marcate cu
+`stage("nume")` sau `@timed("nume")` (în app_streamlit, api_handler, utils)
+acumulează per rerulare:
+  - calls: numărul de apeluri;
+  - seconds: timpul total (wall clock);
+  - alloc_bytes: variația memoriei urmărite de tracemalloc, doar dacă urmărirea este
+    pornită (config.PROFILE_ALLOCATIONS), pentru că tracemalloc încetinește tot procesul.
+    Valoarea este la nivel de proces: include alocările altor fire (sesiuni) care
+    rulează în același timp, deci este exactă doar pentru o sesiune activă.
+`count("nume")` incrementează contoare simple (ex: hit-uri de cache).
+
+Rerularea curentă este per fir de execuție (Streamlit rulează fiecare sesiune pe
+firul ei), iar rerulările terminate intră într-un buffer circular comun procesului
+(config.PROFILING_BUFFER_SIZE). În afara unei rerulări, instrumentarea nu face nimic,
+deci modelele apelate din CLI sau din serviciul HTTP nu plătesc aproape nimic.
+
+Etapele imbricate se suprapun (timpul unei etape include etapele din interiorul ei).
+"""
+import json
+import threading
+import time
+import tracemalloc
+from collections import deque
+from functools import wraps
+
+import config
+
+_local = threading.local()
+_buffer = deque(maxlen=config.PROFILING_BUFFER_SIZE)
+_buffer_lock = threading.Lock()
+
+
+# ==============================================================================
+# == RERULĂRI
+# ==============================================================================
+
+def begin_rerun(label=""):
+    """
+    Începe înregistrarea unei rerulări pe firul curent. O rerulare neterminată (ex:
+    întreruptă de st.rerun() sau st.stop()) este abandonată fără a fi păstrată.
+    """
+    if config.PROFILE_ALLOCATIONS and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    trace = {"label": label, "started": time.time(), "seconds": 0.0, "stages": {}, "counters": {},
+             "_start": time.perf_counter()}
+    _local.trace = trace
+    return trace
+
+
+def end_rerun(label=None):
+    """Termină rerularea curentă și o adaugă în buffer. Returnează înregistrarea (sau None)."""
+    trace = getattr(_local, "trace", None)
+    if trace is None:
+        return None
+    _local.trace = None
+    if label is not None:
+        trace["label"] = label
+    trace["seconds"] = time.perf_counter() - trace.pop("_start")
+    with _buffer_lock:
+        _buffer.append(trace)
+    return trace
+
+
+def current_rerun():
+    return getattr(_local, "trace", None)
+
+
+def traces():
+    """Copie a rerulărilor din buffer, de la cea mai veche la cea mai nouă."""
+    with _buffer_lock:
+        return list(_buffer)
+
+
+def clear():
+    with _buffer_lock:
+        _buffer.clear()
+
+
+# ==============================================================================
+# == ETAPE ȘI CONTOARE
+# ==============================================================================
+
+class _Stage:
+    __slots__ = ("name", "trace", "start", "traced")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.trace = getattr(_local, "trace", None)
+        if self.trace is not None:
+            self.traced = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else None
+            self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        trace = self.trace
+        if trace is None:
+            return False
+        elapsed = time.perf_counter() - self.start
+        entry = trace["stages"].get(self.name)
+        if entry is None:
+            entry = trace["stages"][self.name] = {"calls": 0, "seconds": 0.0, "alloc_bytes": None}
+        entry["calls"] += 1
+        entry["seconds"] += elapsed
+        if self.traced is not None and tracemalloc.is_tracing():
+            entry["alloc_bytes"] = (entry["alloc_bytes"] or 0) + tracemalloc.get_traced_memory()[0] - self.traced
+        return False
+
+
+def stage(name):
+    """Context manager care măsoară o etapă a rerulării curente (nu face nimic în afara unei rerulări)."""
+    return _Stage(name)
+
+
+def timed(name):
+    """Decorator: fiecare apel al funcției este o etapă `name`."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if getattr(_local, "trace", None) is None:
+                return func(*args, **kwargs)
+            with _Stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def count(name, n=1):
+    """Incrementează contorul `name` al rerulării curente."""
+    trace = getattr(_local, "trace", None)
+    if trace is not None:
+        trace["counters"][name] = trace["counters"].get(name, 0) + n
+
+
+# ==============================================================================
+# == RAPOARTE
+# ==============================================================================
+
+def stage_summary(trace_list=None, percentiles=(50, 90, 99)):
+    """
+    Statistici per etapă peste rerulări (doar rerulările în care etapa a apărut).
+
+    Returns:
+        pd.DataFrame: stage, reruns, calls_mean, ms_p{q}..., ms_max, alloc_kb_mean
+            (NaN fără măsurători tracemalloc); ordonat după p50 descrescător.
+            Rândul "(rerulare)" descrie rerulările întregi.
+    """
+    import numpy as np
+    import pandas as pd
+    trace_list = traces() if trace_list is None else trace_list
+    samples = {"(rerulare)": [{"calls": 1, "seconds": t["seconds"], "alloc_bytes": None} for t in trace_list]}
+    for trace in trace_list:
+        for name, entry in trace["stages"].items():
+            samples.setdefault(name, []).append(entry)
+    rows = []
+    for name, entries in samples.items():
+        if not entries:
+            continue
+        ms = np.array([e["seconds"] for e in entries]) * 1000.0
+        row = {"stage": name, "reruns": len(entries), "calls_mean": float(np.mean([e["calls"] for e in entries]))}
+        row.update({f"ms_p{q}": float(np.percentile(ms, q)) for q in percentiles})
+        row["ms_max"] = float(ms.max())
+        traced = [e["alloc_bytes"] for e in entries if e["alloc_bytes"] is not None]
+        row["alloc_kb_mean"] = float(np.mean(traced)) / 1024.0 if traced else np.nan
+        rows.append(row)
+    df = pd.DataFrame(rows)
+    if df.empty:
+        return df
+    return df.sort_values(f"ms_p{percentiles[0]}", ascending=False, ignore_index=True)
+
+
+def counter_totals(trace_list=None):
+    """Suma contoarelor peste rerulări."""
+    totals = {}
+    for trace in traces() if trace_list is None else trace_list:
+        for name, value in trace["counters"].items():
+            totals[name] = totals.get(name, 0) + value
+    return totals
+
+
+def export_json(trace_list=None):
+    """Rerulările din buffer ca JSON (pentru descărcare și comparații ulterioare)."""
+    trace_list = traces() if trace_list is None else trace_list
+    return json.dumps({"generated": time.time(), "buffer_size": _buffer.maxlen, "reruns": trace_list}, ensure_ascii=False, indent=1)
@@ -0,0 +1,205 @@
+# results.py
+
+"""
+Tipurile de rezultat ale simulatorului.
+
+`ModelResult` este înregistrarea compactă (cu __slots__) pentru o singură
+evaluare a unui model, iar `ResultTable` este tabelul columnar (array-uri
+NumPy) cu o schemă fixă, folosit pentru rulări multiple, sweep-uri și export.
+Ambele înlocuiesc dicționarele ad-hoc returnate anterior de modele.
+"""
+import numpy as np
+
+# ==============================================================================
+# == SCHEMA FIXĂ
+# ==============================================================================
+# Coloanele numerice prezente în orice rezultat, în ordinea de afișare.
+NUMERIC_COLUMNS = (
+    "cpu_operations",
+    "data_movement_units",
+    "memory_usage_data_units",  # Memoria de vârf (unități abstracte)
+    "aux_memory_units",         # Memorie auxiliară (ex: stiva pentru Quicksort), 0 dacă nu e cazul
+    "estimated_kwh",
+    "estimated_co2_g",
+)
+# Coloanele descriptive (constante pentru un model).
+TEXT_COLUMNS = ("name", "complexity_cpu", "complexity_memory")
+
+
+class ModelResult:
+    """Rezultatul unei singure evaluări a unui model (schemă fixă, fără dicționar per instanță)."""
+
+    __slots__ = TEXT_COLUMNS + NUMERIC_COLUMNS
+
+    def __init__(self, name, cpu_operations=0.0, data_movement_units=0.0, memory_usage_data_units=0.0,
+                 aux_memory_units=0.0, estimated_kwh=0.0, estimated_co2_g=0.0,
+                 complexity_cpu="N/A", complexity_memory="N/A"):
+        self.name = name
+        self.cpu_operations = float(cpu_operations)
+        self.data_movement_units = float(data_movement_units)
+        self.memory_usage_data_units = float(memory_usage_data_units)
+        self.aux_memory_units = float(aux_memory_units)
+        self.estimated_kwh = float(estimated_kwh)
+        self.estimated_co2_g = float(estimated_co2_g)
+        self.complexity_cpu = complexity_cpu
+        self.complexity_memory = complexity_memory
+
+    def as_dict(self):
+        """Returnează rezultatul ca dicționar (ordinea coloanelor din schemă)."""
+        return {field: getattr(self, field) for field in ("name",) + NUMERIC_COLUMNS + ("complexity_cpu", "complexity_memory")}
+
+    def __repr__(self):
+        return f"ModelResult(name={self.name!r}, estimated_co2_g={self.estimated_co2_g!r})"
+
+    def __eq__(self, other):
+        if not isinstance(other, ModelResult):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in self.__slots__)
+
+
+class ResultTable:
+    """
+    Tabel columnar de rezultate, cu schemă fixă.
+
+    Numele modelelor sunt codificate ca dicționar (`model_codes` indexează
+    `model_names`), iar valorile numerice sunt array-uri float64 contigue.
+    Coloanele de parametri (ex: valoarea variată într-un sweep) sunt opționale
+    și se păstrează separat de schema fixă. O coloană de parametri poate fi
+    categorială: valorile sunt coduri întregi, iar etichetele stau în
+    `param_categories[coloană]`.
+    """
+
+    __slots__ = ("model_names", "model_codes", "columns", "param_columns", "complexity", "param_categories")
+
+    def __init__(self, model_names, model_codes, columns, param_columns=None, complexity=None, param_categories=None):
+        self.model_names = list(model_names)
+        self.model_codes = np.asarray(model_codes, dtype=np.int16)
+        n = len(self.model_codes)
+        self.columns = {}
+        for col in NUMERIC_COLUMNS:
+            values = columns.get(col)
+            self.columns[col] = np.zeros(n) if values is None else np.ascontiguousarray(values, dtype=np.float64).reshape(n)
+        self.param_columns = {k: np.asarray(v).reshape(n) for k, v in (param_columns or {}).items()}
+        # Complexitatea este o proprietate a modelului, nu a fiecărui rând: nume -> (cpu, memorie)
+        self.complexity = dict(complexity or {})
+        self.param_categories = {k: list(v) for k, v in (param_categories or {}).items() if k in self.param_columns}
+
+    # --- Construcție ---
+    @classmethod
+    def from_model(cls, name, complexity_cpu, complexity_memory, **columns):
+        """Construiește tabelul unui singur model din coloane (array-uri de orice formă, aplatizate)."""
+        arrays = {k: np.ravel(v) for k, v in columns.items()}
+        n = max((a.size for a in arrays.values()), default=0)
+        arrays = {k: np.broadcast_to(a, (n,)) if a.size != n else a for k, a in arrays.items()}
+        return cls([name], np.zeros(n, dtype=np.int16), arrays, complexity={name: (complexity_cpu, complexity_memory)})
+
+    @classmethod
+    def from_records(cls, records):
+        """Construiește tabelul dintr-o listă de `ModelResult`."""
+        names = list(dict.fromkeys(r.name for r in records))
+        code_of = {name: i for i, name in enumerate(names)}
+        columns = {col: np.fromiter((getattr(r, col) for r in records), dtype=np.float64, count=len(records)) for col in NUMERIC_COLUMNS}
+        complexity = {r.name: (r.complexity_cpu, r.complexity_memory) for r in records}
+        return cls(names, [code_of[r.name] for r in records], columns, complexity=complexity)
+
+    @classmethod
+    def concat(cls, tables):
+        """Concatenează mai multe tabele (ex: câte unul per model) într-unul singur."""
+        tables = list(tables)
+        names, complexity, codes = [], {}, []
+        for table in tables:
+            remap = np.empty(len(table.model_names), dtype=np.int16)
+            for i, name in enumerate(table.model_names):
+                if name not in complexity:
+                    names.append(name)
+                    complexity[name] = table.complexity.get(name, ("N/A", "N/A"))
+                remap[i] = names.index(name)
+            codes.append(remap[table.model_codes] if len(table) else table.model_codes)
+        param_keys = [k for k in (tables[0].param_columns if tables else {}) if all(k in t.param_columns for t in tables)]
+        return cls(
+            names,
+            np.concatenate(codes) if codes else np.empty(0, dtype=np.int16),
+            {col: np.concatenate([t.columns[col] for t in tables]) if tables else np.empty(0) for col in NUMERIC_COLUMNS},
+            param_columns={k: np.concatenate([t.param_columns[k] for t in tables]) for k in param_keys},
+            complexity=complexity,
+            param_categories=tables[0].param_categories if tables else None,
+        )
+
+    def with_params(self, categories=None, **params):
+        """
+        Returnează același tabel cu coloane de parametri atașate (valorile se repetă pentru fiecare model).
+        `categories` (opțional) mapează o coloană la lista de etichete pentru codurile ei.
+        """
+        n = len(self)
+        param_columns = dict(self.param_columns)
+        for key, values in params.items():
+            values = np.ravel(values)
+            param_columns[key] = values if values.size == n else np.resize(values, n)
+        param_categories = {**self.param_categories, **(categories or {})}
+        return ResultTable(self.model_names, self.model_codes, self.columns, param_columns, self.complexity, param_categories)
+
+    # --- Acces ---
+    def __len__(self):
+        return len(self.model_codes)
+
+    def __getitem__(self, column):
+        if column == "name":
+            return np.asarray(self.model_names, dtype=object)[self.model_codes]
+        if column in self.columns:
+            return self.columns[column]
+        return self.param_columns[column]
+
+    @property
+    def names(self):
+        """Numele modelului pentru fiecare rând."""
+        return self["name"]
+
+    def record(self, i):
+        """Rândul `i` ca `ModelResult`."""
+        name = self.model_names[self.model_codes[i]]
+        complexity_cpu, complexity_memory = self.complexity.get(name, ("N/A", "N/A"))
+        return ModelResult(name, complexity_cpu=complexity_cpu, complexity_memory=complexity_memory,
+                           **{col: self.columns[col][i] for col in NUMERIC_COLUMNS})
+
+    def records(self):
+        """Iterează rândurile ca `ModelResult`."""
+        return (self.record(i) for i in range(len(self)))
+
+    def content_hash(self):
+        """Amprentă (hex) a conținutului tabelului, utilă ca cheie de cache."""
+        import hashlib
+        h = hashlib.blake2b(digest_size=16)
+        h.update(repr((self.model_names, sorted(self.complexity.items()), sorted(self.param_categories.items()))).encode())
+        h.update(self.model_codes.tobytes())
+        for col, values in list(self.columns.items()) + sorted(self.param_columns.items()):
+            h.update(col.encode())
+            h.update(np.ascontiguousarray(values).tobytes())
+        return h.hexdigest()
+
+    # --- Conversii ---
+    def to_pandas(self, include_complexity=False):
+        """
+        Convertește tabelul într-un DataFrame fără a copia coloanele numerice.
+        Coloana `name` devine categorială (codurile sunt reutilizate).
+        """
+        import pandas as pd
+        data = {"name": pd.Categorical.from_codes(self.model_codes, categories=self.model_names)}
+        data.update(self.columns)
+        if include_complexity:
+            data["complexity_cpu"] = [self.complexity.get(n, ("N/A", "N/A"))[0] for n in self.names]
+            data["complexity_memory"] = [self.complexity.get(n, ("N/A", "N/A"))[1] for n in self.names]
+        for col, values in self.param_columns.items():
+            data[col] = pd.Categorical.from_codes(values, categories=self.param_categories[col]) if col in self.param_categories else values
+        return pd.DataFrame(data, copy=False)
+
+    def to_arrow(self):
+        """Convertește tabelul într-un `pyarrow.Table` (zero-copy pentru coloanele numerice)."""
+        import pyarrow as pa
+        data = {"name": pa.DictionaryArray.from_arrays(pa.array(self.model_codes), pa.array(self.model_names, type=pa.string()))}
+        data.update({col: pa.array(values) for col, values in self.columns.items()})
+        for col, values in self.param_columns.items():
+            if col in self.param_categories:
+                data[col] = pa.DictionaryArray.from_arrays(pa.array(values), pa.array(self.param_categories[col], type=pa.string()))
+            else:
+                data[col] = pa.array(values)
+        return pa.table(data)
@@ -0,0 +1,371 @@
+# sales_aggregation.py
+
+"""
+Motor real de agregare a vânzărilor pentru Scenariul 2.
+
+Datele sunt la nivel de item (un rând per item: id tranzacție, cantitate, preț),
+în CSV sau Parquet, cu itemii unei tranzacții pe rânduri consecutive (ca într-un
+export de comenzi). Sunt comparate două implementări:
+
+  - `aggregate_streaming` (modelul verde): citește record batch-uri pyarrow și
+    actualizează totalurile într-o singură trecere, cu memorie constantă
+    (un batch la un moment dat). Opțional, partițiile fișierului (grupuri de
+    rânduri Parquet sau intervale de octeți CSV, la granițe de linie) sunt
+    procesate în paralel, iar rezultatele parțiale se combină.
+  - `aggregate_pandas_multi_pass` (modelul standard): încarcă în pandas toate
+    rândurile (doar coloanele folosite), calculează totalul per tranzacție
+    (pasul 1), apoi agregă (pasul 2).
+
+`benchmark` rulează fiecare implementare într-un proces nou și raportează
+timpul și memoria (creșterea RSS-ului de vârf) per milion de rânduri.
+
+Exemplu CLI:
+    python sales_aggregation.py vanzari.parquet --workers 4
+    python sales_aggregation.py vanzari.csv --generate 2000000
+"""
+import argparse
+import csv
+import io
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+import api_handler
+import config
+import log_filter
+import sysinfo
+
+# Coloanele folosite: id tranzacție, cantitate, preț
+COLUMNS = ("transaction_id", "quantity", "price")
+DEFAULT_BATCH_ROWS = 256 * 1024
+CSV_BLOCK_BYTES = 16 * 1024 * 1024
+ENGINES = ("pandas", "streaming")
+
+
+# ==============================================================================
+# == CITIRE ÎN RECORD BATCH-URI
+# ==============================================================================
+
+def _is_parquet(path):
+    return os.path.splitext(path)[1].lower() in (".parquet", ".pq")
+
+
+class _RangeReader(io.RawIOBase):
+    """Fișier restrâns la intervalul de octeți [start, end) (o partiție CSV)."""
+
+    def __init__(self, path, start, end):
+        self._file = open(path, "rb")
+        self._file.seek(start)
+        self._left = end - start
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if self._left <= 0:
+            return 0
+        view = memoryview(buffer)[:min(len(buffer), self._left)]
+        n = self._file.readinto(view)
+        self._left -= n
+        return n
+
+    def close(self):
+        self._file.close()
+        super().close()
+
+
+def _csv_header(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return next(csv.reader(f))
+
+
+def partitions(path, parts):
+    """
+    Împarte fișierul în cel mult `parts` partiții: liste de grupuri de rânduri
+    (Parquet) sau intervale de octeți la granițe de linie (CSV).
+    """
+    if _is_parquet(path):
+        row_groups = np.arange(pq.ParquetFile(path).metadata.num_row_groups)
+        return [chunk.tolist() for chunk in np.array_split(row_groups, max(1, min(parts, len(row_groups)))) if len(chunk)]
+    return log_filter.split_ranges(path, parts)
+
+
+def iter_batches(path, columns=COLUMNS, batch_rows=DEFAULT_BATCH_ROWS, partition=None):
+    """
+    Generează record batch-uri cu `columns` din fișier (sau dintr-o partiție a lui).
+    Memoria folosită este cea a unui batch, indiferent de dimensiunea fișierului.
+    """
+    if _is_parquet(path):
+        parquet = pq.ParquetFile(path)
+        yield from parquet.iter_batches(batch_size=batch_rows, row_groups=partition, columns=list(columns))
+        return
+    start, end = partition if partition is not None else (0, os.path.getsize(path))
+    read_options = pa_csv.ReadOptions(column_names=_csv_header(path), skip_rows=1 if start == 0 else 0, block_size=CSV_BLOCK_BYTES)
+    convert_options = pa_csv.ConvertOptions(include_columns=list(columns))
+    with pa_csv.open_csv(io.BufferedReader(_RangeReader(path, start, end), CSV_BLOCK_BYTES),
+                         read_options=read_options, convert_options=convert_options) as reader:
+        yield from reader
+
+
+# ==============================================================================
+# == AGREGARE ÎNTR-O SINGURĂ TRECERE (STREAMING)
+# ==============================================================================
+
+def _empty_totals():
+    return {"rows": 0, "transactions": 0, "total_quantity": 0, "total_sales": 0.0, "first_id": None, "last_id": None}
+
+
+def update_totals(totals, batch, columns=COLUMNS):
+    """
+    Adaugă un record batch la totaluri (in-place). Tranzacțiile se numără ca
+    schimbări ale id-ului între rânduri consecutive, deci nu se reține niciun id
+    în afara ultimului.
+    """
+    n = batch.num_rows
+    if n == 0:
+        return totals
+    id_col, quantity_col, price_col = columns
+    ids = batch.column(id_col)
+    quantity = batch.column(quantity_col)
+    amount = pc.multiply(pc.cast(quantity, pa.float64()), pc.cast(batch.column(price_col), pa.float64()))
+    first, last = ids[0].as_py(), ids[n - 1].as_py()
+    changes = pc.sum(pc.not_equal(ids.slice(1), ids.slice(0, n - 1))).as_py() or 0 if n > 1 else 0
+    continues = totals["rows"] > 0 and first == totals["last_id"]
+    totals["transactions"] += changes + (0 if continues else 1)
+    totals["rows"] += n
+    totals["total_quantity"] += pc.sum(quantity).as_py() or 0
+    totals["total_sales"] += pc.sum(amount).as_py() or 0.0
+    if totals["first_id"] is None:
+        totals["first_id"] = first
+    totals["last_id"] = last
+    return totals
+
+
+def aggregate_partition(path, partition=None, columns=COLUMNS, batch_rows=DEFAULT_BATCH_ROWS):
+    """Totalurile unei partiții (sau ale întregului fișier, pentru partition=None)."""
+    totals = _empty_totals()
+    for batch in iter_batches(path, columns, batch_rows, partition):
+        update_totals(totals, batch, columns)
+    return totals
+
+
+def merge_totals(parts):
+    """Combină totalurile partițiilor consecutive; o tranzacție tăiată între două partiții se numără o dată."""
+    merged = _empty_totals()
+    for part in parts:
+        if part["rows"] == 0:
+            continue
+        continues = merged["rows"] > 0 and part["first_id"] == merged["last_id"]
+        merged["transactions"] += part["transactions"] - (1 if continues else 0)
+        for key in ("rows", "total_quantity", "total_sales"):
+            merged[key] += part[key]
+        if merged["first_id"] is None:
+            merged["first_id"] = part["first_id"]
+        merged["last_id"] = part["last_id"]
+    return merged
+
+
+def _public(totals):
+    return {key: totals[key] for key in ("rows", "transactions", "total_quantity", "total_sales")}
+
+
+def _partition_results(path, workers, columns, batch_rows, task=aggregate_partition):
+    """Rezultatele lui `task` pentru fiecare partiție (în procesul curent dacă există o singură partiție)."""
+    parts = partitions(path, workers) if workers > 1 else [None]
+    if len(parts) == 1:
+        return [task(path, parts[0], columns, batch_rows)]
+    with ProcessPoolExecutor(max_workers=len(parts)) as executor:
+        futures = [executor.submit(task, path, part, columns, batch_rows) for part in parts]
+        return [future.result() for future in futures]
+
+
+def aggregate_streaming(path, workers=1, columns=COLUMNS, batch_rows=DEFAULT_BATCH_ROWS):
+    """
+    Agregarea într-o singură trecere, opțional pe partiții în paralel.
+
+    Returns:
+        dict: rows, transactions, total_quantity, total_sales.
+    """
+    return _public(merge_totals(_partition_results(path, workers, columns, batch_rows)))
+
+
+# ==============================================================================
+# == REFERINȚA MULTI-PASS (PANDAS)
+# ==============================================================================
+
+def aggregate_pandas_multi_pass(path, workers=1, columns=COLUMNS, batch_rows=None):
+    """
+    Varianta standard: toate rândurile în memorie (doar `columns`, ca streaming-ul),
+    totaluri intermediare per tranzacție, apoi agregarea lor (`workers` și
+    `batch_rows` sunt ignorate, pentru semnătură comună).
+    """
+    id_col, quantity_col, price_col = columns
+    df = pd.read_parquet(path, columns=list(columns)) if _is_parquet(path) else pd.read_csv(path, usecols=list(columns))
+    # Pasul 1: totalul și numărul de itemi per tranzacție
+    per_transaction = pd.DataFrame({
+        "sales": df[quantity_col].astype(np.float64) * df[price_col].astype(np.float64),
+        "quantity": df[quantity_col],
+    }).groupby(df[id_col], sort=False).sum()
+    # Pasul 2: agregarea totalurilor intermediare
+    return {"rows": len(df), "transactions": len(per_transaction),
+            "total_quantity": int(per_transaction["quantity"].sum()), "total_sales": float(per_transaction["sales"].sum())}
+
+
+_ENGINE_FUNCTIONS = {"pandas": aggregate_pandas_multi_pass, "streaming": aggregate_streaming}
+
+
+# ==============================================================================
+# == MĂSURARE
+# ==============================================================================
+
+def _measured_partition(path, partition, columns, batch_rows):
+    """`aggregate_partition` într-un proces de lucru, cu momentele de start/sfârșit și RSS-ul procesului înainte și la vârf."""
+    rss_start = sysinfo.rss_bytes()
+    started = time.time()
+    totals = aggregate_partition(path, partition, columns, batch_rows)
+    return {**totals, "pid": os.getpid(), "started": started, "finished": time.time(),
+            "rss_start_bytes": rss_start, "peak_rss_bytes": sysinfo.peak_rss_bytes()}
+
+
+def _measure_in_child(engine, path, workers, columns, batch_rows):
+    rss_before = sysinfo.peak_rss_bytes()
+    started = time.perf_counter()
+    worker_delta = worker_baseline = 0.0
+    if engine == "streaming" and workers > 1:
+        parts = _partition_results(path, workers, columns, batch_rows, task=_measured_partition)
+        result = _public(merge_totals(parts))
+        total = time.perf_counter() - started
+        # Timpul de lucru: de la primul batch al primului proces până la ultimul rezultat, fără pornirea pool-ului
+        seconds = max(p["finished"] for p in parts) - min(p["started"] for p in parts)
+        by_pid = {}
+        for part in parts:
+            start, peak = by_pid.get(part["pid"], (float("inf"), 0.0))
+            by_pid[part["pid"]] = (min(start, part["rss_start_bytes"]), max(peak, part["peak_rss_bytes"]))
+        # RSS-ul proceselor de lucru după importuri (costul fix) este raportat separat de creșterea din timpul agregării
+        worker_baseline = sum(start for start, _ in by_pid.values())
+        worker_delta = sum(max(peak - start, 0.0) for start, peak in by_pid.values())
+    else:
+        result = _ENGINE_FUNCTIONS[engine](path, workers, columns, batch_rows)
+        seconds = total = time.perf_counter() - started
+    return {**result, "seconds": seconds, "pool_overhead_seconds": total - seconds,
+            "peak_rss_delta_bytes": sysinfo.peak_rss_bytes() - rss_before,
+            "worker_rss_delta_bytes": worker_delta, "worker_baseline_rss_bytes": worker_baseline,
+            "arrow_peak_bytes": float(pa.default_memory_pool().max_memory())}
+
+
+def measure_engine(engine, path, workers=1, columns=COLUMNS, batch_rows=DEFAULT_BATCH_ROWS):
+    """
+    Rulează o implementare într-un proces nou (spawn), ca memoria de vârf să nu
+    fie influențată de rulările anterioare.
+
+    Cu partiții în paralel, `seconds` începe la primul batch (după pornirea
+    proceselor de lucru), iar memoria per milion de rânduri cuprinde doar creșterea
+    RSS-ului fiecărui proces de lucru față de nivelul lui după importuri. Costurile
+    fixe ale paralelizării sunt raportate separat: pool_overhead_seconds și
+    worker_baseline_rss_bytes.
+
+    Returns:
+        dict: Totalurile, plus seconds, seconds_per_million_rows, pool_overhead_seconds,
+            peak_rss_delta_bytes (creșterea RSS-ului de vârf față de procesul gol),
+            worker_rss_delta_bytes, worker_baseline_rss_bytes și bytes_per_million_rows.
+    """
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+        row = executor.submit(_measure_in_child, engine, path, workers, columns, batch_rows).result()
+    millions = max(row["rows"], 1) / 1e6
+    memory = row["peak_rss_delta_bytes"] + row["worker_rss_delta_bytes"]
+    row.update(engine=engine, workers=workers, seconds_per_million_rows=row["seconds"] / millions,
+               bytes_per_million_rows=memory / millions)
+    return row
+
+
+def benchmark(path, engines=ENGINES, workers=1, columns=COLUMNS, batch_rows=DEFAULT_BATCH_ROWS):
+    """Măsoară implementările cerute pe același fișier (pd.DataFrame, un rând per implementare)."""
+    return pd.DataFrame([measure_engine(engine, path, workers if engine == "streaming" else 1, columns, batch_rows) for engine in engines])
+
+
+def compare_with_model(result, path, kwh_cpu, kwh_data, gco2_factor):
+    """
+    Estimările modelelor din Scenariul 2 pentru fișierul dat: N = tranzacții,
+    M = itemi per tranzacție, dimensiunea unui item = octeții fișierului per rând.
+    """
+    transactions = max(result["transactions"], 1)
+    params = {
+        "s2_N_trans": result["transactions"],
+        "s2_avg_items": result["rows"] / transactions,
+        "s2_trans_header_size": config.DEFAULT_INPUT_VALUES["s2_trans_header_size"],
+        "s2_item_size": os.path.getsize(path) / max(result["rows"], 1),
+    }
+    return api_handler.run_scenario_batch(config.SCENARIU_RAPORT_VANZARI, params, kwh_cpu, kwh_data, gco2_factor).to_pandas()
+
+
+# ==============================================================================
+# == DATE DE TEST
+# ==============================================================================
+
+def write_sample_dataset(path, n_transactions, avg_items=None, item_size=None, seed=0, chunk_transactions=200_000):
+    """
+    Scrie un set de date sintetic (CSV sau Parquet, după extensie), în bucăți,
+    cu aceleași distribuții ca measurement.iter_transactions și o coloană `note`
+    de `item_size` caractere care dă dimensiunea unui item.
+    """
+    defaults = config.DEFAULT_INPUT_VALUES
+    avg_items = int(avg_items if avg_items is not None else defaults["s2_avg_items"])
+    item_size = int(item_size if item_size is not None else defaults["s2_item_size"])
+    rng = np.random.default_rng(seed)
+    max_items = max(1, 2 * avg_items - 1)
+    schema = pa.schema([("transaction_id", pa.int64()), ("quantity", pa.int32()), ("price", pa.float64()), ("note", pa.string())])
+    writer = pq.ParquetWriter(path, schema, compression="zstd") if _is_parquet(path) else pa_csv.CSVWriter(path, schema)
+    try:
+        for start in range(0, int(n_transactions), chunk_transactions):
+            count = min(chunk_transactions, int(n_transactions) - start)
+            ids = np.repeat(np.arange(start, start + count, dtype=np.int64), rng.integers(1, max_items + 1, size=count))
+            writer.write_table(pa.table({
+                "transaction_id": ids,
+                "quantity": rng.integers(1, 10, size=len(ids)).astype(np.int32),
+                "price": rng.integers(100, 10_000, size=len(ids)) / 100.0,
+                "note": pa.repeat(pa.scalar("i" * max(item_size, 1)), len(ids)),
+            }, schema=schema))
+    finally:
+        writer.close()
+
+
+# ==============================================================================
+# == INTERFAȚĂ LINIE DE COMANDĂ
+# ==============================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Agregă vânzările dintr-un fișier CSV/Parquet: streaming (o trecere) vs. pandas (multi-pass).")
+    parser.add_argument("path", help="Fișierul cu itemi (.csv sau .parquet).")
+    parser.add_argument("--workers", type=int, default=1, help="Partiții procesate în paralel de varianta streaming.")
+    parser.add_argument("--batch-rows", type=int, default=DEFAULT_BATCH_ROWS, help="Rânduri per record batch (Parquet).")
+    parser.add_argument("--engine", choices=ENGINES, action="append", help="Implementările măsurate (implicit toate).")
+    parser.add_argument("--generate", type=int, default=None, metavar="N_TRANS", help="Generează întâi un set sintetic cu N_TRANS tranzacții la `path`.")
+    parser.add_argument("--hardware", default=config.DEFAULT_HARDWARE_PROFILE_NAME, help="Profilul hardware pentru estimarea modelului.")
+    args = parser.parse_args(argv)
+
+    if args.generate:
+        write_sample_dataset(args.path, args.generate)
+    df = benchmark(args.path, tuple(args.engine or ENGINES), args.workers, batch_rows=args.batch_rows)
+    df["MiB_per_million_rows"] = df["bytes_per_million_rows"] / 2**20
+    columns = ["engine", "workers", "rows", "transactions", "total_sales", "seconds", "seconds_per_million_rows", "MiB_per_million_rows"]
+    if args.workers > 1:
+        df["worker_baseline_MiB"] = df["worker_baseline_rss_bytes"] / 2**20
+        columns += ["pool_overhead_seconds", "worker_baseline_MiB"]
+    print(df[columns].to_string(index=False))
+
+    profile = config.HARDWARE_PROFILES[args.hardware]
+    modeled = compare_with_model(df.iloc[0], args.path, profile["kwh_per_cpu_op"], profile["kwh_per_data_move"], config.GCO2EQ_PER_KWH_DEFAULT)
+    print("\nEstimarea modelelor pentru parametrii deduși din fișier:")
+    print(modeled[["name", "cpu_operations", "data_movement_units", "memory_usage_data_units", "estimated_kwh"]].to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+# sensitivity.py
+
+"""
+Analiza globală de sensibilitate (indici Sobol) pentru modelele fiecărui scenariu.
+
+Spre deosebire de tab-ul „What-If” (un parametru variat, restul fixe), aici
+toate intrările variază simultan: parametrii scenariului, constantele COST_PER_*
+și factorii de conversie (kWh per operație / per unitate de date, gCO2/kWh).
+Fiecare intrare este eșantionată log-uniform într-un interval în jurul valorii
+curente (implicit [v/2, 2v]).
+
+Eșantionarea Saltelli folosește două matrice A, B (n x d) și cele d matrice
+AB_i (A cu coloana i din B), adică n*(d+2) evaluări, toate într-un singur apel
+vectorizat al modelelor (constantele ca array-uri, prin
+`api_handler.override_cost_constants`). Indicii se calculează cu estimatorii Jansen:
+    S_i  = 1 - E[(f(B) - f(AB_i))^2] / (2 Var)     (efectul de ordinul întâi)
+    ST_i = E[(f(A) - f(AB_i))^2] / (2 Var)         (efectul total, cu interacțiuni)
+
+Ieșirile analizate sunt emisiile CO2 ale fiecărui model și reducerea relativă a
+fiecărui model verde față de cel standard (1 - CO2_verde / CO2_standard), care
+arată ce parametri decid dacă varianta verde merită.
+
+Exemplu CLI:
+    python sensitivity.py --scenario 3 --samples 8192
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+import api_handler
+import config
+import utils
+
+DEFAULT_BASE_SAMPLES = 4096
+# Fiecare intrare variază log-uniform în [v / spread, v * spread]
+DEFAULT_SPREAD = 2.0
+# Limitele fizice ale unor parametri (ex: procentajul de erori)
+PARAMETER_LIMITS = {"s3_err_perc": (0.0, 100.0)}
+# Unitatea de cost CPU: variația ei este deja acoperită de kwh_cpu
+UNIT_COST_CONSTANT = "COST_PER_COMPARISON_CPU"
+
+
+# ==============================================================================
+# == INTERVALELE INTRĂRILOR
+# ==============================================================================
+
+def _interval(name, value, spread):
+    low, high = value / spread, value * spread
+    limit_low, limit_high = PARAMETER_LIMITS.get(name, (0.0, np.inf))
+    return max(low, limit_low), min(high, limit_high)
+
+
+def used_cost_constants(scenario, params):
+    """Constantele COST_PER_* de care depind modelele scenariului (fiecare este modificată, pe rând, într-o evaluare)."""
+    scenario = api_handler.resolve_scenario(scenario)
+    point = {k: params.get(k, config.DEFAULT_INPUT_VALUES[k]) for k in api_handler.scenario_input_keys(scenario)}
+    baseline = api_handler.scenario_costs(scenario, point, use_cache=False)["cpu_operations"]
+    used = []
+    for name in sorted(dir(config)):
+        if name.startswith("COST_PER_"):
+            with api_handler.override_cost_constants(**{name: 2.0 * getattr(config, name) + 1.0}):
+                if not np.array_equal(api_handler.scenario_costs(scenario, point)["cpu_operations"], baseline):
+                    used.append(name)
+    return used
+
+
+def default_bounds(scenario, params, kwh_cpu, kwh_data, gco2_factor, spread=DEFAULT_SPREAD,
+                   include_constants=True, include_factors=True):
+    """
+    Intervalele [min, max] ale intrărilor variate, în jurul valorilor curente.
+
+    Returns:
+        dict: nume -> (min, max), în ordinea: parametrii scenariului, constantele
+            COST_PER_* folosite de modelele scenariului, factorii de conversie. Intrările cu
+            valoare nepozitivă rămân fixe și nu apar.
+    """
+    scenario = api_handler.resolve_scenario(scenario)
+    nominal = {k: float(params.get(k, config.DEFAULT_INPUT_VALUES[k])) for k in api_handler.scenario_input_keys(scenario)}
+    if include_constants:
+        nominal.update((name, float(getattr(config, name))) for name in used_cost_constants(scenario, params)
+                       if name != UNIT_COST_CONSTANT)
+    if include_factors:
+        nominal.update(kwh_cpu=float(kwh_cpu), kwh_data=float(kwh_data), gco2=float(gco2_factor))
+    return {name: _interval(name, value, spread) for name, value in nominal.items() if value > 0}
+
+
+# ==============================================================================
+# == EȘANTIONARE SALTELLI ȘI EVALUARE
+# ==============================================================================
+
+def saltelli_design(n, d, rng):
+    """
+    Matricea de eșantionare în [0, 1): blocurile A, B, AB_1, ..., AB_d (fiecare n x d),
+    concatenate pe rânduri (n*(d+2) x d).
+    """
+    a = rng.random((n, d))
+    b = rng.random((n, d))
+    ab = np.repeat(a[None, :, :], d, axis=0)
+    ab[np.arange(d), :, np.arange(d)] = b.T
+    return np.concatenate([a, b, ab.reshape(d * n, d)])
+
+
+def _scale(unit, bounds):
+    """Transformă eșantioanele din [0, 1) în valori log-uniforme în intervalele date."""
+    low = np.array([b[0] for b in bounds.values()])
+    high = np.array([b[1] for b in bounds.values()])
+    return low * (high / low) ** unit
+
+
+def evaluate_co2(scenario, params, kwh_cpu, kwh_data, gco2_factor, samples):
+    """
+    Emisiile CO2 ale tuturor modelelor pentru un set de eșantioane.
+
+    Args:
+        samples (dict): nume -> array; numele pot fi chei de intrare, constante
+            COST_PER_* sau factori (kwh_cpu, kwh_data, gco2). Restul rămân la valorile date.
+
+    Returns:
+        tuple: (numele modelelor, array modele x eșantioane).
+    """
+    scenario = api_handler.resolve_scenario(scenario)
+    size = len(next(iter(samples.values())))
+    point = {k: samples.get(k, params.get(k, config.DEFAULT_INPUT_VALUES[k])) for k in api_handler.scenario_input_keys(scenario)}
+    constants = {k: v for k, v in samples.items() if k.startswith("COST_PER_")}
+    with api_handler.override_cost_constants(**constants):
+        costs = api_handler.scenario_costs(scenario, point, use_cache=False)
+    m = len(costs.model_names)
+    cpu = np.broadcast_to(costs["cpu_operations"].reshape(m, -1), (m, size))
+    data = np.broadcast_to(costs["data_movement_units"].reshape(m, -1), (m, size))
+    _, co2 = utils.calculate_energy_co2(cpu, data, samples.get("kwh_cpu", kwh_cpu), samples.get("kwh_data", kwh_data),
+                                        samples.get("gco2", gco2_factor))
+    return costs.model_names, np.broadcast_to(co2, (m, size))
+
+
+def jansen_indices(y, n, d):
+    """
+    Indicii Sobol de ordinul întâi și totali pentru ieșirile `y` pe designul Saltelli.
+
+    Args:
+        y (array): Valorile ieșirii, în ordinea din `saltelli_design` (n*(d+2)).
+
+    Returns:
+        tuple: (S1, ST), array-uri de lungime d (zero dacă ieșirea nu variază).
+    """
+    f_a, f_b = y[:n], y[n:2 * n]
+    f_ab = y[2 * n:].reshape(d, n)
+    variance = np.var(np.concatenate([f_a, f_b]))
+    if not np.isfinite(variance) or variance <= 0:
+        return np.zeros(d), np.zeros(d)
+    first = 1.0 - np.mean((f_b - f_ab) ** 2, axis=1) / (2.0 * variance)
+    total = np.mean((f_a - f_ab) ** 2, axis=1) / (2.0 * variance)
+    return first, total
+
+
+def sobol_indices(scenario, params, kwh_cpu, kwh_data, gco2_factor, bounds=None, n=DEFAULT_BASE_SAMPLES, seed=0):
+    """
+    Calculează indicii Sobol pentru emisiile fiecărui model și pentru reducerea
+    relativă a fiecărui model verde.
+
+    Args:
+        scenario: Numele sau numărul scenariului.
+        params (dict): Valorile curente ale intrărilor (centrul intervalelor).
+        kwh_cpu, kwh_data, gco2_factor: Factorii curenți de conversie.
+        bounds (dict): nume -> (min, max) (implicit `default_bounds`).
+        n (int): Eșantioanele de bază; totalul evaluărilor este n*(d+2).
+        seed (int): Sămânța generatorului.
+
+    Returns:
+        pd.DataFrame: Coloanele output, parameter, S1, ST, ordonate după ST descrescător per ieșire.
+    """
+    scenario = api_handler.resolve_scenario(scenario)
+    bounds = bounds if bounds is not None else default_bounds(scenario, params, kwh_cpu, kwh_data, gco2_factor)
+    names = list(bounds)
+    d = len(names)
+    values = _scale(saltelli_design(int(n), d, np.random.default_rng(seed)), bounds)
+    models, co2 = evaluate_co2(scenario, params, kwh_cpu, kwh_data, gco2_factor, {name: values[:, j] for j, name in enumerate(names)})
+
+    outputs = {f"CO2: {name}": co2[i] for i, name in enumerate(models)}
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for i in range(1, len(models)):
+            outputs[f"Reducere CO2: {models[i]}"] = np.where(co2[0] > 0, 1.0 - co2[i] / co2[0], 0.0)
+
+    frames = []
+    for output, y in outputs.items():
+        first, total = jansen_indices(np.asarray(y, dtype=np.float64), int(n), d)
+        frames.append(pd.DataFrame({"output": output, "parameter": names, "S1": first, "ST": total}).sort_values("ST", ascending=False))
+    return pd.concat(frames, ignore_index=True)
+
+
+# ==============================================================================
+# == INTERFAȚĂ LINIE DE COMANDĂ
+# ==============================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Indici Sobol (ordinul întâi și totali) pentru emisiile CO2 ale modelelor unui scenariu.")
+    parser.add_argument("--scenario", required=True, help="Numărul (1-3) sau numele scenariului.")
+    parser.add_argument("--samples", type=int, default=DEFAULT_BASE_SAMPLES, help="Eșantioanele de bază (evaluări = n*(d+2)).")
+    parser.add_argument("--spread", type=float, default=DEFAULT_SPREAD, help="Factorul intervalelor: [v/spread, v*spread].")
+    parser.add_argument("--seed", type=int, default=0, help="Sămânța generatorului.")
+    parser.add_argument("--hardware", default=config.DEFAULT_HARDWARE_PROFILE_NAME, help="Profilul hardware nominal.")
+    parser.add_argument("--gco2", type=float, default=config.GCO2EQ_PER_KWH_DEFAULT, help="Intensitatea CO2 nominală (gCO2eq/kWh).")
+    args = parser.parse_args(argv)
+
+    profile = config.HARDWARE_PROFILES[args.hardware]
+    kwh_cpu, kwh_data = profile["kwh_per_cpu_op"], profile["kwh_per_data_move"]
+    bounds = default_bounds(args.scenario, config.DEFAULT_INPUT_VALUES, kwh_cpu, kwh_data, args.gco2, args.spread)
+    df = sobol_indices(args.scenario, config.DEFAULT_INPUT_VALUES, kwh_cpu, kwh_data, args.gco2, bounds, args.samples, args.seed)
+    for output, group in df.groupby("output", sort=False):
+        print(f"\n{output}")
+        print(group[["parameter", "S1", "ST"]].to_string(index=False, float_format=lambda x: f"{x:.3f}"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+# shared_cache.py
+
+"""
+Cache-uri LRU la nivel de proces, comune tuturor sesiunilor, plafonate în octeți.
+
+Streamlit rulează toate sesiunile în același proces, deci un rezultat calculat
+pentru o sesiune (ex: rularea cu valorile implicite din config.DEFAULT_INPUT_VALUES)
+poate fi refolosit de toate celelalte. Fiecare cache are un nume, un plafon de
+memorie (config.SHARED_CACHE_LIMITS_MB) și contoare hits / misses / evictions;
+când suma dimensiunilor estimate depășește plafonul, intrările folosite cel mai
+demult sunt eliminate. Contoarele apar și în profilarea rerulării curente
+(`<nume>.hit` / `<nume>.miss`, vezi profiling.count).
+
+Valorile din cache sunt partajate între sesiuni și fire: cine le primește nu
+trebuie să le modifice (tabelele ResultTable din api_handler sunt read-only).
+Modulul este folosit fără Streamlit (CLI, serviciul HTTP), deci nu depinde de
+st.cache_resource.
+
+Cache-urile folosite:
+  - cost_cache: costurile abstracte per scenariu (api_handler.scenario_costs);
+  - result_cache: rezultatele cu energie/CO2, inclusiv sweep-urile (api_handler.run_scenario_batch);
+  - figure_cache: graficele construite de interfață;
+  - excel_cache: rapoartele Excel (utils.get_excel_export).
+"""
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+import config
+import profiling
+from results import ResultTable
+
+DEFAULT_LIMIT_MB = 32
+
+
+# ==============================================================================
+# == ESTIMAREA DIMENSIUNII
+# ==============================================================================
+
+def estimate_size(value, _seen=None):
+    """
+    Estimează memoria (octeți) ocupată de o valoare: array-uri NumPy, ResultTable,
+    DataFrame-uri, figuri Plotly, bytes și containerele lor. Obiectele comune
+    (același id) sunt numărate o singură dată.
+    """
+    seen = set() if _seen is None else _seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    if isinstance(value, np.ndarray):
+        # getsizeof include datele doar pentru array-urile care își dețin memoria
+        return sys.getsizeof(value) if value.base is None else value.nbytes
+    if isinstance(value, ResultTable):
+        arrays = [value.model_codes] + list(value.columns.values()) + list(value.param_columns.values())
+        return sys.getsizeof(value) + sum(estimate_size(a, seen) for a in arrays)
+    if isinstance(value, (bytes, bytearray, str)):
+        return sys.getsizeof(value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k, seen) + estimate_size(v, seen) for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(estimate_size(v, seen) for v in value)
+    if hasattr(value, "memory_usage") and hasattr(value, "columns"):  # pandas.DataFrame
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if hasattr(value, "to_plotly_json"):  # figură Plotly
+        return estimate_size(value.to_plotly_json(), seen)
+    return sys.getsizeof(value)
+
+
+# ==============================================================================
+# == CACHE-UL
+# ==============================================================================
+
+class SharedCache:
+    """
+    Cache LRU sigur pentru mai multe fire, plafonat în octeți.
+
+    Args:
+        name (str): Numele cache-ului (apare în statistici și în contoarele de profilare).
+        max_bytes (int): Plafonul de memorie; o valoare mai mare decât plafonul nu este păstrată.
+    """
+
+    def __init__(self, name, max_bytes):
+        self.name = name
+        self.max_bytes = int(max_bytes)
+        self._entries = OrderedDict()  # cheie -> (valoare, octeți)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, key, default=None):
+        """Valoarea pentru `key` (și o marchează ca folosită recent), sau `default`."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+            else:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+        profiling.count(f"{self.name}.miss" if entry is None else f"{self.name}.hit")
+        return default if entry is None else entry[0]
+
+    def put(self, key, value, size=None):
+        """Adaugă (sau înlocuiește) o valoare și elimină intrările vechi peste plafon. Returnează valoarea."""
+        size = estimate_size(value) if size is None else int(size)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            if size > self.max_bytes:
+                return value
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+                self._stats["evictions"] += 1
+        return value
+
+    def get_or_compute(self, key, compute, size=None):
+        """
+        Valoarea din cache sau `compute()`, păstrată apoi în cache. Două sesiuni care
+        cer simultan aceeași cheie pot calcula amândouă valoarea (fără blocare în timpul calculului).
+        """
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = self.put(key, compute(), size)
+        return value
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def info(self):
+        """Statisticile cache-ului: hits, misses, evictions, entries, bytes, max_bytes, hit_rate."""
+        with self._lock:
+            stats = dict(self._stats, entries=len(self._entries), bytes=self._bytes, max_bytes=self.max_bytes)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+    def clear(self):
+        """Golește cache-ul și îi resetează contoarele."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._stats.update(hits=0, misses=0, evictions=0)
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(name):
+    """Cache-ul partajat cu numele dat, creat la prima folosire cu plafonul din config.SHARED_CACHE_LIMITS_MB."""
+    with _caches_lock:
+        cache = _caches.get(name)
+        if cache is None:
+            limit_mb = config.SHARED_CACHE_LIMITS_MB.get(name, DEFAULT_LIMIT_MB)
+            cache = _caches[name] = SharedCache(name, limit_mb * 1024 * 1024)
+        return cache
+
+
+def cache_info():
+    """Statisticile tuturor cache-urilor create, după nume."""
+    with _caches_lock:
+        caches = list(_caches.values())
+    return {cache.name: cache.info() for cache in caches}
+
+
+def clear_all():
+    """Golește toate cache-urile partajate."""
+    with _caches_lock:
+        caches = list(_caches.values())
+    for cache in caches:
+        cache.clear()
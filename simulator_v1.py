@@ -1,17 +1,15 @@
 # simulator_v1.py
 
 import math # Pentru calcule cu log2 (logaritm în baza 2)
-import matplotlib.pyplot as plt # Importăm matplotlib
-import numpy as np # Importăm numpy pentru a ajuta la aranjarea barelor
+# matplotlib și numpy sunt importate doar în plot_results (încărcarea lor durează mult mai mult decât modelele)
 
 # --- 1. Definirea Unităților de Cost Abstracte (Acestea sunt valori ilustrative pe care le poți ajusta) ---
 # Acestea reprezintă unități abstracte de "muncă" sau "dimensiune".
 # Valorile absolute nu contează la fel de mult ca diferențele lor relative
 # și modul în care acestea scalează cu N.
 
-COST_PER_COMPARISON_CPU = 1          # "Operație" CPU pentru o comparație
-COST_PER_SWAP_FULL_RECORD_CPU = 5    # "Operații" CPU pentru interschimbarea a două înregistrări complete (implică mai mult decât o simplă comparație)
-COST_PER_SWAP_KEY_INDEX_CPU = 2      # "Operații" CPU pentru interschimbarea a două perechi mici cheie-index
+# Valorile sunt definite o singură dată, în config.py (eventual înlocuite de un profil calibrat).
+from config import COST_PER_COMPARISON_CPU, COST_PER_SWAP_FULL_RECORD_CPU, COST_PER_SWAP_KEY_INDEX_CPU
 
 # Unități de mișcare a datelor (de ex., ar putea fi "octeți" abstracți sau "cuvinte de memorie mutate")
 # Pentru simplitate, să spunem că mutarea unei înregistrări costă proporțional cu dimensiunea sa.
@@ -175,6 +173,9 @@ def plot_results(results_list):
     """
     Generează și afișează diagrame de bare pentru a compara rezultatele modelelor.
     """
+    import matplotlib.pyplot as plt
+    import numpy as np # Pentru aranjarea barelor
+
     model_names = [res['name'] for res in results_list]
     cpu_ops = [res['cpu_operations'] for res in results_list]
     data_movement = [res['data_movement_units'] for res in results_list]
@@ -283,37 +284,23 @@ if __name__ == "__main__":
 
 import streamlit as st
 import math
-import matplotlib.pyplot as plt
-import numpy as np
 import requests
 import os
 from datetime import datetime, timedelta
 import pandas as pd # Adăugat pentru tabelul de reduceri
 import plotly.express as px
 
-# --- Încărcare variabile de mediu din fișierul .env ---
-from dotenv import load_dotenv
-load_dotenv()
+# --- Variabilele de mediu din fișierul .env sunt încărcate de config.load_env() ---
+import config
+config.load_env()
 EM_API_KEY = os.getenv("EM_API_KEY")
 
 # --- 1. Definirea Unităților de Cost Abstracte și Profiluri Hardware ---
-COST_PER_COMPARISON_CPU = 1.0
-COST_PER_SWAP_FULL_RECORD_CPU = 5.0
-COST_PER_SWAP_KEY_INDEX_CPU = 2.0
-COST_PER_ARITHMETIC_OP_CPU = 0.5
-COST_PER_MEMORY_ACCESS_CPU = 0.1
-COST_PER_REGEX_MATCH_CPU = 10.0
-COST_PER_STRING_CHECK_CPU = 0.2
-
-HARDWARE_PROFILES = {
-    "Laptop Modern Eficient": {"kwh_per_cpu_op": 0.00000000008, "kwh_per_data_move": 0.00000000004, "description": "Consum redus."},
-    "Desktop Performant Mediu": {"kwh_per_cpu_op": 0.00000000012, "kwh_per_data_move": 0.00000000006, "description": "Echilibru."},
-    "Server Puternic (sau Desktop Gaming)": {"kwh_per_cpu_op": 0.00000000020, "kwh_per_data_move": 0.00000000010, "description": "Performanță maximă."},
-    "Dispozitiv IoT/Embeded (Consum Redus)": {"kwh_per_cpu_op": 0.00000000003, "kwh_per_data_move": 0.00000000002, "description": "Consum minim."},
-    "Cloud VM (General Purpose)": {"kwh_per_cpu_op": 0.00000000010, "kwh_per_data_move": 0.00000000005, "description": "VM Cloud general."}
-}
-DEFAULT_HARDWARE_PROFILE_NAME = "Desktop Performant Mediu"
-GCO2EQ_PER_KWH_DEFAULT = 275.0
+# Constantele și profilurile provin din config.py (o singură sursă, inclusiv profilul calibrat).
+from config import (COST_PER_COMPARISON_CPU, COST_PER_SWAP_FULL_RECORD_CPU, COST_PER_SWAP_KEY_INDEX_CPU,
+                    COST_PER_ARITHMETIC_OP_CPU, COST_PER_MEMORY_ACCESS_CPU, COST_PER_REGEX_MATCH_CPU,
+                    COST_PER_STRING_CHECK_CPU, HARDWARE_PROFILES, DEFAULT_HARDWARE_PROFILE_NAME,
+                    GCO2EQ_PER_KWH_DEFAULT)
 
 # --- Funcții Utilitare și Model ---
 @st.cache_data(ttl=24*3600)
@@ -0,0 +1,263 @@
+# sweep.py
+
+"""
+Motor de sweep pe o grilă multi-dimensională de parametri.
+
+Se pot varia oricare intrări ale unui scenariu (cheile din
+config.DEFAULT_INPUT_VALUES), plus profilul hardware (config.HARDWARE_PROFILES)
+și zona CO2 (config.HARDCODED_CO2_ZONES / Media UE). Produsul cartezian nu
+este materializat niciodată: punctele sunt generate din indicele plat, pe
+bucăți de dimensiune fixă, evaluate vectorizat (costurile abstracte o singură
+dată per combinație de parametri, apoi broadcast pe profil x zonă) și trimise mai departe ca
+`results.ResultTable` (sau scrise direct în Parquet/CSV).
+
+Exemplu CLI:
+    python sweep.py --scenario 1 --axis s1_N=1:5000000:2000 --axis s1_avg_rec_size=10,100,1000 \\
+        --hardware all --zones all --out grila.parquet
+"""
+import argparse
+import math
+import time
+
+import numpy as np
+
+import api_handler
+import config
+from results import ResultTable
+
+# Numele coloanelor pentru axele categoriale
+HARDWARE_AXIS = "hardware_profile"
+CO2_ZONE_AXIS = "co2_zone"
+# Numărul implicit de puncte din grilă evaluate simultan (limitează memoria de vârf)
+DEFAULT_CHUNK_POINTS = 250_000
+
+
+def co2_zone_factors():
+    """Zonele CO2 disponibile offline (fără API-ul live), ca nume -> gCO2eq/kWh."""
+    zones = {config.ZONE_MEDIA_UE: config.GCO2EQ_PER_KWH_DEFAULT}
+    zones.update({name: data["value"] for name, data in config.HARDCODED_CO2_ZONES.items()})
+    return zones
+
+
+def expand_values(spec):
+    """
+    Transformă o specificație de valori într-un array NumPy 1-D.
+
+    Acceptă o listă/tuple/array, un `range`, sau un dicționar cu cheile
+    `start`, `stop` și fie `num` (interval inclusiv, opțional `log: True`),
+    fie `step`. Cheia opțională `dtype` (ex: "int") rotunjește valorile.
+    """
+    if isinstance(spec, range):
+        return np.arange(spec.start, spec.stop, spec.step, dtype=np.int64)
+    if isinstance(spec, dict):
+        start, stop = spec["start"], spec["stop"]
+        if "num" in spec:
+            values = (np.geomspace if spec.get("log") else np.linspace)(start, stop, int(spec["num"]))
+        else:
+            values = np.arange(start, stop, spec.get("step", 1))
+        dtype = spec.get("dtype")
+        return np.unique(np.rint(values).astype(np.int64)) if dtype == "int" else values
+    values = np.atleast_1d(np.asarray(spec))
+    if values.ndim != 1 or values.size == 0:
+        raise ValueError(f"Specificație de valori invalidă: {spec!r}")
+    return values
+
+
+class ParameterGrid:
+    """
+    Produsul cartezian al axelor de parametri pentru un scenariu.
+
+    Args:
+        scenario: Numele sau numărul scenariului (vezi api_handler.resolve_scenario).
+        axes (dict): Cheie de intrare -> specificație de valori (vezi expand_values).
+        hardware_profiles (list): Nume din config.HARDWARE_PROFILES (implicit profilul implicit).
+        co2_zones (list): Nume din co2_zone_factors() (implicit Media UE).
+        base_params (dict): Valorile fixe pentru intrările care nu sunt variate.
+    """
+
+    def __init__(self, scenario, axes=None, hardware_profiles=None, co2_zones=None, base_params=None):
+        self.scenario = api_handler.resolve_scenario(scenario)
+        input_keys = api_handler.scenario_input_keys(self.scenario)
+        self.base_params = {k: config.DEFAULT_INPUT_VALUES[k] for k in input_keys}
+        self.base_params.update({k: v for k, v in (base_params or {}).items() if k in self.base_params})
+
+        self.axes = {}
+        for key, spec in (axes or {}).items():
+            if key not in input_keys:
+                raise ValueError(f"Parametrul '{key}' nu aparține scenariului '{self.scenario}'. Opțiuni: {input_keys}")
+            self.axes[key] = expand_values(spec)
+
+        self.hardware_profiles = list(hardware_profiles or [config.DEFAULT_HARDWARE_PROFILE_NAME])
+        unknown = [p for p in self.hardware_profiles if p not in config.HARDWARE_PROFILES]
+        if unknown:
+            raise ValueError(f"Profil hardware necunoscut: {unknown}")
+        zones = co2_zone_factors()
+        self.co2_zones = list(co2_zones or [config.ZONE_MEDIA_UE])
+        unknown = [z for z in self.co2_zones if z not in zones]
+        if unknown:
+            raise ValueError(f"Zonă CO2 necunoscută (sau indisponibilă offline): {unknown}")
+
+        self._kwh_cpu = np.array([config.HARDWARE_PROFILES[p]["kwh_per_cpu_op"] for p in self.hardware_profiles])
+        self._kwh_data = np.array([config.HARDWARE_PROFILES[p]["kwh_per_data_move"] for p in self.hardware_profiles])
+        self._gco2 = np.array([zones[z] for z in self.co2_zones])
+
+    @property
+    def shape(self):
+        """Forma grilei: axele de parametri, apoi profilul hardware și zona CO2."""
+        return tuple(len(v) for v in self.axes.values()) + (len(self.hardware_profiles), len(self.co2_zones))
+
+    @property
+    def size(self):
+        """Numărul total de puncte din grilă (fără a înmulți cu numărul de modele)."""
+        return math.prod(self.shape)
+
+    @property
+    def param_points(self):
+        """Numărul de combinații ale parametrilor de intrare (fără axele hardware/CO2)."""
+        return math.prod(self.shape[:-2])
+
+    def evaluate(self, start, stop):
+        """
+        Evaluează combinațiile de parametri cu indicii [start, stop), pentru toate
+        profilurile hardware și zonele CO2 ale grilei.
+
+        Costurile abstracte se calculează o singură dată per combinație de
+        parametri; energia și CO2 pentru toate profilurile x zonele rezultă
+        dintr-un singur broadcast (api_handler.energy_matrix).
+
+        Returns:
+            ResultTable: Rezultatele (model-major), cu coloanele de parametri variați,
+                `point_index`, `hardware_profile` și `co2_zone` (categoriale).
+        """
+        param_index = np.arange(start, stop, dtype=np.int64)
+        coords = np.unravel_index(param_index, self.shape[:-2]) if self.axes else ()
+        params = dict(self.base_params)
+        for (key, values), idx in zip(self.axes.items(), coords):
+            params[key] = values[idx]
+        # Bucățile unui sweep nu se repetă: nu le păstrăm în cache-ul de costuri
+        costs = api_handler.scenario_costs(self.scenario, params, use_cache=False)
+        kwh, co2 = api_handler.energy_matrix(costs, self._kwh_cpu, self._kwh_data, self._gco2)
+
+        m, n, P, Z = co2.shape
+        full = (m, n, P, Z)
+        columns = {col: np.broadcast_to(costs[col].reshape(m, n, 1, 1), full).ravel()
+                   for col in ("cpu_operations", "data_movement_units", "memory_usage_data_units", "aux_memory_units")}
+        columns["estimated_kwh"] = np.broadcast_to(kwh[..., None], full).ravel()
+        columns["estimated_co2_g"] = co2.ravel()
+
+        rows_per_model = n * P * Z
+        local = np.arange(rows_per_model, dtype=np.int64)
+        point_index = np.repeat(param_index, P * Z) * (P * Z) + local % (P * Z)
+        param_columns = {"point_index": point_index}
+        for (key, values), idx in zip(self.axes.items(), coords):
+            param_columns[key] = np.repeat(values[idx], P * Z)
+        param_columns[HARDWARE_AXIS] = ((local // Z) % P).astype(np.int16)
+        param_columns[CO2_ZONE_AXIS] = (local % Z).astype(np.int16)
+        table = ResultTable(costs.model_names, np.repeat(np.arange(m, dtype=np.int16), rows_per_model), columns, complexity=costs.complexity)
+        return table.with_params(categories={HARDWARE_AXIS: self.hardware_profiles, CO2_ZONE_AXIS: self.co2_zones}, **param_columns)
+
+    def iter_chunks(self, chunk_size=DEFAULT_CHUNK_POINTS):
+        """Generează rezultatele pe bucăți de cel mult `chunk_size` puncte (memorie mărginită)."""
+        per_param = len(self.hardware_profiles) * len(self.co2_zones)
+        step = max(1, int(chunk_size) // per_param)
+        for start in range(0, self.param_points, step):
+            yield self.evaluate(start, min(start + step, self.param_points))
+
+
+# ==============================================================================
+# == DESTINAȚII PENTRU REZULTATE
+# ==============================================================================
+
+def collect(grid, chunk_size=DEFAULT_CHUNK_POINTS):
+    """Evaluează întreaga grilă într-un singur ResultTable (doar pentru grile care încap în memorie)."""
+    return ResultTable.concat(grid.iter_chunks(chunk_size))
+
+
+def write_parquet(grid, path, chunk_size=DEFAULT_CHUNK_POINTS, compression="zstd"):
+    """Scrie grila în Parquet, un row group per bucată. Returnează numărul de rânduri scrise."""
+    import pyarrow.parquet as pq
+    writer, rows = None, 0
+    try:
+        for chunk in grid.iter_chunks(chunk_size):
+            table = chunk.to_arrow()
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema, compression=compression)
+            writer.write_table(table)
+            rows += table.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def write_csv(grid, path, chunk_size=DEFAULT_CHUNK_POINTS):
+    """Scrie grila în CSV, bucată cu bucată. Returnează numărul de rânduri scrise."""
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    writer, rows = None, 0
+    try:
+        for chunk in grid.iter_chunks(chunk_size):
+            table = chunk.to_arrow()
+            # CSV nu are tipuri dicționar: decodificăm coloanele categoriale
+            table = pa.table({name: col.cast(pa.string()) if pa.types.is_dictionary(col.type) else col for name, col in zip(table.column_names, table.columns)})
+            if writer is None:
+                writer = pacsv.CSVWriter(path, table.schema)
+            writer.write_table(table)
+            rows += table.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+# ==============================================================================
+# == INTERFAȚĂ LINIE DE COMANDĂ
+# ==============================================================================
+
+def parse_axis(text):
+    """
+    Interpretează o axă din linia de comandă: `cheie=a,b,c` (listă),
+    `cheie=start:stop:num` (interval liniar inclusiv) sau `cheie=log:start:stop:num`.
+    """
+    key, _, spec = text.partition("=")
+    if not spec:
+        raise argparse.ArgumentTypeError(f"Axă invalidă: {text!r} (format: cheie=valori)")
+    log = spec.startswith("log:")
+    parts = spec[4:].split(":") if log else spec.split(":")
+    if len(parts) == 3:
+        start, stop, num = float(parts[0]), float(parts[1]), int(parts[2])
+        integer = all(p.lstrip("-").isdigit() for p in parts[:2])
+        return key, {"start": start, "stop": stop, "num": num, "log": log, "dtype": "int" if integer else None}
+    return key, [float(v) for v in spec.split(",")]
+
+
+def _names_or_all(values, all_names):
+    if not values:
+        return None
+    return list(all_names) if values == ["all"] else values
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sweep pe grilă multi-dimensională pentru modelele simulatorului.")
+    parser.add_argument("--scenario", required=True, help="Numărul (1-3) sau numele scenariului.")
+    parser.add_argument("--axis", action="append", type=parse_axis, default=[], help="Axă de variat, ex: s1_N=1:5000000:1000")
+    parser.add_argument("--hardware", nargs="+", help="Profiluri hardware (sau 'all').")
+    parser.add_argument("--zones", nargs="+", help="Zone CO2 (sau 'all').")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_POINTS)
+    parser.add_argument("--out", required=True, help="Fișier de ieșire (.parquet sau .csv).")
+    args = parser.parse_args(argv)
+
+    grid = ParameterGrid(
+        args.scenario, dict(args.axis),
+        hardware_profiles=_names_or_all(args.hardware, config.HARDWARE_PROFILES),
+        co2_zones=_names_or_all(args.zones, co2_zone_factors()),
+    )
+    print(f"Grilă {grid.shape} = {grid.size:,} puncte pentru '{grid.scenario}'")
+    started = time.perf_counter()
+    writer = write_csv if args.out.lower().endswith(".csv") else write_parquet
+    rows = writer(grid, args.out, args.chunk_size)
+    print(f"{rows:,} rânduri scrise în {args.out} în {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
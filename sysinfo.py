@@ -0,0 +1,41 @@
+# sysinfo.py
+
+"""
+Memoria procesului (RSS), pentru instrumentele de măsurare din linia de comandă
+(log_filter, sales_aggregation, load_test).
+
+`peak_rss_bytes` folosește getrusage: câmpul ru_maxrss este în KiB pe Linux și
+în octeți pe macOS, iar pe Windows (fără modulul resource) rezultatul este NaN.
+`rss_bytes` citește RSS-ul curent din /proc/self/statm (Linux); în rest, revine
+la vârful raportat de getrusage.
+"""
+import os
+import sys
+
+try:
+    import resource
+except ImportError:  # Windows: fără getrusage, RSS-ul de vârf nu este raportat
+    resource = None
+
+# ru_maxrss: octeți pe macOS, KiB pe Linux și celelalte sisteme Unix
+_MAXRSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+
+def peak_rss_bytes(children=False):
+    """
+    RSS-ul de vârf (octeți) al procesului curent sau, cu `children=True`, al celui
+    mai mare proces copil terminat și așteptat; NaN fără getrusage.
+    """
+    if resource is None:
+        return float("nan")
+    who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+    return float(resource.getrusage(who).ru_maxrss * _MAXRSS_UNIT)
+
+
+def rss_bytes():
+    """RSS-ul curent al procesului (Linux: /proc/self/statm; altfel vârful, vezi `peak_rss_bytes`)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return peak_rss_bytes()
@@ -0,0 +1,7 @@
+# tests/conftest.py
+
+"""Configurare comună: modulele simulatorului stau în rădăcina depozitului (fără pachet)."""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,144 @@
+# tests/test_api_client.py
+
+"""
+Clientul Electricity Maps (api_client) contra unui server local care imită API-ul:
+reîncercări, single-flight, rezerva expirată din cache și răspunsuri malformate.
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from tenacity import wait_none
+
+import api_client
+
+
+class StubServer:
+    """Server HTTP local: răspunde cu (status, corp, întârziere) din `responses`; ultimul se repetă."""
+
+    def __init__(self):
+        self.responses = [(200, {"carbonIntensity": 250}, 0.0)]
+        self.requests = 0
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with stub._lock:
+                    stub.requests += 1
+                    status, body, delay = stub.responses[0] if len(stub.responses) == 1 else stub.responses.pop(0)
+                time.sleep(delay)
+                data = body.encode() if isinstance(body, str) else json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub():
+    server = StubServer()
+    yield server
+    server.close()
+
+
+def _client(stub, cache=None, max_attempts=3):
+    return api_client.CarbonIntensityClient(api_key="test", base_url=stub.url, timeout=(1.0, 2.0),
+                                            max_attempts=max_attempts, cache=cache)
+
+
+def test_retries_transient_errors(stub, monkeypatch):
+    monkeypatch.setattr(api_client, "wait_exponential_jitter", lambda **kwargs: wait_none())
+    stub.responses = [(503, {}, 0.0), (429, {}, 0.0), (200, {"carbonIntensity": 312.5}, 0.0)]
+    assert _client(stub).get("RO") == 312.5
+    assert stub.requests == 3
+
+
+def test_does_not_retry_client_errors(stub):
+    stub.responses = [(401, {}, 0.0)]
+    with pytest.raises(api_client.CarbonIntensityError):
+        _client(stub).get("RO")
+    assert stub.requests == 1
+
+
+def test_concurrent_calls_share_one_request(stub):
+    stub.responses = [(200, {"carbonIntensity": 250}, 0.3)]
+    client = _client(stub)
+    barrier = threading.Barrier(8)
+    results = []
+
+    def call():
+        barrier.wait()
+        results.append(client.get("RO"))
+
+    threads = [threading.Thread(target=call) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [250.0] * 8
+    assert stub.requests == 1
+    assert client.stats["deduplicated"] == 7
+
+
+def test_fresh_cache_skips_the_request(stub, tmp_path):
+    cache = api_client.DiskTTLCache(str(tmp_path / "carbon.json"), ttl=3600)
+    cache.set("RO", 199.0)
+    assert _client(stub, cache).get("RO") == 199.0
+    assert stub.requests == 0
+
+
+def test_stale_value_is_used_when_the_api_fails(stub, tmp_path):
+    cache = api_client.DiskTTLCache(str(tmp_path / "carbon.json"), ttl=0)
+    cache.set("RO", 180.0)
+    stub.responses = [(500, {}, 0.0)]
+    client = _client(stub, cache, max_attempts=1)
+    assert client.get("RO") == 180.0
+    assert client.stats["stale_hits"] == 1
+    with pytest.raises(api_client.CarbonIntensityError):
+        client.get("RO", allow_stale=False)
+
+
+@pytest.mark.parametrize("body", [
+    "nu este json",
+    [1, 2],
+    {},
+    {"carbonIntensity": None},
+    {"carbonIntensity": "abc"},
+    {"carbonIntensity": {"valoare": 1}},
+    {"carbonIntensity": True},
+    {"carbonIntensity": -5},
+])
+def test_malformed_bodies_raise_carbon_intensity_error(stub, body):
+    stub.responses = [(200, body, 0.0)]
+    with pytest.raises(api_client.CarbonIntensityError):
+        _client(stub).get("RO")
+
+
+def test_malformed_body_falls_back_to_stale_value(stub, tmp_path):
+    cache = api_client.DiskTTLCache(str(tmp_path / "carbon.json"), ttl=0)
+    cache.set("RO", 210.0)
+    stub.responses = [(200, [1, 2], 0.0)]
+    assert _client(stub, cache).get("RO") == 210.0
+
+
+def test_missing_api_key_raises(stub):
+    client = api_client.CarbonIntensityClient(api_key="", base_url=stub.url)
+    with pytest.raises(api_client.CarbonIntensityError):
+        client.get("RO")
+    assert stub.requests == 0
@@ -0,0 +1,70 @@
+# tests/test_carbon_scheduler.py
+
+"""
+Planificarea după intensitatea carbonică: termenele lipsă (NaT) și cache-ul
+de medii glisante al profilului.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+import carbon_scheduler
+from carbon_scheduler import IntensityProfile, schedule_jobs
+
+
+def _profile():
+    # Minimul (10) este în ultimele două ore ale seriei
+    return IntensityProfile("2024-01-01", "1h", [300, 250, 200, 150, 100, 50, 10, 10])
+
+
+def test_missing_deadline_means_end_of_series():
+    profile = _profile()
+    deadlines = pd.to_datetime(["2024-01-01 04:00", None])
+    plan = schedule_jobs(profile, [1.0, 1.0], [2.0, 2.0], deadline=deadlines)
+    assert plan["feasible"].tolist() == [True, True]
+    assert plan["best_start"].iloc[0] == pd.Timestamp("2024-01-01 02:00")
+    assert plan["best_start"].iloc[1] == pd.Timestamp("2024-01-01 06:00")
+    expected = schedule_jobs(profile, [1.0], [2.0])
+    assert plan["best_emissions_g"].iloc[1] == expected["best_emissions_g"].iloc[0]
+
+
+def test_missing_earliest_means_start_of_series():
+    plan = schedule_jobs(_profile(), [1.0], [1.0], earliest=pd.to_datetime([None]))
+    assert bool(plan["feasible"].iloc[0])
+    assert plan["earliest_start"].iloc[0] == pd.Timestamp("2024-01-01 00:00")
+
+
+def test_emission_curve_with_missing_deadline():
+    curve = _profile().emission_curve(1.0, 2.0, deadline=pd.NaT)
+    assert len(curve) == 7
+    assert curve.index[-1] == pd.Timestamp("2024-01-01 06:00")
+
+
+def test_window_cache_is_bounded():
+    profile = IntensityProfile("2024-01-01", "1h", np.arange(1.0, 200.0))
+    for duration in range(1, 3 * carbon_scheduler.WINDOW_CACHE_SIZE):
+        means = profile.window_means(duration)
+        np.testing.assert_allclose(means[0], np.mean(np.arange(1.0, duration + 1.0)))
+    assert len(profile._window_cache) == carbon_scheduler.WINDOW_CACHE_SIZE
+    assert profile.window_means(1.0) is profile.window_means(1.0)
+
+
+def test_invalid_runtimes_are_reported_per_job():
+    plan = schedule_jobs(_profile(), [1.0, 1.0, 1.0, 1.0], [2.0, 0.0, np.nan, -1.0])
+    assert plan["invalid_runtime"].tolist() == [False, True, True, True]
+    assert plan["feasible"].tolist() == [True, False, False, False]
+    assert plan["best_start"].iloc[0] == pd.Timestamp("2024-01-01 06:00")
+
+
+def test_fractional_runtimes_use_exact_window_means():
+    profile = IntensityProfile("2024-01-01", "1h", np.random.default_rng(0).uniform(50, 400, 200))
+    runtimes = np.array([0.5, 1.25, 2.0, 2.75, 7.5])
+    plan = schedule_jobs(profile, np.ones(runtimes.size), runtimes)
+    for runtime, row in zip(runtimes, plan.itertuples()):
+        means = profile.window_means(runtime)
+        start = int((row.best_start - pd.Timestamp("2024-01-01")) / pd.Timedelta("1h"))
+        assert row.best_mean_intensity == pytest.approx(means[start])
+        assert row.earliest_emissions_g == pytest.approx(means[0])
+        # Startul este ales pe ferestre de pași întregi: aproape de optimul exact
+        assert row.best_mean_intensity <= means[0] + 1e-9
+        assert row.best_mean_intensity <= means.min() * 1.1
@@ -0,0 +1,126 @@
+# tests/test_energy_meter.py
+
+"""
+Contorul de energie (energy_meter) pe un arbore powercap fals: descoperirea
+domeniilor, revenirea la zero a contoarelor și excluderea pregătirii argumentelor.
+"""
+import pytest
+
+import config
+import energy_meter
+from energy_meter import EnergyMeter, EnergyMeterError, discover_domains
+
+
+def _write_zone(root, zone_id, name, energy_uj, max_range_uj=1_000_000):
+    zone = root / zone_id
+    zone.mkdir()
+    (zone / "name").write_text(f"{name}\n")
+    (zone / "energy_uj").write_text(f"{energy_uj}\n")
+    (zone / "max_energy_range_uj").write_text(f"{max_range_uj}\n")
+    return zone
+
+
+def _set(zone, energy_uj):
+    (zone / "energy_uj").write_text(f"{energy_uj}\n")
+
+
+def _add(zone, delta_uj, max_range_uj=1_000_000):
+    current = int((zone / "energy_uj").read_text())
+    _set(zone, (current + delta_uj) % max_range_uj)
+
+
+@pytest.fixture
+def powercap(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "POWERCAP_ROOT", str(tmp_path))
+    return tmp_path
+
+
+def test_discovers_default_domains(powercap):
+    _write_zone(powercap, "intel-rapl:0", "package-0", 10)
+    _write_zone(powercap, "intel-rapl:0:0", "core", 5)
+    _write_zone(powercap, "intel-rapl:0:1", "dram", 7)
+    (powercap / "intel-rapl:9").mkdir()  # fără energy_uj: ignorat
+    assert [d.name for d in discover_domains()] == ["package-0", "dram@intel-rapl:0:1"]
+    assert len(discover_domains(include=None)) == 3
+
+
+def test_missing_tree_raises(powercap):
+    with pytest.raises(EnergyMeterError):
+        EnergyMeter()
+
+
+def test_unreadable_counter_raises(powercap):
+    zone = _write_zone(powercap, "intel-rapl:0", "package-0", 10)
+    meter = EnergyMeter()
+    _set(zone, "ilizibil")
+    with pytest.raises(EnergyMeterError):
+        meter.domains[0].read_uj()
+
+
+def test_counter_wraparound(powercap):
+    zone = _write_zone(powercap, "intel-rapl:0", "package-0", 900_000)
+    meter = EnergyMeter(sample_interval=60)
+    meter.start()
+    _set(zone, 100_000)  # 100 000 µJ până la capăt + 100 000 după revenirea la zero
+    reading = meter.stop()
+    assert reading.joules_by_domain == {"package-0": 0.2}
+
+
+def test_wraparound_between_samples(powercap):
+    zone = _write_zone(powercap, "intel-rapl:0", "package-0", 0)
+    meter = EnergyMeter(sample_interval=60)
+    meter.start()
+    for _ in range(5):  # 5 x 0,6 J: contorul revine la zero de trei ori, o dată între două citiri
+        _add(zone, 600_000)
+        meter._sample()
+    reading = meter.stop()
+    assert reading.total_joules == pytest.approx(3.0)
+
+
+def test_idle_power_is_subtracted(powercap):
+    zone = _write_zone(powercap, "intel-rapl:0", "package-0", 0)
+    meter = EnergyMeter(sample_interval=60, idle_watts=1.0)
+    meter.start()
+    _add(zone, 500_000)
+    reading = meter.stop()
+    assert reading.net_joules == pytest.approx(0.5 - reading.duration_s)
+
+
+def test_measure_excludes_argument_setup(powercap):
+    zone = _write_zone(powercap, "intel-rapl:0", "package-0", 0)
+    meter = EnergyMeter(sample_interval=60)
+
+    def make_args():
+        _add(zone, 50_000)  # energia pregătirii datelor nu trebuie atribuită sarcinii
+        return (1_000,)
+
+    reading = meter.measure(lambda uj: _add(zone, uj), min_duration=0.0, make_args=make_args)
+    assert reading.calls == 1
+    assert reading.total_joules == pytest.approx(0.001)
+
+
+def test_measure_repeats_until_min_duration(powercap, monkeypatch):
+    zone = _write_zone(powercap, "intel-rapl:0", "package-0", 0)
+    monkeypatch.setattr(energy_meter, "MAX_PREPARED_CALLS", 20)
+    meter = EnergyMeter(sample_interval=60)
+    reading = meter.measure(lambda uj: _add(zone, uj), min_duration=10.0, make_args=lambda: (1_000,))
+    assert reading.calls == 20
+    assert reading.net_joules_per_call == pytest.approx(0.001)
+
+
+def test_measure_consumes_lazy_arguments_before_metering(powercap):
+    zone = _write_zone(powercap, "intel-rapl:0", "package-0", 0)
+    meter = EnergyMeter(sample_interval=60)
+
+    def rows():
+        for _ in range(3):
+            _add(zone, 50_000)  # generarea fiecărui rând consumă energie
+            yield 1_000
+
+    def workload(items):
+        for uj in items:
+            _add(zone, uj)
+
+    reading = meter.measure(workload, min_duration=0.0, make_args=lambda: (rows(),))
+    assert reading.calls == 1
+    assert reading.total_joules == pytest.approx(0.003)
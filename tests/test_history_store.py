@@ -0,0 +1,66 @@
+# tests/test_history_store.py
+
+"""Istoricul persistent (history_store): versiuni și ferestre incrementale după ștergeri."""
+import pytest
+
+import api_handler
+import config
+import history_store
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = history_store.HistoryStore(str(tmp_path / "history.sqlite3"))
+    yield store
+    store.close()
+
+
+def _results():
+    params = {k: config.DEFAULT_INPUT_VALUES[k] for k in api_handler.scenario_input_keys(config.SCENARIU_SORTARE)}
+    return api_handler.run_scenario_batch(config.SCENARIU_SORTARE, params, 1e-9, 1e-9, 300.0)
+
+
+def _append(store, run_id):
+    store.append_run(run_id, "Sortare", config.DEFAULT_HARDWARE_PROFILE_NAME, config.ZONE_MEDIA_UE, 300.0, {"N": 1000}, _results())
+
+
+def test_version_changes_after_clear_and_refill(store):
+    _append(store, "A")
+    before = store.version()
+    store.clear()
+    _append(store, "B")
+    assert store.version() != before
+
+
+def test_refresh_view_reloads_after_clear(store):
+    _append(store, "A")
+    view = history_store.refresh_view({}, store)
+    store.clear()
+    _append(store, "B")
+    _append(store, "C")
+    view = history_store.refresh_view(view, store)
+    assert list(view["frame"]["ID Rulare"]) == ["B"] * 3 + ["C"] * 3
+    assert list(store.fetch()["ID Rulare"]) == ["B"] * 3 + ["C"] * 3
+
+
+def test_refresh_view_reads_only_new_rows(store):
+    _append(store, "A")
+    view = history_store.refresh_view({}, store)
+    _append(store, "B")
+    view = history_store.refresh_view(view, store)
+    assert list(view["frame"]["ID Rulare"]) == ["A"] * 3 + ["B"] * 3
+    assert view["rowid"] == store.last_rowid()
+
+
+def test_owners_only_see_and_clear_their_runs(store):
+    store.append_run("A", "Sortare", config.DEFAULT_HARDWARE_PROFILE_NAME, config.ZONE_MEDIA_UE, 300.0, {"N": 1000}, _results(), owner="ana")
+    store.append_run("B", "Sortare", config.DEFAULT_HARDWARE_PROFILE_NAME, config.ZONE_MEDIA_UE, 300.0, {"N": 1000}, _results(), owner="ion")
+    assert store.run_ids("ana") == ["A"]
+    assert set(store.fetch(owner="ion")["ID Rulare"]) == {"B"}
+    ion_version = store.version("ion")
+    store.clear("ana")
+    assert store.run_ids("ana") == []
+    assert store.run_ids("ion") == ["B"]
+    view = history_store.refresh_view({}, store, owner="ion")
+    assert list(view["frame"]["ID Rulare"]) == ["B"] * 3
+    assert store.version("ion") != ion_version  # orice ștergere schimbă generația
@@ -0,0 +1,37 @@
+# tests/test_http_service.py
+
+"""Validarea cererilor /evaluate (http_service.prepare_request): corpurile invalide dau ValueError (400)."""
+import numpy as np
+import pytest
+
+import config
+import http_service
+
+
+@pytest.fixture(scope="module")
+def target():
+    return http_service.build_targets()["1"]
+
+
+@pytest.mark.parametrize("body", [
+    [],
+    {"params": [1]},
+    {"params": {"necunoscut": 1}},
+    {"params": {"s1_N": {"a": 1}}},
+    {"params": {"s1_N": "abc"}},
+    {"hardware_profile": [["Laptop"]]},
+    {"hardware_profile": "Inexistent"},
+    {"co2_zone": {"a": 1}},
+    {"gco2_per_kwh": {}},
+    {"params": {"s1_N": [1, 2], "s1_avg_rec_size": [1, 2, 3]}},
+])
+def test_invalid_bodies_raise_value_error(target, body):
+    with pytest.raises(ValueError):
+        http_service.prepare_request(target, body)
+
+
+def test_valid_body_broadcasts_lists(target):
+    prepared = http_service.prepare_request(target, {"params": {"s1_N": [10, 20, 30]}, "gco2_per_kwh": 250})
+    assert prepared["s1_N"].tolist() == [10, 20, 30]
+    assert prepared["s1_avg_rec_size"].tolist() == [config.DEFAULT_INPUT_VALUES["s1_avg_rec_size"]] * 3
+    assert np.all(prepared["gco2"] == 250)
@@ -0,0 +1,46 @@
+# tests/test_index_sort.py
+
+"""
+Sortarea prin index (index_sort): corectitudinea strategiilor și octeții mutați
+numărați, separați de cei estimați.
+"""
+import math
+
+import numpy as np
+import pytest
+
+import index_sort
+
+
+def test_strategies_sort_and_count_record_moves():
+    source = index_sort.make_records(1_000, 40, seed=3)
+    expected = np.sort(source["key"])
+    for strategy in index_sort.STRATEGIES:
+        row = index_sort.measure_strategy(strategy, source)
+        assert row["sorted"]
+        assert row["estimated_bytes_moved"] > 0
+    full = index_sort.measure_strategy("full_record_sort", source)
+    assert math.isnan(full["bytes_moved"])
+    gathered, counters = index_sort.argsort_gather(source.copy())
+    assert counters["bytes_moved"] == 1_000 * 40
+    np.testing.assert_array_equal(gathered["key"], expected)
+
+
+def test_cycle_permute_counts_actual_moves():
+    records = index_sort.make_records(6, 16, seed=0)
+    records["key"] = [5, 0, 1, 2, 3, 4]  # un singur ciclu de lungime 6
+    payload = records["payload"].copy()
+    out, counters = index_sort.cycle_permute(records)
+    assert out["key"].tolist() == [0, 1, 2, 3, 4, 5]
+    # 5 mutări în ciclu + intrarea în temporar și ieșirea din el
+    assert counters["bytes_moved"] == 7 * 16
+    assert counters["cycles"] == 1
+    assert out["payload"].tolist() == payload[[1, 2, 3, 4, 5, 0]].tolist()
+
+
+def test_already_sorted_records_move_nothing():
+    records = index_sort.make_records(100, 16, seed=0)
+    records["key"] = np.arange(100, dtype=np.uint64)
+    _, counters = index_sort.cycle_permute(records)
+    assert counters["bytes_moved"] == 0
+    assert counters["estimated_bytes_moved"] == pytest.approx(100 * math.log2(100) / 2 * index_sort.KEY_INDEX_BYTES * 2)
@@ -0,0 +1,92 @@
+# tests/test_log_filter.py
+
+"""
+Filtrul de loguri (log_filter): împărțirea la granițe de linie și contoarele
+independente de numărul de procese și de dimensiunea blocurilor.
+"""
+import pytest
+
+import log_filter
+import measurement
+
+
+def _reference(path):
+    """Contoarele calculate linie cu linie, cu aceeași expresie regulată."""
+    with open(path, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    matched = [m for m in (measurement.ERROR_LINE_PATTERN.match(line) for line in lines) if m]
+    return {"lines": len(lines), "matched": len(matched), "message_bytes": sum(len(m.group(3)) for m in matched),
+            "candidates": sum("ERROR" in line for line in lines), "matched_lines": [m.group(0) for m in matched]}
+
+
+def _scan_all(path, parts, block_bytes, out_dir=None):
+    totals = {"bytes": 0, "lines": 0, "candidates": 0, "matched": 0, "message_bytes": 0}
+    matched_lines = []
+    for i, (start, end) in enumerate(log_filter.split_ranges(path, parts)):
+        out_path = str(out_dir / f"part{i}.log") if out_dir else None
+        stats = log_filter.scan_range(path, start, end, block_bytes, out_path)
+        for key in totals:
+            totals[key] += stats[key]
+        if out_path:
+            with open(out_path, encoding="utf-8") as f:
+                matched_lines += f.read().splitlines()
+    return totals, matched_lines
+
+
+@pytest.fixture(params=[True, False], ids=["cu-newline-final", "fara-newline-final"])
+def log_path(request, tmp_path):
+    path = tmp_path / "app.log"
+    log_filter.write_sample_log(str(path), 2_000, avg_line_len=60, err_perc=10, err_msg_size=20, seed=2)
+    # O linie foarte lungă, mai mare decât blocurile mici din teste
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("2024-01-01 00:00:00 ERROR [lung] " + "z" * 5_000 + "\n")
+        f.write("2024-01-01 00:00:01 ERROR [final] ultimul mesaj" + ("\n" if request.param else ""))
+    return str(path)
+
+
+def test_split_ranges_cover_the_file_at_line_boundaries(log_path):
+    with open(log_path, "rb") as f:
+        data = f.read()
+    for parts in (1, 2, 3, 7, 50):
+        ranges = log_filter.split_ranges(log_path, parts)
+        assert 1 <= len(ranges) <= parts
+        assert ranges[0][0] == 0 and ranges[-1][1] == len(data)
+        for (_, end), (start, _) in zip(ranges, ranges[1:]):
+            assert end == start
+            assert data[start - 1:start] == b"\n"
+
+
+@pytest.mark.parametrize("parts", [1, 2, 5])
+@pytest.mark.parametrize("block_bytes", [64, 1_000, log_filter.DEFAULT_BLOCK_BYTES])
+def test_counts_do_not_depend_on_parts_or_block_size(log_path, tmp_path, parts, block_bytes):
+    expected = _reference(log_path)
+    totals, matched_lines = _scan_all(log_path, parts, block_bytes, tmp_path)
+    assert totals["lines"] == expected["lines"]
+    assert totals["matched"] == expected["matched"]
+    assert totals["candidates"] == expected["candidates"]
+    assert totals["message_bytes"] == expected["message_bytes"]
+    assert matched_lines == expected["matched_lines"]
+
+
+def test_last_line_without_newline_is_counted(tmp_path):
+    path = tmp_path / "scurt.log"
+    path.write_bytes(b"2024-01-01 00:00:00 INFO [a] x\n2024-01-01 00:00:01 ERROR [b] mesaj")
+    stats = log_filter.scan_range(str(path), 0, path.stat().st_size, block_bytes=16)
+    assert (stats["lines"], stats["matched"], stats["message_bytes"]) == (2, 1, len("mesaj"))
+
+
+def test_empty_file(tmp_path):
+    path = tmp_path / "gol.log"
+    path.write_bytes(b"")
+    assert log_filter.split_ranges(str(path), 4) == [(0, 0)]
+    assert log_filter.filter_log(str(path))["lines"] == 0
+
+
+def test_filter_log_in_parallel_matches_single_process(log_path, tmp_path, monkeypatch):
+    single = log_filter.filter_log(log_path, workers=1, block_bytes=512, out_path=str(tmp_path / "unu.log"))
+    monkeypatch.setattr(log_filter, "MIN_BYTES_PER_WORKER", 1_024)
+    parallel = log_filter.filter_log(log_path, workers=3, block_bytes=512, out_path=str(tmp_path / "trei.log"))
+    assert parallel["workers"] == 3
+    for key in ("lines", "candidates", "matched", "message_bytes"):
+        assert parallel[key] == single[key]
+    assert (tmp_path / "trei.log").read_bytes() == (tmp_path / "unu.log").read_bytes()
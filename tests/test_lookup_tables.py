@@ -0,0 +1,88 @@
+# tests/test_lookup_tables.py
+
+"""
+Tabelele precalculate pentru scalabilitate (lookup_tables): interpolarea,
+acoperirea sweep-urilor și invalidarea la schimbarea constantelor de cost.
+"""
+import numpy as np
+import pytest
+
+import api_handler
+import config
+import lookup_tables
+
+RANGE = (1, 20_000)
+
+
+@pytest.fixture(scope="module")
+def tables_dir(tmp_path_factory):
+    directory = str(tmp_path_factory.mktemp("lookup_tables"))
+    lookup_tables.build(directory, value_range=RANGE, exact_upto=128, log_points=1_500, samples=2_000)
+    return directory
+
+
+@pytest.fixture
+def default_tables(tables_dir, monkeypatch):
+    monkeypatch.setattr(config, "LOOKUP_TABLES_DIR", tables_dir)
+    monkeypatch.setattr(lookup_tables, "_default_tables", None)
+    monkeypatch.setattr(lookup_tables, "_default_tables_loaded", False)
+    return lookup_tables.get_tables()
+
+
+def test_interpolate_reads_grid_points_exactly():
+    grid = np.array([1.0, 2.0, 4.0, 8.0])
+    values = np.array([[3.0, 5.0, 7.0, 11.0]])
+    np.testing.assert_allclose(lookup_tables.interpolate(grid, values, np.array([1.0, 4.0, 8.0])), [[3.0, 7.0, 11.0]])
+
+
+def test_interpolate_is_exact_for_power_laws_between_points():
+    grid = np.array([1.0, 10.0, 100.0, 1_000.0])
+    points = np.array([3.0, 42.0, 100.0, 777.0])
+    values = np.stack([grid ** 2, 5 * grid * np.log2(grid + 1)])
+    estimate = lookup_tables.interpolate(grid, values, points)
+    np.testing.assert_allclose(estimate[0], points ** 2)
+
+
+def test_interpolate_falls_back_to_linear_next_to_zero():
+    grid = np.array([1.0, 3.0, 5.0])
+    values = np.array([[0.0, 4.0, 8.0], [6.0, 0.0, 0.0]])
+    log_log = 4.0 * 2.0 ** (np.log(4 / 3) / np.log(5 / 3))  # ambii vecini > 0
+    np.testing.assert_allclose(lookup_tables.interpolate(grid, values, np.array([2.0, 4.0])), [[2.0, log_log], [3.0, 0.0]])
+
+
+@pytest.mark.parametrize("scenario", config.SCENARIO_OPTIONS)
+def test_run_sweep_matches_the_models(default_tables, scenario):
+    key = config.SCALING_PARAMS[scenario]["key"]
+    params = dict(config.DEFAULT_INPUT_VALUES)
+    params[key] = np.unique(np.round(np.geomspace(1, RANGE[1], 300)))
+    assert default_tables.covers(scenario, params, key)
+    table = lookup_tables.run_sweep(scenario, params, key, 1e-9, 2e-10, 300.0)
+    models = api_handler.run_scenario_batch(scenario, params, 1e-9, 2e-10, 300.0)
+    assert table.model_names == models.model_names
+    for column in ("cpu_operations", "data_movement_units", "estimated_kwh", "estimated_co2_g"):
+        np.testing.assert_allclose(table[column], models[column], rtol=config.LOOKUP_MAX_REL_ERROR)
+
+
+def test_uncovered_sweeps_are_rejected(default_tables):
+    scenario = config.SCENARIU_SORTARE
+    key = config.SCALING_PARAMS[scenario]["key"]
+    params = dict(config.DEFAULT_INPUT_VALUES, **{key: np.array([10.0, 20.0])})
+    assert default_tables.covers(scenario, params, key)
+    assert not default_tables.covers(scenario, dict(params, **{key: np.array([10.0, RANGE[1] + 1.0])}), key)
+    assert not default_tables.covers(scenario, dict(params, **{key: np.array([10.5])}), key)
+    assert not default_tables.covers(scenario, dict(params, s1_avg_rec_size=params["s1_avg_rec_size"] + 1), key)
+    assert not default_tables.covers(scenario, params, "s1_avg_rec_size")
+
+
+def test_changed_cost_constants_invalidate_the_tables(default_tables):
+    scenario = config.SCENARIU_SORTARE
+    key = config.SCALING_PARAMS[scenario]["key"]
+    params = dict(config.DEFAULT_INPUT_VALUES, **{key: np.array([10.0, 5_000.0])})
+    name = next(n for n in sorted(dir(config)) if n.startswith("COST_PER_"))
+    with api_handler.override_cost_constants(**{name: getattr(config, name) * 3}):
+        assert not default_tables.covers(scenario, params, key)
+        assert lookup_tables.sweep_costs(scenario, params, key) is None
+        swept = lookup_tables.run_sweep(scenario, params, key, 1e-9, 2e-10, 300.0)
+        np.testing.assert_allclose(swept["cpu_operations"],
+                                   api_handler.run_scenario_batch(scenario, params, 1e-9, 2e-10, 300.0)["cpu_operations"])
+    assert default_tables.covers(scenario, params, key)
@@ -0,0 +1,51 @@
+# tests/test_measurement.py
+
+"""Măsurarea strategiilor reale (measurement.measure_call)."""
+import tracemalloc
+
+import pytest
+
+import measurement
+
+
+def _allocate(size):
+    buffer = bytearray(size)
+    return {"bytes": len(buffer)}
+
+
+def test_measure_call_keeps_existing_tracing():
+    tracemalloc.start()
+    try:
+        result = measurement.measure_call(lambda: (1_000_000,), _allocate)
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+    assert result["peak_bytes"] >= 1_000_000
+
+
+def test_measure_call_stops_only_its_own_tracing():
+    assert not tracemalloc.is_tracing()
+    result = measurement.measure_call(lambda: (1_000_000,), _allocate)
+    assert not tracemalloc.is_tracing()
+    assert 1_000_000 <= result["peak_bytes"] < 2_000_000
+    assert result["bytes"] == 1_000_000
+
+
+def test_setup_generates_data_outside_the_measurement(monkeypatch):
+    params = measurement.measured_params(measurement.config.SCENARIU_RAPORT_VANZARI, {"s2_N_trans": 200})
+    setup, strategies = measurement.SCENARIO_STRATEGIES[measurement.config.SCENARIU_RAPORT_VANZARI]
+    make_args = setup(params, 0)
+    # După setup, generatorul nu mai trebuie apelat: argumentele sunt iteratoare peste datele existente
+    monkeypatch.setattr(measurement, "iter_transactions", None)
+    results = [fn(*make_args()) for fn in strategies]
+    assert results[0]["transactions"] == results[1]["transactions"] == 200
+    assert results[0]["total_sales"] == pytest.approx(results[1]["total_sales"])
+
+
+def test_log_setup_yields_fresh_iterators():
+    params = measurement.measured_params(measurement.config.SCENARIU_FILTRARE_LOGURI, {"s3_N_lines": 500})
+    setup, (full_load, streaming) = measurement.SCENARIO_STRATEGIES[measurement.config.SCENARIU_FILTRARE_LOGURI]
+    make_args = setup(params, 0)
+    first, second = full_load(*make_args()), streaming(*make_args())
+    assert first["lines"] == second["lines"] == 500
+    assert first["error_lines"] == second["error_lines"]
@@ -0,0 +1,64 @@
+# tests/test_models.py
+
+"""Modelele analitice: funcțiile scalare și variantele batch (api_handler) dau aceleași valori."""
+import itertools
+
+import numpy as np
+import pytest
+
+import api_handler
+import config
+from results import NUMERIC_COLUMNS
+
+KWH_CPU, KWH_DATA, GCO2 = 2e-9, 3e-9, 275.0
+# Valori pentru fiecare parametru: cazuri limită (0, 1) și valori obișnuite
+VALUES = {
+    "s1_N": [0, 1, 2, 1000, 250_000], "s1_avg_rec_size": [1, 100], "s1_key_idx_size": [1, 5],
+    "s2_N_trans": [0, 1, 10_000], "s2_avg_items": [1, 3], "s2_trans_header_size": [20], "s2_item_size": [1, 10],
+    "s3_N_lines": [0, 100, 100_000], "s3_avg_line_len": [150], "s3_err_perc": [1, 5, 100], "s3_err_msg_size": [50],
+}
+MODELS = [(scenario, model_costs.__name__[:-len("_costs")], keys)
+          for scenario, models in api_handler.SCENARIO_MODELS.items() for model_costs, keys in models]
+
+
+@pytest.mark.parametrize("scenario, model, keys", MODELS, ids=[m[1] for m in MODELS])
+def test_scalar_wrapper_matches_batch(scenario, model, keys):
+    scalar = getattr(api_handler, model)
+    batch = getattr(api_handler, model + "_batch")
+    points = list(itertools.product(*(VALUES[k] for k in keys)))
+    table = batch(*(np.array(column, dtype=float) for column in zip(*points)), KWH_CPU, KWH_DATA, GCO2)
+    assert len(table) == len(points)
+    for i, point in enumerate(points):
+        record = scalar(*point, KWH_CPU, KWH_DATA, GCO2)
+        expected = table.record(i)
+        assert record.name == expected.name
+        assert (record.complexity_cpu, record.complexity_memory) == (expected.complexity_cpu, expected.complexity_memory)
+        for column in NUMERIC_COLUMNS:
+            assert getattr(record, column) == pytest.approx(getattr(expected, column), rel=1e-12, abs=0.0), (point, column)
+
+
+def test_standard_sort_reference_values():
+    result = api_handler.model_standard_sort(1000, 100, KWH_CPU, KWH_DATA, GCO2)
+    comparisons, swaps = 1000 * 999 / 2, 1000 * 999 / 4
+    cpu = comparisons * config.COST_PER_COMPARISON_CPU + swaps * config.COST_PER_SWAP_FULL_RECORD_CPU
+    data = swaps * 100 * 2.0
+    assert result.cpu_operations == pytest.approx(cpu)
+    assert result.data_movement_units == pytest.approx(data)
+    assert result.memory_usage_data_units == pytest.approx(100_000)
+    assert result.estimated_kwh == pytest.approx(cpu * KWH_CPU + data * KWH_DATA)
+    assert result.estimated_co2_g == pytest.approx((cpu * KWH_CPU + data * KWH_DATA) * GCO2)
+
+
+def test_invalid_inputs_give_zero_costs():
+    result = api_handler.model_efficient_sort(0, 100, KWH_CPU, KWH_DATA, GCO2)
+    assert all(getattr(result, column) == 0.0 for column in NUMERIC_COLUMNS)
+
+
+def test_run_scenario_batch_matches_scalar_models():
+    params = dict(config.DEFAULT_INPUT_VALUES)
+    table = api_handler.run_scenario_batch(config.SCENARIU_RAPORT_VANZARI, params, KWH_CPU, KWH_DATA, GCO2, use_cache=False)
+    scalars = [api_handler.model_standard_sales_report, api_handler.model_green_sales_report]
+    keys = api_handler.scenario_input_keys(config.SCENARIU_RAPORT_VANZARI)
+    for i, model in enumerate(scalars):
+        record = model(*(params[k] for k in keys), KWH_CPU, KWH_DATA, GCO2)
+        assert record.estimated_co2_g == pytest.approx(table.record(i).estimated_co2_g, rel=1e-12)
@@ -0,0 +1,51 @@
+# tests/test_sales_aggregation.py
+
+"""
+Agregarea vânzărilor: implementările pandas și streaming dau aceleași totaluri
+și citesc doar coloanele folosite.
+"""
+import pandas as pd
+import pytest
+
+import sales_aggregation
+
+
+@pytest.fixture(params=["vanzari.csv", "vanzari.parquet"])
+def dataset(request, tmp_path):
+    path = str(tmp_path / request.param)
+    sales_aggregation.write_sample_dataset(path, 500, avg_items=4, item_size=32, seed=1, chunk_transactions=128)
+    return path
+
+
+def test_engines_agree(dataset):
+    expected = sales_aggregation.aggregate_pandas_multi_pass(dataset)
+    assert expected["transactions"] == 500
+    assert sales_aggregation.aggregate_streaming(dataset, batch_rows=97) == pytest.approx(expected)
+
+
+def test_pandas_reads_only_used_columns(dataset, monkeypatch):
+    loaded = []
+    for reader in ("read_csv", "read_parquet"):
+        original = getattr(pd, reader)
+
+        def spy(*args, _original=original, **kwargs):
+            df = _original(*args, **kwargs)
+            loaded.append(list(df.columns))
+            return df
+
+        monkeypatch.setattr(pd, reader, spy)
+    sales_aggregation.aggregate_pandas_multi_pass(dataset)
+    assert loaded == [list(sales_aggregation.COLUMNS)]
+
+
+def test_parallel_partitions_match_single_pass(dataset):
+    expected = sales_aggregation.aggregate_streaming(dataset)
+    assert sales_aggregation.aggregate_streaming(dataset, workers=3, batch_rows=97) == pytest.approx(expected)
+
+
+def test_parallel_measurement_reports_fixed_overhead_separately(dataset):
+    row = sales_aggregation._measure_in_child("streaming", dataset, 2, sales_aggregation.COLUMNS, 97)
+    assert row["transactions"] == 500
+    assert row["pool_overhead_seconds"] >= 0
+    assert row["worker_baseline_rss_bytes"] > 0
+    assert 0 <= row["worker_rss_delta_bytes"] < row["worker_baseline_rss_bytes"]
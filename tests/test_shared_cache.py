@@ -0,0 +1,61 @@
+# tests/test_shared_cache.py
+
+"""
+Cache-ul partajat între sesiuni (shared_cache): plafonul de octeți, ordinea
+eliminării (LRU), contabilizarea octeților și valorile mai mari decât plafonul.
+"""
+import numpy as np
+
+from shared_cache import SharedCache, estimate_size
+
+
+def test_put_evicts_least_recently_used_entries_over_the_byte_cap():
+    cache = SharedCache("test", max_bytes=100)
+    for key in "abc":
+        cache.put(key, key, size=30)
+    assert cache.get("a") == "a"  # "a" devine cea mai recent folosită
+    cache.put("d", "d", size=30)
+    assert "b" not in cache and all(key in cache for key in "acd")
+    cache.put("e", "e", size=60)
+    assert list(key for key in "abcde" if key in cache) == ["d", "e"]
+    info = cache.info()
+    assert info["evictions"] == 3
+    assert info["bytes"] == 90 and info["entries"] == 2
+
+
+def test_byte_total_follows_replacements():
+    cache = SharedCache("test", max_bytes=100)
+    cache.put("a", 1, size=40)
+    cache.put("b", 2, size=20)
+    cache.put("a", 3, size=10)
+    assert cache.info()["bytes"] == 30
+    assert cache.get("a") == 3
+    cache.put("b", 4, size=95)  # înlocuirea lui "b" depășește plafonul: "a" este eliminată
+    assert "a" not in cache and cache.info()["bytes"] == 95
+
+
+def test_oversize_values_are_returned_but_not_stored():
+    cache = SharedCache("test", max_bytes=100)
+    cache.put("a", "old", size=50)
+    assert cache.put("a", "new", size=101) == "new"
+    assert "a" not in cache and len(cache) == 0
+    assert cache.info()["bytes"] == 0 and cache.info()["evictions"] == 0
+
+
+def test_put_estimates_sizes_when_not_given():
+    cache = SharedCache("test", max_bytes=1 << 20)
+    values = np.zeros(1_000)
+    cache.put("values", values)
+    assert cache.info()["bytes"] == estimate_size(values) >= values.nbytes
+
+
+def test_get_or_compute_and_clear():
+    cache = SharedCache("test", max_bytes=100)
+    calls = []
+    compute = lambda: calls.append(1) or "value"
+    assert cache.get_or_compute("k", compute, size=10) == "value"
+    assert cache.get_or_compute("k", compute, size=10) == "value"
+    info = cache.info()
+    assert len(calls) == 1 and (info["hits"], info["misses"]) == (1, 1)
+    cache.clear()
+    assert cache.info() == dict(cache.info(), hits=0, misses=0, evictions=0, entries=0, bytes=0)
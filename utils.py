@@ -5,9 +5,16 @@ Acest modul oferă funcții utilitare pentru simulator, în special pentru
 calculele de conversie de la costuri abstracte la impactul din lumea reală
 și pentru generarea de rapoarte.
 """
+import hashlib
 import io
-import pandas as pd
-from openpyxl.drawing.image import Image
+
+import numpy as np
+
+import profiling
+import shared_cache
+
+# pandas (și openpyxl) sunt importate doar în funcțiile care construiesc tabele sau rapoarte:
+# modelele (api_handler) și serviciile fără interfață folosesc doar calculele numerice de aici.
 
 # ==============================================================================
 # == SECȚIUNEA 1: CONSTANTE PENTRU ECHIVALENTE REALE
@@ -27,6 +34,7 @@ def calculate_energy_co2(cpu_ops, data_movement, kwh_cpu_factor, kwh_data_factor
     """
     Calculează energia totală estimată (kWh) și emisiile de CO2 (g)
     pe baza costurilor abstracte și a factorilor de conversie.
+    Acceptă atât valori scalare, cât și array-uri NumPy (cu broadcast).
     """
     energy_from_cpu = cpu_ops * kwh_cpu_factor
     energy_from_data = data_movement * kwh_data_factor
@@ -39,52 +47,148 @@ def get_real_world_equivalents(estimated_co2_g, gco2eq_per_kwh_factor):
     """
     Convertește o cantitate dată de emisii de CO2 (în grame) în echivalente
     tangibile, din lumea reală.
+
+    Pentru valori scalare returnează doar echivalentele semnificative (ca înainte).
+    Pentru array-uri returnează ambele chei, cu 0.0 acolo unde emisiile sunt neglijabile.
+    """
+    co2 = np.asarray(estimated_co2_g, dtype=np.float64)
+    gco2_factor = np.asarray(gco2eq_per_kwh_factor, dtype=np.float64)
+    significant = co2 > 0.0001
+    # Calculăm emisiile de gCO2 per km pentru o mașină electrică
+    # pe baza eficienței (kWh/km) și a factorului de emisii al rețelei (gCO2/kWh)
+    gco2_per_km_ev = EV_EFFICIENCY_KWH_PER_KM * gco2_factor
+    ev_possible = significant & (gco2_per_km_ev > 0)
+    km_driven_ev = np.divide(co2, gco2_per_km_ev, out=np.zeros(np.broadcast(co2, gco2_per_km_ev).shape), where=ev_possible)
+    tree_hours = np.where(significant, co2 / GCO2_ABSORBED_BY_TREE_PER_HOUR, 0.0)
+
+    if co2.ndim == 0 and gco2_factor.ndim == 0:
+        equivalents = {}
+        if significant:
+            if ev_possible:
+                equivalents["km parcurși cu o mașină electrică"] = float(km_driven_ev)
+            equivalents["ore necesare unui copac pentru a absorbi"] = float(tree_hours)
+        return equivalents
+
+    return {
+        "km parcurși cu o mașină electrică": km_driven_ev,
+        "ore necesare unui copac pentru a absorbi": np.broadcast_to(tree_hours, km_driven_ev.shape),
+    }
+
+REDUCTION_METRICS = [("cpu_operations", "CPU"), ("data_movement_units", "Mișc.Date"), ("memory_usage_data_units", "Memorie"), ("estimated_kwh", "Energie"), ("estimated_co2_g", "CO2")]
+
+
+@profiling.timed("utils.calculate_reductions")
+def calculate_reductions(result_table):
     """
-    equivalents = {}
-    if estimated_co2_g > 0.0001:
-        # Calculăm emisiile de gCO2 per km pentru o mașină electrică
-        # pe baza eficienței (kWh/km) și a factorului de emisii al rețelei (gCO2/kWh)
-        gco2_per_km_ev = EV_EFFICIENCY_KWH_PER_KM * gco2eq_per_kwh_factor
-        
-        if gco2_per_km_ev > 0:
-            km_driven_ev = estimated_co2_g / gco2_per_km_ev
-            equivalents["km parcurși cu o mașină electrică"] = km_driven_ev
-            
-        tree_hours = estimated_co2_g / GCO2_ABSORBED_BY_TREE_PER_HOUR
-        equivalents["ore necesare unui copac pentru a absorbi"] = tree_hours
-        
-    return equivalents
+    Calculează reducerile procentuale ale fiecărui model "verde" față de primul
+    model din tabel (modelul standard).
+
+    Args:
+        result_table (results.ResultTable): Rezultatele unei rulări (un rând per model).
+
+    Returns:
+        pd.DataFrame: Câte un rând per model verde, cu reducerile formatate ca text.
+    """
+    import pandas as pd
+    reduction_data = []
+    names = result_table.names
+    for i in range(1, len(result_table)):
+        row_reduction = {"Model Verde": names[i]}
+        for metric_key, metric_name_ro_short in REDUCTION_METRICS:
+            current_val = result_table[metric_key][i]
+            standard_val = result_table[metric_key][0]
+            if standard_val > 1e-9:
+                reduction_percent = ((standard_val - current_val) / standard_val) * 100
+                row_reduction[f"Reducere {metric_name_ro_short} (%)"] = f"{reduction_percent:.1f}%"
+            else:
+                row_reduction[f"Reducere {metric_name_ro_short} (%)"] = "N/A" if current_val == standard_val else "∞"
+        reduction_data.append(row_reduction)
+    return pd.DataFrame(reduction_data)
 
 # ==============================================================================
 # == SECȚIUNEA 3: FUNCȚIE PENTRU EXPORT EXCEL
 # ==============================================================================
 
-def create_excel_export(all_results, df_reductions, df_history, figs_cost, figs_impact):
+# Figurile din aplicație și coloana din foaia 'Rezumat Simulare' din care se construiește graficul nativ echivalent.
+NATIVE_CHART_COLUMNS = {
+    "CPU": "cpu_operations",
+    "Data Movement": "data_movement_units",
+    "Memory": "memory_usage_data_units",
+    "Energy": "estimated_kwh",
+    "CO2": "estimated_co2_g",
+}
+CHART_MODES = ("native", "image")
+
+
+def _figure_title(fig, default):
+    """Titlul unei figuri Plotly (dacă există), altfel valoarea implicită."""
+    try:
+        return fig.layout.title.text or default
+    except AttributeError:
+        return default
+
+
+def _native_bar_chart(data_ws, title, value_col, n_rows):
+    """Grafic de tip coloană Excel, cu categoriile din coloana A și valorile din `value_col` (antet pe rândul 1)."""
+    from openpyxl.chart import BarChart, Reference
+    chart = BarChart()
+    chart.type = "col"
+    chart.title = title
+    chart.legend = None
+    chart.width, chart.height = 20, 11
+    chart.add_data(Reference(data_ws, min_col=value_col, min_row=1, max_row=n_rows + 1), titles_from_data=True)
+    chart.set_categories(Reference(data_ws, min_col=1, min_row=2, max_row=n_rows + 1))
+    return chart
+
+
+def _native_line_chart(data_ws, title, value_col, n_rows):
+    """Grafic de tip linie Excel pentru o coloană (antet pe rândul 1), în ordinea rândurilor."""
+    from openpyxl.chart import LineChart, Reference
+    chart = LineChart()
+    chart.title = title
+    chart.width, chart.height = 20, 11
+    chart.add_data(Reference(data_ws, min_col=value_col, min_row=1, max_row=n_rows + 1), titles_from_data=True)
+    return chart
+
+
+@profiling.timed("utils.create_excel_export")
+def create_excel_export(all_results, df_reductions, df_history, figs_cost, figs_impact, chart_mode="native"):
     """
     Creează un fișier Excel în memorie, conținând toate datele și graficele unei simulări.
 
     Args:
-        all_results (list): Lista de dicționare cu rezultatele detaliate pentru fiecare model.
+        all_results (results.ResultTable): Rezultatele detaliate pentru fiecare model.
         df_reductions (pd.DataFrame): DataFrame-ul cu reducerile procentuale.
         df_history (pd.DataFrame): DataFrame-ul cu istoricul complet al rulărilor.
         figs_cost (dict): Un dicționar de figuri Plotly pentru graficele de costuri.
         figs_impact (dict): Un dicționar de figuri Plotly pentru graficele de impact.
+        chart_mode (str): "native" (implicit) construiește grafice Excel native din datele
+            scrise în foi; "image" randează figurile Plotly ca PNG prin kaleido. În modul
+            "native", figurile fără echivalent nativ sunt randate ca imagine, dacă se poate.
 
     Returns:
         bytes: Conținutul binar al fișierului Excel generat.
     """
+    if chart_mode not in CHART_MODES:
+        raise ValueError(f"chart_mode trebuie să fie unul din {CHART_MODES}, nu {chart_mode!r}")
+    import pandas as pd
     output = io.BytesIO()
     
     with pd.ExcelWriter(output, engine='openpyxl') as writer:
         # Foaia 1: Rezumat și Reduceri
-        df_summary = pd.DataFrame(all_results)
+        df_summary = all_results.to_pandas(include_complexity=True)
         df_summary.to_excel(writer, sheet_name='Rezumat Simulare', index=False, startrow=0)
         if not df_reductions.empty:
             df_reductions.to_excel(writer, sheet_name='Rezumat Simulare', index=True, startrow=len(df_summary) + 3)
+        summary_ws = writer.book['Rezumat Simulare']
 
         # Foaia 2: Istoricul Complet
         if not df_history.empty:
             df_history.to_excel(writer, sheet_name='Istoric Complet', index=False)
+            if chart_mode == "native" and "CO2 (g)" in df_history.columns:
+                history_ws = writer.book['Istoric Complet']
+                chart = _native_line_chart(history_ws, "Emisii CO2 (g) pe intrările din istoric", df_history.columns.get_loc("CO2 (g)") + 1, len(df_history))
+                history_ws.add_chart(chart, f"A{len(df_history) + 3}")
 
         # Funcție ajutătoare pentru a adăuga grafice
         def add_charts_to_sheet(sheet_name, figs_dict):
@@ -95,11 +199,19 @@ def create_excel_export(all_results, df_reductions, df_history, figs_cost, figs_
                  
             current_row = 1
             for title, fig in figs_dict.items():
-                img_data = io.BytesIO(fig.to_image(format="png", width=800, height=450, scale=2))
-                img = Image(img_data)
-                
                 ws.cell(row=current_row, column=1, value=title)
-                ws.add_image(img, f'A{current_row + 1}')
+                column = NATIVE_CHART_COLUMNS.get(title)
+                if chart_mode == "native" and column in df_summary.columns:
+                    chart = _native_bar_chart(summary_ws, _figure_title(fig, title), df_summary.columns.get_loc(column) + 1, len(df_summary))
+                    ws.add_chart(chart, f'A{current_row + 1}')
+                else:
+                    # Varianta de rezervă: imagine PNG randată de kaleido (proces de browser headless)
+                    try:
+                        from openpyxl.drawing.image import Image
+                        img = Image(io.BytesIO(fig.to_image(format="png", width=800, height=450, scale=2)))
+                        ws.add_image(img, f'A{current_row + 1}')
+                    except (ImportError, ValueError, RuntimeError) as e:
+                        ws.cell(row=current_row + 1, column=1, value=f"Graficul nu a putut fi randat ca imagine: {e}")
                 current_row += 25 
 
         # Adăugăm foile de calcul cu grafice
@@ -110,3 +222,44 @@ def create_excel_export(all_results, df_reductions, df_history, figs_cost, figs_
 
     processed_data = output.getvalue()
     return processed_data
+
+
+# Rapoartele generate sunt memorate după conținut (rezultate + istoric), în cache-ul partajat
+# `excel_cache` (plafonat în octeți; cele mai vechi sunt eliminate, LRU).
+_excel_cache = shared_cache.get_cache("excel_cache")
+
+
+def excel_report_key(all_results, df_history, chart_mode="native", history_version=None):
+    """
+    Calculează cheia de cache a unui raport Excel: un hash al rezultatelor, al
+    istoricului și al modului de grafice. Graficele derivă din rezultate, deci nu intră în cheie.
+    Cu `history_version` (ex: history_store.HistoryStore.version()) istoricul nu mai
+    este citit și hash-uit; `df_history` poate fi atunci None.
+    """
+    h = hashlib.blake2b(all_results.content_hash().encode(), digest_size=16)
+    h.update(chart_mode.encode())
+    if history_version is not None:
+        h.update(f"history:{history_version}".encode())
+    else:
+        import pandas as pd
+        h.update(repr(list(df_history.columns)).encode())
+        if not df_history.empty:
+            h.update(pd.util.hash_pandas_object(df_history, index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def get_excel_export(all_results, df_reductions, df_history, figs_cost, figs_impact, report_key=None, chart_mode="native"):
+    """
+    Returnează raportul Excel din cache sau îl generează (o singură dată per conținut)
+    cu `create_excel_export`. Argumentele sunt aceleași; `report_key` poate fi
+    transmis dacă a fost deja calculat cu `excel_report_key`. `df_history` poate fi
+    și o funcție fără argumente, apelată doar dacă raportul trebuie generat.
+    """
+    if report_key is None and callable(df_history):
+        df_history = df_history()
+    key = report_key or excel_report_key(all_results, df_history, chart_mode)
+
+    def build():
+        history = df_history() if callable(df_history) else df_history
+        return create_excel_export(all_results, df_reductions, history, figs_cost, figs_impact, chart_mode)
+    return _excel_cache.get_or_compute(key, build)